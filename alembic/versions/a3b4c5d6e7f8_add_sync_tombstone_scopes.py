@@ -0,0 +1,210 @@
+"""scope sync tombstones and record the tombstone purge horizon
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNC_TABLES = {
+    "shift_reports": "shift_report_id",
+    "shift_report_details": "shift_report_detail_id",
+    "project_works": "project_work_id",
+}
+
+SYNC_SCOPE_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION sync_report_scope(
+        report uuid, OUT scope_user uuid, OUT scope_project uuid
+    ) AS $$
+    BEGIN
+        SELECT r."user", r.project INTO scope_user, scope_project
+        FROM shift_reports r WHERE r.shift_report_id = report;
+        IF NOT FOUND THEN
+            SELECT t.scope_user, t.scope_project INTO scope_user, scope_project
+            FROM sync_tombstones t
+            WHERE t.entity = 'shift_reports' AND t.entity_id = report
+            ORDER BY t.tombstone_id DESC LIMIT 1;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sync_write_tombstone() RETURNS trigger AS $$
+    DECLARE
+        scope record;
+    BEGIN
+        IF TG_TABLE_NAME = 'shift_reports' THEN
+            SELECT OLD."user" AS scope_user, OLD.project AS scope_project
+            INTO scope;
+        ELSIF TG_TABLE_NAME = 'shift_report_details' THEN
+            SELECT * INTO scope FROM sync_report_scope(OLD.shift_report);
+        ELSE
+            SELECT NULL::uuid AS scope_user, OLD.project AS scope_project
+            INTO scope;
+        END IF;
+        INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+        VALUES (
+            TG_TABLE_NAME,
+            (to_jsonb(OLD) ->> TG_ARGV[0])::uuid,
+            scope.scope_user,
+            scope.scope_project
+        );
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sync_scope_changed() RETURNS trigger AS $$
+    DECLARE
+        scope record;
+    BEGIN
+        IF TG_TABLE_NAME = 'shift_reports' THEN
+            INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+            SELECT 'shift_report_details', d.shift_report_detail_id,
+                   OLD."user", OLD.project
+            FROM shift_report_details d WHERE d.shift_report = OLD.shift_report_id
+            UNION ALL
+            SELECT 'shift_reports', OLD.shift_report_id, OLD."user", OLD.project;
+            UPDATE shift_report_details SET change_version = change_version
+            WHERE shift_report = NEW.shift_report_id;
+        ELSIF TG_TABLE_NAME = 'shift_report_details' THEN
+            SELECT * INTO scope FROM sync_report_scope(OLD.shift_report);
+            INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+            VALUES (
+                'shift_report_details', OLD.shift_report_detail_id,
+                scope.scope_user, scope.scope_project
+            );
+        ELSIF TG_TABLE_NAME = 'project_works' THEN
+            INSERT INTO sync_tombstones (entity, entity_id, scope_project)
+            VALUES ('project_works', OLD.project_work_id, OLD.project);
+        ELSIF TG_TABLE_NAME = 'projects' THEN
+            -- Прежний прораб теряет весь проект; автор отчетов — нет
+            INSERT INTO sync_tombstones (entity, entity_id, scope_leader)
+            SELECT 'project_works', w.project_work_id, OLD.project_leader
+            FROM project_works w WHERE w.project = OLD.project_id
+            UNION ALL
+            SELECT 'shift_reports', r.shift_report_id, OLD.project_leader
+            FROM shift_reports r WHERE r.project = OLD.project_id
+            UNION ALL
+            SELECT 'shift_report_details', d.shift_report_detail_id,
+                   OLD.project_leader
+            FROM shift_report_details d
+            JOIN shift_reports r ON r.shift_report_id = d.shift_report
+            WHERE r.project = OLD.project_id;
+            UPDATE project_works SET change_version = change_version
+            WHERE project = NEW.project_id;
+            UPDATE shift_reports SET change_version = change_version
+            WHERE project = NEW.project_id;
+            UPDATE shift_report_details d SET change_version = d.change_version
+            FROM shift_reports r
+            WHERE r.shift_report_id = d.shift_report AND r.project = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Таблицы, где смена столбцов выводит строку из области видимости:
+# (столбцы, условие срабатывания триггера)
+SYNC_SCOPE_TRIGGERS = {
+    "shift_reports": (
+        '"user", project',
+        'OLD."user" IS DISTINCT FROM NEW."user" '
+        "OR OLD.project IS DISTINCT FROM NEW.project",
+    ),
+    "shift_report_details": (
+        "shift_report",
+        "OLD.shift_report IS DISTINCT FROM NEW.shift_report",
+    ),
+    "project_works": ("project", "OLD.project IS DISTINCT FROM NEW.project"),
+    "projects": (
+        "project_leader",
+        "OLD.project_leader IS DISTINCT FROM NEW.project_leader",
+    ),
+}
+
+
+def upgrade() -> None:
+    for column in ("scope_user", "scope_project", "scope_leader"):
+        op.add_column("sync_tombstones", sa.Column(column, sa.UUID(), nullable=True))
+    op.create_table(
+        "sync_meta",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+    # Старые надгробия без области не отдаются клиентам с ограниченной
+    # областью — их токены должны получить полную пересинхронизацию
+    op.execute(
+        """
+        INSERT INTO sync_meta (key, value)
+        SELECT 'purge_horizon', max(change_version) FROM sync_tombstones
+        HAVING count(*) > 0
+        """
+    )
+
+    for statement in SYNC_SCOPE_FUNCTIONS:
+        op.execute(statement)
+    for table, primary_key in SYNC_TABLES.items():
+        # Надгробие пишется до удаления: каскадно удаляемые детали берут
+        # область из надгробия своего отчета
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_tombstone
+            BEFORE DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_write_tombstone('{primary_key}')
+            """
+        )
+    for table, (columns, condition) in SYNC_SCOPE_TRIGGERS.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_sync_scope
+            AFTER UPDATE OF {columns} ON {table}
+            FOR EACH ROW WHEN ({condition})
+            EXECUTE FUNCTION sync_scope_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in SYNC_SCOPE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_scope ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS sync_scope_changed()")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_write_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (entity, entity_id)
+            VALUES (TG_TABLE_NAME, (to_jsonb(OLD) ->> TG_ARGV[0])::uuid);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, primary_key in SYNC_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_write_tombstone('{primary_key}')
+            """
+        )
+    op.execute("DROP FUNCTION IF EXISTS sync_report_scope(uuid)")
+    op.drop_table("sync_meta")
+    for column in ("scope_leader", "scope_project", "scope_user"):
+        op.drop_column("sync_tombstones", column)
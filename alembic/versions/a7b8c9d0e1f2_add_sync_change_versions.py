@@ -0,0 +1,118 @@
+"""add change versions and tombstones for delta sync
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_VERSION_SQL = "pg_current_xact_id()::text::bigint"
+
+SYNC_TABLES = {
+    "shift_reports": "shift_report_id",
+    "shift_report_details": "shift_report_detail_id",
+    "project_works": "project_work_id",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("tombstone_id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "change_version",
+            sa.BigInteger(),
+            server_default=sa.text(CHANGE_VERSION_SQL),
+            nullable=False,
+        ),
+        sa.Column(
+            "deleted_at",
+            sa.BigInteger(),
+            server_default=sa.text("EXTRACT(EPOCH FROM NOW())"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_sync_tombstones_change_version", "sync_tombstones", ["change_version"]
+    )
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION sync_bump_change_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_version := {CHANGE_VERSION_SQL};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_write_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (entity, entity_id)
+            VALUES (TG_TABLE_NAME, (to_jsonb(OLD) ->> TG_ARGV[0])::uuid);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table, primary_key in SYNC_TABLES.items():
+        # Постоянное значение по умолчанию добавляется без перезаписи
+        # таблицы; volatile-выражение в ADD COLUMN переписало бы её целиком
+        # под ACCESS EXCLUSIVE. Существующие строки получают версию 0 и
+        # попадают в полный снимок, новые — версию транзакции.
+        op.add_column(
+            table,
+            sa.Column(
+                "change_version",
+                sa.BigInteger(),
+                server_default=sa.text("0"),
+                nullable=False,
+            ),
+        )
+        op.alter_column(
+            table, "change_version", server_default=sa.text(CHANGE_VERSION_SQL)
+        )
+        op.create_index(f"ix_{table}_change_version", table, ["change_version"])
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_change_version
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_bump_change_version()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_tombstone
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_write_tombstone('{primary_key}')
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in SYNC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_version ON {table}")
+        op.drop_index(f"ix_{table}_change_version", table_name=table)
+        op.drop_column(table, "change_version")
+    op.execute("DROP FUNCTION IF EXISTS sync_write_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS sync_bump_change_version()")
+    op.drop_index("ix_sync_tombstones_change_version", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
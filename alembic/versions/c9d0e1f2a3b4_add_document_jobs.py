@@ -0,0 +1,53 @@
+"""add document_jobs for background template generation
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_jobs",
+        sa.Column("job_id", sa.UUID(), primary_key=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("cache_key", sa.String(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_by",
+            sa.UUID(),
+            sa.ForeignKey("users.user_id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.BigInteger(),
+            server_default=sa.text("EXTRACT(EPOCH FROM NOW())"),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.BigInteger(), nullable=True),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "ix_document_jobs_created_by", "document_jobs", ["created_by"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_jobs_created_by", table_name="document_jobs")
+    op.drop_table("document_jobs")
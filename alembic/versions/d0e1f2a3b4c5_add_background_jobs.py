@@ -0,0 +1,60 @@
+"""add background_jobs queue table
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("job_id", sa.UUID(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "run_at",
+            sa.BigInteger(),
+            server_default=sa.text("EXTRACT(EPOCH FROM NOW())"),
+            nullable=False,
+        ),
+        sa.Column("locked_until", sa.BigInteger(), nullable=True),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.BigInteger(),
+            server_default=sa.text("EXTRACT(EPOCH FROM NOW())"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "ix_background_jobs_ready",
+        "background_jobs",
+        ["status", "priority", "run_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_ready", table_name="background_jobs")
+    op.drop_table("background_jobs")
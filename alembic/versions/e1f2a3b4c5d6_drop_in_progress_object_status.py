@@ -0,0 +1,45 @@
+"""drop legacy in_progress object status
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Раньше статус удалялся при каждом старте приложения. Версия таблицы
+    # увеличивается в той же транзакции, иначе ETag списка статусов не
+    # изменится и клиенты продолжат получать 304 с удалённым статусом
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            DELETE FROM object_statuses
+            WHERE object_status_id = 'in_progress'
+              AND NOT EXISTS (SELECT 1 FROM objects WHERE status = 'in_progress');
+            IF FOUND THEN
+                INSERT INTO table_versions (table_name, version)
+                VALUES ('object_statuses', 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = table_versions.version + 1;
+                PERFORM pg_notify('reference_cache', 'object_statuses');
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,40 @@
+"""add indexes for payroll aggregation
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_shift_reports_signed_date",
+        "shift_reports",
+        ["date"],
+        postgresql_where=sa.text("signed AND NOT deleted"),
+    )
+    op.create_index(
+        "ix_shift_report_details_shift_report",
+        "shift_report_details",
+        ["shift_report"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_shift_report_details_shift_report", table_name="shift_report_details"
+    )
+    op.drop_index("ix_shift_reports_signed_date", table_name="shift_reports")
@@ -0,0 +1,40 @@
+"""add day bucket column to shift_reports
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "shift_reports",
+        sa.Column(
+            "day",
+            sa.Date(),
+            sa.Computed(
+                "(to_timestamp(date) AT TIME ZONE 'Europe/Moscow')::date",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_shift_reports_day_user", "shift_reports", ["day", "user"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shift_reports_day_user", table_name="shift_reports")
+    op.drop_column("shift_reports", "day")
@@ -2,24 +2,34 @@ import time
 
 from flask import Flask, g, request
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
 from flask_restx import Api
-from opentelemetry import trace
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from prometheus_client import REGISTRY
 from prometheus_flask_exporter import PrometheusMetrics
 from werkzeug.middleware.proxy_fix import ProxyFix
 
-from app.database import init_db, set_db_globals, setup_listeners
-from app.database.vacuum import start_background_task
+from app.database import (
+    check_pool_budget,
+    init_db,
+    set_db_globals,
+    setup_listeners,
+)
+from app.database.maintenance import maintenance_scheduler
+from app.database.reference_cache import reference_cache
+from app.database.scope_cache import scope_cache
+from app.database.slow_queries import slow_query_log
+from app.database.sql_metrics import sql_instrumentation
+from app.decorators.auth import authenticate_request
 from app.error_handlers import setup_error_handlers
 from app.routes import register_namespaces, register_routes
-from app.utils.db_setting_tables import set_object_status, set_roles
+from app.utils.db_setting_tables import seed_reference_data
+from app.utils.document_jobs import document_job_runner
+from app.utils.passwords import password_hasher
+from app.utils.responses import register_json_representation, response_compression
+from app.utils.startup import StartupProfile
+from app.utils.template_client import template_client
+from app.utils.tracing import setup_tracing
 from config import DevelopmentConfig, TestingConfig
 from logger import setup_logger
 
@@ -38,6 +48,7 @@ ma = Marshmallow()
 
 def create_app(config_name="development"):
     """Функция для создания экземпляра приложения"""
+    profile = StartupProfile()
     app = Flask(__name__)
     # Выбираем конфигурацию
     if config_name == "development":
@@ -46,19 +57,8 @@ def create_app(config_name="development"):
         if "app_info" not in REGISTRY._names_to_collectors:
             metrics.info("app_info", "Описание приложения", version="1.0.3")
         app.config.from_object(DevelopmentConfig)
-        # Настройка
-        trace.set_tracer_provider(
-            TracerProvider(resource=Resource.create({"service.name": "ok_service"}))
-        )
-
-        jaeger_exporter = JaegerExporter(
-            agent_host_name="jaeger",  # имя контейнера!
-            agent_port=6831,
-        )
-
-        span_processor = BatchSpanProcessor(jaeger_exporter)
-        trace.get_tracer_provider().add_span_processor(span_processor)  # type: ignore
-        FlaskInstrumentor().instrument_app(app)
+        with profile.phase("tracing"):
+            setup_tracing(app)
     elif config_name == "testing":
         app.config.from_object(TestingConfig)
     elif config_name == "local_development":
@@ -75,23 +75,40 @@ def create_app(config_name="development"):
         x_port=1,  # Учитываем X-Forwarded-Port
     )
     # Инициализация базы данных
-    engine, Session, Base = init_db(app.config["SQLALCHEMY_DATABASE_URI"], config_name)
-    set_db_globals(engine, Session, Base)
+    with profile.phase("database"):
+        engine, Session, Base = init_db(
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            config_name,
+            pool_size=app.config["DB_POOL_SIZE"],
+            max_overflow=app.config["DB_MAX_OVERFLOW"],
+            pool_timeout=app.config["DB_POOL_TIMEOUT"],
+        )
+        set_db_globals(engine, Session, Base)
+    sql_instrumentation.init_app(app)
+    sql_instrumentation.instrument(engine)
+    slow_query_log.init_app(app)
     logger = setup_logger()
     logger.info("База данных успешно инициализирована.", extra={"login": "init"})
+    check_pool_budget(app.config)
 
-    # Запуск фоновой задачи при старте приложения
+    password_hasher.init_app(app)
+    template_client.init_app(app)
+    document_job_runner.init_app(app)
 
-    # Инициализация ролей и админа
+    # Роли и статусы объектов: один идемпотентный запрос
+    with profile.phase("seed"):
+        seed_reference_data()
 
-    set_roles()
+    # Прогрев кэша справочников: при preload_app воркеры наследуют его от мастера
+    with profile.phase("reference_cache"):
+        reference_cache.init_app(app)
+        reference_cache.warm()
+    scope_cache.init_app(app)
 
-    set_object_status()
+    maintenance_scheduler.init_app(app)
 
     if config_name != "testing":
         setup_listeners()
-        with app.app_context():
-            start_background_task()
 
     # Инициализация JWT
     try:
@@ -115,20 +132,28 @@ def create_app(config_name="development"):
     # Инициализация Marshmallow
     ma.init_app(app)
 
-    # Инициализация API
-    api = Api(app, doc="/swagger", security="Bearer", authorizations=authorizations)
-    # Регистрация маршрутов
-    register_namespaces(api)
+    # Инициализация API; Swagger-спецификация строится при первом запросе
+    with profile.phase("namespaces"):
+        api = Api(app, doc="/swagger", security="Bearer", authorizations=authorizations)
+        register_json_representation(api, app.config.get("API_JSON_RENDERER", "orjson"))
+        register_namespaces(api)
 
     setup_error_handlers(app)
 
+    # Статистика SQL запроса: число запросов, время в БД, строки, N+1
     @app.before_request
-    def inject_user_info():
-        try:
-            verify_jwt_in_request(optional=True)
-            g.user_info = get_jwt_identity() or "anonymous"
-        except Exception:
-            g.user_info = "anonymous"
+    def start_sql_stats():
+        rule = request.url_rule
+        sql_instrumentation.start(rule.rule if rule else "unmatched")
+
+    @app.teardown_request
+    def finish_sql_stats(exc):
+        sql_instrumentation.finish()
+
+    # Единственная проверка JWT за запрос; identity кладётся в g
+    app.before_request(authenticate_request)
+    # Поток обслуживания БД стартует в каждом воркере после fork
+    app.before_request(maintenance_scheduler.ensure_started)
 
     @app.before_request
     def start_timer():
@@ -160,4 +185,10 @@ def create_app(config_name="development"):
     # Настройка CORS
     CORS(app, resources={r"/*": {"origins": "*"}})
 
+    # Сжатие gzip/brotli JSON-ответов больше COMPRESS_MIN_SIZE
+    response_compression.init_app(app)
+    app.after_request(response_compression.compress_response)
+
+    app.extensions["startup_profile"] = profile.report()
+    profile.log()
     return app
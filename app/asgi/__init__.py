@@ -0,0 +1,84 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from app.asgi.endpoints import (
+    REFERENCE_LISTS,
+    projects_all,
+    reference_list,
+    shift_reports_all,
+)
+from app.database.scope_cache import scope_cache
+from app.database.slow_queries import slow_query_log
+from app.database.sql_metrics import sql_instrumentation
+from app.utils.responses import response_compression
+from config import DevelopmentConfig, TestingConfig
+from logger import setup_logger
+
+CONFIGS = {
+    "development": DevelopmentConfig,
+    "local_development": DevelopmentConfig,
+    "testing": TestingConfig,
+}
+
+
+def async_database_url(url):
+    """URL основной БД с асинхронным драйвером asyncpg."""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def create_asgi_app(config_name="development"):
+    """ASGI-приложение для нагруженных списков (только чтение).
+
+    Запускается рядом с Flask (`uvicorn asgi:app`) и отдаёт те же ответы
+    по тем же путям: /shift_reports/all, /projects/all и справочники.
+    Запросы к БД идут через пул asyncpg, поэтому тысячи одновременных
+    соединений обслуживает один процесс без пула потоков."""
+    if config_name not in CONFIGS:
+        raise ValueError(f"Неизвестное имя конфигурации: {config_name}")
+    config = CONFIGS[config_name]
+    logger = setup_logger()
+    # Синглтоны настраиваются так же, как во Flask: init_app читает app.config
+    settings = SimpleNamespace(
+        config={key: getattr(config, key) for key in dir(config) if key.isupper()}
+    )
+    for extension in (
+        scope_cache,
+        sql_instrumentation,
+        slow_query_log,
+        response_compression,
+    ):
+        extension.init_app(settings)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.engine = create_async_engine(
+            async_database_url(config.SQLALCHEMY_DATABASE_URI),
+            pool_size=config.ASYNC_DB_POOL_SIZE,
+            max_overflow=config.ASYNC_DB_MAX_OVERFLOW,
+            pool_timeout=config.ASYNC_DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+        sql_instrumentation.instrument(app.state.engine.sync_engine)
+        logger.info("ASGI-приложение запущено", extra={"login": "init"})
+        try:
+            yield
+        finally:
+            await app.state.engine.dispose()
+
+    routes = [
+        Route("/shift_reports/all", shift_reports_all, methods=["GET"]),
+        Route("/projects/all", projects_all, methods=["GET"]),
+    ]
+    routes += [
+        Route(f"/{spec.key}/all", reference_list(spec), methods=["GET"])
+        for spec in REFERENCE_LISTS
+    ]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.config = config
+    return app
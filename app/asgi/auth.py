@@ -0,0 +1,37 @@
+import jwt
+
+from app.decorators.auth import Identity
+
+
+class AuthError(Exception):
+    """Ошибка проверки токена; статусы и тексты как у flask_jwt_extended."""
+
+    def __init__(self, msg, status):
+        super().__init__(msg)
+        self.msg = msg
+        self.status = status
+
+
+def authenticate(request, config):
+    """Проверяет access-токен из заголовка Authorization и возвращает Identity."""
+    header = request.headers.get("Authorization")
+    if not header:
+        raise AuthError("Missing Authorization Header", 401)
+    scheme, _, token = header.partition(" ")
+    if scheme != "Bearer" or not token or " " in token:
+        raise AuthError(
+            "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'", 422
+        )
+    try:
+        claims = jwt.decode(
+            token,
+            config.JWT_SECRET_KEY,
+            algorithms=[getattr(config, "JWT_ALGORITHM", "HS256")],
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthError("Token has expired", 401) from None
+    except jwt.InvalidTokenError as e:
+        raise AuthError(str(e), 422) from None
+    if claims.get("type") != "access":
+        raise AuthError("Only non-refresh tokens are allowed", 422)
+    return Identity.from_jwt(claims["sub"])
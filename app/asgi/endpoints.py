@@ -0,0 +1,342 @@
+import logging
+import time
+from dataclasses import dataclass
+from functools import wraps
+from importlib import import_module
+
+from marshmallow import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app.asgi.auth import AuthError, authenticate
+from app.database.sql_metrics import sql_instrumentation
+from app.decorators.etag import ETAG_TABLES, build_etag
+from app.utils.marshalling import marshal
+from app.utils.responses import dumps, response_compression
+
+logger = logging.getLogger("ok_service")
+
+
+def _load(path):
+    """Объект по пути "модуль:имя" — модели и менеджеры импортируются лениво."""
+    module, _, name = path.partition(":")
+    return getattr(import_module(module), name)
+
+
+def query_args(request):
+    """Query-параметры в том же виде, что request.args во Flask."""
+    return MultiDict(request.query_params.multi_items())
+
+
+def json_response(request, content, status_code, headers=None):
+    """JSON через orjson со сжатием по Accept-Encoding — как output_json
+    и response_compression во Flask."""
+    body = dumps(content)
+    headers = dict(headers or {})
+    if response_compression.enabled:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = response_compression.negotiate(
+            parse_accept_header(request.headers.get("Accept-Encoding"))
+        )
+        if encoding and len(body) >= response_compression.min_size:
+            body = response_compression.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            if headers.get("ETag", "").startswith('"'):
+                headers["ETag"] = "W/" + headers["ETag"]
+    return Response(
+        body, status_code=status_code, headers=headers, media_type="application/json"
+    )
+
+
+async def run_db(request, fn):
+    """Выполняет синхронный код менеджеров поверх асинхронного драйвера.
+
+    `fn(session)` получает обычную Session, поэтому менеджеры с внешней
+    сессией работают без изменений, а ожидание БД не блокирует цикл
+    событий."""
+    stats = sql_instrumentation.current()
+
+    def call(session):
+        # run_sync выполняет fn в отдельном greenlet со своим контекстом
+        sql_instrumentation.activate(stats)
+        return fn(session)
+
+    async with AsyncSession(request.app.state.engine) as session:
+        return await session.run_sync(call)
+
+
+def endpoint(model_path):
+    """Проверка JWT, маршалинг моделью Swagger и лог запроса —
+    как auth_required, marshal_with и after_request во Flask.
+
+    Обработчик получает (request, current_user) и возвращает Response
+    либо кортеж (data, code, headers)."""
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request):
+            started = time.perf_counter()
+            sql_instrumentation.start(request.url.path)
+            current_user = None
+            try:
+                current_user = authenticate(request, request.app.state.config)
+            except AuthError as e:
+                response = json_response(request, {"msg": e.msg}, e.status)
+            else:
+                stats = sql_instrumentation.current()
+                if stats is not None:
+                    stats.role = current_user.role
+                result = await handler(request, current_user)
+                if isinstance(result, Response):
+                    response = result
+                else:
+                    data, code, headers = result
+                    response = json_response(
+                        request,
+                        marshal(data, _load(model_path), native=True),
+                        code,
+                        headers,
+                    )
+            sql_instrumentation.finish()
+            duration = round((time.perf_counter() - started) * 1000)
+            user_agent = request.headers.get("User-Agent", "unknown")
+            logger.info(
+                f"{request.method} {request.url.path} {response.status_code} "
+                f"{duration}ms {user_agent}",
+                extra={"login": current_user or "anonymous"},
+            )
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+@endpoint("app.routes.models.shift_report_models:shift_report_all_response")
+async def shift_reports_all(request, current_user):
+    from app.routes.namespaces.shift_report_ns import (
+        apply_role_scope,
+        build_filters,
+        load_filter_args,
+    )
+    from app.schemas.shift_report_schemas import ShiftReportFilterSchema
+
+    logger.info("Request to fetch all shift reports", extra={"login": current_user})
+    try:
+        args = load_filter_args(ShiftReportFilterSchema(), query_args(request))
+    except ValidationError as err:
+        logger.error(f"Validation error: {err.messages}", extra={"login": current_user})
+        return {"msg": "Validation error", "detail": err.messages}, 400, None
+    offset = args.get("offset", 0)  # type: ignore
+    limit = args.get("limit", None)  # type: ignore
+    sort_by = args.get("sort_by")  # type: ignore
+    sort_order = args.get("sort_order", "desc")  # type: ignore
+    filters = build_filters(args)
+
+    def fetch(session):
+        from app.database.managers.shift_reports_managers import ShiftReportsManager
+
+        if not apply_role_scope(current_user, filters, session=session):
+            return None
+        db = ShiftReportsManager(session=session)
+        total_count, reports = db.get_shift_reports_filtered(
+            offset=offset,
+            limit=limit,
+            sort_by=sort_by,  # type: ignore
+            sort_order=sort_order,
+            **filters,
+        )
+        for report in reports:
+            report["shift_report_details_sum"] = db.get_total_sum_by_shift_report(
+                report["shift_report_id"]
+            )
+        return total_count, reports
+
+    try:
+        result = await run_db(request, fetch)
+    except Exception as e:
+        logger.error(
+            f"Error fetching shift reports: {e}", extra={"login": current_user}
+        )
+        return {"msg": f"Error fetching shift reports: {e}"}, 500, None
+    if result is None:
+        return {"msg": "Forbidden"}, 403, None
+    total_count, reports = result
+    logger.info(
+        f"Successfully fetched {len(reports)} shift reports",
+        extra={"login": current_user},
+    )
+    return (
+        {
+            "msg": "Shift reports found successfully",
+            "shift_reports": reports,
+            "total": total_count,
+        },
+        200,
+        None,
+    )
+
+
+@endpoint("app.routes.models.project_models:project_all_response")
+async def projects_all(request, current_user):
+    from app.schemas.project_schemas import ProjectFilterSchema
+
+    logger.info("Request to fetch all projects", extra={"login": current_user})
+    try:
+        args = ProjectFilterSchema().load(query_args(request))
+    except ValidationError as err:
+        logger.error(f"Validation error: {err.messages}", extra={"login": current_user})
+        return {"error": err.messages}, 400, None
+    offset = args.get("offset", 0)  # type: ignore
+    limit = args.get("limit", 10)  # type: ignore
+    sort_by = args.get("sort_by")  # type: ignore
+    sort_order = args.get("sort_order", "desc")  # type: ignore
+    filters = {
+        name: args.get(name)  # type: ignore
+        for name in (
+            "name",
+            "deleted",
+            "object",
+            "project_leader",
+            "created_by",
+            "created_at",
+        )
+    }
+
+    def fetch(session):
+        from app.database.managers.projects_managers import ProjectsManager
+
+        return ProjectsManager(session=session).get_all_filtered_with_status(
+            user=current_user,
+            offset=offset,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            **filters,
+        )
+
+    try:
+        projects = await run_db(request, fetch)
+    except Exception as e:
+        logger.error(f"Error fetching projects: {e}", extra={"login": current_user})
+        return {"msg": f"Error fetching projects: {e}"}, 500, None
+    logger.info(
+        f"Successfully fetched {len(projects)} projects",
+        extra={"login": current_user},
+    )
+    return {"msg": "Projects found successfully", "projects": projects}, 200, None
+
+
+@dataclass(frozen=True)
+class ReferenceList:
+    """Описание справочника: те же схема, фильтры, менеджер и ETag-таблицы,
+    что у соответствующего `/<ns>/all` во Flask."""
+
+    key: str
+    label: str
+    schema: str
+    manager: str
+    model: str
+    filters: tuple
+    tables: tuple
+    default_limit: int | None = None
+    default_sort_order: str = "desc"
+
+
+REFERENCE_LISTS = (
+    ReferenceList(
+        key="works",
+        label="works",
+        schema="app.schemas.work_schemas:WorkFilterSchema",
+        manager="app.database.managers.works_managers:WorksManager",
+        model="app.routes.models.work_models:work_all_response",
+        filters=("name", "deleted", "created_by", "created_at"),
+        tables=ETAG_TABLES["works"],
+        default_sort_order="descc",
+    ),
+    ReferenceList(
+        key="materials",
+        label="materials",
+        schema="app.schemas.material_schemas:MaterialFilterSchema",
+        manager="app.database.managers.materials_manager:MaterialsManager",
+        model="app.routes.models.material_models:material_all_response",
+        filters=("name", "measurement_unit", "deleted", "created_by", "created_at"),
+        tables=ETAG_TABLES["materials"],
+    ),
+    ReferenceList(
+        key="work_prices",
+        label="work prices",
+        schema="app.schemas.work_price_schemas:WorkPriceFilterSchema",
+        manager="app.database.managers.works_managers:WorkPricesManager",
+        model="app.routes.models.work_price_models:work_price_all_response",
+        filters=("work", "deleted", "category", "price", "created_by", "created_at"),
+        tables=ETAG_TABLES["work_prices"],
+    ),
+    ReferenceList(
+        key="cities",
+        label="cities",
+        schema="app.schemas.city_schemas:CityFilterSchema",
+        manager="app.database.managers.cities_manager:CitiesManager",
+        model="app.routes.models.city_models:city_all_response",
+        filters=("name", "deleted"),
+        tables=ETAG_TABLES["cities"],
+        default_limit=10,
+    ),
+)
+
+
+def reference_list(spec):
+    """Эндпоинт справочника с условным GET (ETag/304), как etag_conditional."""
+
+    @endpoint(spec.model)
+    async def handler(request, current_user):
+        logger.info(f"Request to fetch all {spec.label}", extra={"login": current_user})
+        params = query_args(request)
+        try:
+            args = _load(spec.schema)().load(params)
+        except ValidationError as err:
+            logger.error(
+                f"Validation error while filtering {spec.label}: {err.messages}",
+                extra={"login": current_user},
+            )
+            return {"error": err.messages}, 400, None
+        if_none_match = parse_etags(request.headers.get("If-None-Match"))
+
+        def fetch(session):
+            from app.database.managers.table_versions_manager import (
+                TableVersionsManager,
+            )
+
+            versions = TableVersionsManager(session=session).get_versions(spec.tables)
+            etag = build_etag(versions, params.items(multi=True))
+            if if_none_match.contains_weak(etag):
+                return etag, None
+            items = _load(spec.manager)(session=session).get_all_filtered(
+                offset=args.get("offset", 0),  # type: ignore
+                limit=args.get("limit", spec.default_limit),  # type: ignore
+                sort_by=args.get("sort_by"),  # type: ignore
+                sort_order=args.get("sort_order", spec.default_sort_order),  # type: ignore
+                **{name: args.get(name) for name in spec.filters},  # type: ignore
+            )
+            return etag, items
+
+        try:
+            etag, items = await run_db(request, fetch)
+        except Exception as e:
+            logger.error(
+                f"Error fetching {spec.label}: {e}", extra={"login": current_user}
+            )
+            return {"msg": f"Error fetching {spec.label}: {e}"}, 500, None
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if items is None:
+            return Response(status_code=304, headers=headers)
+        logger.info(
+            f"Successfully fetched {len(items)} {spec.label}",
+            extra={"login": current_user},
+        )
+        message = f"{spec.label.capitalize()} found successfully"
+        return {"msg": message, spec.key: items}, 200, headers
+
+    return handler
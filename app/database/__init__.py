@@ -1,3 +1,3 @@
-from .db_setup import init_db
+from .db_setup import check_pool_budget, dispose_engine_after_fork, init_db
 from .db_globals import set_db_globals
 from .event_listeners import setup_listeners
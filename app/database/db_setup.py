@@ -1,11 +1,17 @@
+import logging
+import os
+import weakref
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
 
+logger = logging.getLogger("ok_service")
+
 Base = declarative_base()
 
 
-def init_db(database_url, config_name):
+def init_db(database_url, config_name, pool_size=10, max_overflow=20, pool_timeout=30):
 
     if config_name == "testing":
         engine = create_engine(
@@ -27,12 +33,60 @@ def init_db(database_url, config_name):
         engine = create_engine(
             database_url,
             echo=False,
-            pool_size=10,  # Размер пула соединений
-            max_overflow=20,  # Максимальное количество дополнительных соединений
-            pool_timeout=30,  # Время ожидания доступного соединения (сек)
+            pool_size=pool_size,  # Размер пула соединений (на процесс)
+            max_overflow=max_overflow,  # Дополнительные соединения при пиках
+            pool_timeout=pool_timeout,  # Время ожидания доступного соединения (сек)
             pool_recycle=1800,  # Перезапуск соединения каждые 30 минут
             pool_pre_ping=True  # Проверка соединения перед выдачей из пула
         )
         Session = sessionmaker(bind=engine)  # Для прода
 
+    install_fork_guard(engine)
     return engine, Session, Base
+
+
+def install_fork_guard(engine):
+    """Сбрасывает пул в дочернем процессе сразу после любого fork.
+
+    Соединения пула принадлежат родителю: если ребёнок возьмёт такое
+    соединение (даже для pre-ping), оба процесса будут писать в один
+    сокет. dispose(close=False) заменяет пул пустым, не трогая сокеты
+    родителя. Для gunicorn то же явно делает post_fork."""
+    engine_ref = weakref.ref(engine)
+
+    def reset_pool():
+        engine = engine_ref()
+        if engine is not None:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=reset_pool)
+
+
+def dispose_engine_after_fork():
+    """Сбрасывает унаследованный от мастера пул в новом воркере (post_fork).
+
+    close=False: сокеты мастера не закрываются и не получают Terminate
+    из дочернего процесса; воркер открывает собственные соединения."""
+    from app.database.db_globals import engine
+
+    if engine is not None:
+        engine.dispose(close=False)
+        logger.info(
+            f"Пул соединений сброшен после fork в процессе {os.getpid()}",
+            extra={"login": "init"},
+        )
+
+
+def check_pool_budget(config):
+    """Предупреждает, если все воркеры вместе могут открыть больше
+    соединений, чем отведено сервису на сервере БД."""
+    per_process = config["DB_POOL_SIZE"] + config["DB_MAX_OVERFLOW"]
+    total = config["WEB_WORKERS"] * per_process
+    if total > config["DB_MAX_CONNECTIONS"]:
+        logger.warning(
+            f"Пулы {config['WEB_WORKERS']} воркеров могут открыть {total} "
+            f"соединений при лимите {config['DB_MAX_CONNECTIONS']}: "
+            f"уменьшите DB_POOL_SIZE/DB_MAX_OVERFLOW или WEB_WORKERS",
+            extra={"login": "init"},
+        )
+    return total
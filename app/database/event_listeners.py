@@ -1,13 +1,11 @@
 import json
 import logging
 import time
-from base64 import urlsafe_b64encode
 from uuid import UUID
 
-from cryptography.hazmat.primitives.serialization import load_pem_private_key
-from pywebpush import WebPushException, webpush
 from sqlalchemy import event
 
+from app.utils.vapid import vapid_private_key
 from config import Config
 
 logger = logging.getLogger("ok_service")
@@ -15,10 +13,6 @@ logger = logging.getLogger("ok_service")
 config = Config()
 ORIGIN = config.ORIGIN
 
-# Чтение приватного ключа из файла
-with open("vapid_private_key.pem", "rb") as f:
-    private_key = load_pem_private_key(f.read(), password=None)
-
 VAPID_CLAIMS = {
     "sub": "mailto:your-email@example.com",  # Замени на реальный email
     "aud": "https://fcm.googleapis.com",  # 👈 Должно совпадать с `endpoint`
@@ -280,6 +274,9 @@ def send_push_notification(subscriptions, message_data):
     """Отправка WebPush-уведомления"""
     logger.debug(f"[WebPush] Подготовка к отправке: {message_data}")
 
+    # pywebpush тянет aiohttp — импортируем только при отправке
+    from pywebpush import WebPushException, webpush
+
     from app.database.managers.subscription_manager import SubscriptionsManager
 
     db = SubscriptionsManager()
@@ -294,12 +291,7 @@ def send_push_notification(subscriptions, message_data):
             webpush(
                 subscription_info=subscription_info,
                 data=json.dumps(message_data),
-                vapid_private_key=urlsafe_b64encode(
-                    private_key.private_numbers().private_value.to_bytes(  # type: ignore
-                        length=(private_key.key_size + 7) // 8,  # type: ignore
-                        byteorder="big",  # type: ignore
-                    )
-                ).decode("utf-8"),
+                vapid_private_key=vapid_private_key(),
                 vapid_claims=VAPID_CLAIMS,  # type: ignore
             )
             logger.info("[WebPush] Уведомление успешно отправлено.")
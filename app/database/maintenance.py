@@ -0,0 +1,367 @@
+import logging
+import math
+import os
+import threading
+import time
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import func, select, text
+
+logger = logging.getLogger("ok_service")
+
+# Ключ advisory-блокировки лидера обслуживания (произвольная константа)
+LEADER_LOCK_KEY = 0x6F6B5F6D61696E  # "ok_main"
+
+MAINTENANCE_RUNS = Counter(
+    "maintenance_runs_total",
+    "Циклы обслуживания БД",
+    ["result"],
+)
+MAINTENANCE_LEADER = Gauge(
+    "maintenance_leader",
+    "1, если этот процесс держит блокировку лидера обслуживания",
+)
+MAINTENANCE_LAST_RUN = Gauge(
+    "maintenance_last_run_timestamp_seconds",
+    "Время окончания последнего цикла обслуживания",
+)
+MAINTENANCE_LAST_DURATION = Gauge(
+    "maintenance_last_run_duration_seconds",
+    "Длительность последнего цикла обслуживания",
+)
+MAINTENANCE_LAST_OBJECTS = Gauge(
+    "maintenance_last_run_objects",
+    "Сколько объектов обработано в последнем цикле",
+    ["action"],
+)
+
+# Таблицы, где мёртвых строк больше порога, или статистика устарела
+CANDIDATE_TABLES = text(
+    """
+    SELECT schemaname, relname, n_live_tup, n_dead_tup, n_mod_since_analyze
+    FROM pg_stat_user_tables
+    WHERE (n_dead_tup >= :min_dead
+           AND n_dead_tup > :dead_ratio * GREATEST(n_live_tup, 1))
+       OR (n_mod_since_analyze >= :min_dead
+           AND n_mod_since_analyze > :dead_ratio * GREATEST(n_live_tup, 1))
+    ORDER BY n_dead_tup DESC
+    """
+)
+
+# Данные для оценки раздутия btree-индексов по простым столбцам: сколько
+# страниц занимает индекс и сколько заняли бы reltuples ключей средней
+# ширины из pg_stats (без расширения pgstattuple)
+BTREE_INDEXES = text(
+    """
+    SELECT n.nspname AS schemaname,
+           ci.relname AS index_name,
+           ci.relpages,
+           ci.reltuples,
+           COALESCE(ci_opts.fillfactor, 90) AS fillfactor,
+           (SELECT SUM(COALESCE(s.avg_width, 16))
+              FROM pg_attribute a
+              LEFT JOIN pg_stats s
+                ON s.schemaname = n.nspname
+               AND s.tablename = ct.relname
+               AND s.attname = a.attname
+             WHERE a.attrelid = ct.oid
+               AND a.attnum = ANY (i.indkey)) AS key_width
+    FROM pg_index i
+    JOIN pg_class ci ON ci.oid = i.indexrelid
+    JOIN pg_class ct ON ct.oid = i.indrelid
+    JOIN pg_namespace n ON n.oid = ci.relnamespace
+    JOIN pg_am am ON am.oid = ci.relam
+    LEFT JOIN LATERAL (
+        SELECT split_part(opt, '=', 2)::int AS fillfactor
+        FROM unnest(ci.reloptions) AS opt
+        WHERE opt LIKE 'fillfactor=%'
+    ) ci_opts ON TRUE
+    WHERE am.amname = 'btree'
+      AND i.indisvalid
+      AND i.indexprs IS NULL
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND n.nspname NOT LIKE 'pg_toast%'
+      AND ci.relpages::bigint * current_setting('block_size')::bigint >= :min_bytes
+    """
+)
+
+# Невалидные копии индекса (<индекс>_ccnew, _ccnew1, ...), которые оставляет
+# прерванный REINDEX CONCURRENTLY
+REINDEX_LEFTOVERS = text(
+    """
+    SELECT ci.relname AS index_name
+    FROM pg_index i
+    JOIN pg_class ci ON ci.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = ci.relnamespace
+    WHERE n.nspname = :schema
+      AND NOT i.indisvalid
+      AND left(ci.relname, length(:index_name)) = :index_name
+      AND substr(ci.relname, length(:index_name) + 1) ~ '^_ccnew[0-9]*$'
+    """
+)
+
+
+def estimate_btree_bloat(relpages, reltuples, key_width, fillfactor, block_size):
+    """Доля лишних страниц btree-индекса в процентах (0 — без раздутия).
+
+    Оценка по размеру кортежа: заголовок 8 байт + ключ с выравниванием
+    до 8 + указатель строки 4 байта на странице без заголовка и
+    спецобласти btree, заполненной на fillfactor."""
+    if not relpages or reltuples is None or reltuples < 0 or key_width is None:
+        return 0.0
+    tuple_size = 8 + math.ceil(float(key_width) / 8) * 8 + 4
+    usable = (block_size - 24 - 16) * fillfactor / 100
+    expected = math.ceil(float(reltuples) * tuple_size / usable) + 1  # + метастраница
+    return max(0.0, 100.0 * (relpages - expected) / relpages)
+
+
+class MaintenanceScheduler:
+    """Обслуживание БД вместо суточного VACUUM/REINDEX DATABASE.
+
+    Цикл выполняет только один процесс на все воркеры и хосты — тот, что
+    держит advisory-блокировку на своём соединении; остальные раз в
+    интервал пытаются её перехватить. Обрабатываются лишь таблицы с
+    накопившимися мёртвыми строками или устаревшей статистикой, а
+    раздутые индексы перестраиваются через REINDEX CONCURRENTLY без
+    блокировки записи."""
+
+    def __init__(self):
+        self.enabled = False
+        self.interval = 3600
+        self.min_dead = 1000
+        self.dead_ratio = 0.1
+        self.reindex_bloat_pct = 30.0
+        self.reindex_min_bytes = 10 * 1024 * 1024
+        self.tombstone_retention = 90 * 86400
+        self.document_retention = 24 * 3600
+        self.job_retention = 7 * 86400
+        self.last_run = None
+        self._conn = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("MAINTENANCE_ENABLED", True)
+        self.interval = app.config.get("MAINTENANCE_INTERVAL", 3600)
+        self.min_dead = app.config.get("MAINTENANCE_VACUUM_MIN_DEAD", 1000)
+        self.dead_ratio = app.config.get("MAINTENANCE_VACUUM_DEAD_RATIO", 0.1)
+        self.reindex_bloat_pct = app.config.get("MAINTENANCE_REINDEX_BLOAT_PCT", 30.0)
+        self.reindex_min_bytes = app.config.get(
+            "MAINTENANCE_REINDEX_MIN_BYTES", 10 * 1024 * 1024
+        )
+        self.tombstone_retention = (
+            app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 90) * 86400
+        )
+        self.document_retention = app.config.get("TEMPLATE_CACHE_TTL", 24 * 3600)
+        self.job_retention = app.config.get("JOB_QUEUE_RETENTION_DAYS", 7) * 86400
+
+    def ensure_started(self):
+        """Запускает поток планировщика в текущем процессе (один раз).
+
+        Вызывается из before_request и worker.py: при preload_app поток
+        мастера не переживает fork, поэтому он стартует уже в воркерах."""
+        if not self.enabled or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._conn = None
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._loop, name="db-maintenance", daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                if self.acquire_leadership():
+                    self.run_once()
+                    MAINTENANCE_RUNS.labels("done").inc()
+                else:
+                    MAINTENANCE_RUNS.labels("skipped").inc()
+            except Exception as e:
+                MAINTENANCE_RUNS.labels("error").inc()
+                logger.error(f"Ошибка обслуживания БД: {e}", extra={"login": "system"})
+                self.release_leadership()
+            time.sleep(self.interval)
+
+    def acquire_leadership(self):
+        """Берёт (или подтверждает) блокировку лидера на отдельном соединении.
+
+        Блокировка сессионная: пока соединение живо, лидер не меняется; при
+        падении процесса Postgres снимает её сам."""
+        from app.database.db_globals import engine
+
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                self.release_leadership()
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        acquired = conn.execute(select(func.pg_try_advisory_lock(LEADER_LOCK_KEY)))
+        if not acquired.scalar():
+            conn.close()
+            return False
+        self._conn = conn
+        MAINTENANCE_LEADER.set(1)
+        logger.info(
+            f"Процесс {os.getpid()} стал лидером обслуживания БД",
+            extra={"login": "system"},
+        )
+        return True
+
+    def release_leadership(self):
+        conn, self._conn = self._conn, None
+        MAINTENANCE_LEADER.set(0)
+        if conn is None:
+            return
+        try:
+            conn.execute(select(func.pg_advisory_unlock(LEADER_LOCK_KEY)))
+        except Exception:
+            pass
+        finally:
+            conn.close()
+
+    def run_once(self):
+        """Один цикл обслуживания на соединении лидера; возвращает сводку."""
+        conn = self._conn
+        started = time.monotonic()
+        summary = {"vacuum": [], "analyze": [], "reindex": []}
+
+        for table in self.candidate_tables(conn):
+            name = self._qualified(conn, table["schemaname"], table["relname"])
+            dead, live = table["n_dead_tup"], max(table["n_live_tup"], 1)
+            if dead >= self.min_dead and dead > self.dead_ratio * live:
+                conn.execute(text(f"VACUUM (ANALYZE) {name}"))
+                summary["vacuum"].append(name)
+            else:
+                conn.execute(text(f"ANALYZE {name}"))
+                summary["analyze"].append(name)
+
+        for index in self.bloated_indexes(conn):
+            name = self._qualified(conn, index["schemaname"], index["index_name"])
+            if self._reindex(conn, index["schemaname"], index["index_name"]):
+                summary["reindex"].append(name)
+
+        self._purge_tombstones()
+        self._purge_documents()
+        self._purge_jobs()
+
+        duration = time.monotonic() - started
+        MAINTENANCE_LAST_RUN.set(time.time())
+        MAINTENANCE_LAST_DURATION.set(duration)
+        for action, names in summary.items():
+            MAINTENANCE_LAST_OBJECTS.labels(action).set(len(names))
+        self.last_run = {
+            "finished_at": int(time.time()),
+            "duration": round(duration, 3),
+            **summary,
+        }
+        logger.info(
+            f"Обслуживание БД за {duration:.1f} с: VACUUM {len(summary['vacuum'])}, "
+            f"ANALYZE {len(summary['analyze'])}, REINDEX {len(summary['reindex'])}",
+            extra={"login": "system"},
+        )
+        return self.last_run
+
+    def candidate_tables(self, conn):
+        rows = conn.execute(
+            CANDIDATE_TABLES,
+            {"min_dead": self.min_dead, "dead_ratio": self.dead_ratio},
+        )
+        return [dict(row._mapping) for row in rows]
+
+    def bloated_indexes(self, conn):
+        block_size = int(conn.execute(text("SHOW block_size")).scalar())
+        rows = conn.execute(BTREE_INDEXES, {"min_bytes": self.reindex_min_bytes})
+        result = []
+        for row in rows:
+            index = dict(row._mapping)
+            index["bloat_pct"] = estimate_btree_bloat(
+                index["relpages"],
+                index["reltuples"],
+                index["key_width"],
+                index["fillfactor"],
+                block_size,
+            )
+            if index["bloat_pct"] >= self.reindex_bloat_pct:
+                result.append(index)
+        return result
+
+    def _reindex(self, conn, schema, index_name):
+        """Перестраивает индекс через REINDEX CONCURRENTLY; False при ошибке.
+
+        Ошибка одного индекса не прерывает цикл, а оставшаяся от неё
+        невалидная копия *_ccnew сразу удаляется: иначе она обновляется
+        при каждой записи в таблицу и занимает место до ручной очистки."""
+        name = self._qualified(conn, schema, index_name)
+        try:
+            conn.execute(text(f"REINDEX INDEX CONCURRENTLY {name}"))
+            return True
+        except Exception as e:
+            logger.error(
+                f"Ошибка REINDEX индекса {name}: {e}", extra={"login": "system"}
+            )
+        try:
+            leftovers = conn.execute(
+                REINDEX_LEFTOVERS, {"schema": schema, "index_name": index_name}
+            ).scalars()
+            for leftover in leftovers.all():
+                leftover = self._qualified(conn, schema, leftover)
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {leftover}"))
+                logger.warning(
+                    f"Удалён невалидный индекс {leftover} после ошибки REINDEX",
+                    extra={"login": "system"},
+                )
+        except Exception as e:
+            logger.error(
+                f"Ошибка удаления копии индекса {name} после REINDEX: {e}",
+                extra={"login": "system"},
+            )
+        return False
+
+    def _purge_tombstones(self):
+        from app.database.managers.sync_manager import SyncManager
+
+        try:
+            SyncManager().purge_tombstones(int(time.time()) - self.tombstone_retention)
+        except Exception as e:
+            logger.error(
+                f"Ошибка при очистке надгробий синхронизации: {e}",
+                extra={"login": "system"},
+            )
+
+    def _purge_documents(self):
+        from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+        try:
+            DocumentJobsManager().purge_documents(
+                int(time.time()) - self.document_retention
+            )
+        except Exception as e:
+            logger.error(
+                f"Ошибка при очистке документов заданий генерации: {e}",
+                extra={"login": "system"},
+            )
+
+    def _purge_jobs(self):
+        from app.database.managers.job_queue_manager import JobQueueManager
+
+        try:
+            JobQueueManager().purge_finished(int(time.time()) - self.job_retention)
+        except Exception as e:
+            logger.error(
+                f"Ошибка при очистке завершённых фоновых заданий: {e}",
+                extra={"login": "system"},
+            )
+
+    @staticmethod
+    def _qualified(conn, schema, name):
+        quote = conn.dialect.identifier_preparer.quote
+        return f"{quote(schema)}.{quote(name)}"
+
+
+maintenance_scheduler = MaintenanceScheduler()
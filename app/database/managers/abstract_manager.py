@@ -4,11 +4,15 @@ from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from uuid import UUID
 
-from sqlalchemy import asc, desc, inspect
+from sqlalchemy import asc, desc, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.database.db_globals import Session
+from app.database.models import TableVersions
+from app.database.reference_cache import NOTIFY_CHANNEL as REFERENCE_CACHE_CHANNEL
+from app.database.reference_cache import invalidate_after_commit
 
 logger = logging.getLogger("ok_service")
 
@@ -16,6 +20,10 @@ EXACT_MATCH_FIELDS = {"status", "role", "category"}
 
 
 class BaseDBManager(ABC):
+    # Справочники: каждая запись через менеджер увеличивает версию таблицы,
+    # по которой строится ETag списков (см. app.decorators.etag), и
+    # сбрасывает кэш справочников в воркерах (app.database.reference_cache)
+    versioned = False
 
     def __init__(self, session=None):
         """
@@ -50,6 +58,26 @@ class BaseDBManager(ABC):
             if session.is_active:
                 session.close()
 
+    def _bump_version(self, session):
+        """Увеличивает версию таблицы в той же транзакции, что и изменение."""
+        if not self.versioned:
+            return
+        stmt = pg_insert(TableVersions).values(
+            table_name=self.model.__tablename__,  # type: ignore
+            version=1,
+        )
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TableVersions.table_name],
+                set_={"version": TableVersions.version + 1},
+            )
+        )
+        # Уведомление доставляется слушателям только после коммита
+        session.execute(
+            select(func.pg_notify(REFERENCE_CACHE_CHANNEL, self.model.__tablename__))  # type: ignore
+        )
+        invalidate_after_commit(session, self.model.__tablename__)  # type: ignore
+
     def add(self, **kwargs):
         try:
             with self.session_scope() as session:
@@ -60,6 +88,7 @@ class BaseDBManager(ABC):
                 except Exception:
                     session.rollback()
                     raise
+                self._bump_version(session)
                 return new_record.to_dict()
         except Exception as e:
             logger.error(
@@ -202,6 +231,7 @@ class BaseDBManager(ABC):
                     for key, value in filtered_kwargs.items():
                         setattr(record, key, value)
                         flag_modified(record, key)
+                    self._bump_version(session)
                     logger.info(
                         "Record updated successfully: %s",
                         record,
@@ -234,6 +264,7 @@ class BaseDBManager(ABC):
                 record = self.get_record_by_id(record_id)
                 if record:
                     session.delete(record)
+                    self._bump_version(session)
                     logger.info(
                         "Record deleted successfully", extra={"login": "database"}
                     )
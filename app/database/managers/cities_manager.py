@@ -3,6 +3,7 @@ from app.database.managers.abstract_manager import BaseDBManager
 
 
 class CitiesManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
@@ -0,0 +1,105 @@
+import logging
+from datetime import datetime
+
+from app.database.managers.abstract_manager import BaseDBManager
+from app.database.models import DocumentJobs
+from app.database.models.document_jobs import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+)
+
+logger = logging.getLogger("ok_service")
+
+
+def _now():
+    return int(datetime.utcnow().timestamp())
+
+
+class DocumentJobsManager(BaseDBManager):
+    @property
+    def model(self):
+        return DocumentJobs
+
+    def create_job(self, payload, cache_key, created_by, enqueue=False):
+        """Создаёт задание генерации.
+
+        С enqueue=True в той же транзакции ставит его в очередь Postgres:
+        без записи очереди задание осталось бы queued навсегда."""
+        with self.session_scope() as session:
+            job = DocumentJobs(
+                payload=payload,
+                cache_key=cache_key,
+                created_by=created_by,
+                status=JOB_QUEUED,
+            )
+            session.add(job)
+            session.flush()
+            if enqueue:
+                from app.database.managers.job_queue_manager import JobQueueManager
+                from app.jobs.tasks import DOCUMENT_GENERATE
+
+                JobQueueManager(session=session).enqueue(
+                    DOCUMENT_GENERATE, {"job_id": str(job.job_id)}
+                )
+            return job.to_dict()
+
+    def get_payload(self, job_id):
+        with self.session_scope() as session:
+            return (
+                session.query(DocumentJobs.payload)
+                .filter(DocumentJobs.job_id == job_id)
+                .scalar()
+            )
+
+    def mark_running(self, job_id):
+        self._set_status(job_id, JOB_RUNNING, started_at=_now())
+
+    def mark_done(self, job_id, document):
+        self._set_status(job_id, JOB_DONE, document=document, finished_at=_now())
+
+    def get_document(self, job_id):
+        """Содержимое готового документа или None, если его нет (или он
+        уже удалён по сроку хранения)."""
+        with self.session_scope() as session:
+            return (
+                session.query(DocumentJobs.document)
+                .filter(DocumentJobs.job_id == job_id)
+                .scalar()
+            )
+
+    def purge_documents(self, before):
+        """Удаляет содержимое документов, готовых раньше before (unix time).
+
+        Сами задания остаются, скачивание отвечает 410. Возвращает число
+        очищенных заданий."""
+        with self.session_scope() as session:
+            purged = (
+                session.query(DocumentJobs)
+                .filter(
+                    DocumentJobs.document.isnot(None),
+                    DocumentJobs.finished_at < before,
+                )
+                .update({"document": None}, synchronize_session=False)
+            )
+        if purged:
+            logger.info(
+                f"Удалено устаревших документов заданий генерации: {purged}",
+                extra={"login": "database"},
+            )
+        return purged
+
+    def mark_failed(self, job_id, error):
+        self._set_status(
+            job_id, JOB_FAILED, error=str(error)[:1000], finished_at=_now()
+        )
+
+    def _set_status(self, job_id, status, **values):
+        with self.session_scope() as session:
+            session.query(DocumentJobs).filter(DocumentJobs.job_id == job_id).update(
+                {"status": status, **values}, synchronize_session=False
+            )
+        logger.debug(
+            f"Задание генерации {job_id}: {status}", extra={"login": "database"}
+        )
@@ -0,0 +1,240 @@
+import logging
+import random
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select, update
+
+from app.database.managers.abstract_manager import BaseDBManager
+from app.database.models import BackgroundJobs
+from app.database.models.background_jobs import (
+    QUEUE_DONE,
+    QUEUE_FAILED,
+    QUEUE_QUEUED,
+    QUEUE_RUNNING,
+)
+
+logger = logging.getLogger("ok_service")
+
+
+def _now():
+    return int(datetime.utcnow().timestamp())
+
+
+class JobQueueManager(BaseDBManager):
+    """Очередь фоновых заданий в Postgres.
+
+    Воркеры забирают задания через `FOR UPDATE SKIP LOCKED`, поэтому
+    несколько процессов не получают одно задание и не ждут друг друга.
+    Задание упавшего воркера возвращается в работу по истечении окна
+    видимости (`locked_until`)."""
+
+    @property
+    def model(self):
+        return BackgroundJobs
+
+    def enqueue(self, kind, payload, priority=0, max_attempts=5, delay=0):
+        """Ставит задание в очередь и возвращает его job_id."""
+        with self.session_scope() as session:
+            job = BackgroundJobs(
+                kind=kind,
+                payload=payload,
+                priority=priority,
+                max_attempts=max_attempts,
+                status=QUEUE_QUEUED,
+                attempts=0,
+                run_at=_now() + int(delay),
+            )
+            session.add(job)
+            session.flush()
+            job_id = job.job_id
+        logger.debug(
+            f"Задание {kind} {job_id} поставлено в очередь",
+            extra={"login": "database"},
+        )
+        return job_id
+
+    def claim(self, worker_id, visibility_timeout, kinds=None):
+        """Забирает самое приоритетное готовое задание.
+
+        Возвращает словарь с полями задания или None, если очередь пуста."""
+        now = _now()
+        ready = or_(
+            and_(
+                BackgroundJobs.status == QUEUE_QUEUED,
+                BackgroundJobs.run_at <= now,
+            ),
+            and_(
+                BackgroundJobs.status == QUEUE_RUNNING,
+                BackgroundJobs.locked_until < now,
+                BackgroundJobs.attempts < BackgroundJobs.max_attempts,
+            ),
+        )
+        candidate = select(BackgroundJobs.job_id).where(ready)
+        if kinds:
+            candidate = candidate.where(BackgroundJobs.kind.in_(kinds))
+        candidate = (
+            candidate.order_by(
+                BackgroundJobs.priority.desc(), BackgroundJobs.run_at.asc()
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BackgroundJobs)
+            .where(BackgroundJobs.job_id == candidate)
+            .values(
+                status=QUEUE_RUNNING,
+                attempts=BackgroundJobs.attempts + 1,
+                locked_until=now + int(visibility_timeout),
+                locked_by=worker_id,
+            )
+            .returning(
+                BackgroundJobs.job_id,
+                BackgroundJobs.kind,
+                BackgroundJobs.payload,
+                BackgroundJobs.attempts,
+                BackgroundJobs.max_attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        with self.session_scope() as session:
+            row = session.execute(stmt).first()
+            return dict(row._mapping) if row else None
+
+    def extend(self, job_id, worker_id, visibility_timeout):
+        """Продлевает окно видимости долгого задания."""
+        with self.session_scope() as session:
+            result = session.execute(
+                update(BackgroundJobs)
+                .where(
+                    BackgroundJobs.job_id == job_id,
+                    BackgroundJobs.locked_by == worker_id,
+                    BackgroundJobs.status == QUEUE_RUNNING,
+                )
+                .values(locked_until=_now() + int(visibility_timeout))
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
+
+    def complete(self, job_id, worker_id):
+        """Отмечает задание выполненным.
+
+        Возвращает False, если воркер уже потерял аренду задания."""
+        return self._finish(
+            job_id, worker_id, status=QUEUE_DONE, finished_at=_now(), last_error=None
+        )
+
+    def fail(
+        self,
+        job_id,
+        worker_id,
+        error,
+        attempts,
+        max_attempts,
+        backoff_base,
+        backoff_max,
+    ):
+        """Фиксирует ошибку: повтор с экспоненциальной задержкой или
+        окончательный статус failed после max_attempts попыток.
+
+        Возвращает True, если задание будет повторено, False — если попытки
+        исчерпаны, и None, если воркер уже потерял аренду задания."""
+        error = str(error)[:1000]
+        if attempts >= max_attempts:
+            finished = self._finish(
+                job_id,
+                worker_id,
+                status=QUEUE_FAILED,
+                finished_at=_now(),
+                last_error=error,
+            )
+            return False if finished else None
+        delay = min(backoff_max, backoff_base * 2 ** (attempts - 1))
+        # Разброс, чтобы одновременно упавшие задания не вернулись пачкой
+        delay += random.uniform(0, delay / 10)
+        finished = self._finish(
+            job_id,
+            worker_id,
+            status=QUEUE_QUEUED,
+            run_at=_now() + int(delay),
+            last_error=error,
+        )
+        return True if finished else None
+
+    def fail_expired(self):
+        """Закрывает задания, чей воркер пропал на последней попытке."""
+        with self.session_scope() as session:
+            result = session.execute(
+                update(BackgroundJobs)
+                .where(
+                    BackgroundJobs.status == QUEUE_RUNNING,
+                    BackgroundJobs.locked_until < _now(),
+                    BackgroundJobs.attempts >= BackgroundJobs.max_attempts,
+                )
+                .values(
+                    status=QUEUE_FAILED,
+                    finished_at=_now(),
+                    last_error="Visibility timeout expired",
+                    locked_by=None,
+                    locked_until=None,
+                )
+                .returning(
+                    BackgroundJobs.job_id,
+                    BackgroundJobs.kind,
+                    BackgroundJobs.payload,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return [dict(row._mapping) for row in result]
+
+    def purge_finished(self, before):
+        """Удаляет выполненные и упавшие задания, закрытые раньше before.
+
+        Без этого строки копятся и раздувают индекс готовых заданий,
+        который просматривает каждый claim. Возвращает число удалённых."""
+        with self.session_scope() as session:
+            purged = (
+                session.query(BackgroundJobs)
+                .filter(
+                    BackgroundJobs.status.in_((QUEUE_DONE, QUEUE_FAILED)),
+                    BackgroundJobs.finished_at < before,
+                )
+                .delete(synchronize_session=False)
+            )
+        if purged:
+            logger.info(
+                f"Удалено завершённых фоновых заданий: {purged}",
+                extra={"login": "database"},
+            )
+        return purged
+
+    def _finish(self, job_id, worker_id, **values):
+        """Закрывает задание, только если его всё ещё держит worker_id.
+
+        Воркер с истёкшей арендой не должен перезаписать результат того,
+        кто забрал задание после него. Возвращает True, если строка
+        обновлена."""
+        with self.session_scope() as session:
+            result = session.execute(
+                update(BackgroundJobs)
+                .where(
+                    BackgroundJobs.job_id == job_id,
+                    BackgroundJobs.locked_by == worker_id,
+                    BackgroundJobs.status == QUEUE_RUNNING,
+                )
+                .values(locked_by=None, locked_until=None, **values)
+                .execution_options(synchronize_session=False)
+            )
+            finished = result.rowcount > 0
+        if not finished:
+            logger.warning(
+                f"Задание {job_id}: результат воркера {worker_id} отброшен, "
+                "аренда задания потеряна",
+                extra={"login": "database"},
+            )
+            return False
+        logger.debug(
+            f"Задание {job_id}: {values.get('status')}", extra={"login": "database"}
+        )
+        return True
@@ -12,12 +12,16 @@ logger = logging.getLogger("ok_service")
 
 
 class MaterialsManager(BaseDBManager):
+    versioned = True
+
     @property
     def model(self):
         return Materials
 
 
 class WorkMaterialRelationsManager(BaseDBManager):
+    versioned = True
+
     @property
     def model(self):
         return WorkMaterialRelations
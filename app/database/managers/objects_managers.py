@@ -11,6 +11,7 @@ class ObjectsManager(BaseDBManager):
 
 
 class ObjectStatusesManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
@@ -1,14 +1,14 @@
 import logging
 import uuid
 from decimal import Decimal
-from uuid import UUID
 
-from sqlalchemy import and_, asc, desc
+from sqlalchemy import and_, asc, desc, func, select
 from sqlalchemy.orm import joinedload
 
 # Предполагается, что BaseDBManager в другом файле
 from app.database.managers.abstract_manager import BaseDBManager
 from app.database.models import (
+    Materials,
     Objects,
     ProjectMaterials,
     Projects,
@@ -17,8 +17,8 @@ from app.database.models import (
     ShiftReportDetails,
     ShiftReportMaterials,
     ShiftReports,
-    WorkMaterialRelations,
 )
+from app.database.reference_cache import reference_cache
 
 logger = logging.getLogger("ok_service")
 
@@ -123,38 +123,22 @@ class ProjectsManager(BaseDBManager):
 
             return [record.to_dict() for record in records]
 
-    def get_projects_by_leader(self, user_id):
-        """Получает список проектов, где указанный пользователь является прорабом."""
-        try:
-            logger.debug(
-                f"Fetching projects for project leader: {user_id}",
-                extra={"login": "database"},
-            )
-
-            with self.session_scope() as session:
-                projects = (
-                    session.query(Projects)
-                    .filter(Projects.project_leader == user_id)
-                    .all()
-                )
-
-                result = [project.to_dict() for project in projects]
-
-                logger.info(
-                    f"Found {len(result)} projects for project leader {user_id}",
-                    extra={"login": "database"},
-                )
-
-                return result
-
-        except Exception as e:
-            logger.error(
-                f"Error fetching projects for leader {user_id}: {e}",
-                extra={"login": "database"},
-            )
-            return []
+    @staticmethod
+    def _signed_totals(key, shift_report, quantity, project_id):
+        """Подзапрос: сумма `quantity` по `key` в подписанных отчетах проекта."""
+        return (
+            select(key.label("key"), func.sum(quantity).label("quantity"))
+            .join(ShiftReports, ShiftReports.shift_report_id == shift_report)
+            .where(ShiftReports.project == project_id, ShiftReports.signed.is_(True))
+            .group_by(key)
+            .subquery()
+        )
 
     def get_project_stats(self, project_id):
+        """План и факт по работам проекта одним GROUP BY-запросом.
+
+        Ключ — work_id: количество работ проекта с этой работой и сумма
+        количеств деталей подписанных отчетов проекта по ней."""
         try:
             logger.debug(
                 f"Fetching project for project id: {project_id}",
@@ -162,64 +146,31 @@ class ProjectsManager(BaseDBManager):
             )
 
             with self.session_scope() as session:
-                project_works = (
-                    session.query(ProjectWorks)
-                    .filter(ProjectWorks.project == project_id)
-                    .all()
+                done = self._signed_totals(
+                    ShiftReportDetails.work,
+                    ShiftReportDetails.shift_report,
+                    ShiftReportDetails.quantity,
+                    project_id,
                 )
-
-                result = {
-                    str(work.work): {
-                        "project_work_quantity": 0,
-                        "shift_report_details_quantity": 0,
-                        "project_work_name": work.project_work_name,
-                    }
-                    for work in project_works
-                }
-
-                project_works = [work.to_dict() for work in project_works]
-                for work in project_works:
-                    work_id = str(work["work"])
-                    if isinstance(work["quantity"], Decimal):
-                        work["quantity"] = float(work["quantity"])
-                    result[work_id]["project_work_quantity"] += work["quantity"]
-
-                reports = (
-                    session.query(ShiftReports)
-                    .filter(
-                        ShiftReports.project == project_id,
-                        ShiftReports.signed.is_(True),
+                rows = session.execute(
+                    select(
+                        ProjectWorks.work,
+                        func.sum(ProjectWorks.quantity).label("planned"),
+                        func.max(ProjectWorks.project_work_name).label("name"),
+                        done.c.quantity.label("done"),
                     )
-                    .all()
+                    .outerjoin(done, done.c.key == ProjectWorks.work)
+                    .where(ProjectWorks.project == project_id)
+                    .group_by(ProjectWorks.work, done.c.quantity)
                 )
-
-                reports = [report.to_dict() for report in reports]
-                for report in reports:
-                    details = (
-                        session.query(ShiftReportDetails)
-                        .filter(
-                            ShiftReportDetails.shift_report
-                            == UUID(report["shift_report_id"])
-                        )
-                        .all()
-                    )
-                    details = [detail.to_dict() for detail in details]
-
-                    for detail in details:
-                        detail_work_id = str(detail["work"])
-                        if isinstance(detail["quantity"], Decimal):
-                            detail["quantity"] = float(detail["quantity"])
-                        if detail_work_id in result:
-                            result[detail_work_id]["shift_report_details_quantity"] += (
-                                detail["quantity"]
-                            )
-                        else:
-                            logger.warning(
-                                f"Work ID {detail_work_id} not found in result",
-                                extra={"login": "database"},
-                            )
-
-                return result
+                return {
+                    str(row.work): {
+                        "project_work_quantity": float(row.planned or 0),
+                        "shift_report_details_quantity": float(row.done or 0),
+                        "project_work_name": row.name,
+                    }
+                    for row in rows
+                }
         except Exception as e:
             logger.error(
                 f"Error fetching projects for leader {project_id}: {e}",
@@ -228,6 +179,7 @@ class ProjectsManager(BaseDBManager):
             return {}
 
     def get_project_stats_by_project_work(self, project_id):
+        """План и факт по каждой работе проекта (ключ — project_work_id)."""
         try:
             logger.debug(
                 f"Fetching project stats BY PROJECT WORK for project id: {project_id}",
@@ -235,68 +187,30 @@ class ProjectsManager(BaseDBManager):
             )
 
             with self.session_scope() as session:
-                project_works = (
-                    session.query(ProjectWorks)
-                    .filter(ProjectWorks.project == project_id)
-                    .all()
+                done = self._signed_totals(
+                    ShiftReportDetails.project_work,
+                    ShiftReportDetails.shift_report,
+                    ShiftReportDetails.quantity,
+                    project_id,
                 )
-
-                result = {
-                    str(work.project_work_id): {
-                        "project_work_quantity": 0,
-                        "shift_report_details_quantity": 0,
-                        "project_work_name": work.project_work_name,
-                    }
-                    for work in project_works
-                }
-
-                project_works = [work.to_dict() for work in project_works]
-                for work in project_works:
-                    work_id = str(work["project_work_id"])
-                    if isinstance(work["quantity"], Decimal):
-                        work["quantity"] = float(work["quantity"])
-                    result[work_id]["project_work_quantity"] += work["quantity"]
-
-                reports = (
-                    session.query(ShiftReports)
-                    .filter(
-                        ShiftReports.project == project_id,
-                        ShiftReports.signed.is_(True),
+                rows = session.execute(
+                    select(
+                        ProjectWorks.project_work_id,
+                        ProjectWorks.quantity,
+                        ProjectWorks.project_work_name,
+                        done.c.quantity.label("done"),
                     )
-                    .all()
+                    .outerjoin(done, done.c.key == ProjectWorks.project_work_id)
+                    .where(ProjectWorks.project == project_id)
                 )
-
-                reports = [report.to_dict() for report in reports]
-                for report in reports:
-                    details = (
-                        session.query(ShiftReportDetails)
-                        .filter(
-                            ShiftReportDetails.shift_report
-                            == UUID(report["shift_report_id"])
-                        )
-                        .all()
-                    )
-                    details = [detail.to_dict() for detail in details]
-
-                    for detail in details:
-                        project_work = detail.get("project_work") or {}
-                        detail_project_work_id = project_work.get("project_work_id")
-                        if not detail_project_work_id:
-                            continue
-                        detail_project_work_id = str(detail_project_work_id)
-                        if isinstance(detail["quantity"], Decimal):
-                            detail["quantity"] = float(detail["quantity"])
-                        if detail_project_work_id in result:
-                            result[detail_project_work_id][
-                                "shift_report_details_quantity"
-                            ] += detail["quantity"]
-                        else:
-                            logger.warning(
-                                f"Work ID {detail_project_work_id} not found in result",
-                                extra={"login": "database"},
-                            )
-
-                return result
+                return {
+                    str(row.project_work_id): {
+                        "project_work_quantity": float(row.quantity or 0),
+                        "shift_report_details_quantity": float(row.done or 0),
+                        "project_work_name": row.project_work_name,
+                    }
+                    for row in rows
+                }
         except Exception as e:
             logger.error(
                 f"Error fetching project stats by project_work for project {
@@ -307,6 +221,11 @@ class ProjectsManager(BaseDBManager):
             return {}
 
     def get_project_stats_by_project_materials(self, project_id):
+        """План и факт по материалам проекта одним запросом.
+
+        FULL JOIN материалов проекта с материалами подписанных отчетов:
+        материал, которого нет в проекте, попадает в результат без плана и
+        названия."""
         try:
             logger.debug(
                 f"Fetching project stats BY PROJECT MATERIALS for project id: {
@@ -316,70 +235,41 @@ class ProjectsManager(BaseDBManager):
             )
 
             with self.session_scope() as session:
-                project_materials = (
-                    session.query(ProjectMaterials)
-                    .filter(ProjectMaterials.project == project_id)
-                    .all()
-                )
-
-                result = {
-                    str(pm.material): {
-                        "project_material_quantity": 0,
-                        "shift_report_materials_quantity": 0,
-                        "material_name": pm.materials.name if pm.materials else None,
-                    }
-                    for pm in project_materials
-                }
-
-                for pm in project_materials:
-                    material_id = str(pm.material)
-                    quantity = pm.quantity
-                    if isinstance(quantity, Decimal):
-                        quantity = float(quantity)
-                    if material_id not in result:
-                        result[material_id] = {
-                            "project_material_quantity": 0,
-                            "shift_report_materials_quantity": 0,
-                            "material_name": pm.materials.name
-                            if pm.materials
-                            else None,
-                        }
-                    result[material_id]["project_material_quantity"] += quantity
-
-                reports = (
-                    session.query(ShiftReports)
-                    .filter(
-                        ShiftReports.project == project_id,
-                        ShiftReports.signed.is_(True),
+                planned = (
+                    select(
+                        ProjectMaterials.material.label("key"),
+                        func.sum(ProjectMaterials.quantity).label("quantity"),
                     )
-                    .all()
+                    .where(ProjectMaterials.project == project_id)
+                    .group_by(ProjectMaterials.material)
+                    .subquery()
                 )
-
-                report_ids = [report.shift_report_id for report in reports]
-                if report_ids:
-                    shift_materials = (
-                        session.query(ShiftReportMaterials)
-                        .filter(ShiftReportMaterials.shift_report.in_(report_ids))
-                        .all()
+                used = self._signed_totals(
+                    ShiftReportMaterials.material,
+                    ShiftReportMaterials.shift_report,
+                    ShiftReportMaterials.quantity,
+                    project_id,
+                )
+                rows = session.execute(
+                    select(
+                        func.coalesce(planned.c.key, used.c.key).label("material"),
+                        planned.c.quantity.label("planned"),
+                        used.c.quantity.label("used"),
+                        Materials.name,
+                    ).select_from(
+                        planned.join(
+                            used, used.c.key == planned.c.key, full=True
+                        ).outerjoin(Materials, Materials.material_id == planned.c.key)
                     )
-                else:
-                    shift_materials = []
-
-                for sm in shift_materials:
-                    material_id = str(sm.material)
-                    quantity = sm.quantity
-                    if isinstance(quantity, Decimal):
-                        quantity = float(quantity)
-
-                    if material_id not in result:
-                        result[material_id] = {
-                            "project_material_quantity": 0,
-                            "shift_report_materials_quantity": 0,
-                            "material_name": None,
-                        }
-                    result[material_id]["shift_report_materials_quantity"] += quantity
-
-                return result
+                )
+                return {
+                    str(row.material): {
+                        "project_material_quantity": float(row.planned or 0),
+                        "shift_report_materials_quantity": float(row.used or 0),
+                        "material_name": row.name,
+                    }
+                    for row in rows
+                }
         except Exception as e:
             logger.error(
                 f"Error fetching project stats by project materials for project {
@@ -395,26 +285,6 @@ class ProjectSchedulesManager(BaseDBManager):
     def model(self):
         return ProjectSchedules
 
-    def get_schedule_ids_by_project_leader(self, user_id):
-        """
-        Возвращает ID всех ProjectWorks, где пользователь является project_leader.
-        """
-        with self.session_scope() as session:
-            schedule_ids = (
-                session.query(ProjectSchedules.project_schedule_id)
-                .join(Projects, ProjectSchedules.project == Projects.project_id)
-                .filter(Projects.project_leader == UUID(user_id))
-                .all()
-            )
-
-            # ✅ Достаём первый элемент из tuple
-            result = [str(schedule_id[0]) for schedule_id in schedule_ids]
-            logger.debug(
-                f"Найдено {len(result)} работ для project_leader={user_id}",
-                extra={"login": "database"},
-            )
-            return result
-
 
 class ProjectWorksManager(BaseDBManager):
     @property
@@ -426,20 +296,14 @@ class ProjectWorksManager(BaseDBManager):
             ProjectMaterials.project_work == project_work.project_work_id
         ).delete(synchronize_session=False)
 
-        relations = (
-            session.query(WorkMaterialRelations)
-            .options(joinedload(WorkMaterialRelations.materials))
-            .filter(WorkMaterialRelations.work == project_work.work)
-            .all()
-        )
+        relations = reference_cache.work_materials(project_work.work, session)
         if not relations:
             return
 
         for relation in relations:
             quantity = Decimal(project_work.quantity) * Decimal(relation.quantity)
-            material = relation.materials
-            if material and material.measurement_unit:
-                unit = str(material.measurement_unit).strip().lower()
+            if relation.measurement_unit:
+                unit = str(relation.measurement_unit).strip().lower()
                 if unit == "шт.":
                     quantity = Decimal(int(quantity))
 
@@ -447,7 +311,7 @@ class ProjectWorksManager(BaseDBManager):
                 ProjectMaterials(
                     project_material_id=uuid.uuid4(),
                     project=project_work.project,
-                    material=relation.material,
+                    material=relation.material_id,
                     quantity=quantity,
                     project_work=project_work.project_work_id,
                     created_by=created_by,
@@ -504,26 +368,6 @@ class ProjectWorksManager(BaseDBManager):
             session.delete(record)
             return record
 
-    def get_work_ids_by_project_leader(self, user_id):
-        """
-        Возвращает ID всех ProjectWorks, где пользователь является project_leader.
-        """
-        with self.session_scope() as session:
-            work_ids = (
-                session.query(ProjectWorks.project_work_id)
-                .join(Projects, ProjectWorks.project == Projects.project_id)
-                .filter(Projects.project_leader == UUID(user_id))
-                .all()
-            )
-
-            # ✅ Достаём первый элемент из tuple
-            result = [str(work_id[0]) for work_id in work_ids]
-            logger.debug(
-                f"Найдено {len(result)} работ для project_leader={user_id}",
-                extra={"login": "database"},
-            )
-            return result
-
     def get_manager(self, project):
         """Получение ID менеджера объекта по project"""
         try:
@@ -4,6 +4,7 @@ from app.database.managers.abstract_manager import BaseDBManager
 
 
 class RolesManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
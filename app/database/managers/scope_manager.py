@@ -0,0 +1,95 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import exists, func, select
+
+from app.database.managers.abstract_manager import BaseDBManager
+from app.database.models import Projects, ProjectSchedules, ProjectWorks
+from app.database.scope_cache import scope_cache
+
+logger = logging.getLogger("ok_service")
+
+
+def _as_uuid(value):
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+class ScopeManager(BaseDBManager):
+    """Проверки доступа прораба в виде SQL-предикатов.
+
+    Вместо выгрузки всех id проектов/работ/графиков в Python каждая
+    проверка — один запрос EXISTS или предикат, подставляемый в запрос."""
+
+    @property
+    def model(self):
+        return Projects
+
+    @staticmethod
+    def led_projects_select(user_id):
+        """Подзапрос id проектов прораба для `column.in_(...)`."""
+        return select(Projects.project_id).where(
+            Projects.project_leader == _as_uuid(user_id)
+        )
+
+    def get_led_project_ids(self, user_id):
+        """Множество id проектов прораба (строки), кэшируется на TTL."""
+        user_id = str(user_id)
+        project_ids = scope_cache.get(user_id)
+        if project_ids is not None:
+            return project_ids
+        with self.session_scope() as session:
+            rows = session.execute(self.led_projects_select(user_id)).scalars()
+            project_ids = frozenset(str(project_id) for project_id in rows)
+        scope_cache.set(user_id, project_ids)
+        logger.debug(
+            f"Область видимости прораба {user_id}: {len(project_ids)} проектов",
+            extra={"login": "database"},
+        )
+        return project_ids
+
+    def leads_projects(self, user_id, project_ids):
+        """Является ли пользователь прорабом всех перечисленных проектов."""
+        project_ids = {str(project_id) for project_id in project_ids}
+        if not project_ids:
+            return True
+        cached = scope_cache.get(str(user_id))
+        if cached is not None and project_ids <= cached:
+            return True
+        with self.session_scope() as session:
+            count = session.execute(
+                select(func.count(Projects.project_id)).where(
+                    Projects.project_leader == _as_uuid(user_id),
+                    Projects.project_id.in_([_as_uuid(p) for p in project_ids]),
+                )
+            ).scalar()
+        return count == len(project_ids)
+
+    def leads_project(self, user_id, project_id):
+        return self.leads_projects(user_id, [project_id])
+
+    def leads_project_work(self, user_id, project_work_id):
+        """Принадлежит ли работа проекта проекту прораба (один EXISTS)."""
+        return self._exists_in_led_project(
+            ProjectWorks.project,
+            ProjectWorks.project_work_id == _as_uuid(project_work_id),
+            user_id,
+        )
+
+    def leads_project_schedule(self, user_id, project_schedule_id):
+        """Принадлежит ли график проекту прораба (один EXISTS)."""
+        return self._exists_in_led_project(
+            ProjectSchedules.project,
+            ProjectSchedules.project_schedule_id == _as_uuid(project_schedule_id),
+            user_id,
+        )
+
+    def _exists_in_led_project(self, project_column, condition, user_id):
+        with self.session_scope() as session:
+            return session.execute(
+                select(
+                    exists().where(
+                        condition,
+                        project_column.in_(self.led_projects_select(user_id)),
+                    )
+                )
+            ).scalar()
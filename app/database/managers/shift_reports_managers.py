@@ -2,7 +2,18 @@ import logging
 from decimal import Decimal
 from uuid import UUID, uuid4
 
-from sqlalchemy import asc, desc
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    Select,
+    asc,
+    cast,
+    desc,
+    distinct,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import aliased, joinedload
 from sqlalchemy.sql import func
@@ -10,17 +21,25 @@ from sqlalchemy.sql import func
 from app.database.managers.abstract_manager import BaseDBManager
 from app.database.models import (
     Leaves,
+    Materials,
+    Objects,
     Projects,
+    ProjectWorks,
     ShiftReportDetails,
     ShiftReportMaterials,
     ShiftReports,
     Users,
-    WorkMaterialRelations,
     WorkPrices,
+    Works,
 )
+from app.database.reference_cache import reference_cache
+from app.utils.geo import as_float_array, haversine_m
 
 logger = logging.getLogger("ok_service")
 
+# Измерения ведомости в порядке вложенности ROLLUP (после пользователя)
+PAYROLL_DIMENSIONS = ("project", "work", "night_shift", "extreme_conditions")
+
 
 class ShiftManager(BaseDBManager):
     def _convert_to_uuid(self, value):
@@ -59,17 +78,12 @@ class ShiftManager(BaseDBManager):
             logger.warning(f"ShiftReport {shift_report_id} не найден")
             return Decimal(0)
 
-        work_price = (
-            session.query(WorkPrices)
-            .filter(WorkPrices.work == work_id, WorkPrices.category == user.category)
-            .first()
-        )
+        price = reference_cache.work_price(work_id, user.category, session)
 
-        if not work_price:
+        if price is None:
             logger.warning(f"WorkPrices для work_id {work_id} не найден")
             return Decimal(0)
 
-        price = work_price.price
         summ = price or Decimal(0)  # Берём цену работы
 
         if shift_report.extreme_conditions:
@@ -239,6 +253,53 @@ class ShiftReportsManager(ShiftManager):
             )
             raise
 
+    SHIFT_REPORT_RANGE_FILTERS = (
+        "date_from",
+        "date_to",
+        "date_start_from",
+        "date_start_to",
+        "date_end_from",
+        "date_end_to",
+    )
+
+    def _filter_shift_reports_query(self, query, **filters):
+        """Применяет фильтры отчетов по сменам: диапазоны дат и точные совпадения."""
+        # Фильтрация по дате
+        for field_name, date_from, date_to in (
+            ("date", "date_from", "date_to"),
+            ("date_start", "date_start_from", "date_start_to"),
+            ("date_end", "date_end_from", "date_end_to"),
+        ):
+            column = getattr(self.model, field_name)
+            if filters.get(date_from) and filters.get(date_to):
+                query = query.filter(
+                    column.between(filters[date_from], filters[date_to])
+                )
+                logger.debug(
+                    f"Фильтруем по {field_name}: {filters[date_from]} - {
+                        filters[date_to]
+                    }",
+                    extra={"login": "database"},
+                )
+            elif filters.get(date_from):
+                query = query.filter(column >= filters[date_from])
+            elif filters.get(date_to):
+                query = query.filter(column <= filters[date_to])
+
+        # Остальные фильтры
+        for key, value in filters.items():
+            if key in self.SHIFT_REPORT_RANGE_FILTERS:
+                continue
+            if value is not None and hasattr(self.model, key):
+                column = getattr(self.model, key)
+                query = query.filter(
+                    column.in_(value)
+                    if isinstance(value, (list, tuple, set, Select))
+                    else column == value
+                )
+
+        return query
+
     def get_shift_reports_filtered(
         self, offset=0, limit=None, sort_by="created_at", sort_order="desc", **filters
     ):
@@ -250,88 +311,14 @@ class ShiftReportsManager(ShiftManager):
         )
 
         with self.session_scope() as session:
-            query = session.query(self.model)
+            query = self._filter_shift_reports_query(
+                session.query(self.model), **filters
+            )
 
             # Aliases для join
             user_alias = aliased(Users)
             project_alias = aliased(Projects)
 
-            # Фильтрация по дате
-            if (
-                filters.get("date_from")
-                and filters.get("date_to")
-                and hasattr(self.model, "date")
-            ):
-                column = getattr(self.model, "date")
-                query = query.filter(
-                    column.between(filters["date_from"], filters["date_to"])
-                )
-                logger.debug(
-                    f"Фильтруем по дате: {filters['date_from']} - {filters['date_to']}",
-                    extra={"login": "database"},
-                )
-            elif filters.get("date_from") and hasattr(self.model, "date"):
-                query = query.filter(
-                    getattr(self.model, "date") >= filters["date_from"]
-                )
-            elif filters.get("date_to") and hasattr(self.model, "date"):
-                query = query.filter(getattr(self.model, "date") <= filters["date_to"])
-
-            if (
-                filters.get("date_start_from")
-                and filters.get("date_start_to")
-                and hasattr(self.model, "date_start")
-            ):
-                column = getattr(self.model, "date_start")
-                query = query.filter(
-                    column.between(filters["date_start_from"], filters["date_start_to"])
-                )
-            elif filters.get("date_start_from") and hasattr(self.model, "date_start"):
-                query = query.filter(
-                    getattr(self.model, "date_start") >= filters["date_start_from"]
-                )
-            elif filters.get("date_start_to") and hasattr(self.model, "date_start"):
-                query = query.filter(
-                    getattr(self.model, "date_start") <= filters["date_start_to"]
-                )
-
-            if (
-                filters.get("date_end_from")
-                and filters.get("date_end_to")
-                and hasattr(self.model, "date_end")
-            ):
-                column = getattr(self.model, "date_end")
-                query = query.filter(
-                    column.between(filters["date_end_from"], filters["date_end_to"])
-                )
-            elif filters.get("date_end_from") and hasattr(self.model, "date_end"):
-                query = query.filter(
-                    getattr(self.model, "date_end") >= filters["date_end_from"]
-                )
-            elif filters.get("date_end_to") and hasattr(self.model, "date_end"):
-                query = query.filter(
-                    getattr(self.model, "date_end") <= filters["date_end_to"]
-                )
-
-            # Остальные фильтры
-            for key, value in filters.items():
-                if key in [
-                    "date_from",
-                    "date_to",
-                    "date_start_from",
-                    "date_start_to",
-                    "date_end_from",
-                    "date_end_to",
-                ]:
-                    continue
-                if value is not None and hasattr(self.model, key):
-                    column = getattr(self.model, key)
-                    query = query.filter(
-                        column.in_(value)
-                        if isinstance(value, (list, tuple, set))
-                        else column == value
-                    )
-
             order = desc if sort_order == "desc" else asc
             if sort_by:
                 if sort_by == "user":
@@ -362,6 +349,353 @@ class ShiftReportsManager(ShiftManager):
             )
             return total_count, [record.to_dict() for record in records]
 
+    EXPORT_ENTITIES = ("shift_reports", "details", "materials")
+
+    def _export_columns(self, entity):
+        """Колонки выгрузки: пары (заголовок, выражение SQL)."""
+        report_columns = [
+            ("number", ShiftReports.number),
+            ("date", ShiftReports.date),
+            ("user_name", Users.name),
+            ("project_name", Projects.name),
+        ]
+        if entity == "details":
+            return [
+                ("shift_report_detail_id", ShiftReportDetails.shift_report_detail_id),
+                *report_columns,
+                ("project_work_name", ProjectWorks.project_work_name),
+                ("work_name", Works.name),
+                ("quantity", ShiftReportDetails.quantity),
+                ("summ", ShiftReportDetails.summ),
+            ]
+        if entity == "materials":
+            return [
+                (
+                    "shift_report_material_id",
+                    ShiftReportMaterials.shift_report_material_id,
+                ),
+                *report_columns,
+                ("material_name", Materials.name),
+                ("measurement_unit", Materials.measurement_unit),
+                ("quantity", ShiftReportMaterials.quantity),
+            ]
+        details_sum = (
+            select(func.coalesce(func.sum(ShiftReportDetails.summ), 0))
+            .where(ShiftReportDetails.shift_report == ShiftReports.shift_report_id)
+            .scalar_subquery()
+        )
+        return [
+            ("shift_report_id", ShiftReports.shift_report_id),
+            *report_columns,
+            ("object_name", Objects.name),
+            ("date_start", ShiftReports.date_start),
+            ("date_end", ShiftReports.date_end),
+            ("signed", ShiftReports.signed),
+            ("deleted", ShiftReports.deleted),
+            ("night_shift", ShiftReports.night_shift),
+            ("extreme_conditions", ShiftReports.extreme_conditions),
+            ("lng_start", ShiftReports.lng_start),
+            ("ltd_start", ShiftReports.ltd_start),
+            ("lng_end", ShiftReports.lng_end),
+            ("ltd_end", ShiftReports.ltd_end),
+            ("distance_start", ShiftReports.distance_start),
+            ("distance_end", ShiftReports.distance_end),
+            ("comment", ShiftReports.comment),
+            ("shift_report_details_sum", details_sum),
+        ]
+
+    def iter_export_rows(
+        self,
+        entity="shift_reports",
+        chunk_size=1000,
+        sort_by="date",
+        sort_order="asc",
+        **filters,
+    ):
+        """Построчная выгрузка отчетов, их деталей или материалов.
+
+        Первым кортежем отдаётся заголовок. Строки читаются из БД порциями
+        по `chunk_size` через server-side курсор, поэтому память не растёт
+        с объёмом выгрузки."""
+        if entity not in self.EXPORT_ENTITIES:
+            raise ValueError(f"Unknown export entity: {entity}")
+
+        columns = self._export_columns(entity)
+        yield tuple(header for header, _ in columns)
+
+        with self.session_scope() as session:
+            query = session.query(*[column for _, column in columns])
+            if entity == "details":
+                query = query.select_from(ShiftReportDetails).join(
+                    ShiftReports,
+                    ShiftReports.shift_report_id == ShiftReportDetails.shift_report,
+                )
+            elif entity == "materials":
+                query = query.select_from(ShiftReportMaterials).join(
+                    ShiftReports,
+                    ShiftReports.shift_report_id == ShiftReportMaterials.shift_report,
+                )
+            else:
+                query = query.select_from(ShiftReports)
+
+            query = query.join(Users, Users.user_id == ShiftReports.user).join(
+                Projects, Projects.project_id == ShiftReports.project
+            )
+            if entity == "details":
+                query = query.join(
+                    Works, Works.work_id == ShiftReportDetails.work
+                ).outerjoin(
+                    ProjectWorks,
+                    ProjectWorks.project_work_id == ShiftReportDetails.project_work,
+                )
+            elif entity == "materials":
+                query = query.join(
+                    Materials, Materials.material_id == ShiftReportMaterials.material
+                )
+            else:
+                query = query.outerjoin(Objects, Objects.object_id == Projects.object)
+
+            query = self._filter_shift_reports_query(query, **filters)
+
+            order = desc if sort_order == "desc" else asc
+            if sort_by == "user":
+                query = query.order_by(order(Users.name))
+            elif sort_by == "project":
+                query = query.order_by(order(Projects.name))
+            elif sort_by and hasattr(self.model, sort_by):
+                query = query.order_by(order(getattr(self.model, sort_by)))
+            query = query.order_by(ShiftReports.number)
+
+            for row in query.yield_per(chunk_size):
+                yield tuple(row)
+
+    def _compute_report_distances(self, session, **filters):
+        """Считает расстояния от точек начала и конца смены до объекта.
+
+        Координаты выбираются одним запросом, расстояния считаются
+        векторно через NumPy для всей выборки сразу."""
+        query = (
+            session.query(
+                ShiftReports.shift_report_id.label("shift_report_id"),
+                ShiftReports.number.label("number"),
+                ShiftReports.date.label("date"),
+                ShiftReports.user.label("user"),
+                Users.name.label("user_name"),
+                ShiftReports.project.label("project"),
+                Projects.name.label("project_name"),
+                Objects.object_id.label("object"),
+                Objects.name.label("object_name"),
+                ShiftReports.ltd_start,
+                ShiftReports.lng_start,
+                ShiftReports.ltd_end,
+                ShiftReports.lng_end,
+                ShiftReports.distance_start,
+                ShiftReports.distance_end,
+                Objects.ltd.label("object_ltd"),
+                Objects.lng.label("object_lng"),
+            )
+            .select_from(ShiftReports)
+            .join(Users, Users.user_id == ShiftReports.user)
+            .join(Projects, Projects.project_id == ShiftReports.project)
+            .outerjoin(Objects, Objects.object_id == Projects.object)
+        )
+        query = self._filter_shift_reports_query(query, **filters)
+        rows = query.order_by(ShiftReports.number).all()
+
+        def column(name):
+            return as_float_array([getattr(row, name) for row in rows])
+
+        object_ltd = column("object_ltd")
+        object_lng = column("object_lng")
+        distances = {
+            "computed_start": haversine_m(
+                column("ltd_start"), column("lng_start"), object_ltd, object_lng
+            ),
+            "computed_end": haversine_m(
+                column("ltd_end"), column("lng_end"), object_ltd, object_lng
+            ),
+            "reported_start": column("distance_start"),
+            "reported_end": column("distance_end"),
+        }
+        logger.debug(
+            f"Рассчитаны расстояния до объекта для {len(rows)} отчетов",
+            extra={"login": "database"},
+        )
+        return rows, distances
+
+    def get_geofence_report(
+        self, radius, tolerance=None, only_violations=True, **filters
+    ):
+        """Проверка отчетов по геозоне объекта.
+
+        Отчет считается нарушением, если точка начала или конца смены дальше
+        `radius` метров от объекта, либо если переданное клиентом расстояние
+        расходится с рассчитанным больше чем на `tolerance` метров.
+        Возвращает (сводка, список строк)."""
+        with self.session_scope() as session:
+            rows, distances = self._compute_report_distances(session, **filters)
+
+        computed_start = distances["computed_start"]
+        computed_end = distances["computed_end"]
+        # Сравнения с NaN дают False: без координат нарушение не фиксируется
+        with np.errstate(invalid="ignore"):
+            start_outside = computed_start > radius
+            end_outside = computed_end > radius
+            mismatch = np.zeros(len(rows), dtype=bool)
+            if tolerance is not None:
+                mismatch = (
+                    np.abs(distances["reported_start"] - computed_start) > tolerance
+                ) | (np.abs(distances["reported_end"] - computed_end) > tolerance)
+        violations = start_outside | end_outside | mismatch
+        no_coordinates = np.isnan(computed_start) & np.isnan(computed_end)
+
+        summary = {
+            "checked": len(rows),
+            "violations": int(violations.sum()),
+            "start_outside": int(start_outside.sum()),
+            "end_outside": int(end_outside.sum()),
+            "distance_mismatch": int(mismatch.sum()),
+            "no_coordinates": int(no_coordinates.sum()),
+            "radius": radius,
+        }
+
+        def _value(array, index):
+            value = array[index]
+            return None if np.isnan(value) else round(float(value), 2)
+
+        indices = np.flatnonzero(violations) if only_violations else range(len(rows))
+        result = []
+        for index in indices:
+            row = rows[index]
+            result.append(
+                {
+                    "shift_report_id": str(row.shift_report_id),
+                    "number": row.number,
+                    "date": row.date,
+                    "user": str(row.user),
+                    "user_name": row.user_name,
+                    "project": str(row.project),
+                    "project_name": row.project_name,
+                    "object": str(row.object) if row.object else None,
+                    "object_name": row.object_name,
+                    "distance_start": row.distance_start,
+                    "distance_end": row.distance_end,
+                    "computed_distance_start": _value(computed_start, index),
+                    "computed_distance_end": _value(computed_end, index),
+                    "start_outside": bool(start_outside[index]),
+                    "end_outside": bool(end_outside[index]),
+                    "distance_mismatch": bool(mismatch[index]),
+                }
+            )
+        return summary, result
+
+    def fill_distances(self, overwrite=False, **filters):
+        """Массово заполняет distance_start/distance_end рассчитанными значениями.
+
+        По умолчанию заполняются только пустые поля; с `overwrite=True`
+        клиентские значения перезаписываются. Возвращает число обновлённых
+        отчетов."""
+        with self.session_scope() as session:
+            rows, distances = self._compute_report_distances(session, **filters)
+            updates = {}
+            for field_name, computed, reported in (
+                ("distance_start", "computed_start", "reported_start"),
+                ("distance_end", "computed_end", "reported_end"),
+            ):
+                mask = ~np.isnan(distances[computed])
+                if not overwrite:
+                    mask &= np.isnan(distances[reported])
+                for index in np.flatnonzero(mask):
+                    shift_report_id = rows[index].shift_report_id
+                    mapping = updates.setdefault(
+                        shift_report_id, {"shift_report_id": shift_report_id}
+                    )
+                    mapping[field_name] = round(float(distances[computed][index]), 2)
+
+            if updates:
+                session.bulk_update_mappings(ShiftReports, list(updates.values()))
+            logger.info(
+                f"Заполнены расстояния до объекта для {len(updates)} отчетов",
+                extra={"login": "database"},
+            )
+            return len(updates)
+
+    CALENDAR_GROUPS = ("user", "project")
+
+    def get_calendar(self, day_from, day_to, group_by="user", **filters):
+        """Календарь смен: число отчетов и сумма работ по дням.
+
+        Один агрегирующий запрос по вычисляемому столбцу `day` с разбивкой
+        по пользователю или проекту — этого достаточно для heatmap
+        «месяц x бригада» без выгрузки самих отчетов."""
+        if group_by not in self.CALENDAR_GROUPS:
+            raise ValueError(f"Unknown calendar group: {group_by}")
+
+        with self.session_scope() as session:
+            if group_by == "project":
+                key, name = ShiftReports.project, Projects.name
+            else:
+                key, name = ShiftReports.user, Users.name
+
+            details_sum = (
+                select(
+                    ShiftReportDetails.shift_report,
+                    func.sum(ShiftReportDetails.summ).label("summ"),
+                )
+                .group_by(ShiftReportDetails.shift_report)
+                .subquery()
+            )
+            query = (
+                session.query(
+                    ShiftReports.day.label("day"),
+                    key.label("key"),
+                    name.label("name"),
+                    func.count(ShiftReports.shift_report_id).label(
+                        "shift_reports_count"
+                    ),
+                    func.count(ShiftReports.shift_report_id)
+                    .filter(ShiftReports.signed.is_(True))
+                    .label("signed_count"),
+                    func.coalesce(func.sum(details_sum.c.summ), 0).label("summ"),
+                )
+                .select_from(ShiftReports)
+                .outerjoin(
+                    details_sum,
+                    details_sum.c.shift_report == ShiftReports.shift_report_id,
+                )
+                .filter(ShiftReports.day.between(day_from, day_to))
+            )
+            if group_by == "project":
+                query = query.join(
+                    Projects, Projects.project_id == ShiftReports.project
+                )
+            else:
+                query = query.join(Users, Users.user_id == ShiftReports.user)
+
+            if filters.get("deleted") is None:
+                filters["deleted"] = False
+            query = self._filter_shift_reports_query(query, **filters)
+            query = query.group_by(ShiftReports.day, key, name).order_by(
+                name, key, ShiftReports.day
+            )
+
+            result = [
+                {
+                    "day": row.day.isoformat(),
+                    group_by: str(row.key),
+                    f"{group_by}_name": row.name,
+                    "shift_reports_count": row.shift_reports_count,
+                    "signed_count": row.signed_count,
+                    "summ": float(row.summ),
+                }
+                for row in query.all()
+            ]
+            logger.debug(
+                f"Календарь {day_from} - {day_to} по {group_by}: {len(result)} ячеек",
+                extra={"login": "database"},
+            )
+            return result
+
 
 class ShiftReportsDetailsManager(ShiftManager):
     @property
@@ -377,15 +711,23 @@ class ShiftReportsDetailsManager(ShiftManager):
             joined_shift_reports = False
 
             # Фильтрация по дате смены (ShiftReports.date)
-            if filters.get("date_from") is not None or filters.get("date_to") is not None:
+            if (
+                filters.get("date_from") is not None
+                or filters.get("date_to") is not None
+            ):
                 query = query.join(
                     ShiftReports,
                     ShiftReports.shift_report_id == self.model.shift_report,
                 )
                 joined_shift_reports = True
-                if filters.get("date_from") is not None and filters.get("date_to") is not None:
+                if (
+                    filters.get("date_from") is not None
+                    and filters.get("date_to") is not None
+                ):
                     query = query.filter(
-                        ShiftReports.date.between(filters["date_from"], filters["date_to"])
+                        ShiftReports.date.between(
+                            filters["date_from"], filters["date_to"]
+                        )
                     )
                 elif filters.get("date_from") is not None:
                     query = query.filter(ShiftReports.date >= filters["date_from"])
@@ -457,26 +799,152 @@ class ShiftReportsDetailsManager(ShiftManager):
             records = query.all()
             return [record.to_dict() for record in records]
 
+    def get_payroll(self, group_by=None, project_leader=None, **filters):
+        """Ведомость начислений: суммы `summ` по пользователям за период.
+
+        Считается одним GROUP BY ROLLUP по подписанным и не удалённым отчетам,
+        поэтому помимо строк детализации возвращаются промежуточные итоги
+        по каждому пользователю и общий итог (`level` = "total")."""
+        dimensions = [name for name in PAYROLL_DIMENSIONS if name in (group_by or [])]
+
+        with self.session_scope() as session:
+            keys = {
+                "user": tuple_(Users.user_id, Users.name),
+                "project": tuple_(ShiftReports.project, Projects.name),
+                "work": tuple_(ShiftReportDetails.work, Works.name),
+                "night_shift": ShiftReports.night_shift,
+                "extreme_conditions": ShiftReports.extreme_conditions,
+            }
+            columns = {
+                "project": [
+                    ShiftReports.project.label("project"),
+                    Projects.name.label("project_name"),
+                ],
+                "work": [
+                    ShiftReportDetails.work.label("work"),
+                    Works.name.label("work_name"),
+                ],
+                "night_shift": [ShiftReports.night_shift.label("night_shift")],
+                "extreme_conditions": [
+                    ShiftReports.extreme_conditions.label("extreme_conditions")
+                ],
+            }
+            selected = [col for name in dimensions for col in columns[name]]
+            levels = ["total", "user", *dimensions]
+
+            query = (
+                session.query(
+                    Users.user_id.label("user"),
+                    Users.name.label("user_name"),
+                    *selected,
+                    func.sum(ShiftReportDetails.summ).label("summ"),
+                    func.sum(ShiftReportDetails.quantity).label("quantity"),
+                    func.count(ShiftReportDetails.shift_report_detail_id).label(
+                        "details_count"
+                    ),
+                    func.count(distinct(ShiftReports.shift_report_id)).label(
+                        "shift_reports_count"
+                    ),
+                    func.grouping(
+                        Users.user_id,
+                        *[columns[name][0].element for name in dimensions],
+                    ).label("grouping"),
+                )
+                .select_from(ShiftReportDetails)
+                .join(
+                    ShiftReports,
+                    ShiftReports.shift_report_id == ShiftReportDetails.shift_report,
+                )
+                .join(Users, Users.user_id == ShiftReports.user)
+                .filter(
+                    ShiftReports.signed.is_(True),
+                    ShiftReports.deleted.is_(False),
+                )
+            )
+
+            if "project" in dimensions or project_leader is not None:
+                query = query.join(
+                    Projects, Projects.project_id == ShiftReports.project
+                )
+            if "work" in dimensions:
+                query = query.join(Works, Works.work_id == ShiftReportDetails.work)
+
+            if project_leader is not None:
+                query = query.filter(
+                    Projects.project_leader == self._convert_to_uuid(project_leader)
+                )
+            if filters.get("date_from") is not None:
+                query = query.filter(ShiftReports.date >= filters["date_from"])
+            if filters.get("date_to") is not None:
+                query = query.filter(ShiftReports.date <= filters["date_to"])
+            for key, column in (
+                ("user", ShiftReports.user),
+                ("project", ShiftReports.project),
+            ):
+                value = filters.get(key)
+                if value:
+                    query = query.filter(
+                        column.in_([self._convert_to_uuid(v) for v in value])
+                    )
+
+            query = query.group_by(
+                func.rollup(*[keys[name] for name in ["user", *dimensions]])
+            ).order_by(
+                Users.name.asc().nullslast(),
+                Users.user_id.asc().nullslast(),
+                *[col.element.asc().nullslast() for col in selected],
+            )
+
+            result = []
+            bits = len(levels) - 1
+            for row in query.all():
+                # GROUPING() ставит 1 для свёрнутых столбцов, старший бит — user
+                depth = next(
+                    (i for i in range(bits) if row.grouping >> (bits - 1 - i) & 1),
+                    bits,
+                )
+                item = {
+                    "user": str(row.user) if row.user else None,
+                    "user_name": row.user_name,
+                    "project": None,
+                    "project_name": None,
+                    "work": None,
+                    "work_name": None,
+                    "night_shift": None,
+                    "extreme_conditions": None,
+                    "summ": row.summ or 0,
+                    "quantity": row.quantity or 0,
+                    "details_count": row.details_count,
+                    "shift_reports_count": row.shift_reports_count,
+                    "level": levels[depth],
+                }
+                for col in selected:
+                    value = getattr(row, col.name)
+                    if col.name in ("project", "work") and value is not None:
+                        value = str(value)
+                    item[col.name] = value
+                result.append(item)
+
+            logger.debug(
+                f"Ведомость: {len(result)} строк, группировка {levels}",
+                extra={"login": "database"},
+            )
+            return result
+
     @staticmethod
     def _sync_shift_report_materials(session, detail, created_by):
         session.query(ShiftReportMaterials).filter(
             ShiftReportMaterials.shift_report_detail == detail.shift_report_detail_id
         ).delete(synchronize_session=False)
 
-        relations = (
-            session.query(WorkMaterialRelations)
-            .options(joinedload(WorkMaterialRelations.materials))
-            .filter(WorkMaterialRelations.work == detail.work)
-            .all()
-        )
+        relations = reference_cache.work_materials(detail.work, session)
         if not relations:
             return
 
         for relation in relations:
             quantity = Decimal(detail.quantity) * Decimal(relation.quantity)
-            material = relation.materials
-            if material and material.measurement_unit:
-                unit = str(material.measurement_unit).strip().lower()
+            if relation.measurement_unit:
+                unit = str(relation.measurement_unit).strip().lower()
                 if unit == "шт.":
                     quantity = Decimal(int(quantity))
 
@@ -484,7 +952,7 @@ class ShiftReportsDetailsManager(ShiftManager):
                 ShiftReportMaterials(
                     shift_report_material_id=uuid4(),
                     shift_report=detail.shift_report,
-                    material=relation.material,
+                    material=relation.material_id,
                     quantity=quantity,
                     shift_report_detail=detail.shift_report_detail_id,
                     created_by=created_by,
@@ -552,13 +1020,9 @@ class ShiftReportsDetailsManager(ShiftManager):
         )
 
         # Получаем цену работы
-        work_price = (
-            session.query(WorkPrices)
-            .filter(WorkPrices.work == work_id, WorkPrices.category == user.category)
-            .first()
-        )
+        price = reference_cache.work_price(work_id, user.category, session)
 
-        if not work_price:
+        if price is None:
             logger.warning(
                 f"[WARNING] Цена работы для work_id {work_id} и категории {
                     user.category
@@ -566,7 +1030,6 @@ class ShiftReportsDetailsManager(ShiftManager):
             )
             return Decimal(0)
 
-        price = work_price.price
         logger.debug(f"[DEBUG] Найдена цена работы: {price}")
 
         # Инициализируем сумму
@@ -646,9 +1109,7 @@ class ShiftReportsDetailsManager(ShiftManager):
                     shift_report.user,
                 )
 
-                self._sync_shift_report_materials(
-                    session, detail, detail.created_by
-                )
+                self._sync_shift_report_materials(session, detail, detail.created_by)
                 session.commit()
                 logger.info(
                     f"[INFO] Обновлены данные для shift_report_detail {
@@ -677,7 +1138,8 @@ class ShiftReportsDetailsManager(ShiftManager):
                     return None
 
                 session.query(ShiftReportMaterials).filter(
-                    ShiftReportMaterials.shift_report_detail == record.shift_report_detail_id
+                    ShiftReportMaterials.shift_report_detail
+                    == record.shift_report_detail_id
                 ).delete(synchronize_session=False)
                 session.delete(record)
                 return record
@@ -755,3 +1217,69 @@ class ShiftReportsDetailsManager(ShiftManager):
                     extra={"login": "database"},
                 )
                 raise
+
+    def reprice_unsigned(self, work_ids):
+        """Пересчитывает суммы работ неподписанных отчетов по текущим расценкам.
+
+        Один UPDATE ... FROM вместо update_summ по каждой записи: цена
+        берётся так же — самая ранняя расценка работы для разряда автора
+        отчета (0, если её нет), +25% за особые условия и за ночную смену.
+        Действующие расценки выбираются один раз через DISTINCT ON, записи
+        с неизменной суммой не обновляются. Возвращает число обновлённых
+        записей."""
+        # Действующая расценка: самая ранняя для работы и разряда
+        prices = (
+            select(WorkPrices.work, WorkPrices.category, WorkPrices.price)
+            .where(WorkPrices.work.in_(work_ids))
+            .distinct(WorkPrices.work, WorkPrices.category)
+            .order_by(WorkPrices.work, WorkPrices.category, WorkPrices.created_at)
+            .subquery()
+        )
+        factor = (
+            1
+            + cast(ShiftReports.extreme_conditions, Integer) * Decimal("0.25")
+            + cast(ShiftReports.night_shift, Integer) * Decimal("0.25")
+        )
+        repriced = (
+            select(
+                ShiftReportDetails.shift_report_detail_id,
+                func.round(
+                    func.coalesce(prices.c.price, 0)
+                    * factor
+                    * ShiftReportDetails.quantity,
+                    2,
+                ).label("summ"),
+            )
+            .join(
+                ShiftReports,
+                ShiftReports.shift_report_id == ShiftReportDetails.shift_report,
+            )
+            .join(Users, Users.user_id == ShiftReports.user)
+            .outerjoin(
+                prices,
+                (prices.c.work == ShiftReportDetails.work)
+                & (prices.c.category == Users.category),
+            )
+            .where(
+                ShiftReportDetails.work.in_(work_ids),
+                ShiftReports.signed.is_(False),
+                ShiftReports.deleted.is_(False),
+            )
+            .subquery()
+        )
+        with self.session_scope() as session:
+            result = session.execute(
+                update(ShiftReportDetails)
+                .where(
+                    ShiftReportDetails.shift_report_detail_id
+                    == repriced.c.shift_report_detail_id,
+                    ShiftReportDetails.summ.is_distinct_from(repriced.c.summ),
+                )
+                .values(summ=repriced.c.summ)
+                .execution_options(synchronize_session=False)
+            )
+            logger.info(
+                f"Пересчитаны суммы {result.rowcount} работ неподписанных отчетов",
+                extra={"login": "database"},
+            )
+            return result.rowcount
@@ -0,0 +1,168 @@
+import logging
+
+from sqlalchemy import delete, func, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload
+
+from app.database.managers.abstract_manager import BaseDBManager
+from app.database.models import (
+    Projects,
+    ProjectWorks,
+    ShiftReportDetails,
+    ShiftReports,
+    SyncMeta,
+    SyncTombstones,
+)
+from app.database.models.sync_tombstones import (
+    SYNC_PURGE_HORIZON,
+    SYNC_TABLES,
+    SYNC_TOKEN_SQL,
+)
+
+logger = logging.getLogger("ok_service")
+
+
+class SyncManager(BaseDBManager):
+    @property
+    def model(self):
+        return SyncTombstones
+
+    def get_changes(self, since=None, user=None, projects=None, leader=None):
+        """Изменения сущностей мобильного клиента начиная с токена `since`.
+
+        Без `since` отдаётся полный снимок. Возвращает новый токен,
+        изменённые строки по типам сущностей, id удалённых (или вышедших из
+        области видимости) записей и признак полной пересинхронизации.
+        Строки с версией, равной токену, могут прийти повторно — клиент
+        применяет их идемпотентно.
+
+        Если надгробия новее `since` уже удалены по сроку хранения, вместо
+        разницы отдаётся полный снимок с full_resync=True: клиент должен
+        заменить им все локальные данные."""
+        with self.session_scope() as session:
+            # Токен берётся до чтения данных: всё, что закоммитится позже,
+            # получит версию не меньше токена
+            token = session.execute(text(f"SELECT {SYNC_TOKEN_SQL}")).scalar()
+
+            full_resync = False
+            if since is not None:
+                horizon = session.get(SyncMeta, SYNC_PURGE_HORIZON)
+                if horizon is not None and since <= horizon.value:
+                    since = None
+                    full_resync = True
+
+            reports_query = session.query(ShiftReports).options(
+                joinedload(ShiftReports.projects).joinedload(Projects.objects)
+            )
+            details_query = (
+                session.query(ShiftReportDetails)
+                .join(
+                    ShiftReports,
+                    ShiftReports.shift_report_id == ShiftReportDetails.shift_report,
+                )
+                .options(
+                    joinedload(ShiftReportDetails.shift_reports),
+                    joinedload(ShiftReportDetails.project_works),
+                )
+            )
+            project_works_query = session.query(ProjectWorks)
+
+            if since is not None:
+                reports_query = reports_query.filter(
+                    ShiftReports.change_version >= since
+                )
+                details_query = details_query.filter(
+                    ShiftReportDetails.change_version >= since
+                )
+                project_works_query = project_works_query.filter(
+                    ProjectWorks.change_version >= since
+                )
+            if user is not None:
+                reports_query = reports_query.filter(ShiftReports.user == user)
+                details_query = details_query.filter(ShiftReports.user == user)
+            if projects is not None:
+                reports_query = reports_query.filter(ShiftReports.project.in_(projects))
+                details_query = details_query.filter(ShiftReports.project.in_(projects))
+                project_works_query = project_works_query.filter(
+                    ProjectWorks.project.in_(projects)
+                )
+
+            changes = {
+                "shift_reports": [row.to_dict() for row in reports_query.all()],
+                "shift_report_details": [row.to_dict() for row in details_query.all()],
+                "project_works": [row.to_dict() for row in project_works_query.all()],
+            }
+
+            deleted = {entity: [] for entity in SYNC_TABLES}
+            if since is not None:
+                tombstones = session.query(
+                    SyncTombstones.entity, SyncTombstones.entity_id
+                ).filter(SyncTombstones.change_version >= since)
+                # Надгробия фильтруются по той же области, что и строки
+                if user is not None:
+                    tombstones = tombstones.filter(
+                        or_(
+                            SyncTombstones.entity == "project_works",
+                            SyncTombstones.scope_user == user,
+                        )
+                    )
+                if projects is not None:
+                    tombstones = tombstones.filter(
+                        or_(
+                            SyncTombstones.scope_project.in_(projects),
+                            SyncTombstones.scope_leader == leader,
+                        )
+                    )
+                # Строка, перешедшая в другую область, которая тоже видна
+                # клиенту, приходит изменением, а не удалением
+                present = {
+                    entity: {row[SYNC_TABLES[entity]] for row in rows}
+                    for entity, rows in changes.items()
+                }
+                for entity, entity_id in tombstones.order_by(
+                    SyncTombstones.change_version
+                ):
+                    entity_id = str(entity_id)
+                    if entity_id not in present.get(entity, ()):
+                        deleted.setdefault(entity, []).append(entity_id)
+
+            logger.debug(
+                f"Синхронизация с {since}: новый токен {token}, "
+                f"{sum(len(rows) for rows in changes.values())} изменений, "
+                f"{sum(len(ids) for ids in deleted.values())} удалений",
+                extra={"login": "database"},
+            )
+            return token, changes, deleted, full_resync
+
+    def purge_tombstones(self, older_than):
+        """Удаляет надгробия старше `older_than` (epoch-секунды).
+
+        Максимальная версия удалённых надгробий сохраняется как горизонт
+        очистки: токены не новее него получают полную пересинхронизацию."""
+        with self.session_scope() as session:
+            versions = (
+                session.execute(
+                    delete(SyncTombstones)
+                    .where(SyncTombstones.deleted_at < older_than)
+                    .returning(SyncTombstones.change_version)
+                )
+                .scalars()
+                .all()
+            )
+            if versions:
+                stmt = pg_insert(SyncMeta).values(
+                    key=SYNC_PURGE_HORIZON, value=max(versions)
+                )
+                session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[SyncMeta.key],
+                        set_={
+                            "value": func.greatest(SyncMeta.value, stmt.excluded.value)
+                        },
+                    )
+                )
+            logger.info(
+                f"Удалено {len(versions)} устаревших надгробий синхронизации",
+                extra={"login": "database"},
+            )
+            return len(versions)
@@ -0,0 +1,19 @@
+from app.database.managers.abstract_manager import BaseDBManager
+from app.database.models import TableVersions
+
+
+class TableVersionsManager(BaseDBManager):
+    @property
+    def model(self):
+        return TableVersions
+
+    def get_versions(self, table_names):
+        """Версии указанных таблиц одним запросом; отсутствующие — 0."""
+        with self.session_scope() as session:
+            rows = (
+                session.query(TableVersions.table_name, TableVersions.version)
+                .filter(TableVersions.table_name.in_(table_names))
+                .all()
+            )
+        versions = dict(rows)
+        return {name: versions.get(name, 0) for name in table_names}
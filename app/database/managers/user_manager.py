@@ -3,6 +3,7 @@ from uuid import UUID, uuid4
 from app.database.models import Users
 # Предполагается, что BaseDBManager в другом файле
 from app.database.managers.abstract_manager import BaseDBManager
+from app.utils.passwords import password_hasher
 
 logger = logging.getLogger('ok_service')
 
@@ -82,6 +83,40 @@ class UserManager(BaseDBManager):
                 logger.error(f"Database error in check_password: {e}")
                 return False
 
+    def get_login_record(self, login):
+        """Данные для входа одним запросом (по уникальному индексу login)"""
+        with self.session_scope() as session:
+            row = session.query(
+                self.model.user_id,
+                self.model.login,
+                self.model.role,
+                self.model.password_hash,
+                self.model.deleted,
+            ).filter_by(login=login).first()
+            if row is None:
+                return None
+            return {
+                "user_id": str(row.user_id),
+                "login": row.login,
+                "role": row.role,
+                "password_hash": row.password_hash,
+                "deleted": row.deleted,
+            }
+
+    def rehash_password(self, user_id, old_hash, password):
+        """Перехеширует пароль текущими параметрами после успешного входа.
+
+        Хеш считается до открытия сессии; обновление не затирает пароль,
+        если его успели сменить параллельно."""
+        new_hash = password_hasher.hash(password)
+        with self.session_scope() as session:
+            updated = session.query(self.model).filter_by(
+                user_id=UUID(str(user_id)), password_hash=old_hash
+            ).update({"password_hash": new_hash}, synchronize_session=False)
+        logger.info(f"Пароль пользователя {user_id} перехеширован",
+                    extra={"login": "database"})
+        return bool(updated)
+
     def update_user_password(self, user_id, new_password):
         """Обновляем пароль пользователя"""
         with self.session_scope() as session:
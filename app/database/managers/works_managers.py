@@ -1,14 +1,24 @@
 import logging
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import joinedload
 from sqlalchemy import asc, desc
 from app.database.models import Works, WorkPrices, WorkCategories
+from app.utils.db_works import PRICE_COLUMNS
 # Предполагается, что BaseDBManager в другом файле
 from app.database.managers.abstract_manager import BaseDBManager
 
 logger = logging.getLogger('ok_service')
 
+# Столбцы WorkPrices и столбцы разницы расценок, из которых они берутся
+PRICE_VALUES = {"work": "work_id", "category": "price_category", "price": "price"}
+
 
 class WorksManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
@@ -57,16 +67,280 @@ class WorksManager(BaseDBManager):
             # Преобразуем записи в словари
             return [record.to_dict() for record in records]
 
+    def import_catalogue(self, catalogue, created_by, dry_run=False):
+        """Загружает прайс-лист в справочник: категории, работы и расценки.
+
+        catalogue — нормализованный DataFrame (см. app.utils.db_works) со
+        столбцами work_category, work и price_1..price_4. Текущий справочник
+        читается тремя запросами, разница считается в pandas: категории
+        сопоставляются по имени, работы — по (категории, имени), расценки —
+        по (работе, разряду) с той записью, которую берёт расчёт сумм
+        (самая ранняя, см. reference_cache). Новые и изменённые строки
+        записываются пакетными upsert по первичному ключу в одной транзакции;
+        удалённые записи из прайс-листа восстанавливаются, пустые расценки
+        не трогаются. С dry_run=True возвращается только сводка."""
+        with self.session_scope() as session:
+            categories, category_ids = self._diff_categories(session, catalogue)
+            catalogue = catalogue.assign(
+                category=catalogue["work_category"].map(category_ids)
+            )
+            works = self._diff_works(session, catalogue)
+            prices = WorkPricesManager.diff_prices(
+                session, _melt_prices(catalogue.merge(works, on=["category", "work"]))
+            )
+
+            summary = {
+                "dry_run": dry_run,
+                "rows": len(catalogue),
+                "categories": _count_changes(categories),
+                "works": _count_changes(works),
+                "prices": _count_changes(prices),
+            }
+            if dry_run:
+                return summary
+
+            for manager, diff, values in (
+                (
+                    WorkCategoriesManager(session=session),
+                    categories,
+                    {"name": "work_category"},
+                ),
+                (self, works, {"name": "work", "category": "category"}),
+                (WorkPricesManager(session=session), prices, PRICE_VALUES),
+            ):
+                if _upsert(session, manager.model, diff, values, created_by):
+                    manager._bump_version(session)
+
+            logger.info(f"Импорт прайс-листа: {summary}", extra={"login": "database"})
+            return summary
+
+    @staticmethod
+    def _diff_categories(session, catalogue):
+        """Категории прайс-листа и словарь имя -> work_category_id."""
+        existing = _frame(
+            session.query(
+                WorkCategories.work_category_id.label("id"),
+                WorkCategories.name.label("work_category"),
+                WorkCategories.deleted,
+            ).order_by(WorkCategories.deleted, WorkCategories.created_at),
+            ["id", "work_category", "deleted"],
+        ).drop_duplicates("work_category")
+        diff = pd.DataFrame(
+            {"work_category": catalogue["work_category"].unique()}
+        ).merge(existing, on="work_category", how="left")
+        diff = _mark_changes(diff, diff["deleted"].eq(True))
+        return diff, dict(zip(diff["work_category"], diff["id"]))
+
+    @staticmethod
+    def _diff_works(session, catalogue):
+        existing = _frame(
+            session.query(
+                Works.work_id.label("id"),
+                Works.category,
+                Works.name.label("work"),
+                Works.deleted,
+            ).order_by(Works.deleted, Works.created_at),
+            ["id", "category", "work", "deleted"],
+        ).drop_duplicates(["category", "work"])
+        diff = catalogue[["category", "work"]].merge(
+            existing, on=["category", "work"], how="left"
+        )
+        diff = _mark_changes(diff, diff["deleted"].eq(True))
+        return diff.assign(work_id=diff["id"])
+
 
 class WorkPricesManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
         return WorkPrices
 
+    @staticmethod
+    def diff_prices(session, prices):
+        """Сравнивает расценки (work_id, price_category, price) с текущими.
+
+        Расценка сопоставляется с той записью, которую берёт расчёт сумм
+        (самая ранняя для работы и разряда, см. reference_cache)."""
+        existing = _frame(
+            session.query(
+                WorkPrices.work_price_id.label("id"),
+                WorkPrices.work.label("work_id"),
+                WorkPrices.category.label("price_category"),
+                WorkPrices.price.label("current_price"),
+                WorkPrices.deleted,
+            )
+            .filter(WorkPrices.work.in_(prices["work_id"].unique().tolist()))
+            .order_by(WorkPrices.created_at),
+            ["id", "work_id", "price_category", "current_price", "deleted"],
+        ).drop_duplicates(["work_id", "price_category"])
+        prices = prices.assign(
+            price=[Decimal(f"{price:.2f}") for price in prices["price"]]
+        )
+        diff = prices.merge(existing, on=["work_id", "price_category"], how="left")
+        return _mark_changes(
+            diff, diff["deleted"].eq(True) | diff["price"].ne(diff["current_price"])
+        )
+
+    def apply_matrix(self, matrix, created_by, reprice=False, reprice_backend="inline"):
+        """Применяет матрицу расценок «работы x разряды 0–4» одним upsert.
+
+        matrix — список {"work": id, "prices": {разряд: цена}}, повтор
+        работы и разряда перекрывает предыдущий. Версия таблицы (и
+        уведомление кэшей) увеличивается один раз на всю матрицу. Возвращает
+        счётчики и список созданных/изменённых расценок.
+
+        С reprice=True суммы неподписанных отчетов по изменённым работам
+        пересчитываются: при reprice_backend="queue" в той же транзакции
+        ставится задание для worker.py, иначе пересчёт выполняется сразу
+        после сохранения расценок."""
+        prices = pd.DataFrame(
+            [
+                (UUID(str(row["work"])), int(category), price)
+                for row in matrix
+                for category, price in row["prices"].items()
+            ],
+            columns=["work_id", "price_category", "price"],
+        ).drop_duplicates(["work_id", "price_category"], keep="last")
+
+        with self.session_scope() as session:
+            work_ids = prices["work_id"].unique().tolist()
+            known = {
+                work_id
+                for (work_id,) in session.query(Works.work_id).filter(
+                    Works.work_id.in_(work_ids)
+                )
+            }
+            unknown = [str(work_id) for work_id in work_ids if work_id not in known]
+            if unknown:
+                raise ValueError(f"Works not found: {', '.join(unknown)}")
+
+            diff = self.diff_prices(session, prices)
+            changed = diff[diff["change"] != "unchanged"]
+            summary = {
+                **_count_changes(diff),
+                "changes": [
+                    {
+                        "work_price_id": str(row["id"]),
+                        "work": str(row["work_id"]),
+                        "category": int(row["price_category"]),
+                        "old_price": (
+                            None if pd.isna(row["current_price"]) else row["current_price"]
+                        ),
+                        "price": row["price"],
+                        "change": row["change"],
+                    }
+                    for row in changed.to_dict("records")
+                ],
+                "reprice_job_id": None,
+                "repriced": None,
+            }
+            if not _upsert(session, WorkPrices, diff, PRICE_VALUES, created_by):
+                return summary
+            self._bump_version(session)
+
+            changed_works = sorted({str(work) for work in changed["work_id"]})
+            if reprice and reprice_backend == "queue":
+                from app.database.managers.job_queue_manager import JobQueueManager
+                from app.jobs.tasks import SHIFT_REPORT_DETAILS_REPRICE
+
+                summary["reprice_job_id"] = JobQueueManager(session=session).enqueue(
+                    SHIFT_REPORT_DETAILS_REPRICE, {"works": changed_works}
+                )
+            logger.info(
+                f"Матрица расценок применена: создано {summary['created']}, "
+                f"изменено {summary['updated']}",
+                extra={"login": "database"},
+            )
+
+        if reprice and reprice_backend != "queue":
+            from app.database.managers.shift_reports_managers import (
+                ShiftReportsDetailsManager,
+            )
+
+            # Пересчёт читает уже сохранённые расценки, поэтому идёт после
+            # фиксации транзакции
+            summary["repriced"] = ShiftReportsDetailsManager().reprice_unsigned(
+                [UUID(work_id) for work_id in changed_works]
+            )
+        return summary
+
 
 class WorkCategoriesManager(BaseDBManager):
+    versioned = True
 
     @property
     def model(self):
         return WorkCategories
+
+
+def _melt_prices(catalogue):
+    """Расценки прайс-листа по разрядам в длинном виде, без пустых."""
+    prices = catalogue.melt(
+        id_vars=["work_id"],
+        value_vars=PRICE_COLUMNS,
+        var_name="price_category",
+        value_name="price",
+    ).dropna(subset=["price"])
+    prices["price_category"] = (
+        prices["price_category"].str.removeprefix("price_").astype(int)
+    )
+    return prices
+
+
+def _frame(query, columns):
+    return pd.DataFrame(query.all(), columns=columns, dtype=object)
+
+
+def _mark_changes(diff, changed):
+    """Размечает строки разницы: created (новый id), updated, unchanged."""
+    diff = diff.reset_index(drop=True)
+    created = diff["id"].isna()
+    diff["change"] = "unchanged"
+    diff.loc[changed & ~created, "change"] = "updated"
+    diff.loc[created, "change"] = "created"
+    diff.loc[created, "id"] = pd.Series(
+        [uuid4() for _ in range(int(created.sum()))],
+        index=diff.index[created],
+        dtype=object,
+    )
+    return diff
+
+
+def _count_changes(diff):
+    counts = diff["change"].value_counts()
+    return {
+        change: int(counts.get(change, 0))
+        for change in ("created", "updated", "unchanged")
+    }
+
+
+def _upsert(session, model, diff, values, created_by):
+    """Записывает новые и изменённые строки разницы одним пакетным
+    INSERT ... ON CONFLICT по первичному ключу модели.
+
+    values — столбцы модели и соответствующие им столбцы разницы. Возвращает
+    False, если записывать нечего."""
+    changed = diff[diff["change"] != "unchanged"]
+    if changed.empty:
+        return False
+    key = model.__mapper__.primary_key[0]
+    columns = {key.name: "id", **values}
+    extra = {"measurement_unit": "шт."} if model is Works else {}
+    rows = [
+        {
+            **{column: row[source] for column, source in columns.items()},
+            **extra,
+            "created_by": created_by,
+            "deleted": False,
+        }
+        for row in changed[list(dict.fromkeys(columns.values()))].to_dict("records")
+    ]
+    stmt = pg_insert(model)
+    update = {"deleted": False}
+    if model is WorkPrices:
+        update["price"] = stmt.excluded.price
+    session.execute(
+        stmt.on_conflict_do_update(index_elements=[key], set_=update), rows
+    )
+    return True
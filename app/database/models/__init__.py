@@ -1,4 +1,6 @@
+from .background_jobs import BackgroundJobs
 from .cities import Cities
+from .document_jobs import DocumentJobs
 from .leaves import AbsenceReason, Leaves
 from .logs import Logs
 from .materials import Materials
@@ -13,6 +15,8 @@ from .shift_report import ShiftReports
 from .shift_report_details import ShiftReportDetails
 from .shift_report_materials import ShiftReportMaterials
 from .subscriptions import Subscriptions
+from .sync_tombstones import SyncMeta, SyncTombstones
+from .table_versions import TableVersions
 from .user import Users
 from .work_categories import WorkCategories
 from .work_material_relations import WorkMaterialRelations
@@ -0,0 +1,74 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import UUID, BigInteger, Column, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import text
+
+from app.database.db_setup import Base
+
+# Статусы задания в очереди
+QUEUE_QUEUED = "queued"
+QUEUE_RUNNING = "running"
+QUEUE_DONE = "done"
+QUEUE_FAILED = "failed"
+
+
+class BackgroundJobs(Base):
+    """Задание очереди фоновых работ (забирается через SKIP LOCKED)."""
+
+    __tablename__ = "background_jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, nullable=False)
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    # Больше — раньше
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default=QUEUE_QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    # Не раньше этого момента (epoch-секунды); используется для backoff
+    run_at = Column(
+        BigInteger,
+        default=lambda: int(datetime.utcnow().timestamp()),
+        server_default=text("EXTRACT(EPOCH FROM NOW())"),
+        nullable=False,
+    )
+    # Окно видимости: после него задание упавшего воркера забирается снова
+    locked_until = Column(BigInteger, nullable=True)
+    locked_by = Column(String, nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(
+        BigInteger,
+        default=lambda: int(datetime.utcnow().timestamp()),
+        server_default=text("EXTRACT(EPOCH FROM NOW())"),
+        nullable=False,
+    )
+    finished_at = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        Index("ix_background_jobs_ready", "status", "priority", "run_at"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<BackgroundJobs(job_id={self.job_id}, kind={self.kind}, "
+            f"status={self.status}, attempts={self.attempts})>"
+        )
+
+    def to_dict(self):
+        return {
+            "job_id": str(self.job_id),
+            "kind": self.kind,
+            "payload": self.payload,
+            "priority": self.priority,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at,
+            "locked_until": self.locked_until,
+            "locked_by": self.locked_by,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
@@ -0,0 +1,66 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import text
+
+from app.database.db_setup import Base
+
+# Статусы задания генерации документа
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class DocumentJobs(Base):
+    """Фоновое задание генерации документа через сервис шаблонов."""
+
+    __tablename__ = "document_jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, nullable=False)
+    status = Column(String, nullable=False, default=JOB_QUEUED)
+    payload = Column(JSONB, nullable=False)
+    # Ключ готового файла в кэше шаблонов (sha256 данных)
+    cache_key = Column(String, nullable=False)
+    error = Column(String, nullable=True)
+    # Готовый документ: хранится в БД, чтобы его отдал любой веб-узел,
+    # а не только тот, где его сгенерировал worker.py; загружается только
+    # при скачивании
+    document = deferred(Column(LargeBinary, nullable=True))
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
+    created_at = Column(
+        BigInteger,
+        default=lambda: int(datetime.utcnow().timestamp()),
+        server_default=text("EXTRACT(EPOCH FROM NOW())"),
+        nullable=False,
+    )
+    started_at = Column(BigInteger, nullable=True)
+    finished_at = Column(BigInteger, nullable=True)
+
+    __table_args__ = (Index("ix_document_jobs_created_by", "created_by"),)
+
+    def __repr__(self):
+        return f"<DocumentJobs(job_id={self.job_id}, status={self.status})>"
+
+    def to_dict(self):
+        return {
+            "job_id": str(self.job_id),
+            "status": self.status,
+            "error": self.error,
+            "cache_key": self.cache_key,
+            "created_by": str(self.created_by),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
@@ -1,11 +1,22 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import UUID, BigInteger, Boolean, Column, ForeignKey, Numeric, String
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    Boolean,
+    Column,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
 from app.database.db_setup import Base
+from app.database.models.sync_tombstones import CHANGE_VERSION_SQL
 
 
 class ProjectWorks(Base):
@@ -29,6 +40,15 @@ class ProjectWorks(Base):
         nullable=False,
     )
     created_by = Column(UUID, ForeignKey("users.user_id"), nullable=False)
+    # Версия последнего изменения, проставляется триггером (см. sync_tombstones)
+    change_version = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CHANGE_VERSION_SQL),
+        server_onupdate=FetchedValue(),
+    )
+
+    __table_args__ = (Index("ix_project_works_change_version", "change_version"),)
 
     works = relationship("Works", back_populates="project_work")
     projects = relationship("Projects", back_populates="project_work")
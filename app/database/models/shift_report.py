@@ -6,8 +6,12 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    Computed,
+    Date,
+    FetchedValue,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Sequence,
     Text,
@@ -16,10 +20,14 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
 from app.database.db_setup import Base
+from app.database.models.sync_tombstones import CHANGE_VERSION_SQL
 
 # Создаем SEQUENCE (он должен быть заранее в БД)
 shift_reports_number_seq = Sequence("shift_reports_number_seq", start=1, increment=1)
 
+# Часовой пояс, в котором epoch-поле date раскладывается по календарным дням
+SHIFT_DAY_TIMEZONE = "Europe/Moscow"
+
 
 class ShiftReports(Base):
     __tablename__ = "shift_reports"
@@ -29,6 +37,14 @@ class ShiftReports(Base):
     )
     user = Column(UUID, ForeignKey("users.user_id"), nullable=False)
     date = Column(BigInteger, nullable=False)
+    # Календарный день смены, вычисляется СУБД из date (для календаря/heatmap)
+    day = Column(
+        Date,
+        Computed(
+            f"(to_timestamp(date) AT TIME ZONE '{SHIFT_DAY_TIMEZONE}')::date",
+            persisted=True,
+        ),
+    )
     date_start = Column(BigInteger, nullable=True)
     date_end = Column(BigInteger, nullable=True)
     project = Column(UUID, ForeignKey("projects.project_id"), nullable=False)
@@ -71,6 +87,25 @@ class ShiftReports(Base):
     users = relationship("Users", back_populates="shift_report", foreign_keys=[user])
 
     comment = Column(Text, nullable=True)
+    # Версия последнего изменения, проставляется триггером (см. sync_tombstones)
+    change_version = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CHANGE_VERSION_SQL),
+        server_onupdate=FetchedValue(),
+    )
+
+    __table_args__ = (
+        # Частичный индекс для агрегатов по подписанным отчетам (ведомость)
+        Index(
+            "ix_shift_reports_signed_date",
+            "date",
+            postgresql_where=text("signed AND NOT deleted"),
+        ),
+        # Агрегаты календаря по дням и пользователям
+        Index("ix_shift_reports_day_user", "day", "user"),
+        Index("ix_shift_reports_change_version", "change_version"),
+    )
 
     def __repr__(self):
         return (
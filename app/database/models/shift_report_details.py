@@ -2,11 +2,20 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Numeric
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    Column,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Numeric,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
 from app.database.db_setup import Base
+from app.database.models.sync_tombstones import CHANGE_VERSION_SQL
 
 
 class ShiftReportDetails(Base):
@@ -33,6 +42,18 @@ class ShiftReportDetails(Base):
         nullable=False,
     )
     created_by = Column(UUID, ForeignKey("users.user_id"), nullable=False)
+    # Версия последнего изменения, проставляется триггером (см. sync_tombstones)
+    change_version = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CHANGE_VERSION_SQL),
+        server_onupdate=FetchedValue(),
+    )
+
+    __table_args__ = (
+        Index("ix_shift_report_details_shift_report", "shift_report"),
+        Index("ix_shift_report_details_change_version", "change_version"),
+    )
 
     shift_reports = relationship("ShiftReports", back_populates="shift_report_details")
     works = relationship("Works", back_populates="shift_report_details")
@@ -0,0 +1,264 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    UUID,
+    BigInteger,
+    Column,
+    Identity,
+    Index,
+    String,
+    event,
+)
+from sqlalchemy.sql import text
+
+from app.database.db_setup import Base
+
+# Таблицы, изменения которых отдаются мобильному клиенту через /sync,
+# и их первичные ключи
+SYNC_TABLES = {
+    "shift_reports": "shift_report_id",
+    "shift_report_details": "shift_report_detail_id",
+    "project_works": "project_work_id",
+}
+
+# Версия изменения — 64-битный id транзакции. Он растёт монотонно, а
+# pg_snapshot_xmin() даёт границу, ниже которой незакоммиченных
+# транзакций уже нет, поэтому токен синхронизации не пропускает изменения
+# из транзакций, закоммиченных позже соседних.
+CHANGE_VERSION_SQL = "pg_current_xact_id()::text::bigint"
+SYNC_TOKEN_SQL = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+# Ключ строки sync_meta с максимальной версией удалённых надгробий: токены
+# не новее неё требуют полной пересинхронизации
+SYNC_PURGE_HORIZON = "purge_horizon"
+
+
+# Область видимости строки для надгробия: автор и проект отчета. Деталь
+# берёт их у отчета; если отчет удаляется в том же операторе (каскад),
+# — из его надгробия, которое пишется до удаления (BEFORE DELETE).
+# При выходе строки из области (смена автора или проекта отчета, отчета
+# у детали, проекта у работы проекта, прораба у проекта) пишется
+# надгробие для прежней области, а строки получают новую версию, чтобы их
+# получила новая область.
+SYNC_SCOPE_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION sync_report_scope(
+        report uuid, OUT scope_user uuid, OUT scope_project uuid
+    ) AS $$
+    BEGIN
+        SELECT r."user", r.project INTO scope_user, scope_project
+        FROM shift_reports r WHERE r.shift_report_id = report;
+        IF NOT FOUND THEN
+            SELECT t.scope_user, t.scope_project INTO scope_user, scope_project
+            FROM sync_tombstones t
+            WHERE t.entity = 'shift_reports' AND t.entity_id = report
+            ORDER BY t.tombstone_id DESC LIMIT 1;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sync_write_tombstone() RETURNS trigger AS $$
+    DECLARE
+        scope record;
+    BEGIN
+        IF TG_TABLE_NAME = 'shift_reports' THEN
+            SELECT OLD."user" AS scope_user, OLD.project AS scope_project
+            INTO scope;
+        ELSIF TG_TABLE_NAME = 'shift_report_details' THEN
+            SELECT * INTO scope FROM sync_report_scope(OLD.shift_report);
+        ELSE
+            SELECT NULL::uuid AS scope_user, OLD.project AS scope_project
+            INTO scope;
+        END IF;
+        INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+        VALUES (
+            TG_TABLE_NAME,
+            (to_jsonb(OLD) ->> TG_ARGV[0])::uuid,
+            scope.scope_user,
+            scope.scope_project
+        );
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION sync_scope_changed() RETURNS trigger AS $$
+    DECLARE
+        scope record;
+    BEGIN
+        IF TG_TABLE_NAME = 'shift_reports' THEN
+            INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+            SELECT 'shift_report_details', d.shift_report_detail_id,
+                   OLD."user", OLD.project
+            FROM shift_report_details d WHERE d.shift_report = OLD.shift_report_id
+            UNION ALL
+            SELECT 'shift_reports', OLD.shift_report_id, OLD."user", OLD.project;
+            UPDATE shift_report_details SET change_version = change_version
+            WHERE shift_report = NEW.shift_report_id;
+        ELSIF TG_TABLE_NAME = 'shift_report_details' THEN
+            SELECT * INTO scope FROM sync_report_scope(OLD.shift_report);
+            INSERT INTO sync_tombstones (entity, entity_id, scope_user, scope_project)
+            VALUES (
+                'shift_report_details', OLD.shift_report_detail_id,
+                scope.scope_user, scope.scope_project
+            );
+        ELSIF TG_TABLE_NAME = 'project_works' THEN
+            INSERT INTO sync_tombstones (entity, entity_id, scope_project)
+            VALUES ('project_works', OLD.project_work_id, OLD.project);
+        ELSIF TG_TABLE_NAME = 'projects' THEN
+            -- Прежний прораб теряет весь проект; автор отчетов — нет
+            INSERT INTO sync_tombstones (entity, entity_id, scope_leader)
+            SELECT 'project_works', w.project_work_id, OLD.project_leader
+            FROM project_works w WHERE w.project = OLD.project_id
+            UNION ALL
+            SELECT 'shift_reports', r.shift_report_id, OLD.project_leader
+            FROM shift_reports r WHERE r.project = OLD.project_id
+            UNION ALL
+            SELECT 'shift_report_details', d.shift_report_detail_id,
+                   OLD.project_leader
+            FROM shift_report_details d
+            JOIN shift_reports r ON r.shift_report_id = d.shift_report
+            WHERE r.project = OLD.project_id;
+            UPDATE project_works SET change_version = change_version
+            WHERE project = NEW.project_id;
+            UPDATE shift_reports SET change_version = change_version
+            WHERE project = NEW.project_id;
+            UPDATE shift_report_details d SET change_version = d.change_version
+            FROM shift_reports r
+            WHERE r.shift_report_id = d.shift_report AND r.project = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Таблицы, где смена столбцов выводит строку из области видимости:
+# (столбцы, условие срабатывания триггера)
+SYNC_SCOPE_TRIGGERS = {
+    "shift_reports": (
+        '"user", project',
+        'OLD."user" IS DISTINCT FROM NEW."user" '
+        "OR OLD.project IS DISTINCT FROM NEW.project",
+    ),
+    "shift_report_details": (
+        "shift_report",
+        "OLD.shift_report IS DISTINCT FROM NEW.shift_report",
+    ),
+    "project_works": ("project", "OLD.project IS DISTINCT FROM NEW.project"),
+    "projects": (
+        "project_leader",
+        "OLD.project_leader IS DISTINCT FROM NEW.project_leader",
+    ),
+}
+
+
+class SyncTombstones(Base):
+    __tablename__ = "sync_tombstones"
+
+    tombstone_id = Column(BigInteger, Identity(), primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    # Область видимости строки на момент удаления или выхода из неё:
+    # автор отчета и проект; бывший прораб — для надгробий смены прораба
+    scope_user = Column(UUID(as_uuid=True), nullable=True)
+    scope_project = Column(UUID(as_uuid=True), nullable=True)
+    scope_leader = Column(UUID(as_uuid=True), nullable=True)
+    change_version = Column(
+        BigInteger, nullable=False, server_default=text(CHANGE_VERSION_SQL)
+    )
+    deleted_at = Column(
+        BigInteger,
+        default=lambda: int(datetime.utcnow().timestamp()),
+        server_default=text("EXTRACT(EPOCH FROM NOW())"),
+        nullable=False,
+    )
+
+    __table_args__ = (Index("ix_sync_tombstones_change_version", "change_version"),)
+
+    def __repr__(self):
+        return (
+            f"<SyncTombstones(entity={self.entity}, entity_id={self.entity_id}, "
+            f"change_version={self.change_version})>"
+        )
+
+    def to_dict(self):
+        return {
+            "entity": self.entity,
+            "entity_id": str(self.entity_id),
+            "scope_user": str(self.scope_user) if self.scope_user else None,
+            "scope_project": str(self.scope_project) if self.scope_project else None,
+            "scope_leader": str(self.scope_leader) if self.scope_leader else None,
+            "change_version": self.change_version,
+            "deleted_at": self.deleted_at,
+        }
+
+
+class SyncMeta(Base):
+    """Служебные значения синхронизации (см. SYNC_PURGE_HORIZON)."""
+
+    __tablename__ = "sync_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f"<SyncMeta(key={self.key}, value={self.value})>"
+
+    def to_dict(self):
+        return {"key": self.key, "value": self.value}
+
+
+def sync_trigger_ddl():
+    """SQL функций и триггеров версионирования для таблиц SYNC_TABLES.
+
+    Триггеры работают на уровне БД, поэтому учитывают и массовые
+    UPDATE/DELETE, и каскадное удаление по внешним ключам."""
+    statements = [
+        f"""
+        CREATE OR REPLACE FUNCTION sync_bump_change_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_version := {CHANGE_VERSION_SQL};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        *SYNC_SCOPE_FUNCTIONS,
+    ]
+    for table, primary_key in SYNC_TABLES.items():
+        statements += [
+            f"DROP TRIGGER IF EXISTS {table}_change_version ON {table}",
+            f"""
+            CREATE TRIGGER {table}_change_version
+            BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_bump_change_version()
+            """,
+            f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}",
+            f"""
+            CREATE TRIGGER {table}_tombstone
+            BEFORE DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_write_tombstone('{primary_key}')
+            """,
+        ]
+    for table, (columns, condition) in SYNC_SCOPE_TRIGGERS.items():
+        statements += [
+            f"DROP TRIGGER IF EXISTS {table}_sync_scope ON {table}",
+            f"""
+            CREATE TRIGGER {table}_sync_scope
+            AFTER UPDATE OF {columns} ON {table}
+            FOR EACH ROW WHEN ({condition})
+            EXECUTE FUNCTION sync_scope_changed()
+            """,
+        ]
+    return statements
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_sync_triggers(target, connection, **kw):
+    """Создаёт триггеры синхронизации вместе со схемой (create_all)."""
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in sync_trigger_ddl():
+        connection.execute(DDL(statement))
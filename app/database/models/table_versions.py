@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.database.db_setup import Base
+
+
+class TableVersions(Base):
+    """Счётчик изменений справочной таблицы, используется для ETag."""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersions(table_name={self.table_name}, version={self.version})>"
+
+    def to_dict(self):
+        return {"table_name": self.table_name, "version": self.version}
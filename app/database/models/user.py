@@ -14,9 +14,9 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from app.database.db_setup import Base
+from app.utils.passwords import password_hasher
 
 
 class Users(Base):
@@ -140,10 +140,10 @@ class Users(Base):
         )
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(str(password))
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)  # type: ignore
+        return password_hasher.verify(self.password_hash, password)
 
     def to_dict(self):
         return {
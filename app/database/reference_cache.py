@@ -0,0 +1,427 @@
+import logging
+import os
+import select
+import threading
+import time
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from decimal import Decimal
+from uuid import UUID
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+
+logger = logging.getLogger("ok_service")
+
+# Канал NOTIFY, по которому менеджеры сообщают об изменении справочника
+NOTIFY_CHANNEL = "reference_cache"
+# Как часто поток LISTEN проверяет запрос на остановку, секунды
+LISTEN_POLL_INTERVAL = 1.0
+
+CACHE_LOOKUPS = Counter(
+    "reference_cache_lookups_total",
+    "Обращения к кэшу справочников",
+    ["section", "result"],
+)
+CACHE_RELOADS = Counter(
+    "reference_cache_reloads_total",
+    "Перезагрузки секций кэша справочников",
+    ["section", "reason"],
+)
+
+
+@dataclass(frozen=True)
+class WorkRef:
+    work_id: UUID
+    name: str
+    category: UUID | None
+    measurement_unit: str | None
+    deleted: bool
+
+
+@dataclass(frozen=True)
+class MaterialRef:
+    material_id: UUID
+    name: str
+    measurement_unit: str | None
+    deleted: bool
+
+
+@dataclass(frozen=True)
+class WorkMaterialRef:
+    material_id: UUID
+    quantity: Decimal
+    measurement_unit: str | None
+
+
+@dataclass
+class _Snapshot:
+    data: dict
+    versions: dict
+    checked_at: float
+
+
+def _as_uuid(value):
+    # Ключи секций — UUID, а менеджеры иногда передают id строкой
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _read_versions(session, tables):
+    from app.database.models import TableVersions
+
+    rows = session.query(TableVersions.table_name, TableVersions.version).filter(
+        TableVersions.table_name.in_(tables)
+    )
+    versions = dict(rows.all())
+    return {name: versions.get(name, 0) for name in tables}
+
+
+def _load_works(session):
+    from app.database.models import Works
+
+    return {
+        row.work_id: WorkRef(
+            work_id=row.work_id,
+            name=row.name,
+            category=row.category,
+            measurement_unit=row.measurement_unit,
+            deleted=row.deleted,
+        )
+        for row in session.query(
+            Works.work_id,
+            Works.name,
+            Works.category,
+            Works.measurement_unit,
+            Works.deleted,
+        )
+    }
+
+
+def _load_work_prices(session):
+    from app.database.models import WorkPrices
+
+    prices = {}
+    rows = session.query(
+        WorkPrices.work, WorkPrices.category, WorkPrices.price
+    ).order_by(WorkPrices.created_at)
+    for work, category, price in rows:
+        prices.setdefault((work, category), price)
+    return prices
+
+
+def _load_materials(session):
+    from app.database.models import Materials
+
+    return {
+        row.material_id: MaterialRef(
+            material_id=row.material_id,
+            name=row.name,
+            measurement_unit=row.measurement_unit,
+            deleted=row.deleted,
+        )
+        for row in session.query(
+            Materials.material_id,
+            Materials.name,
+            Materials.measurement_unit,
+            Materials.deleted,
+        )
+    }
+
+
+def _load_work_materials(session):
+    from app.database.models import Materials, WorkMaterialRelations
+
+    relations = {}
+    rows = session.query(
+        WorkMaterialRelations.work,
+        WorkMaterialRelations.material,
+        WorkMaterialRelations.quantity,
+        Materials.measurement_unit,
+    ).outerjoin(Materials, Materials.material_id == WorkMaterialRelations.material)
+    for work, material, quantity, measurement_unit in rows:
+        relations.setdefault(work, []).append(
+            WorkMaterialRef(
+                material_id=material,
+                quantity=quantity,
+                measurement_unit=measurement_unit,
+            )
+        )
+    return {work: tuple(items) for work, items in relations.items()}
+
+
+def _load_names(model, key_column):
+    def loader(session):
+        return {key: name for key, name in session.query(key_column, model.name)}
+
+    return loader
+
+
+def _sections():
+    from app.database.models import Cities, ObjectStatuses, Roles
+
+    # секция -> (таблицы, от которых она зависит, загрузчик)
+    return {
+        "works": (("works",), _load_works),
+        "work_prices": (("work_prices",), _load_work_prices),
+        "materials": (("materials",), _load_materials),
+        "work_materials": (
+            ("work_material_relations", "materials"),
+            _load_work_materials,
+        ),
+        "roles": (("roles",), _load_names(Roles, Roles.role_id)),
+        "object_statuses": (
+            ("object_statuses",),
+            _load_names(ObjectStatuses, ObjectStatuses.object_status_id),
+        ),
+        "cities": (("cities",), _load_names(Cities, Cities.city_id)),
+    }
+
+
+class ReferenceCache:
+    """Кэш справочников в памяти процесса (gunicorn-воркера).
+
+    Секции загружаются целиком и отдаются как неизменяемые структуры.
+    Инвалидация — по NOTIFY от менеджеров при записи (см.
+    BaseDBManager._bump_version); страховка на случай потери соединения —
+    периодическая сверка версий из table_versions."""
+
+    def __init__(self):
+        self.enabled = True
+        self.listen = True
+        self.check_interval = 30.0
+        self._sections = None
+        self._snapshots = {}
+        self._lock = threading.RLock()
+        self._listener_pid = None
+        self._listener_connected = False
+        self._listener_thread = None
+        self._listener_stop = threading.Event()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("REFERENCE_CACHE_ENABLED", True)
+        self.listen = app.config.get("REFERENCE_CACHE_LISTEN", True)
+        self.check_interval = app.config.get("REFERENCE_CACHE_CHECK_INTERVAL", 30.0)
+        self.clear()
+
+    @property
+    def sections(self):
+        if self._sections is None:
+            self._sections = _sections()
+        return self._sections
+
+    def warm(self):
+        """Загружает все секции (вызывается при старте приложения)."""
+        if not self.enabled:
+            return
+        for section in self.sections:
+            self._reload(section, reason="warm")
+        logger.info(
+            f"Кэш справочников прогрет: {len(self._snapshots)} секций",
+            extra={"login": "init"},
+        )
+
+    def clear(self):
+        with self._lock:
+            self._snapshots = {}
+
+    def mark_stale(self):
+        """Сверяет версии всех секций при следующем обращении, не сбрасывая их."""
+        with self._lock:
+            for snapshot in self._snapshots.values():
+                snapshot.checked_at = float("-inf")
+
+    def invalidate_table(self, table_name):
+        """Сбрасывает секции, зависящие от таблицы."""
+        with self._lock:
+            for section, (tables, _) in self.sections.items():
+                if table_name in tables:
+                    self._snapshots.pop(section, None)
+
+    def get(self, section, session=None):
+        """Возвращает данные секции, при необходимости перезагружая её.
+
+        При выключенном кэше секция читается заново — в `session`
+        вызывающего кода, если она передана."""
+        if not self.enabled:
+            _, loader = self.sections[section]
+            if session is not None:
+                return loader(session)
+            with self._session() as own_session:
+                return loader(own_session)
+
+        self._ensure_listener()
+        snapshot = self._snapshots.get(section)
+        if snapshot is None:
+            CACHE_LOOKUPS.labels(section=section, result="miss").inc()
+            return self._reload(section, reason="miss").data
+
+        if time.monotonic() - snapshot.checked_at >= self._current_check_interval():
+            tables, _ = self.sections[section]
+            with self._session() as own_session:
+                versions = _read_versions(own_session, tables)
+            if versions != snapshot.versions:
+                CACHE_LOOKUPS.labels(section=section, result="miss").inc()
+                return self._reload(section, reason="version").data
+            snapshot.checked_at = time.monotonic()
+
+        CACHE_LOOKUPS.labels(section=section, result="hit").inc()
+        return snapshot.data
+
+    def work_price(self, work_id, category, session=None):
+        prices = self.get("work_prices", session)
+        return prices.get((_as_uuid(work_id), category))
+
+    def work_materials(self, work_id, session=None):
+        return self.get("work_materials", session).get(_as_uuid(work_id), ())
+
+    def work(self, work_id, session=None):
+        return self.get("works", session).get(_as_uuid(work_id))
+
+    def stats(self):
+        """Попадания/промахи по секциям и доля попаданий."""
+        result = {}
+        for metric in CACHE_LOOKUPS.collect():
+            for sample in metric.samples:
+                if not sample.name.endswith("_total"):
+                    continue
+                item = result.setdefault(
+                    sample.labels["section"], {"hit": 0, "miss": 0}
+                )
+                item[sample.labels["result"]] = int(sample.value)
+        for item in result.values():
+            total = item["hit"] + item["miss"]
+            item["hit_rate"] = item["hit"] / total if total else None
+        return result
+
+    def _current_check_interval(self):
+        # Без живого LISTEN сверяем версии при каждом обращении
+        if self.listen and not self._listener_connected:
+            return 0.0
+        return self.check_interval
+
+    def _reload(self, section, reason):
+        tables, loader = self.sections[section]
+        # Версии читаются до данных: запись между ними даст более старую
+        # версию, и при следующей сверке секция перезагрузится ещё раз
+        with self._session() as session:
+            versions = _read_versions(session, tables)
+            data = loader(session)
+        snapshot = _Snapshot(data=data, versions=versions, checked_at=time.monotonic())
+        with self._lock:
+            self._snapshots[section] = snapshot
+        CACHE_RELOADS.labels(section=section, reason=reason).inc()
+        logger.debug(
+            f"Секция кэша {section} перезагружена ({reason}): {len(data)} записей",
+            extra={"login": "database"},
+        )
+        return snapshot
+
+    @staticmethod
+    @contextmanager
+    def _session():
+        """Отдельная сессия кэша, не связанная с сессией запроса."""
+        from app.database.db_globals import engine
+
+        session = OrmSession(bind=engine)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def _ensure_listener(self):
+        """Запускает поток LISTEN один раз в каждом процессе (после fork)."""
+        if not self.listen or self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            # Данные, унаследованные от мастера, сверяем с БД при первом обращении
+            self.mark_stale()
+            self._listener_pid = os.getpid()
+            self._listener_connected = False
+            self._listener_stop = threading.Event()
+            self._listener_thread = threading.Thread(
+                target=self._listen_loop,
+                args=(self._listener_stop,),
+                name="reference-cache-listener",
+                daemon=True,
+            )
+            self._listener_thread.start()
+
+    def stop_listener(self, timeout=5):
+        """Останавливает поток LISTEN и закрывает его соединение."""
+        with self._lock:
+            thread, self._listener_thread = self._listener_thread, None
+            self._listener_stop.set()
+            self._listener_pid = None
+        if thread is not None:
+            thread.join(timeout)
+        self._listener_connected = False
+
+    def _listen_loop(self, stop):
+        from app.database.db_globals import engine
+
+        while not stop.is_set():
+            connection = None
+            try:
+                raw = engine.raw_connection()  # type: ignore
+                connection = raw.dbapi_connection
+                raw.detach()  # соединение не возвращается в пул
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Пока слушателя не было, уведомления могли потеряться:
+                # прогретые при старте секции сверяются с table_versions
+                self.mark_stale()
+                self._listener_connected = True
+                logger.info(
+                    "Кэш справочников: подписка на NOTIFY активна",
+                    extra={"login": "database"},
+                )
+                while not stop.is_set():
+                    ready = select.select([connection], [], [], LISTEN_POLL_INTERVAL)
+                    if ready == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self.invalidate_table(notify.payload)
+            except Exception as e:
+                self._listener_connected = False
+                logger.warning(
+                    f"Кэш справочников: LISTEN прерван, переподключение: {e}",
+                    extra={"login": "database"},
+                )
+                if connection is not None:
+                    with suppress(Exception):
+                        connection.close()
+                stop.wait(5)
+                continue
+            with suppress(Exception):
+                connection.close()
+
+
+reference_cache = ReferenceCache()
+
+# Таблицы, изменённые в транзакции сессии, — для сброса кэша после коммита
+_PENDING_TABLES = "reference_cache_tables"
+
+
+def invalidate_after_commit(session, table_name):
+    """Сбрасывает секции таблицы в этом процессе после коммита `session`.
+
+    Собственный NOTIFY доходит до процесса с задержкой: без этого запрос
+    сразу после записи мог бы прочитать из кэша старые данные."""
+    session.info.setdefault(_PENDING_TABLES, set()).add(table_name)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed(session):
+    for table_name in session.info.pop(_PENDING_TABLES, ()):
+        reference_cache.invalidate_table(table_name)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_PENDING_TABLES, None)
@@ -0,0 +1,46 @@
+import threading
+import time
+
+
+class ScopeCache:
+    """Короткоживущий кэш областей видимости пользователей (в памяти воркера).
+
+    Хранит только множества «своих» проектов прораба. Отсутствие id в
+    множестве перепроверяется запросом к БД, поэтому новый проект доступен
+    сразу, а отзыв доступа вступает в силу не позже чем через TTL."""
+
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get("AUTH_SCOPE_CACHE_TTL", self.ttl)
+        self.clear()
+
+    def get(self, user_id):
+        if self.ttl <= 0:
+            return None
+        item = self._items.get(user_id)
+        if item is None or time.monotonic() - item[0] >= self.ttl:
+            return None
+        return item[1]
+
+    def set(self, user_id, project_ids):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._items[user_id] = (time.monotonic(), project_ids)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._items = {}
+            else:
+                self._items.pop(user_id, None)
+
+    def clear(self):
+        self.invalidate()
+
+
+scope_cache = ScopeCache()
@@ -0,0 +1,170 @@
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import Counter
+
+logger = logging.getLogger("ok_service")
+
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL-запросы дольше SLOW_QUERY_THRESHOLD_MS",
+    ["endpoint"],
+)
+
+# Блокирующие SELECT: EXPLAIN ANALYZE взял бы те же блокировки строк
+LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|SHARE|KEY\s+SHARE)\b", re.I
+)
+
+# Сколько параметров показывать в форме запроса (раскрытые IN бывают длинными)
+MAX_PARAMS_SHAPE = 50
+
+
+def parameters_shape(parameters):
+    """Форма параметров без значений: имя (или позиция) -> тип."""
+
+    def shape(value):
+        if isinstance(value, (list, tuple, set)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        items = list(parameters.items())
+    elif isinstance(parameters, (list, tuple)):
+        items = list(enumerate(parameters))
+    else:
+        return {}
+    result = {str(key): shape(value) for key, value in items[:MAX_PARAMS_SHAPE]}
+    if len(items) > MAX_PARAMS_SHAPE:
+        result["..."] = f"+{len(items) - MAX_PARAMS_SHAPE}"
+    return result
+
+
+def explainable(statement):
+    """EXPLAIN ANALYZE выполняет запрос — допускаются только чистые SELECT."""
+    text = statement.lstrip()
+    return text[:6].upper() == "SELECT" and not LOCKING_CLAUSE.search(text)
+
+
+class SlowQueryLog:
+    """Кольцевой буфер медленных SQL-запросов с выборочным EXPLAIN.
+
+    Запрос дольше порога попадает в буфер вместе с формой параметров
+    (без значений), эндпоинтом и ролью пользователя. Для доли
+    EXPLAIN_SAMPLE_RATE из них в фоновом потоке выполняется
+    EXPLAIN (ANALYZE, BUFFERS) на отдельном соединении в откатываемой
+    транзакции с statement_timeout; одновременно — не больше одного.
+    Буфер отдаёт GET /diagnostics/slow_queries."""
+
+    def __init__(self):
+        self.threshold = 0.5
+        self.sample_rate = 0.1
+        self.explain_timeout_ms = 10000
+        self._entries = deque(maxlen=100)
+        self._ids = itertools.count(1)
+        self._explaining = False
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.threshold = app.config.get("SLOW_QUERY_THRESHOLD_MS", 500) / 1000
+        self.sample_rate = app.config.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0.1)
+        self.explain_timeout_ms = app.config.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000)
+        self.clear(size=app.config.get("SLOW_QUERY_LOG_SIZE", 100))
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    @property
+    def executor(self):
+        # Пул потоков не переживает fork — создаём свой в каждом воркере
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="slow-query-explain"
+                    )
+                    self._pid = os.getpid()
+                    self._explaining = False
+        return self._executor
+
+    def clear(self, size=None):
+        with self._lock:
+            self._entries = deque(maxlen=size or self._entries.maxlen)
+
+    def entries(self):
+        """Снимок буфера, новые записи первыми."""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def observe(self, conn, statement, parameters, duration, endpoint, role, many):
+        if duration < self.threshold or statement.startswith("EXPLAIN"):
+            return None
+        SLOW_QUERIES.labels(endpoint).inc()
+        entry = {
+            "id": next(self._ids),
+            "captured_at": int(time.time()),
+            "endpoint": endpoint,
+            "role": role,
+            "duration_ms": round(duration * 1000, 1),
+            "statement": statement,
+            "parameters": parameters_shape(parameters),
+            "plan": None,
+            "explain": "skipped",
+        }
+        sample = (
+            not many
+            and not conn.dialect.is_async
+            and explainable(statement)
+            and random.random() < self.sample_rate
+        )
+        with self._lock:
+            if sample and not self._explaining:
+                self._explaining = True
+                entry["explain"] = "pending"
+            self._entries.append(entry)
+        logger.warning(
+            f"Медленный запрос {entry['duration_ms']} мс в {endpoint}: "
+            f"{statement[:300]}",
+            extra={"login": "database"},
+        )
+        if entry["explain"] == "pending":
+            self.executor.submit(
+                self._explain, conn.engine, entry, statement, parameters
+            )
+        return entry
+
+    def _explain(self, engine, entry, statement, parameters):
+        try:
+            with engine.connect() as conn:
+                conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"
+                )
+                plan = conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement,
+                    parameters or {},
+                ).scalar()
+                conn.rollback()
+            with self._lock:
+                entry["plan"] = plan
+                entry["explain"] = "done"
+        except Exception as e:
+            with self._lock:
+                entry["explain"] = f"error: {e}"[:500]
+            logger.error(
+                f"Ошибка EXPLAIN медленного запроса: {e}", extra={"login": "database"}
+            )
+        finally:
+            self._explaining = False
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,198 @@
+import logging
+import os
+import re
+import time
+import traceback
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+
+from flask import g, has_request_context
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+
+from app.database.slow_queries import slow_query_log
+
+logger = logging.getLogger("ok_service")
+
+SQL_QUERIES = Histogram(
+    "db_request_queries",
+    "Число SQL-запросов за HTTP-запрос",
+    ["endpoint"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200, 500),
+)
+SQL_DURATION = Histogram(
+    "db_request_duration_seconds",
+    "Время в БД за HTTP-запрос",
+    ["endpoint"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+SQL_ROWS = Histogram(
+    "db_request_rows",
+    "Строк возвращено БД за HTTP-запрос",
+    ["endpoint"],
+    buckets=(0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+SQL_N_PLUS_ONE = Counter(
+    "db_n_plus_one_total",
+    "Запросы, в которых одинаковый SQL повторялся больше порога",
+    ["endpoint"],
+)
+
+# Параметры (%(name_1)s, $1, ?), раскрытые списки IN и литералы
+_IN_LIST = re.compile(r"\bIN\s*\(\s*[^()]*\)", re.IGNORECASE)
+_PARAMS = re.compile(r"%\([^)]*\)s|\$\d+|\?|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize_statement(statement):
+    """SQL без значений: одинаковые запросы с разными параметрами совпадают."""
+    statement = _PARAMS.sub("?", statement)
+    statement = _IN_LIST.sub("IN (?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+def _caller():
+    """Ближайший кадр кода приложения, из которого выполнен запрос."""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        if frame.filename.startswith(APP_DIR) and frame.filename != __file__:
+            path = os.path.relpath(frame.filename, os.path.dirname(APP_DIR))
+            return f"{path}:{frame.lineno} {frame.name}"
+    return "unknown"
+
+
+class RequestSqlStats:
+    """SQL-статистика одного HTTP-запроса."""
+
+    __slots__ = (
+        "endpoint",
+        "role",
+        "queries",
+        "duration",
+        "rows",
+        "statements",
+        "callers",
+    )
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.role = None
+        self.queries = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.statements = StatementCounter()
+        self.callers = {}
+
+
+_current = ContextVar("request_sql_stats", default=None)
+
+
+def _request_role(stats):
+    """Роль пользователя текущего запроса (для журнала медленных запросов)."""
+    if stats is None:
+        return "system"
+    if stats.role is None and has_request_context():
+        identity = g.get("identity")
+        return identity.role if identity else "anonymous"
+    return stats.role or "anonymous"
+
+
+class SqlInstrumentation:
+    """Счётчики SQL по эндпоинтам и детектор N+1.
+
+    Хуки before/after_cursor_execute движка копят число запросов, время в
+    БД и число строк в статистике текущего запроса (ContextVar), а по его
+    окончании она уходит в гистограммы Prometheus с меткой эндпоинта.
+    Если нормализованный запрос повторился больше N_PLUS_ONE_THRESHOLD
+    раз, в лог пишется предупреждение с местом вызова. Запросы фоновых
+    потоков (вне HTTP-запроса) в статистику не попадают, но, как и все
+    остальные, проверяются журналом медленных запросов (slow_queries)."""
+
+    def __init__(self):
+        self.enabled = True
+        self.n_plus_one_threshold = 10
+
+    def init_app(self, app):
+        self.enabled = app.config.get("SQL_METRICS_ENABLED", True)
+        self.n_plus_one_threshold = app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 10)
+
+    def instrument(self, engine):
+        if event.contains(engine, "before_cursor_execute", self._before_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def start(self, endpoint):
+        """Начинает сбор статистики запроса к эндпоинту."""
+        if self.enabled:
+            _current.set(RequestSqlStats(endpoint))
+
+    @staticmethod
+    def current():
+        return _current.get()
+
+    @staticmethod
+    def activate(stats):
+        """Переносит статистику в другой контекст (greenlet run_sync)."""
+        _current.set(stats)
+
+    def finish(self):
+        """Выгружает статистику запроса в метрики; возвращает её."""
+        stats = _current.get()
+        _current.set(None)
+        if stats is None:
+            return None
+        endpoint = stats.endpoint
+        SQL_QUERIES.labels(endpoint).observe(stats.queries)
+        SQL_DURATION.labels(endpoint).observe(stats.duration)
+        SQL_ROWS.labels(endpoint).observe(stats.rows)
+        repeated = [
+            (statement, count)
+            for statement, count in stats.statements.items()
+            if count > self.n_plus_one_threshold
+        ]
+        if repeated:
+            SQL_N_PLUS_ONE.labels(endpoint).inc()
+        for statement, count in repeated:
+            logger.warning(
+                f"N+1 в {endpoint}: запрос выполнен {count} раз из "
+                f"{stats.callers.get(statement, 'unknown')}: {statement[:300]}",
+                extra={"login": "database"},
+            )
+        return stats
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, many):
+        if slow_query_log.enabled or _current.get() is not None:
+            context._sql_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, many):
+        started = getattr(context, "_sql_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        stats = _current.get()
+        if slow_query_log.enabled:
+            slow_query_log.observe(
+                conn,
+                statement,
+                parameters,
+                duration,
+                endpoint=stats.endpoint if stats else "background",
+                role=_request_role(stats),
+                many=many,
+            )
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.duration += duration
+        if cursor.description is not None:
+            stats.rows += max(cursor.rowcount, 0)
+        normalized = normalize_statement(statement)
+        stats.statements[normalized] += 1
+        # Место вызова ищем один раз — когда запрос впервые превысил порог
+        if stats.statements[normalized] == self.n_plus_one_threshold + 1:
+            stats.callers[normalized] = _caller()
+
+
+sql_instrumentation = SqlInstrumentation()
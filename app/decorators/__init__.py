@@ -1,2 +1,4 @@
 from .api_key_required import api_key_required
 from .role_decorators import user_forbidden, admin_required
+from .etag import etag_conditional
+from .auth import auth_required, current_identity, Identity
@@ -0,0 +1,73 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from functools import wraps
+
+from flask import g
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+logger = logging.getLogger("ok_service")
+
+
+@dataclass(frozen=True)
+class Identity:
+    """Пользователь из access-токена.
+
+    Поддерживает обращение как к словарю (`current_user["role"]`,
+    `current_user.get("login")`), чтобы обработчики и логгер работали
+    с ним так же, как с разобранным JSON-identity."""
+
+    user_id: str
+    role: str
+    login: str
+
+    @classmethod
+    def from_jwt(cls, identity):
+        data = json.loads(identity)
+        return cls(user_id=data["user_id"], role=data["role"], login=data["login"])
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def authenticate_request():
+    """before_request: однократная проверка JWT и разбор identity.
+
+    Результат (или ошибка проверки) сохраняется в `g`, дальше его читают
+    `auth_required`, декораторы ролей и обработчики."""
+    g.identity = None
+    g.auth_error = None
+    try:
+        if verify_jwt_in_request(optional=True):
+            g.identity = Identity.from_jwt(get_jwt_identity())
+    except Exception as e:
+        # Ошибку отдаст auth_required защищённого маршрута
+        g.auth_error = e
+    g.user_info = g.identity.to_dict() if g.identity else "anonymous"
+
+
+def current_identity():
+    """Identity текущего запроса (None для анонимного)."""
+    return g.get("identity")
+
+
+def auth_required(func):
+    """Требует валидный access-токен, проверенный в authenticate_request."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if g.get("identity") is None:
+            if g.get("auth_error") is not None:
+                raise g.auth_error
+            # Токена нет или middleware не отработал — штатная проверка
+            if verify_jwt_in_request():
+                g.identity = Identity.from_jwt(get_jwt_identity())
+        return func(*args, **kwargs)
+
+    return wrapper
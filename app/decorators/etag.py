@@ -0,0 +1,63 @@
+import hashlib
+from functools import wraps
+
+from flask import Response, request
+from flask_restx.utils import unpack
+
+# Таблицы, по версиям которых строится ETag списка справочника. Общие для
+# Flask (etag_conditional) и ASGI (REFERENCE_LISTS), чтобы ETag совпадали.
+# Дочерние списки зависят и от родительской таблицы: удаление работы или
+# материала каскадно удаляет расценки и связи, не меняя их версии
+ETAG_TABLES = {
+    "works": ("works", "work_categories", "work_prices"),
+    "materials": ("materials",),
+    "work_prices": ("work_prices", "works"),
+    "work_material_relations": ("work_material_relations", "materials"),
+    "cities": ("cities",),
+    "roles": ("roles",),
+    "object_statuses": ("object_statuses",),
+}
+
+
+def build_etag(versions, args):
+    """Строгий ETag из версий таблиц и параметров запроса."""
+    payload = "|".join(f"{name}:{version}" for name, version in versions.items())
+    payload += "?" + "&".join(f"{key}={value}" for key, value in sorted(args))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def etag_conditional(key):
+    """Условный GET для справочников.
+
+    ETag строится по версиям таблиц ETAG_TABLES[key] (их увеличивают
+    менеджеры при записи). При совпадении If-None-Match сразу отдаётся
+    304 — без запроса списка и marshal_with, поэтому декоратор ставится
+    над marshal_with."""
+    table_names = ETAG_TABLES[key]
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            from app.database.managers.table_versions_manager import (
+                TableVersionsManager,
+            )
+
+            versions = TableVersionsManager().get_versions(table_names)
+            etag = build_etag(versions, request.args.items(multi=True))
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = "no-cache"
+                return response
+
+            data, code, headers = unpack(func(*args, **kwargs))
+            if code == 200:
+                headers = dict(headers or {})
+                headers["ETag"] = f'"{etag}"'
+                headers["Cache-Control"] = "no-cache"
+            return data, code, headers
+
+        return wrapper
+
+    return decorator
@@ -1,7 +1,6 @@
 import logging
-import json
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity
+from app.decorators.auth import current_identity
 
 
 logger = logging.getLogger("ok_service")
@@ -11,7 +10,7 @@ def admin_required(func):
     """Декоратор для проверки, что текущий пользователь — администратор."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user.get("role") != "admin":
             logger.warning("Несанкционированный доступ: требуется администратор.",
                            extra={"login": current_user})
@@ -24,7 +23,7 @@ def user_forbidden(func):
     """Декоратор для проверки, что текущий пользователь — администратор."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user.get("role") == "user":
             logger.warning("Несанкционированный доступ: недостаточно прав.",
                            extra={"login": current_user})
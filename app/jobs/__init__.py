@@ -0,0 +1,3 @@
+from app.jobs.registry import get_task, task
+
+__all__ = ["get_task", "task"]
@@ -0,0 +1,30 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+# Обработчики заданий очереди по виду (kind)
+_TASKS = {}
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    # Вызывается с payload и текстом ошибки, когда попытки исчерпаны
+    on_failure: Callable | None = None
+
+
+def task(name, on_failure=None):
+    """Регистрирует функцию `func(payload)` как обработчик заданий `name`."""
+
+    def decorator(func):
+        _TASKS[name] = Task(name=name, func=func, on_failure=on_failure)
+        return func
+
+    return decorator
+
+
+def get_task(name):
+    # Обработчики регистрируются при импорте модуля задач
+    import app.jobs.tasks  # noqa: F401
+
+    return _TASKS.get(name)
@@ -0,0 +1,32 @@
+from uuid import UUID
+
+from app.jobs.registry import task
+
+DOCUMENT_GENERATE = "documents.generate"
+
+
+def _document_failed(payload, error):
+    from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+    DocumentJobsManager().mark_failed(UUID(payload["job_id"]), error)
+
+
+@task(DOCUMENT_GENERATE, on_failure=_document_failed)
+def generate_document(payload):
+    from app.utils.document_jobs import document_job_runner
+
+    document_job_runner.generate(UUID(payload["job_id"]))
+
+
+SHIFT_REPORT_DETAILS_REPRICE = "shift_report_details.reprice"
+
+
+@task(SHIFT_REPORT_DETAILS_REPRICE)
+def reprice_shift_report_details(payload):
+    from app.database.managers.shift_reports_managers import (
+        ShiftReportsDetailsManager,
+    )
+
+    ShiftReportsDetailsManager().reprice_unsigned(
+        [UUID(work_id) for work_id in payload["works"]]
+    )
@@ -0,0 +1,187 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from app.jobs.registry import get_task
+
+logger = logging.getLogger("ok_service")
+
+
+class Worker:
+    """Процесс-обработчик очереди фоновых заданий (см. worker.py).
+
+    Каждый поток независимо забирает задания через SKIP LOCKED, так что
+    воркеров можно запускать сколько угодно на любых машинах. Пока задание
+    выполняется, окно видимости продлевается; если процесс умер, задание
+    заберёт другой воркер после JOB_QUEUE_VISIBILITY_TIMEOUT."""
+
+    def __init__(self, config, worker_id=None, kinds=None):
+        self.concurrency = config.get("JOB_WORKER_CONCURRENCY", 2)
+        self.poll_interval = config.get("JOB_QUEUE_POLL_INTERVAL", 1.0)
+        self.visibility_timeout = config.get("JOB_QUEUE_VISIBILITY_TIMEOUT", 300)
+        self.backoff_base = config.get("JOB_QUEUE_BACKOFF_BASE", 10)
+        self.backoff_max = config.get("JOB_QUEUE_BACKOFF_MAX", 600)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = kinds
+        self._stop = threading.Event()
+
+    def run(self):
+        """Основной цикл; завершается по SIGTERM/SIGINT после текущих заданий."""
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        logger.info(
+            f"Воркер очереди {self.worker_id} запущен, потоков: {self.concurrency}",
+            extra={"login": "system"},
+        )
+        threads = [
+            threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        while not self._stop.wait(self.visibility_timeout / 2):
+            self._fail_expired()
+        for thread in threads:
+            thread.join()
+        logger.info(
+            f"Воркер очереди {self.worker_id} остановлен", extra={"login": "system"}
+        )
+
+    def stop(self):
+        self._stop.set()
+
+    def _handle_signal(self, signum, frame):
+        logger.info(
+            f"Воркер очереди получил сигнал {signum}, завершение",
+            extra={"login": "system"},
+        )
+        self.stop()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self.run_once()
+            except Exception as e:
+                # БД недоступна и т.п. — не роняем поток, пробуем позже
+                logger.error(f"Ошибка воркера очереди: {e}", extra={"login": "system"})
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self):
+        """Забирает и выполняет одно задание; None — очередь пуста."""
+        from app.database.managers.job_queue_manager import JobQueueManager
+
+        db = JobQueueManager()
+        job = db.claim(self.worker_id, self.visibility_timeout, self.kinds)
+        if job is None:
+            return None
+
+        job_id, kind = job["job_id"], job["kind"]
+        task = get_task(kind)
+        if task is None:
+            logger.error(
+                f"Нет обработчика для задания {kind} {job_id}",
+                extra={"login": "system"},
+            )
+            db.fail(job_id, self.worker_id, f"Unknown job kind: {kind}", 1, 1, 0, 0)
+            return job
+
+        started = time.monotonic()
+        done = threading.Event()
+        lost = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job_id, done, lost), daemon=True
+        )
+        heartbeat.start()
+        error = None
+        try:
+            task.func(job["payload"])
+        except Exception as e:
+            error = e
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if lost.is_set():
+            # Задание уже забрал другой воркер — результат этого запуска
+            # не записываем, чтобы не перезаписать чужой
+            logger.warning(
+                f"Задание {kind} {job_id} брошено: аренда потеряна",
+                extra={"login": "system"},
+            )
+            return job
+        if error is None:
+            if db.complete(job_id, self.worker_id):
+                logger.info(
+                    f"Задание {kind} {job_id} выполнено за "
+                    f"{time.monotonic() - started:.2f} с",
+                    extra={"login": "system"},
+                )
+            return job
+
+        retry = db.fail(
+            job_id,
+            self.worker_id,
+            error,
+            job["attempts"],
+            job["max_attempts"],
+            self.backoff_base,
+            self.backoff_max,
+        )
+        if retry is None:
+            return job
+        logger.error(
+            f"Задание {kind} {job_id} (попытка {job['attempts']}) "
+            f"завершилось ошибкой: {error}" + ("" if retry else "; попытки исчерпаны"),
+            extra={"login": "system"},
+        )
+        if not retry and task.on_failure:
+            task.on_failure(job["payload"], error)
+        return job
+
+    def _heartbeat(self, job_id, done, lost):
+        """Продлевает аренду задания; если продлить не удалось, потому что
+        задание уже забрал другой воркер, выставляет lost."""
+        from app.database.managers.job_queue_manager import JobQueueManager
+
+        while not done.wait(self.visibility_timeout / 3):
+            try:
+                extended = JobQueueManager().extend(
+                    job_id, self.worker_id, self.visibility_timeout
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Не удалось продлить задание {job_id}: {e}",
+                    extra={"login": "system"},
+                )
+                continue
+            if not extended:
+                logger.warning(
+                    f"Аренда задания {job_id} потеряна воркером {self.worker_id}",
+                    extra={"login": "system"},
+                )
+                lost.set()
+                return
+
+    def _fail_expired(self):
+        from app.database.managers.job_queue_manager import JobQueueManager
+
+        try:
+            expired = JobQueueManager().fail_expired()
+        except Exception as e:
+            logger.error(
+                f"Ошибка проверки зависших заданий: {e}", extra={"login": "system"}
+            )
+            return
+        for job in expired:
+            logger.error(
+                f"Задание {job['kind']} {job['job_id']} потеряно воркером",
+                extra={"login": "system"},
+            )
+            task = get_task(job["kind"])
+            if task and task.on_failure:
+                task.on_failure(job["payload"], "Visibility timeout expired")
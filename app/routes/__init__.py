@@ -3,11 +3,13 @@ from flask_restx import Api
 
 from .account_route import account_bp
 from .namespaces.city_ns import city_ns
+from .namespaces.diagnostics_ns import diagnostics_ns
 from .namespaces.leave_ns import leave_ns
 from .namespaces.login_ns import login_ns
 from .namespaces.material_ns import material_ns
 from .namespaces.object_ns import object_ns
 from .namespaces.object_status_ns import object_status_ns
+from .namespaces.payroll_ns import payroll_ns
 from .namespaces.project_material_ns import project_material_ns
 from .namespaces.project_ns import project_ns
 from .namespaces.project_schedule_ns import project_schedule_ns
@@ -17,6 +19,7 @@ from .namespaces.shift_report_detail_ns import shift_report_details_ns
 from .namespaces.shift_report_material_ns import shift_report_material_ns
 from .namespaces.shift_report_ns import shift_report_ns
 from .namespaces.subscrtiption_ns import subscription_ns
+from .namespaces.sync_ns import sync_ns
 from .namespaces.template_ns import template_ns
 from .namespaces.user_ns import user_ns
 from .namespaces.work_category_ns import work_category_ns
@@ -52,3 +55,6 @@ def register_namespaces(api: Api):
     api.add_namespace(shift_report_details_ns)
     api.add_namespace(subscription_ns)
     api.add_namespace(template_ns)
+    api.add_namespace(payroll_ns)
+    api.add_namespace(sync_ns)
+    api.add_namespace(diagnostics_ns)
@@ -1,7 +1,8 @@
 import logging
-import json
 from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
+
+from app.decorators import auth_required, current_identity
 
 # Получаем логгер по его имени
 logger = logging.getLogger('ok_service')
@@ -10,11 +11,10 @@ account_bp = Blueprint('account', __name__)
 
 
 @account_bp.route('/protected', methods=['GET'])
-@jwt_required()
+@auth_required
 def protected():
     try:
-        current_user = get_jwt_identity()
-        current_user = json.loads(current_user)
+        current_user = current_identity()
         logger.info(f"Пользователь авторизован: {current_user['user_id']}",
                     extra={'login': current_user['login']}
                     )
@@ -25,7 +25,7 @@ def protected():
 
 
 @account_bp.route('/get_username', methods=['GET'])
-@jwt_required()  # Требуется авторизация с JWT
+@auth_required  # Требуется авторизация с JWT
 def get_username():
     current_user = get_jwt_identity()
     logger.info(f"Получено имя пользователя: {current_user}")
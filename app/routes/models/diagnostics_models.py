@@ -0,0 +1,41 @@
+# Models for diagnostics namespace
+from flask_restx import Model, fields, reqparse
+
+slow_query_model = Model(
+    "SlowQuery",
+    {
+        "id": fields.Integer(description="Sequence number in this worker"),
+        "captured_at": fields.Integer(description="Unix time of capture"),
+        "endpoint": fields.String(description="Endpoint rule or 'background'"),
+        "role": fields.String(description="Role of the requesting user"),
+        "duration_ms": fields.Float(description="Statement duration, ms"),
+        "statement": fields.String(description="SQL with placeholders"),
+        "parameters": fields.Raw(description="Parameter name -> type (no values)"),
+        "explain": fields.String(
+            description="skipped, pending, done or error: <message>"
+        ),
+        "plan": fields.Raw(description="EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)"),
+    },
+)
+
+slow_query_all_response = Model(
+    "SlowQueryAllResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "threshold_ms": fields.Float(description="Capture threshold, ms"),
+        "slow_queries": fields.List(fields.Nested(slow_query_model)),
+    },
+)
+
+slow_query_msg_model = Model(
+    "SlowQueryMessage",
+    {"msg": fields.String(required=True, description="Response message")},
+)
+
+slow_query_filter_parser = reqparse.RequestParser()
+slow_query_filter_parser.add_argument(
+    "endpoint", type=str, required=False, help="Only queries of this endpoint"
+)
+slow_query_filter_parser.add_argument(
+    "limit", type=int, required=False, help="Newest N entries"
+)
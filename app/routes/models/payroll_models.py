@@ -0,0 +1,69 @@
+# Models for payroll namespace
+from flask_restx import Model, fields, reqparse
+
+payroll_row_model = Model(
+    "PayrollRow",
+    {
+        "user": fields.String(required=False, description="User ID (null in total)"),
+        "user_name": fields.String(required=False, description="User name"),
+        "project": fields.String(required=False, description="Project ID"),
+        "project_name": fields.String(required=False, description="Project name"),
+        "work": fields.String(required=False, description="Work ID"),
+        "work_name": fields.String(required=False, description="Work name"),
+        "night_shift": fields.Boolean(required=False, description="Night shift"),
+        "extreme_conditions": fields.Boolean(
+            required=False, description="Extreme conditions"
+        ),
+        "summ": fields.Float(required=True, description="Total earnings"),
+        "quantity": fields.Float(required=True, description="Total quantity"),
+        "details_count": fields.Integer(
+            required=True, description="Number of shift report details"
+        ),
+        "shift_reports_count": fields.Integer(
+            required=True, description="Number of shift reports"
+        ),
+        "level": fields.String(
+            required=True,
+            description="Aggregation level: total, user or the deepest group_by field",
+        ),
+    },
+)
+
+payroll_response = Model(
+    "PayrollResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "payroll": fields.List(
+            fields.Nested(payroll_row_model), description="Payroll rows with subtotals"
+        ),
+        "detail": fields.Raw(
+            required=False, description="Additional details (e.g., validation errors)"
+        ),
+    },
+)
+
+payroll_filter_parser = reqparse.RequestParser()
+payroll_filter_parser.add_argument(
+    "date_from", type=int, required=False, help="Period start (shift report date)"
+)
+payroll_filter_parser.add_argument(
+    "date_to", type=int, required=False, help="Period end (shift report date)"
+)
+payroll_filter_parser.add_argument(
+    "user",
+    type=str,
+    action="append",
+    help="Filter by user IDs (can be passed multiple times or comma-separated)",
+)
+payroll_filter_parser.add_argument(
+    "project",
+    type=str,
+    action="append",
+    help="Filter by project IDs (can be passed multiple times or comma-separated)",
+)
+payroll_filter_parser.add_argument(
+    "group_by",
+    type=str,
+    action="append",
+    help="Breakdown: project, work, night_shift, extreme_conditions",
+)
@@ -203,3 +203,167 @@ shift_report_filter_parser.add_argument(
 shift_report_filter_parser.add_argument(
     "comment", type=str, required=False, help="Filter by comment"
 )
+
+shift_report_export_parser = shift_report_filter_parser.copy()
+shift_report_export_parser.remove_argument("offset")
+shift_report_export_parser.remove_argument("limit")
+shift_report_export_parser.add_argument(
+    "format",
+    type=str,
+    required=False,
+    default="xlsx",
+    choices=["xlsx", "csv"],
+    help="Export file format",
+)
+
+shift_report_geofence_parser = shift_report_filter_parser.copy()
+shift_report_geofence_parser.remove_argument("offset")
+shift_report_geofence_parser.remove_argument("limit")
+shift_report_geofence_parser.add_argument(
+    "radius",
+    type=float,
+    required=False,
+    help="Geofence radius in meters (defaults to GEOFENCE_RADIUS)",
+)
+shift_report_geofence_parser.add_argument(
+    "tolerance",
+    type=float,
+    required=False,
+    help="Allowed difference between reported and computed distance, meters",
+)
+shift_report_geofence_parser.add_argument(
+    "only_violations",
+    type=lambda x: x.lower() in ["true", "1"],
+    required=False,
+    default=True,
+    help="Return only reports outside the geofence",
+)
+
+shift_report_fill_distances_parser = shift_report_filter_parser.copy()
+shift_report_fill_distances_parser.remove_argument("offset")
+shift_report_fill_distances_parser.remove_argument("limit")
+shift_report_fill_distances_parser.add_argument(
+    "overwrite",
+    type=lambda x: x.lower() in ["true", "1"],
+    required=False,
+    default=False,
+    help="Overwrite distances reported by the client",
+)
+
+shift_report_geofence_row_model = Model(
+    "ShiftReportGeofenceRow",
+    {
+        "shift_report_id": fields.String(required=True, description="Report ID"),
+        "number": fields.Integer(required=False, description="Report number"),
+        "date": fields.Integer(required=False, description="Shift date"),
+        "user": fields.String(required=False, description="User ID"),
+        "user_name": fields.String(required=False, description="User name"),
+        "project": fields.String(required=False, description="Project ID"),
+        "project_name": fields.String(required=False, description="Project name"),
+        "object": fields.String(required=False, description="Object ID"),
+        "object_name": fields.String(required=False, description="Object name"),
+        "distance_start": fields.Float(
+            required=False, description="Start distance reported by the client"
+        ),
+        "distance_end": fields.Float(
+            required=False, description="End distance reported by the client"
+        ),
+        "computed_distance_start": fields.Float(
+            required=False, description="Computed start distance to object, meters"
+        ),
+        "computed_distance_end": fields.Float(
+            required=False, description="Computed end distance to object, meters"
+        ),
+        "start_outside": fields.Boolean(
+            required=False, description="Shift started outside the geofence"
+        ),
+        "end_outside": fields.Boolean(
+            required=False, description="Shift ended outside the geofence"
+        ),
+        "distance_mismatch": fields.Boolean(
+            required=False,
+            description="Reported distance differs from computed one",
+        ),
+    },
+)
+
+shift_report_geofence_summary_model = Model(
+    "ShiftReportGeofenceSummary",
+    {
+        "checked": fields.Integer(description="Number of checked reports"),
+        "violations": fields.Integer(description="Number of reports with violations"),
+        "start_outside": fields.Integer(description="Started outside the geofence"),
+        "end_outside": fields.Integer(description="Ended outside the geofence"),
+        "distance_mismatch": fields.Integer(
+            description="Reports with mismatching distances"
+        ),
+        "no_coordinates": fields.Integer(
+            description="Reports without shift or object coordinates"
+        ),
+        "radius": fields.Float(description="Geofence radius, meters"),
+    },
+)
+
+shift_report_geofence_response = Model(
+    "ShiftReportGeofenceResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "summary": fields.Nested(shift_report_geofence_summary_model),
+        "shift_reports": fields.List(fields.Nested(shift_report_geofence_row_model)),
+        "updated": fields.Integer(
+            required=False, description="Number of updated reports"
+        ),
+        "detail": fields.Raw(
+            required=False, description="Additional details (e.g., validation errors)"
+        ),
+    },
+)
+
+shift_report_calendar_parser = shift_report_filter_parser.copy()
+shift_report_calendar_parser.remove_argument("offset")
+shift_report_calendar_parser.remove_argument("limit")
+shift_report_calendar_parser.remove_argument("sort_by")
+shift_report_calendar_parser.remove_argument("sort_order")
+shift_report_calendar_parser.add_argument(
+    "day_from", type=str, required=True, help="First calendar day (YYYY-MM-DD)"
+)
+shift_report_calendar_parser.add_argument(
+    "day_to", type=str, required=True, help="Last calendar day (YYYY-MM-DD)"
+)
+shift_report_calendar_parser.add_argument(
+    "group_by",
+    type=str,
+    required=False,
+    default="user",
+    choices=["user", "project"],
+    help="Heatmap rows: user or project",
+)
+
+shift_report_calendar_cell_model = Model(
+    "ShiftReportCalendarCell",
+    {
+        "day": fields.String(required=True, description="Calendar day (YYYY-MM-DD)"),
+        "user": fields.String(required=False, description="User ID"),
+        "user_name": fields.String(required=False, description="User name"),
+        "project": fields.String(required=False, description="Project ID"),
+        "project_name": fields.String(required=False, description="Project name"),
+        "shift_reports_count": fields.Integer(
+            required=True, description="Number of shift reports"
+        ),
+        "signed_count": fields.Integer(
+            required=True, description="Number of signed shift reports"
+        ),
+        "summ": fields.Float(required=True, description="Sum of shift report details"),
+    },
+)
+
+shift_report_calendar_response = Model(
+    "ShiftReportCalendarResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "calendar": fields.List(fields.Nested(shift_report_calendar_cell_model)),
+        "detail": fields.Raw(
+            required=False, description="Additional details (e.g., validation errors)"
+        ),
+    },
+)
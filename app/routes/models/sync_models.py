@@ -0,0 +1,50 @@
+# Models for sync namespace
+from flask_restx import Model, fields, reqparse
+
+from app.routes.models.project_work_models import project_work_model
+from app.routes.models.shift_report_detail_models import shift_report_details_model
+from app.routes.models.shift_report_models import shift_report_model
+
+sync_deleted_model = Model(
+    "SyncDeleted",
+    {
+        "shift_reports": fields.List(
+            fields.String, description="IDs of deleted shift reports"
+        ),
+        "shift_report_details": fields.List(
+            fields.String, description="IDs of deleted shift report details"
+        ),
+        "project_works": fields.List(
+            fields.String, description="IDs of deleted project works"
+        ),
+    },
+)
+
+sync_response = Model(
+    "SyncResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "token": fields.Integer(
+            required=False, description="Pass as `since` on the next sync"
+        ),
+        "full_resync": fields.Boolean(
+            description="The token is older than the tombstone retention: "
+            "replace all local data with this snapshot"
+        ),
+        "shift_reports": fields.List(fields.Nested(shift_report_model)),
+        "shift_report_details": fields.List(fields.Nested(shift_report_details_model)),
+        "project_works": fields.List(fields.Nested(project_work_model)),
+        "deleted": fields.Nested(sync_deleted_model),
+        "detail": fields.Raw(
+            required=False, description="Additional details (e.g., validation errors)"
+        ),
+    },
+)
+
+sync_parser = reqparse.RequestParser()
+sync_parser.add_argument(
+    "since",
+    type=int,
+    required=False,
+    help="Token from the previous sync; omit for a full snapshot",
+)
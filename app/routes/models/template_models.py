@@ -1,3 +1,5 @@
+from flask_restx import Model, fields
+
 from app.schemas.template_schemas import TemplateGenerateSchema
 from app.utils.helpers import generate_swagger_model
 
@@ -5,3 +7,33 @@ from app.utils.helpers import generate_swagger_model
 template_generate_model = generate_swagger_model(
     TemplateGenerateSchema(), "templateCreate"
 )
+
+template_job_model = Model(
+    "TemplateJob",
+    {
+        "job_id": fields.String(description="ID of the generation job"),
+        "status": fields.String(description="queued, running, done or failed"),
+        "error": fields.String(description="Error message for failed jobs"),
+        "created_by": fields.String(description="ID of the user who created the job"),
+        "created_at": fields.Integer(description="Creation timestamp"),
+        "started_at": fields.Integer(description="Start timestamp"),
+        "finished_at": fields.Integer(description="Finish timestamp"),
+    },
+)
+
+template_job_msg_model = Model(
+    "TemplateJobMessage",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "job_id": fields.String(required=False, description="ID of the job"),
+        "status": fields.String(required=False, description="Job status"),
+    },
+)
+
+template_job_response = Model(
+    "TemplateJobResponse",
+    {
+        "msg": fields.String(required=True, description="Response message"),
+        "job": fields.Nested(template_job_model),
+    },
+)
@@ -1,4 +1,5 @@
 from flask_restx import Model, fields, reqparse
+from werkzeug.datastructures import FileStorage
 from app.schemas.work_schemas import WorkCreateSchema
 from app.utils.helpers import generate_swagger_model
 from app.routes.models.work_category_models import work_category_model
@@ -56,3 +57,33 @@ work_filter_parser.add_argument(
 work_filter_parser.add_argument(
     'sort_order', type=str, required=False, choices=['asc', 'desc'], help='Order of sorting'
 )
+
+# Парсер для загрузки прайс-листа
+work_import_parser = reqparse.RequestParser()
+work_import_parser.add_argument(
+    'file', type=FileStorage, location='files', required=True,
+    help="Price list in Excel format")
+work_import_parser.add_argument(
+    'sheet', type=str, required=False, location='args',
+    help="Sheet name (defaults to 'Расценки СМР монтаж')")
+work_import_parser.add_argument(
+    'dry_run', type=lambda x: x.lower() in ['true', '1'], default=False,
+    location='args', help="Only compute changes without saving them")
+
+# Модель счетчиков изменений при загрузке прайс-листа
+work_import_counts_model = Model('WorkImportCounts', {
+    "created": fields.Integer(description="Number of created records"),
+    "updated": fields.Integer(description="Number of updated or restored records"),
+    "unchanged": fields.Integer(description="Number of unchanged records")
+})
+
+# Модель ответа на загрузку прайс-листа
+work_import_response = Model('WorkImportResponse', {
+    "msg": fields.String(required=True, description="Response message"),
+    "dry_run": fields.Boolean(description="Changes were not saved"),
+    "rows": fields.Integer(description="Number of imported rows"),
+    "skipped": fields.Integer(description="Number of skipped rows"),
+    "categories": fields.Nested(work_import_counts_model),
+    "works": fields.Nested(work_import_counts_model),
+    "prices": fields.Nested(work_import_counts_model)
+})
@@ -66,3 +66,42 @@ work_price_filter_parser.add_argument(
 work_price_filter_parser.add_argument(
     'sort_order', type=str, required=False, choices=['asc', 'desc'], help='Order of sorting'
 )
+
+# Строка матрицы расценок: работа и цены по разрядам 0–4
+work_price_matrix_row_model = Model('WorkPriceMatrixRow', {
+    "work": fields.String(required=True, description="ID of the work"),
+    "prices": fields.Raw(
+        required=True, description="Prices by category, e.g. {\"1\": 150.0, \"2\": 180.0}")
+})
+
+# Модель для массового изменения расценок
+work_price_bulk_model = Model('WorkPriceBulk', {
+    "prices": fields.List(fields.Nested(work_price_matrix_row_model), required=True,
+                          description="Price matrix"),
+    "reprice": fields.Boolean(
+        required=False, description="Recalculate sums of unsigned shift report details")
+})
+
+# Модель созданной или измененной расценки
+work_price_change_model = Model('WorkPriceChange', {
+    "work_price_id": fields.String(description="ID of the work price"),
+    "work": fields.String(description="ID of the work"),
+    "category": fields.Integer(description="Category of the work price"),
+    "old_price": fields.Float(description="Previous price (null for created)"),
+    "price": fields.Float(description="New price"),
+    "change": fields.String(description="created or updated")
+})
+
+# Модель ответа на массовое изменение расценок
+work_price_bulk_response = Model('WorkPriceBulkResponse', {
+    "msg": fields.String(required=True, description="Response message"),
+    "created": fields.Integer(description="Number of created prices"),
+    "updated": fields.Integer(description="Number of updated prices"),
+    "unchanged": fields.Integer(description="Number of unchanged prices"),
+    "changes": fields.List(fields.Nested(work_price_change_model),
+                           description="Created and updated prices"),
+    "reprice_job_id": fields.String(
+        description="ID of the repricing job (REPRICE_JOBS_BACKEND=queue)"),
+    "repriced": fields.Integer(
+        description="Number of repriced shift report details (inline repricing)")
+})
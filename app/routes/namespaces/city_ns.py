@@ -1,14 +1,17 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    etag_conditional,
+)
 from app.routes.models.city_models import (
     city_all_response,
     city_create_model,
@@ -18,6 +21,7 @@ from app.routes.models.city_models import (
     city_response,
 )
 from app.schemas.city_schemas import CityCreateSchema, CityEditSchema, CityFilterSchema
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -32,12 +36,12 @@ city_ns.models[city_model.name] = city_model
 
 @city_ns.route("/add")
 class CityAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @city_ns.expect(city_create_model)
     @city_ns.marshal_with(city_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new city", extra={"login": current_user})
 
         schema = CityCreateSchema()
@@ -80,10 +84,10 @@ class CityAdd(Resource):
 
 @city_ns.route("/<string:city_id>/view")
 class CityView(Resource):
-    @jwt_required()
+    @auth_required
     @city_ns.marshal_with(city_response)
     def get(self, city_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Request to view city: {city_id}", extra={"login": current_user})
 
         try:
@@ -109,11 +113,11 @@ class CityView(Resource):
 
 @city_ns.route("/<string:city_id>/delete/soft")
 class CitySoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @city_ns.marshal_with(city_msg_model)
     def patch(self, city_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete city: {city_id}", extra={"login": current_user}
         )
@@ -147,11 +151,11 @@ class CitySoftDelete(Resource):
 
 @city_ns.route("/<string:city_id>/delete/hard")
 class CityHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @city_ns.marshal_with(city_msg_model)
     def delete(self, city_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete city: {city_id}", extra={"login": current_user}
         )
@@ -191,12 +195,12 @@ class CityHardDelete(Resource):
 
 @city_ns.route("/<string:city_id>/edit")
 class CityEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @city_ns.expect(city_create_model)
     @city_ns.marshal_with(city_msg_model)
     def patch(self, city_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Request to edit city: {city_id}", extra={"login": current_user})
 
         schema = CityEditSchema()
@@ -262,11 +266,12 @@ class CityEdit(Resource):
 
 @city_ns.route("/all")
 class CityAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("cities")
     @city_ns.expect(city_filter_parser)
     @city_ns.marshal_with(city_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all cities", extra={"login": current_user})
 
         schema = CityFilterSchema()
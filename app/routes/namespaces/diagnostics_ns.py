@@ -0,0 +1,54 @@
+import logging
+
+from flask import request
+from flask_restx import Resource
+
+from app.database.slow_queries import slow_query_log
+from app.decorators import admin_required, auth_required, current_identity
+from app.routes.models.diagnostics_models import (
+    slow_query_all_response,
+    slow_query_filter_parser,
+    slow_query_model,
+    slow_query_msg_model,
+)
+from app.utils.marshalling import Namespace
+
+logger = logging.getLogger("ok_service")
+
+diagnostics_ns = Namespace("diagnostics", description="Runtime diagnostics")
+
+diagnostics_ns.models[slow_query_model.name] = slow_query_model
+diagnostics_ns.models[slow_query_all_response.name] = slow_query_all_response
+diagnostics_ns.models[slow_query_msg_model.name] = slow_query_msg_model
+
+
+@diagnostics_ns.route("/slow_queries")
+class SlowQueries(Resource):
+    @auth_required
+    @admin_required
+    @diagnostics_ns.expect(slow_query_filter_parser)
+    @diagnostics_ns.marshal_with(slow_query_all_response)
+    def get(self):
+        current_user = current_identity()
+        logger.info("Request to fetch slow queries", extra={"login": current_user})
+        entries = slow_query_log.entries()
+        endpoint = request.args.get("endpoint")
+        if endpoint:
+            entries = [entry for entry in entries if entry["endpoint"] == endpoint]
+        limit = request.args.get("limit", type=int)
+        if limit:
+            entries = entries[:limit]
+        return {
+            "msg": "Slow queries found successfully",
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "slow_queries": entries,
+        }, 200
+
+    @auth_required
+    @admin_required
+    @diagnostics_ns.marshal_with(slow_query_msg_model)
+    def delete(self):
+        current_user = current_identity()
+        slow_query_log.clear()
+        logger.info("Slow query buffer cleared", extra={"login": current_user})
+        return {"msg": "Slow queries cleared"}, 200
@@ -1,16 +1,14 @@
-import json
 import logging
 from datetime import datetime
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
 from app.database.models.leaves import AbsenceReason
-from app.decorators import admin_required
+from app.decorators import admin_required, auth_required, current_identity
 from app.routes.models.leave_models import (
     leave_all_response,
     leave_create_model,
@@ -27,6 +25,7 @@ from app.schemas.leave_schemas import (
     LeaveEditSchema,
     LeaveFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -48,12 +47,12 @@ def _current_timestamp():
 
 @leave_ns.route("/add")
 class LeaveAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @leave_ns.expect(leave_edit_model)
     @leave_ns.marshal_with(leave_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new leave", extra={"login": current_user})
 
         schema = LeaveCreateSchema()
@@ -117,10 +116,10 @@ class LeaveAdd(Resource):
 
 @leave_ns.route("/<string:leave_id>/view")
 class LeaveView(Resource):
-    @jwt_required()
+    @auth_required
     @leave_ns.marshal_with(leave_response)
     def get(self, leave_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Request to view leave: {leave_id}", extra={"login": current_user})
 
         try:
@@ -139,11 +138,11 @@ class LeaveView(Resource):
 
 @leave_ns.route("/<string:leave_id>/delete/soft")
 class LeaveSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @leave_ns.marshal_with(leave_msg_model)
     def patch(self, leave_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete leave: {leave_id}", extra={"login": current_user}
         )
@@ -172,11 +171,11 @@ class LeaveSoftDelete(Resource):
 
 @leave_ns.route("/<string:leave_id>/delete/hard")
 class LeaveHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @leave_ns.marshal_with(leave_msg_model)
     def delete(self, leave_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete leave: {leave_id}", extra={"login": current_user}
         )
@@ -208,12 +207,12 @@ class LeaveHardDelete(Resource):
 
 @leave_ns.route("/<string:leave_id>/edit")
 class LeaveEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @leave_ns.expect(leave_create_model)
     @leave_ns.marshal_with(leave_msg_model)
     def patch(self, leave_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Request to edit leave: {leave_id}", extra={"login": current_user})
 
         schema = LeaveEditSchema()
@@ -281,11 +280,11 @@ class LeaveEdit(Resource):
 
 @leave_ns.route("/all")
 class LeaveAll(Resource):
-    @jwt_required()
+    @auth_required
     @leave_ns.expect(leave_filter_parser)
     @leave_ns.marshal_with(leave_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all leaves", extra={"login": current_user})
 
         schema = LeaveFilterSchema()
@@ -327,10 +326,10 @@ class LeaveAll(Resource):
 
 @leave_ns.route("/reasons/all")
 class LeaveReasons(Resource):
-    @jwt_required()
+    @auth_required
     @leave_ns.marshal_with(leave_reason_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch leave reasons", extra={"login": current_user})
 
         reasons = [
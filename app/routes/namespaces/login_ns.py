@@ -8,7 +8,7 @@ from flask_jwt_extended import (
     get_jwt_identity,
     verify_jwt_in_request,
 )
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 
 from app.routes.models.login_models import (
@@ -18,6 +18,8 @@ from app.routes.models.login_models import (
     response_auth,
 )
 from app.schemas.login_schemas import LoginSchema, RefreshTokenSchema
+from app.utils.marshalling import Namespace
+from app.utils.passwords import password_hasher
 
 logger = logging.getLogger("ok_service")
 
@@ -56,23 +58,22 @@ class AuthLogin(Resource):
 
         logger.info("Login attempt", extra={"login": login})
 
-        if not (db.exists(login=login) and db.check_password_db(login, password)):
+        # Один запрос; хеш проверяется уже после возврата соединения в пул
+        user = db.get_login_record(login)
+        if not (user and password_hasher.verify(user["password_hash"], password)):
             logger.warning(
                 "Authentication failed: bad username or password",
                 extra={"login": login},
             )
             return {"msg": "Bad username or password"}, 401
 
-        user = db.filter_one_by_dict(login=login)
-        if not user:
-            logger.warning(
-                "User record unexpectedly missing after successful password check",
-                extra={"login": login},
-            )
-            return {"msg": "User not found"}, 404
         if user.get("deleted") is True:
             logger.warning("Authentication blocked: user is deleted", extra={"login": login})
             return {"msg": "User is deleted"}, 401
+
+        if password_hasher.needs_rehash(user["password_hash"]):
+            # Параметры хеширования изменились — обновляем хеш прозрачно
+            db.rehash_password(user["user_id"], user["password_hash"], password)
         identity = json.dumps(
             {"user_id": user["user_id"], "role": user["role"], "login": login}
         )
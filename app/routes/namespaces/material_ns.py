@@ -1,14 +1,17 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    etag_conditional,
+)
 from app.routes.models.material_models import (
     material_all_response,
     material_create_model,
@@ -22,6 +25,7 @@ from app.schemas.material_schemas import (
     MaterialEditSchema,
     MaterialFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -36,12 +40,12 @@ material_ns.models[material_model.name] = material_model
 
 @material_ns.route("/add")
 class MaterialAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @material_ns.expect(material_create_model)
     @material_ns.marshal_with(material_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new material", extra={"login": current_user})
 
         schema = MaterialCreateSchema()
@@ -73,10 +77,10 @@ class MaterialAdd(Resource):
 
 @material_ns.route("/<string:material_id>/view")
 class MaterialView(Resource):
-    @jwt_required()
+    @auth_required
     @material_ns.marshal_with(material_response)
     def get(self, material_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view material: {material_id}", extra={"login": current_user}
         )
@@ -103,11 +107,11 @@ class MaterialView(Resource):
 
 @material_ns.route("/<string:material_id>/delete/soft")
 class MaterialSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @material_ns.marshal_with(material_msg_model)
     def patch(self, material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete material: {material_id}",
             extra={"login": current_user},
@@ -141,11 +145,11 @@ class MaterialSoftDelete(Resource):
 
 @material_ns.route("/<string:material_id>/delete/hard")
 class MaterialHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @material_ns.marshal_with(material_msg_model)
     def delete(self, material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete material: {material_id}",
             extra={"login": current_user},
@@ -185,12 +189,12 @@ class MaterialHardDelete(Resource):
 
 @material_ns.route("/<string:material_id>/edit")
 class MaterialEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @material_ns.expect(material_create_model)
     @material_ns.marshal_with(material_msg_model)
     def patch(self, material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit material: {material_id}", extra={"login": current_user}
         )
@@ -231,11 +235,12 @@ class MaterialEdit(Resource):
 
 @material_ns.route("/all")
 class MaterialAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("materials")
     @material_ns.expect(material_filter_parser)
     @material_ns.marshal_with(material_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info("Request to fetch all materials", extra={"login": current_user})
 
         schema = MaterialFilterSchema()
@@ -1,13 +1,12 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
+from app.decorators import auth_required, current_identity
 from app.routes.models.object_models import (
     object_all_response,
     object_create_model,
@@ -21,6 +20,7 @@ from app.schemas.object_schemas import (
     ObjectEditSchema,
     ObjectFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -36,11 +36,11 @@ object_ns.models[object_model.name] = object_model
 
 @object_ns.route("/add")
 class ObjectAdd(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.expect(object_create_model)
     @object_ns.marshal_with(object_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.debug(f"Decoded JWT Identity: {current_user}")
         if current_user["role"] != "admin":
             logger.warning(
@@ -90,10 +90,10 @@ class ObjectAdd(Resource):
 
 @object_ns.route("/<string:object_id>/view")
 class ObjectView(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.marshal_with(object_response)
     def get(self, object_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to view object: {object_id}", extra={"login": current_user}
         )
@@ -128,10 +128,10 @@ class ObjectView(Resource):
 
 @object_ns.route("/<string:object_id>/delete/soft")
 class ObjectSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.marshal_with(object_msg_model)
     def patch(self, object_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.debug(f"Decoded JWT Identity: {current_user}")
         if current_user["role"] != "admin":
             logger.warning(
@@ -171,10 +171,10 @@ class ObjectSoftDelete(Resource):
 
 @object_ns.route("/<string:object_id>/delete/hard")
 class ObjectHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.marshal_with(object_msg_model)
     def delete(self, object_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.debug(f"Decoded JWT Identity: {current_user}")
         if current_user["role"] != "admin":
             logger.warning(
@@ -220,11 +220,11 @@ class ObjectHardDelete(Resource):
 
 @object_ns.route("/<string:object_id>/edit")
 class ObjectEdit(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.expect(object_create_model)
     @object_ns.marshal_with(object_msg_model)
     def patch(self, object_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.debug(f"Decoded JWT Identity: {current_user}")
         if current_user["role"] != "admin":
             logger.warning(
@@ -272,11 +272,11 @@ class ObjectEdit(Resource):
 
 @object_ns.route("/all")
 class ObjectAll(Resource):
-    @jwt_required()
+    @auth_required
     @object_ns.expect(object_filter_parser)
     @object_ns.marshal_with(object_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all objects", extra={"login": current_user})
 
         schema = ObjectFilterSchema()
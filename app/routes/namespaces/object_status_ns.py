@@ -1,17 +1,17 @@
-import json
 import logging
 
 from flask import request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 
+from app.decorators import auth_required, current_identity, etag_conditional
 from app.routes.models.object_status_models import (
     object_status_all_response,
     object_status_filter_parser,
     object_status_model,
 )
 from app.schemas.object_status_schemas import ObjectStatusFilterSchema
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -25,12 +25,13 @@ object_status_ns.models[object_status_model.name] = object_status_model
 
 @object_status_ns.route("/all")
 class ObjectStatusAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("object_statuses")
     @object_status_ns.expect(object_status_filter_parser)
     @object_status_ns.marshal_with(object_status_all_response)
     @object_status_ns.response(500, "Internal Server Error")
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to fetch all object statuses.", extra={"login": current_user}
         )
@@ -0,0 +1,80 @@
+# Namespace for payroll
+import logging
+
+from flask import request
+from flask_restx import Resource
+from marshmallow import ValidationError
+
+from app.decorators import auth_required, current_identity
+from app.routes.models.payroll_models import (
+    payroll_filter_parser,
+    payroll_response,
+    payroll_row_model,
+)
+from app.schemas.payroll_schemas import PayrollFilterSchema
+from app.utils.marshalling import Namespace
+
+logger = logging.getLogger("ok_service")
+
+payroll_ns = Namespace("payroll", description="Payroll aggregation operations")
+
+# Initialize models
+payroll_ns.models[payroll_row_model.name] = payroll_row_model
+payroll_ns.models[payroll_response.name] = payroll_response
+
+
+@payroll_ns.route("")
+class Payroll(Resource):
+    @auth_required
+    @payroll_ns.expect(payroll_filter_parser)
+    @payroll_ns.marshal_with(payroll_response)
+    def get(self):
+        current_user = current_identity()
+        logger.info("Request to fetch payroll", extra={"login": current_user})
+
+        schema = PayrollFilterSchema()
+        raw_args = request.args.to_dict()
+        for field_name in ["user", "project", "group_by"]:
+            values = request.args.getlist(field_name)
+            if values:
+                raw_args[field_name] = values  # type: ignore
+        try:
+            args = schema.load(raw_args)
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+
+        filters = {
+            "date_from": args.get("date_from"),  # type: ignore
+            "date_to": args.get("date_to"),  # type: ignore
+            "user": args.get("user"),  # type: ignore
+            "project": args.get("project"),  # type: ignore
+        }
+        project_leader = None
+        if current_user["role"] == "user":
+            filters["user"] = [current_user["user_id"]]
+        elif current_user["role"] == "project-leader":
+            # Прораб видит начисления только по своим проектам
+            project_leader = current_user["user_id"]
+
+        try:
+            from app.database.managers.shift_reports_managers import (
+                ShiftReportsDetailsManager,
+            )
+
+            db = ShiftReportsDetailsManager()
+            payroll = db.get_payroll(
+                group_by=args.get("group_by"),  # type: ignore
+                project_leader=project_leader,
+                **filters,
+            )
+            logger.info(
+                f"Successfully fetched payroll: {len(payroll)} rows",
+                extra={"login": current_user},
+            )
+            return {"msg": "Payroll fetched successfully", "payroll": payroll}, 200
+        except Exception as e:
+            logger.error(f"Error fetching payroll: {e}", extra={"login": current_user})
+            return {"msg": f"Error fetching payroll: {e}"}, 500
@@ -1,14 +1,12 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import admin_required, auth_required, current_identity
 from app.routes.models.project_material_models import (
     project_material_all_response,
     project_material_create_model,
@@ -22,6 +20,7 @@ from app.schemas.project_material_schemas import (
     ProjectMaterialEditSchema,
     ProjectMaterialFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -42,12 +41,12 @@ project_material_ns.models[project_material_model.name] = project_material_model
 
 @project_material_ns.route("/add")
 class ProjectMaterialAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @project_material_ns.expect(project_material_create_model)
     @project_material_ns.marshal_with(project_material_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add new project material", extra={"login": current_user}
         )
@@ -83,10 +82,10 @@ class ProjectMaterialAdd(Resource):
 
 @project_material_ns.route("/<string:project_material_id>/view")
 class ProjectMaterialView(Resource):
-    @jwt_required()
+    @auth_required
     @project_material_ns.marshal_with(project_material_response)
     def get(self, project_material_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view project material: {project_material_id}",
             extra={"login": current_user},
@@ -121,11 +120,11 @@ class ProjectMaterialView(Resource):
 
 @project_material_ns.route("/<string:project_material_id>/delete/hard")
 class ProjectMaterialHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @project_material_ns.marshal_with(project_material_msg_model)
     def delete(self, project_material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete project material: {project_material_id}",
             extra={"login": current_user},
@@ -175,12 +174,12 @@ class ProjectMaterialHardDelete(Resource):
 
 @project_material_ns.route("/<string:project_material_id>/edit")
 class ProjectMaterialEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @project_material_ns.expect(project_material_create_model)
     @project_material_ns.marshal_with(project_material_msg_model)
     def patch(self, project_material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit project material: {project_material_id}",
             extra={"login": current_user},
@@ -225,11 +224,11 @@ class ProjectMaterialEdit(Resource):
 
 @project_material_ns.route("/all")
 class ProjectMaterialAll(Resource):
-    @jwt_required()
+    @auth_required
     @project_material_ns.expect(project_material_filter_parser)
     @project_material_ns.marshal_with(project_material_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch all project materials", extra={"login": current_user}
         )
@@ -1,14 +1,12 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import user_forbidden
+from app.decorators import auth_required, current_identity, user_forbidden
 from app.routes.models.project_models import (
     project_all_response,
     project_create_model,
@@ -24,6 +22,7 @@ from app.schemas.project_schemas import (
     ProjectEditSchema,
     ProjectFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -41,12 +40,12 @@ project_ns.models[project_stats_response.name] = project_stats_response
 
 @project_ns.route("/add")
 class ProjectAdd(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_ns.expect(project_create_model)
     @project_ns.marshal_with(project_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new project", extra={"login": current_user})
 
         schema = ProjectCreateSchema()
@@ -76,10 +75,10 @@ class ProjectAdd(Resource):
 
 @project_ns.route("/<string:project_id>/view")
 class ProjectView(Resource):
-    @jwt_required()
+    @auth_required
     @project_ns.marshal_with(project_response)
     def get(self, project_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view project: {project_id}", extra={"login": current_user}
         )
@@ -102,11 +101,11 @@ class ProjectView(Resource):
 
 @project_ns.route("/<string:project_id>/delete/soft")
 class ProjectSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_ns.marshal_with(project_msg_model)
     def patch(self, project_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete project: {project_id}",
             extra={"login": current_user},
@@ -148,11 +147,11 @@ class ProjectSoftDelete(Resource):
 
 @project_ns.route("/<string:project_id>/delete/hard")
 class ProjectHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_ns.marshal_with(project_msg_model)
     def delete(self, project_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete project: {project_id}",
             extra={"login": current_user},
@@ -201,12 +200,12 @@ class ProjectHardDelete(Resource):
 
 @project_ns.route("/<string:project_id>/edit")
 class ProjectEdit(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_ns.expect(project_create_model)
     @project_ns.marshal_with(project_msg_model)
     def patch(self, project_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit project: {project_id}", extra={"login": current_user}
         )
@@ -255,11 +254,11 @@ class ProjectEdit(Resource):
 
 @project_ns.route("/all")
 class ProjectAll(Resource):
-    @jwt_required()
+    @auth_required
     @project_ns.expect(project_filter_parser)
     @project_ns.marshal_with(project_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all projects", extra={"login": current_user})
 
         schema = ProjectFilterSchema()
@@ -315,10 +314,10 @@ class ProjectAll(Resource):
 
 @project_ns.route("/<string:project_id>/get-stat")
 class ProjectStats(Resource):
-    @jwt_required()
+    @auth_required
     @project_ns.marshal_with(project_stats_response)
     def get(self, project_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to view stats of project: {project_id}",
             extra={"login": current_user},
@@ -348,10 +347,10 @@ class ProjectStats(Resource):
 
 # @project_ns.route("/<string:project_id>/get-stat-by-project-work")
 # class ProjectStatsByProjectWork(Resource):
-#     @jwt_required()
+#     @auth_required
 #     @project_ns.marshal_with(project_stats_response)
 #     def get(self, project_id):
-#         current_user = json.loads(get_jwt_identity())
+#         current_user = current_identity()
 #         logger.info(
 #             f"Request to get project stats BY PROJECT WORK for project: {project_id}",
 #             extra={"login": current_user},
@@ -389,10 +388,10 @@ class ProjectStats(Resource):
 
 @project_ns.route("/<string:project_id>/get-stat-by-project-materials")
 class ProjectStatsByProjectMaterials(Resource):
-    @jwt_required()
+    @auth_required
     @project_ns.marshal_with(project_stats_response)
     def get(self, project_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to get project stats BY PROJECT MATERIALS for project: {
                 project_id
@@ -1,15 +1,13 @@
 # Namespace for ProjectSchedules
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import user_forbidden
+from app.decorators import auth_required, current_identity, user_forbidden
 from app.routes.models.project_schedule_models import (
     project_schedule_all_response,
     project_schedule_create_model,
@@ -23,6 +21,7 @@ from app.schemas.project_schedule_schemas import (
     ProjectScheduleEditSchema,
     ProjectScheduleFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -44,12 +43,12 @@ project_schedule_ns.models[project_schedule_model.name] = project_schedule_model
 
 @project_schedule_ns.route("/add")
 class ProjectScheduleAdd(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_schedule_ns.expect(project_schedule_create_model)
     @project_schedule_ns.marshal_with(project_schedule_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add new project schedule", extra={"login": current_user}
         )
@@ -62,23 +61,16 @@ class ProjectScheduleAdd(Resource):
             return {"error": err.messages}, 400
 
         try:
-            from app.database.managers.projects_managers import (
-                ProjectSchedulesManager,
-                ProjectsManager,
-            )
+            from app.database.managers.projects_managers import ProjectSchedulesManager
+            from app.database.managers.scope_manager import ScopeManager
 
             db = ProjectSchedulesManager()
-            db_p = ProjectsManager()
 
             if current_user["role"] == "project-leader":
-                led_projects = db_p.get_all_filtered(
-                    project_leader=current_user["user_id"]
-                )
-                logger.info(
-                    f"Найденные projects: {led_projects}", extra={"login": current_user}
-                )
-                led_project_ids = {p["project_id"] for p in led_projects}
-                if str(data["project"]) not in led_project_ids:  # type: ignore
+                if not ScopeManager().leads_project(
+                    current_user["user_id"],
+                    data["project"],  # type: ignore
+                ):
                     logger.warning(
                         "Trying to add not own project schedule",
                         extra={"login": current_user},
@@ -103,10 +95,10 @@ class ProjectScheduleAdd(Resource):
 
 @project_schedule_ns.route("/<string:schedule_id>/view")
 class ProjectScheduleView(Resource):
-    @jwt_required()
+    @auth_required
     @project_schedule_ns.marshal_with(project_schedule_response)
     def get(self, schedule_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to view project schedule: {schedule_id}",
             extra={"login": current_user},
@@ -136,11 +128,11 @@ class ProjectScheduleView(Resource):
 
 @project_schedule_ns.route("/<string:schedule_id>/delete/hard")
 class ProjectScheduleHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_schedule_ns.marshal_with(project_schedule_msg_model)
     def delete(self, schedule_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete project schedule: {schedule_id}",
             extra={"login": current_user},
@@ -152,10 +144,11 @@ class ProjectScheduleHardDelete(Resource):
             db = ProjectSchedulesManager()
 
             if current_user["role"] == "project-leader":
-                led_schedules = db.get_schedule_ids_by_project_leader(
-                    current_user["user_id"]
-                )
-                if str(schedule_id) not in led_schedules:
+                from app.database.managers.scope_manager import ScopeManager
+
+                if not ScopeManager().leads_project_schedule(
+                    current_user["user_id"], schedule_id
+                ):
                     logger.warning(
                         "Trying to hard delete not user's project schedule",
                         extra={"login": current_user},
@@ -192,12 +185,12 @@ class ProjectScheduleHardDelete(Resource):
 
 @project_schedule_ns.route("/<string:schedule_id>/edit")
 class ProjectScheduleEdit(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_schedule_ns.expect(project_schedule_create_model)
     @project_schedule_ns.marshal_with(project_schedule_msg_model)
     def patch(self, schedule_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit project schedule: {schedule_id}",
             extra={"login": current_user},
@@ -219,10 +212,11 @@ class ProjectScheduleEdit(Resource):
             db = ProjectSchedulesManager()
 
             if current_user["role"] == "project-leader":
-                led_schedules = db.get_schedule_ids_by_project_leader(
-                    current_user["user_id"]
-                )
-                if str(schedule_id) not in led_schedules:
+                from app.database.managers.scope_manager import ScopeManager
+
+                if not ScopeManager().leads_project_schedule(
+                    current_user["user_id"], schedule_id
+                ):
                     logger.warning(
                         "Trying to edit not user's project schedule",
                         extra={"login": current_user},
@@ -249,11 +243,11 @@ class ProjectScheduleEdit(Resource):
 
 @project_schedule_ns.route("/all")
 class ProjectScheduleAll(Resource):
-    @jwt_required()
+    @auth_required
     @project_schedule_ns.expect(project_schedule_filter_parser)
     @project_schedule_ns.marshal_with(project_schedule_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to fetch all project schedules", extra={"login": current_user}
         )
@@ -1,14 +1,12 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import user_forbidden
+from app.decorators import auth_required, current_identity, user_forbidden
 from app.routes.models.project_work_models import (
     project_work_all_response,
     project_work_create_model,
@@ -23,6 +21,7 @@ from app.schemas.project_work_schemas import (
     ProjectWorkEditSchema,
     ProjectWorkFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -41,12 +40,12 @@ project_work_ns.models[project_work_msg_many_model.name] = project_work_msg_many
 
 @project_work_ns.route("/add/many")
 class ProjectWorkAddBulk(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_work_ns.expect([project_work_create_model])
     @project_work_ns.marshal_with(project_work_msg_many_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add multiple project works", extra={"login": current_user}
         )
@@ -65,31 +64,28 @@ class ProjectWorkAddBulk(Resource):
             return {"error": err.messages}, 400
 
         try:
-            from app.database.managers.projects_managers import (
-                ProjectsManager,
-                ProjectWorksManager,
-            )
+            from app.database.managers.projects_managers import ProjectWorksManager
+            from app.database.managers.scope_manager import ScopeManager
 
             db = ProjectWorksManager()
-            db_p = ProjectsManager()
 
             project_work_ids = []
 
             if current_user["role"] == "project-leader":
-                led_projects = db_p.get_all_filtered(
-                    project_leader=current_user["user_id"]
-                )
-                led_project_ids = {p["project_id"] for p in led_projects}
+                # Все проекты пакета проверяются одним запросом
+                if not ScopeManager().leads_projects(
+                    current_user["user_id"],
+                    [data["project"] for data in data_list],  # type: ignore
+                ):
+                    logger.warning(
+                        "Trying to add work for a non-owned project",
+                        extra={"login": current_user},
+                    )
+                    return {
+                        "msg": "You cannot add works for projects you do not own"
+                    }, 403
 
                 for data in data_list:  # type: ignore
-                    if str(data["project"]) not in led_project_ids:
-                        logger.warning(
-                            "Trying to add work for a non-owned project",
-                            extra={"login": current_user},
-                        )
-                        return {
-                            "msg": "You cannot add works for projects you do not own"
-                        }, 403
                     data["signed"] = False
                     new_project_work = db.add(
                         created_by=current_user["user_id"], **data
@@ -120,12 +116,12 @@ class ProjectWorkAddBulk(Resource):
 
 @project_work_ns.route("/add")
 class ProjectWorkAdd(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_work_ns.expect(project_work_create_model)
     @project_work_ns.marshal_with(project_work_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new project work", extra={"login": current_user})
 
         schema = ProjectWorkCreateSchema()
@@ -139,21 +135,17 @@ class ProjectWorkAdd(Resource):
             return {"error": err.messages}, 400
 
         try:
-            from app.database.managers.projects_managers import (
-                ProjectsManager,
-                ProjectWorksManager,
-            )
+            from app.database.managers.projects_managers import ProjectWorksManager
+            from app.database.managers.scope_manager import ScopeManager
 
             db = ProjectWorksManager()
-            db_p = ProjectsManager()
 
             if current_user["role"] == "project-leader":
                 data["signed"] = False  # type: ignore
-                led_projects = db_p.get_all_filtered(
-                    project_leader=current_user["user_id"]
-                )
-                led_project_ids = {p["project_id"] for p in led_projects}
-                if str(data["project"]) not in led_project_ids:  # type: ignore
+                if not ScopeManager().leads_project(
+                    current_user["user_id"],
+                    data["project"],  # type: ignore
+                ):
                     logger.warning(
                         "Trying to add not own project work",
                         extra={"login": current_user},
@@ -179,10 +171,10 @@ class ProjectWorkAdd(Resource):
 
 @project_work_ns.route("/<string:project_work_id>/view")
 class ProjectWorkView(Resource):
-    @jwt_required()
+    @auth_required
     @project_work_ns.marshal_with(project_work_response)
     def get(self, project_work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to view project work: {project_work_id}",
             extra={"login": current_user},
@@ -213,11 +205,11 @@ class ProjectWorkView(Resource):
 
 @project_work_ns.route("/<string:project_work_id>/delete/soft")
 class ProjectWorkSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_work_ns.marshal_with(project_work_msg_model)
     def patch(self, project_work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete project work: {project_work_id}",
             extra={"login": current_user},
@@ -238,10 +230,11 @@ class ProjectWorkSoftDelete(Resource):
                 return {"msg": "Project work not found"}, 404
 
             if current_user["role"] == "project-leader":
-                led_project_works = db.get_work_ids_by_project_leader(
-                    current_user["user_id"]
-                )
-                if str(project_work_id) not in led_project_works:
+                from app.database.managers.scope_manager import ScopeManager
+
+                if not ScopeManager().leads_project_work(
+                    current_user["user_id"], project_work_id
+                ):
                     logger.warning(
                         "Trying to soft delete not user's project work",
                         extra={"login": current_user},
@@ -275,11 +268,11 @@ class ProjectWorkSoftDelete(Resource):
 
 @project_work_ns.route("/<string:project_work_id>/delete/hard")
 class ProjectWorkHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_work_ns.marshal_with(project_work_msg_model)
     def delete(self, project_work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete project work: {project_work_id}",
             extra={"login": current_user},
@@ -300,10 +293,11 @@ class ProjectWorkHardDelete(Resource):
                 return {"msg": "Project work not found"}, 404
 
             if current_user["role"] == "project-leader":
-                led_project_works = db.get_work_ids_by_project_leader(
-                    current_user["user_id"]
-                )
-                if str(project_work_id) not in led_project_works:
+                from app.database.managers.scope_manager import ScopeManager
+
+                if not ScopeManager().leads_project_work(
+                    current_user["user_id"], project_work_id
+                ):
                     logger.warning(
                         "Trying to hard delete not user's project work",
                         extra={"login": current_user},
@@ -345,12 +339,12 @@ class ProjectWorkHardDelete(Resource):
 
 @project_work_ns.route("/<string:project_work_id>/edit")
 class ProjectWorkEdit(Resource):
-    @jwt_required()
+    @auth_required
     @user_forbidden
     @project_work_ns.expect(project_work_create_model)
     @project_work_ns.marshal_with(project_work_msg_model)
     def patch(self, project_work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit project work: {project_work_id}",
             extra={"login": current_user},
@@ -380,10 +374,11 @@ class ProjectWorkEdit(Resource):
                 return {"msg": "Project work not found"}, 404
 
             if current_user["role"] == "project-leader":
-                led_project_works = db.get_work_ids_by_project_leader(
-                    current_user["user_id"]
-                )
-                if str(project_work_id) not in led_project_works:
+                from app.database.managers.scope_manager import ScopeManager
+
+                if not ScopeManager().leads_project_work(
+                    current_user["user_id"], project_work_id
+                ):
                     logger.warning(
                         "Trying to edit not user's project work",
                         extra={"login": current_user},
@@ -417,11 +412,11 @@ class ProjectWorkEdit(Resource):
 
 @project_work_ns.route("/all")
 class ProjectWorkAll(Resource):
-    @jwt_required()
+    @auth_required
     @project_work_ns.expect(project_work_filter_parser)
     @project_work_ns.marshal_with(project_work_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all project works", extra={"login": current_user})
 
         schema = ProjectWorkFilterSchema()
@@ -1,17 +1,17 @@
-import json
 import logging
 
 from flask import request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 
+from app.decorators import auth_required, current_identity, etag_conditional
 from app.routes.models.role_models import (
     role_all_response,
     role_filter_parser,
     role_model,
 )
 from app.schemas.role_schemas import RoleFilterSchema
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -23,11 +23,12 @@ role_ns.models[role_model.name] = role_model
 
 @role_ns.route("/all")
 class RoleAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("roles")
     @role_ns.expect(role_filter_parser)
     @role_ns.marshal_with(role_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all roles.", extra={"login": current_user})
 
         schema = RoleFilterSchema()
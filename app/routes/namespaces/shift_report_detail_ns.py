@@ -1,14 +1,13 @@
 # Namespace for ShiftReportDetails
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
+from app.decorators import auth_required, current_identity
 from app.routes.models.shift_report_detail_models import (
     project_work_brief_model,
     shift_report_brief_model,
@@ -28,6 +27,7 @@ from app.schemas.shift_report_detail_schemas import (
     ShiftReportDetailsEditSchema,
     ShiftReportDetailsFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -68,11 +68,11 @@ shift_report_details_ns.models[shift_report_details_by_report_ids.name] = (
 
 @shift_report_details_ns.route("/add/many")
 class ShiftReportDetailsAddBulk(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.expect([shift_report_details_create_model])
     @shift_report_details_ns.marshal_with(shift_report_details_many_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add multiple shift report details",
             extra={"login": current_user},
@@ -123,11 +123,11 @@ class ShiftReportDetailsAddBulk(Resource):
 
 @shift_report_details_ns.route("/add")
 class ShiftReportDetailsAdd(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.expect(shift_report_details_create_model)
     @shift_report_details_ns.marshal_with(shift_report_details_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add new shift report detail", extra={"login": current_user}
         )
@@ -174,10 +174,10 @@ class ShiftReportDetailsAdd(Resource):
 
 @shift_report_details_ns.route("/<string:detail_id>/view")
 class ShiftReportDetailsView(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.marshal_with(shift_report_details_response)
     def get(self, detail_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view shift report detail: {detail_id}",
             extra={"login": current_user},
@@ -212,10 +212,10 @@ class ShiftReportDetailsView(Resource):
 
 @shift_report_details_ns.route("/<string:detail_id>/delete/hard")
 class ShiftReportDetailsDelete(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.marshal_with(shift_report_details_msg_model)
     def delete(self, detail_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to delete shift report detail: {detail_id}",
             extra={"login": current_user},
@@ -260,11 +260,11 @@ class ShiftReportDetailsDelete(Resource):
 
 @shift_report_details_ns.route("/<string:detail_id>/edit")
 class ShiftReportDetailsEdit(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.expect(shift_report_details_edit_model)
     @shift_report_details_ns.marshal_with(shift_report_details_msg_model)
     def patch(self, detail_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to edit shift report detail: {detail_id}",
             extra={"login": current_user},
@@ -313,11 +313,11 @@ class ShiftReportDetailsEdit(Resource):
 
 @shift_report_details_ns.route("/all")
 class ShiftReportDetailsAll(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.expect(shift_report_details_filter_parser)
     @shift_report_details_ns.marshal_with(shift_report_details_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch all shift report details", extra={"login": current_user}
         )
@@ -394,12 +394,12 @@ class ShiftReportDetailsAll(Resource):
 
 @shift_report_details_ns.route("/all-by-reports")
 class ShiftReportDetailsByReports(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_details_ns.expect(shift_report_details_by_report_ids, validate=True)
     @shift_report_details_ns.doc(consumes=["application/json"])
     @shift_report_details_ns.marshal_with(shift_report_details_all_response)
     def post(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch shift report details by shift report ids",
             extra={"login": current_user},
@@ -1,14 +1,13 @@
-import json
 import logging
 from typing import Any, cast
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
+from app.decorators import auth_required, current_identity
 from app.routes.models.shift_report_material_models import (
     shift_report_material_all_response,
     shift_report_material_create_model,
@@ -22,6 +21,7 @@ from app.schemas.shift_report_material_schemas import (
     ShiftReportMaterialEditSchema,
     ShiftReportMaterialFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -74,11 +74,11 @@ shift_report_material_ns.models[shift_report_material_model.name] = (
 
 @shift_report_material_ns.route("/add")
 class ShiftReportMaterialAdd(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_material_ns.expect(shift_report_material_create_model)
     @shift_report_material_ns.marshal_with(shift_report_material_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add new shift report material", extra={"login": current_user}
         )
@@ -127,10 +127,10 @@ class ShiftReportMaterialAdd(Resource):
 
 @shift_report_material_ns.route("/<string:shift_report_material_id>/view")
 class ShiftReportMaterialView(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_material_ns.marshal_with(shift_report_material_response)
     def get(self, shift_report_material_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view shift report material: {shift_report_material_id}",
             extra={"login": current_user},
@@ -167,10 +167,10 @@ class ShiftReportMaterialView(Resource):
 
 @shift_report_material_ns.route("/<string:shift_report_material_id>/delete/hard")
 class ShiftReportMaterialHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_material_ns.marshal_with(shift_report_material_msg_model)
     def delete(self, shift_report_material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete shift report material: {shift_report_material_id}",
             extra={"login": current_user},
@@ -237,11 +237,11 @@ class ShiftReportMaterialHardDelete(Resource):
 
 @shift_report_material_ns.route("/<string:shift_report_material_id>/edit")
 class ShiftReportMaterialEdit(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_material_ns.expect(shift_report_material_create_model)
     @shift_report_material_ns.marshal_with(shift_report_material_msg_model)
     def patch(self, shift_report_material_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit shift report material: {shift_report_material_id}",
             extra={"login": current_user},
@@ -305,11 +305,11 @@ class ShiftReportMaterialEdit(Resource):
 
 @shift_report_material_ns.route("/all")
 class ShiftReportMaterialAll(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_material_ns.expect(shift_report_material_filter_parser)
     @shift_report_material_ns.marshal_with(shift_report_material_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch all shift report materials", extra={"login": current_user}
         )
@@ -1,28 +1,54 @@
 # Namespace for ShiftReports
-import json
 import logging
 from uuid import UUID
 
-from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask import (
+    Response,
+    abort,
+    current_app,
+    request,
+    send_file,
+    stream_with_context,
+)
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    user_forbidden,
+)
 from app.routes.models.shift_report_models import (
     shift_report_all_response,
+    shift_report_calendar_cell_model,
+    shift_report_calendar_parser,
+    shift_report_calendar_response,
     shift_report_create_model,
     shift_report_detail_model,
+    shift_report_export_parser,
+    shift_report_fill_distances_parser,
     shift_report_filter_parser,
+    shift_report_geofence_parser,
+    shift_report_geofence_response,
+    shift_report_geofence_row_model,
+    shift_report_geofence_summary_model,
     shift_report_model,
     shift_report_msg_model,
     shift_report_response,
 )
 from app.schemas.shift_report_schemas import (
+    ShiftReportCalendarSchema,
     ShiftReportCreateSchema,
     ShiftReportEditSchema,
+    ShiftReportExportSchema,
+    ShiftReportFillDistancesSchema,
     ShiftReportFilterSchema,
+    ShiftReportGeofenceSchema,
 )
+from app.utils.exports import CSV_MIMETYPE, XLSX_MIMETYPE, iter_csv, write_xlsx
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -38,15 +64,102 @@ shift_report_ns.models[shift_report_create_model.name] = shift_report_create_mod
 shift_report_ns.models[shift_report_msg_model.name] = shift_report_msg_model
 shift_report_ns.models[shift_report_response.name] = shift_report_response
 shift_report_ns.models[shift_report_all_response.name] = shift_report_all_response
+shift_report_ns.models[shift_report_calendar_cell_model.name] = (
+    shift_report_calendar_cell_model
+)
+shift_report_ns.models[shift_report_calendar_response.name] = (
+    shift_report_calendar_response
+)
+shift_report_ns.models[shift_report_geofence_row_model.name] = (
+    shift_report_geofence_row_model
+)
+shift_report_ns.models[shift_report_geofence_summary_model.name] = (
+    shift_report_geofence_summary_model
+)
+shift_report_ns.models[shift_report_geofence_response.name] = (
+    shift_report_geofence_response
+)
+
+
+def load_filter_args(schema, args=None):
+    """Валидирует query-параметры, собирая списковые фильтры user/project.
+
+    args — MultiDict параметров (по умолчанию request.args)."""
+    args = request.args if args is None else args
+    raw_args = args.to_dict()
+    user_args = args.getlist("user")
+    project_args = args.getlist("project")
+    if user_args:
+        raw_args["user"] = user_args  # type: ignore
+    if project_args:
+        raw_args["project"] = project_args  # type: ignore
+    return schema.load(raw_args)
+
+
+def build_filters(args):
+    """Собирает фильтры для ShiftReportsManager из провалидированных параметров."""
+    user_filter = args.get("user") or []
+    project_filter = args.get("project") or []
+    filters = {
+        "user": [UUID(user_id) for user_id in user_filter] if user_filter else None,
+        "date_from": int(args.get("date_from")) if args.get("date_from") else None,
+        "date_to": int(args.get("date_to")) if args.get("date_to") else None,
+        "project": [UUID(project_id) for project_id in project_filter]
+        if project_filter
+        else None,
+    }
+    for key in [
+        "date_start_from",
+        "date_start_to",
+        "date_end_from",
+        "date_end_to",
+        "lng_start",
+        "ltd_start",
+        "lng_end",
+        "ltd_end",
+        "distance_start",
+        "distance_end",
+        "created_by",
+        "created_at",
+        "night_shift",
+        "extreme_conditions",
+        "signed",
+        "deleted",
+        "comment",
+    ]:
+        filters[key] = args.get(key)
+    return filters
+
+
+def apply_role_scope(current_user, filters, session=None):
+    """Ограничивает фильтры областью видимости роли.
+
+    Возвращает False, если прораб запрашивает чужие проекты."""
+    if current_user["role"] == "user":
+        filters["user"] = [UUID(current_user["user_id"])]
+
+    if current_user["role"] == "project-leader":
+        from app.database.managers.scope_manager import ScopeManager
+
+        if not filters["project"]:
+            # Проекты прораба — подзапросом в том же SQL, без списка id
+            filters["project"] = ScopeManager.led_projects_select(
+                current_user["user_id"]
+            )
+        elif not ScopeManager(session=session).leads_projects(
+            current_user["user_id"], filters["project"]
+        ):
+            return False
+    return True
 
 
 @shift_report_ns.route("/add")
 class ShiftReportAdd(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.expect(shift_report_create_model)
     @shift_report_ns.marshal_with(shift_report_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new shift report", extra={"login": current_user})
 
         schema = ShiftReportCreateSchema()
@@ -91,10 +204,10 @@ class ShiftReportAdd(Resource):
 
 @shift_report_ns.route("/<string:report_id>/view")
 class ShiftReportView(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.marshal_with(shift_report_response)
     def get(self, report_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view shift report: {report_id}", extra={"login": current_user}
         )
@@ -123,10 +236,10 @@ class ShiftReportView(Resource):
 
 @shift_report_ns.route("/<string:report_id>/delete/soft")
 class ShiftReportSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.marshal_with(shift_report_msg_model)
     def patch(self, report_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete shift report: {report_id}",
             extra={"login": current_user},
@@ -178,10 +291,10 @@ class ShiftReportSoftDelete(Resource):
 
 @shift_report_ns.route("/<string:report_id>/delete/hard")
 class ShiftReportHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.marshal_with(shift_report_msg_model)
     def delete(self, report_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete shift report: {report_id}",
             extra={"login": current_user},
@@ -235,11 +348,11 @@ class ShiftReportHardDelete(Resource):
 
 @shift_report_ns.route("/<string:report_id>/edit")
 class ShiftReportEdit(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.expect(shift_report_create_model)
     @shift_report_ns.marshal_with(shift_report_msg_model)
     def patch(self, report_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit shift report: {report_id}", extra={"login": current_user}
         )
@@ -333,24 +446,16 @@ class ShiftReportEdit(Resource):
 
 @shift_report_ns.route("/all")
 class ShiftReportAll(Resource):
-    @jwt_required()
+    @auth_required
     @shift_report_ns.expect(shift_report_filter_parser)
     @shift_report_ns.marshal_with(shift_report_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all shift reports", extra={"login": current_user})
 
         # Валидация query-параметров через Marshmallow
-        schema = ShiftReportFilterSchema()
-        raw_args = request.args.to_dict()
-        user_args = request.args.getlist("user")
-        project_args = request.args.getlist("project")
-        if user_args:
-            raw_args["user"] = user_args  # type: ignore
-        if project_args:
-            raw_args["project"] = project_args  # type: ignore
         try:
-            args = schema.load(raw_args)  # Валидируем query-параметры
+            args = load_filter_args(ShiftReportFilterSchema())
         except ValidationError as err:
             logger.error(
                 f"Validation error: {err.messages}", extra={"login": current_user}
@@ -360,46 +465,9 @@ class ShiftReportAll(Resource):
         limit = args.get("limit", None)  # type: ignore
         sort_by = args.get("sort_by")  # type: ignore
         sort_order = args.get("sort_order", "desc")  # type: ignore
-        user_filter = args.get("user") or []  # type: ignore
-        project_filter = args.get("project") or []  # type: ignore
-        filters = {
-            "user": [UUID(user_id) for user_id in user_filter] if user_filter else None,  # type: ignore
-            "date_from": int(args.get("date_from")) if args.get("date_from") else None,  # type: ignore
-            "date_to": int(args.get("date_to")) if args.get("date_to") else None,  # type: ignore
-            "project": [UUID(project_id) for project_id in project_filter]
-            if project_filter
-            else None,  # type: ignore
-            "lng_start": args.get("lng_start"),  # type: ignore
-            "ltd_start": args.get("ltd_start"),  # type: ignore
-            "lng_end": args.get("lng_end"),  # type: ignore
-            "ltd_end": args.get("ltd_end"),  # type: ignore
-            "distance_start": args.get("distance_start"),  # type: ignore
-            "distance_end": args.get("distance_end"),  # type: ignore
-            "created_by": args.get("created_by"),  # type: ignore
-            "created_at": args.get("created_at"),  # type: ignore
-            "signed": args.get("signed", None),  # type: ignore
-            "deleted": args.get("deleted", None),  # type: ignore
-            "comment": args.get("comment"),  # type: ignore
-        }
-        if current_user["role"] == "user":
-            filters["user"] = [UUID(current_user["user_id"])]
-
-        if current_user["role"] == "project-leader":
-            from app.database.managers.projects_managers import ProjectsManager
-
-            project_manager = ProjectsManager()
-            user_projects = project_manager.get_projects_by_leader(
-                UUID(current_user["user_id"])
-            )
-            project_ids = [p["project_id"] for p in user_projects]
-            if not filters["project"]:
-                if not project_ids:
-                    return {"msg": "No shift reports found", "shift_reports": []}, 200
-                # Фильтруем только по проектам прораба
-                filters["project"] = project_ids
-            else:
-                if any(proj not in project_ids for proj in filters["project"]):  # type: ignore
-                    return {"msg": "Forbidden"}, 403
+        filters = build_filters(args)
+        if not apply_role_scope(current_user, filters):
+            return {"msg": "Forbidden"}, 403
 
         logger.debug(
             f"Fetching shift reports with filters: {filters}, offset={offset}, limit={
@@ -437,3 +505,204 @@ class ShiftReportAll(Resource):
                 f"Error fetching shift reports: {e}", extra={"login": current_user}
             )
             return {"msg": f"Error fetching shift reports: {e}"}, 500
+
+
+@shift_report_ns.route("/export/<string:entity>")
+@shift_report_ns.doc(
+    params={"entity": "What to export: shift_reports, details or materials"}
+)
+class ShiftReportExport(Resource):
+    @auth_required
+    @shift_report_ns.expect(shift_report_export_parser)
+    @shift_report_ns.response(200, "XLSX or CSV file")
+    def get(self, entity):
+        current_user = current_identity()
+        logger.info(
+            f"Request to export {entity} of shift reports",
+            extra={"login": current_user},
+        )
+
+        from app.database.managers.shift_reports_managers import ShiftReportsManager
+
+        if entity not in ShiftReportsManager.EXPORT_ENTITIES:
+            return {"msg": f"Unknown export entity: {entity}"}, 404
+
+        try:
+            args = load_filter_args(ShiftReportExportSchema())
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+        filters = build_filters(args)
+        if not apply_role_scope(current_user, filters):
+            return {"msg": "Forbidden"}, 403
+
+        db = ShiftReportsManager()
+        rows = db.iter_export_rows(
+            entity=entity,
+            sort_by=args.get("sort_by") or "date",  # type: ignore
+            sort_order=args.get("sort_order", "asc"),  # type: ignore
+            **filters,
+        )
+        file_format = args.get("format", "xlsx")  # type: ignore
+        download_name = f"{entity}.{file_format}"
+
+        if file_format == "csv":
+            return Response(
+                stream_with_context(iter_csv(rows)),
+                mimetype=CSV_MIMETYPE,
+                headers={
+                    "Content-Disposition": f'attachment; filename="{download_name}"'
+                },
+            )
+
+        try:
+            output = write_xlsx(rows, title=entity)
+        except Exception as e:
+            logger.error(
+                f"Error exporting {entity}: {e}", extra={"login": current_user}
+            )
+            return {"msg": f"Error exporting {entity}: {e}"}, 500
+        return send_file(
+            output,
+            mimetype=XLSX_MIMETYPE,
+            as_attachment=True,
+            download_name=download_name,
+        )
+
+
+@shift_report_ns.route("/geofence")
+class ShiftReportGeofence(Resource):
+    @auth_required
+    @user_forbidden
+    @shift_report_ns.expect(shift_report_geofence_parser)
+    @shift_report_ns.marshal_with(shift_report_geofence_response)
+    def get(self):
+        current_user = current_identity()
+        logger.info(
+            "Request to check shift reports geofence", extra={"login": current_user}
+        )
+
+        try:
+            args = load_filter_args(ShiftReportGeofenceSchema())
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+        filters = build_filters(args)
+        if not apply_role_scope(current_user, filters):
+            return {"msg": "Forbidden"}, 403
+
+        radius = args.get("radius")  # type: ignore
+        if radius is None:
+            radius = current_app.config["GEOFENCE_RADIUS"]
+
+        try:
+            from app.database.managers.shift_reports_managers import ShiftReportsManager
+
+            db = ShiftReportsManager()
+            summary, reports = db.get_geofence_report(
+                radius=radius,
+                tolerance=args.get("tolerance"),  # type: ignore
+                only_violations=args.get("only_violations", True),  # type: ignore
+                **filters,
+            )
+            logger.info(
+                f"Geofence checked: {summary['checked']} reports, "
+                f"{summary['violations']} violations",
+                extra={"login": current_user},
+            )
+            return {
+                "msg": "Geofence check completed successfully",
+                "summary": summary,
+                "shift_reports": reports,
+            }, 200
+        except Exception as e:
+            logger.error(f"Error checking geofence: {e}", extra={"login": current_user})
+            return {"msg": f"Error checking geofence: {e}"}, 500
+
+
+@shift_report_ns.route("/geofence/fill")
+class ShiftReportFillDistances(Resource):
+    @auth_required
+    @admin_required
+    @shift_report_ns.expect(shift_report_fill_distances_parser)
+    @shift_report_ns.marshal_with(shift_report_geofence_response)
+    def post(self):
+        current_user = current_identity()
+        logger.info(
+            "Request to fill shift report distances", extra={"login": current_user}
+        )
+
+        try:
+            args = load_filter_args(ShiftReportFillDistancesSchema())
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+        filters = build_filters(args)
+
+        try:
+            from app.database.managers.shift_reports_managers import ShiftReportsManager
+
+            db = ShiftReportsManager()
+            updated = db.fill_distances(
+                overwrite=args.get("overwrite", False),  # type: ignore
+                **filters,
+            )
+            logger.info(
+                f"Distances filled for {updated} shift reports",
+                extra={"login": current_user},
+            )
+            return {"msg": "Distances filled successfully", "updated": updated}, 200
+        except Exception as e:
+            logger.error(f"Error filling distances: {e}", extra={"login": current_user})
+            return {"msg": f"Error filling distances: {e}"}, 500
+
+
+@shift_report_ns.route("/calendar")
+class ShiftReportCalendar(Resource):
+    @auth_required
+    @shift_report_ns.expect(shift_report_calendar_parser)
+    @shift_report_ns.marshal_with(shift_report_calendar_response)
+    def get(self):
+        current_user = current_identity()
+        logger.info(
+            "Request to fetch shift reports calendar", extra={"login": current_user}
+        )
+
+        try:
+            args = load_filter_args(ShiftReportCalendarSchema())
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+        filters = build_filters(args)
+        if not apply_role_scope(current_user, filters):
+            return {"msg": "Forbidden"}, 403
+
+        try:
+            from app.database.managers.shift_reports_managers import ShiftReportsManager
+
+            db = ShiftReportsManager()
+            calendar = db.get_calendar(
+                day_from=args["day_from"],  # type: ignore
+                day_to=args["day_to"],  # type: ignore
+                group_by=args["group_by"],  # type: ignore
+                **filters,
+            )
+            logger.info(
+                f"Successfully fetched calendar: {len(calendar)} cells",
+                extra={"login": current_user},
+            )
+            return {
+                "msg": "Calendar fetched successfully",
+                "calendar": calendar,
+            }, 200
+        except Exception as e:
+            logger.error(f"Error fetching calendar: {e}", extra={"login": current_user})
+            return {"msg": f"Error fetching calendar: {e}"}, 500
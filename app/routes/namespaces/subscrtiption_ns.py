@@ -1,20 +1,12 @@
 import json
 import logging
-from base64 import urlsafe_b64encode
 from uuid import UUID
 
-from cryptography.hazmat.primitives.serialization import (
-    Encoding,
-    PublicFormat,
-    load_pem_private_key,
-    load_pem_public_key,
-)
 from flask import request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
-from pywebpush import WebPushException, webpush
 
+from app.decorators import auth_required, current_identity
 from app.routes.models.subscription_models import (
     notification_model,
     subscription_all_response,
@@ -24,6 +16,8 @@ from app.routes.models.subscription_models import (
     subscription_msg_model,
 )
 from app.schemas.subscription_schemas import SubscriptionGetSchema, SubscriptionSchema
+from app.utils.marshalling import Namespace
+from app.utils.vapid import vapid_private_key
 
 subscription_ns = Namespace("subscriptions", description="Subscription actions")
 
@@ -35,22 +29,6 @@ subscription_ns.models[notification_model.name] = notification_model
 
 logger = logging.getLogger("ok_service")
 
-# Чтение публичного ключа из файла
-with open("vapid_public_key.pem", "rb") as f:
-    public_key = load_pem_public_key(f.read())
-
-# Чтение приватного ключа из файла
-with open("vapid_private_key.pem", "rb") as f:
-    private_key = load_pem_private_key(f.read(), password=None)
-
-# Извлечение сырого публичного ключа
-raw_public_key = public_key.public_bytes(
-    encoding=Encoding.X962, format=PublicFormat.UncompressedPoint
-)
-
-# Преобразование в Base64 URL-safe
-VAPID_PUBLIC_KEY = urlsafe_b64encode(raw_public_key).decode("utf-8")
-
 VAPID_CLAIMS = {"sub": "https://fcm.googleapis.com"}
 
 
@@ -59,14 +37,14 @@ subscription_ns.models[subscription_create_model.name] = subscription_create_mod
 
 @subscription_ns.route("/subscribe")
 class Subscribe(Resource):
-    @jwt_required()
+    @auth_required
     @subscription_ns.expect(subscription_create_model)
     @subscription_ns.marshal_with(subscription_msg_model)
     def post(self):
         from app.database.managers.subscription_manager import SubscriptionsManager
 
         db = SubscriptionsManager()
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Полученные данные: {request.json}", extra={"login": current_user})
 
         # Используем правильную схему
@@ -109,11 +87,11 @@ class Subscribe(Resource):
 
 @subscription_ns.route("/send_notification")
 class SendNotification(Resource):
-    @jwt_required()
+    @auth_required
     @subscription_ns.expect(notification_model)
     @subscription_ns.marshal_with(subscription_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         from app.database.managers.subscription_manager import SubscriptionsManager
 
         db = SubscriptionsManager()
@@ -137,18 +115,15 @@ class SendNotification(Resource):
             "endpoint": subscription["endpoint"],
             "keys": json.loads(subscription["keys"]),
         }
+        # pywebpush тянет aiohttp — импортируем только при отправке
+        from pywebpush import WebPushException, webpush
 
         try:
             message_data = {"header": "Test Notification", "text": message}
             webpush(
                 subscription_info=subscription_info,
                 data=json.dumps(message_data),
-                vapid_private_key=urlsafe_b64encode(
-                    private_key.private_numbers().private_value.to_bytes(  # type: ignore
-                        length=(private_key.key_size + 7) // 8,  # type: ignore
-                        byteorder="big",  # type: ignore
-                    )
-                ).decode("utf-8"),
+                vapid_private_key=vapid_private_key(),
                 vapid_claims=VAPID_CLAIMS,  # type: ignore
             )
             logger.info(
@@ -165,10 +140,10 @@ class SendNotification(Resource):
 
 @subscription_ns.route("/<string:subscription_id>/unsubscribe")
 class Unsubscribe(Resource):
-    @jwt_required()
+    @auth_required
     @subscription_ns.marshal_with(subscription_msg_model)
     def delete(self, subscription_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         from app.database.managers.subscription_manager import SubscriptionsManager
 
         db = SubscriptionsManager()
@@ -201,11 +176,11 @@ class Unsubscribe(Resource):
 
 @subscription_ns.route("/all")
 class GetAllSubscriptions(Resource):
-    @jwt_required()
+    @auth_required
     @subscription_ns.expect(subscription_filter_parser)
     @subscription_ns.marshal_with(subscription_all_response)
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to fetch all shift reports", extra={"login": current_user})
 
         # Валидация query-параметров через Marshmallow
@@ -0,0 +1,95 @@
+# Namespace for delta sync
+import logging
+from uuid import UUID
+
+from flask import request
+from flask_restx import Resource
+from marshmallow import ValidationError
+
+from app.decorators import auth_required, current_identity
+from app.routes.models.project_work_models import project_work_model
+from app.routes.models.shift_report_detail_models import (
+    project_work_brief_model,
+    shift_report_brief_model,
+    shift_report_details_model,
+)
+from app.routes.models.shift_report_models import shift_report_model
+from app.routes.models.sync_models import (
+    sync_deleted_model,
+    sync_parser,
+    sync_response,
+)
+from app.schemas.sync_schemas import SyncQuerySchema
+from app.utils.marshalling import Namespace
+
+logger = logging.getLogger("ok_service")
+
+sync_ns = Namespace("sync", description="Delta sync for mobile clients")
+
+# Initialize models
+sync_ns.models[shift_report_model.name] = shift_report_model
+sync_ns.models[project_work_brief_model.name] = project_work_brief_model
+sync_ns.models[shift_report_brief_model.name] = shift_report_brief_model
+sync_ns.models[shift_report_details_model.name] = shift_report_details_model
+sync_ns.models[project_work_model.name] = project_work_model
+sync_ns.models[sync_deleted_model.name] = sync_deleted_model
+sync_ns.models[sync_response.name] = sync_response
+
+
+@sync_ns.route("")
+class Sync(Resource):
+    @auth_required
+    @sync_ns.expect(sync_parser)
+    @sync_ns.marshal_with(sync_response)
+    def get(self):
+        current_user = current_identity()
+        logger.info("Request to sync changes", extra={"login": current_user})
+
+        try:
+            args = SyncQuerySchema().load(request.args)
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}", extra={"login": current_user}
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+
+        user = None
+        projects = None
+        leader = None
+        if current_user["role"] == "user":
+            user = UUID(current_user["user_id"])
+        elif current_user["role"] == "project-leader":
+            from app.database.managers.scope_manager import ScopeManager
+
+            # Прораб синхронизирует только свои проекты. Подзапрос, а не
+            # кэшированный список: область читается в том же снимке, что и
+            # данные, иначе строки проекта, переданного другому прорабу,
+            # пришли бы ему изменениями вместо удалений
+            leader = UUID(current_user["user_id"])
+            projects = ScopeManager.led_projects_select(leader)
+
+        try:
+            from app.database.managers.sync_manager import SyncManager
+
+            db = SyncManager()
+            token, changes, deleted, full_resync = db.get_changes(
+                since=args.get("since"),  # type: ignore
+                user=user,
+                projects=projects,
+                leader=leader,
+            )
+            logger.info(
+                f"Sync since {args.get('since')}: token {token}"  # type: ignore
+                + (", full resync" if full_resync else ""),
+                extra={"login": current_user},
+            )
+            return {
+                "msg": "Changes fetched successfully",
+                "token": token,
+                "full_resync": full_resync,
+                **changes,
+                "deleted": deleted,
+            }, 200
+        except Exception as e:
+            logger.error(f"Error syncing changes: {e}", extra={"login": current_user})
+            return {"msg": f"Error syncing changes: {e}"}, 500
@@ -1,26 +1,43 @@
-import json
+import io
 import logging
-from io import BytesIO
+from uuid import UUID
 
-import requests
-from flask import current_app, request, send_file
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask import Response, request, send_file, stream_with_context
+from flask_restx import Resource
 from marshmallow import ValidationError
 
-from app.routes.models.template_models import template_generate_model
+from app.decorators import auth_required, current_identity
+from app.routes.models.template_models import (
+    template_generate_model,
+    template_job_model,
+    template_job_msg_model,
+    template_job_response,
+)
 from app.schemas.template_schemas import TemplateGenerateSchema
+from app.utils.marshalling import Namespace
+from app.utils.template_client import (
+    TemplateServiceError,
+    payload_key,
+    template_client,
+)
 
 logger = logging.getLogger("ok_service")
 
+DOCX_MIMETYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+
 template_ns = Namespace("templates", description="template management operations")
 
 template_ns.models[template_generate_model.name] = template_generate_model
+template_ns.models[template_job_model.name] = template_job_model
+template_ns.models[template_job_msg_model.name] = template_job_msg_model
+template_ns.models[template_job_response.name] = template_job_response
 
 
 @template_ns.route("/generate")
 class templateAdd(Resource):
-    @jwt_required()
+    @auth_required
     @template_ns.expect(template_generate_model)
     @template_ns.response(400, "Bad request, invalid data.")
     @template_ns.response(500, "Internal Server Error")
@@ -35,7 +52,7 @@ class templateAdd(Resource):
         },
     )
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         schema = TemplateGenerateSchema()
         try:
             # Валидация входных данных
@@ -46,17 +63,136 @@ class templateAdd(Resource):
                 extra={"login": current_user.get("login")},
             )
             return {"msg": "Некорректные данные", "errors": err.messages}, 400
-        template_url = current_app.config.get("TEMPLATE_SERVICE_URL")
-        response = requests.post(url=template_url, json=data)  # type: ignore
-        if not response.ok:
+
+        # Одинаковые данные дают одинаковый документ — отдаём из кэша
+        key = payload_key(data)
+        cached = template_client.cached_path(key)
+        if cached:
+            try:
+                response = send_file(
+                    cached,
+                    mimetype=DOCX_MIMETYPE,
+                    as_attachment=True,
+                    download_name="output.docx",
+                )
+                response.headers["X-Template-Cache"] = "hit"
+                return response
+            except FileNotFoundError:
+                pass  # файл вытеснен из кэша между проверкой и чтением
+
+        try:
+            upstream = template_client.open_stream(data)
+        except TemplateServiceError as e:
             logger.error(
-                f"Ошибка от TEMPLATE_SERVICE: {response.status_code} - {response.text}"
+                f"Ошибка от TEMPLATE_SERVICE: {e}",
+                extra={"login": current_user.get("login")},
             )
-            return {"msg": "Ошибка при генерации файла"}, 500
-        document_bytes = response.content
+            return {"msg": "Ошибка при генерации файла"}, e.status
+
+        response = Response(
+            stream_with_context(template_client.iter_document(upstream, key)),
+            mimetype=DOCX_MIMETYPE,
+        )
+        # Клиент может отключиться до первой порции: тогда finally генератора
+        # не выполнится, и соединение с сервисом закрывается здесь
+        response.call_on_close(upstream.close)
+        response.headers["Content-Disposition"] = "attachment; filename=output.docx"
+        # iter_content распаковывает gzip/deflate, поэтому длина сжатого
+        # тела от сервиса шаблонов верна только без Content-Encoding
+        if upstream.headers.get("Content-Length") and not upstream.headers.get(
+            "Content-Encoding"
+        ):
+            response.headers["Content-Length"] = upstream.headers["Content-Length"]
+        response.headers["X-Template-Cache"] = "miss"
+        return response
+
+
+def _get_own_job(job_id, current_user):
+    """Задание, если оно существует и доступно пользователю, иначе ответ."""
+    try:
+        job_id = UUID(job_id)
+    except ValueError:
+        return None, ({"msg": "Invalid job id"}, 400)
+
+    from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+    job = DocumentJobsManager().get_by_id(job_id)
+    if not job:
+        return None, ({"msg": "Job not found"}, 404)
+    if current_user["role"] != "admin" and job["created_by"] != current_user["user_id"]:
+        return None, ({"msg": "Forbidden"}, 403)
+    return job, None
+
+
+@template_ns.route("/jobs")
+class TemplateJobCreate(Resource):
+    @auth_required
+    @template_ns.expect(template_generate_model)
+    @template_ns.marshal_with(template_job_msg_model, code=202)
+    @template_ns.doc(description="Постановка генерации файла в очередь")
+    def post(self):
+        current_user = current_identity()
+        try:
+            data = TemplateGenerateSchema().load(request.json)  # type: ignore
+        except ValidationError as err:
+            logger.error(
+                f"Validation error: {err.messages}",
+                extra={"login": current_user},
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+
+        from app.utils.document_jobs import document_job_runner
+
+        try:
+            job = document_job_runner.submit(data, created_by=current_user["user_id"])
+        except Exception as e:
+            logger.error(
+                f"Error creating document job: {e}", extra={"login": current_user}
+            )
+            return {"msg": f"Error creating document job: {e}"}, 500
+        logger.info(
+            f"Document job {job['job_id']} queued", extra={"login": current_user}
+        )
+        return {
+            "msg": "Job created",
+            "job_id": job["job_id"],
+            "status": job["status"],
+        }, 202
+
+
+@template_ns.route("/jobs/<string:job_id>")
+class TemplateJobView(Resource):
+    @auth_required
+    @template_ns.marshal_with(template_job_response)
+    def get(self, job_id):
+        current_user = current_identity()
+        job, error = _get_own_job(job_id, current_user)
+        if error:
+            return error
+        return {"msg": "Job found successfully", "job": job}, 200
+
+
+@template_ns.route("/jobs/<string:job_id>/download")
+class TemplateJobDownload(Resource):
+    @auth_required
+    @template_ns.response(409, "Job is not finished")
+    @template_ns.response(410, "Document expired")
+    def get(self, job_id):
+        current_user = current_identity()
+        job, error = _get_own_job(job_id, current_user)
+        if error:
+            return error
+        if job["status"] != "done":
+            return {"msg": "Job is not finished", "status": job["status"]}, 409
+
+        from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+        document = DocumentJobsManager().get_document(job["job_id"])
+        if document is None:
+            return {"msg": "Document expired, create a new job"}, 410
         return send_file(
-            BytesIO(document_bytes),
-            mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            io.BytesIO(document),
+            mimetype=DOCX_MIMETYPE,
             as_attachment=True,
             download_name="output.docx",
         )
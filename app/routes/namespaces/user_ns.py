@@ -1,13 +1,12 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
+from app.decorators import auth_required, current_identity
 from app.routes.models.user_models import (
     user_all_response,
     user_create_model,
@@ -17,6 +16,7 @@ from app.routes.models.user_models import (
     user_response,
 )
 from app.schemas.user_schemas import UserCreateSchema, UserEditSchema, UserFilterSchema
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -31,13 +31,13 @@ user_ns.models[user_model.name] = user_model
 
 @user_ns.route("/add")
 class UserAdd(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.expect(user_create_model)
     @user_ns.marshal_with(user_msg_model)
     @user_ns.response(400, "Bad request, invalid data.")
     @user_ns.response(500, "Internal Server Error")
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.debug(f"Decoded JWT Identity: {current_user}")
         if current_user["role"] != "admin":
             logger.warning(
@@ -114,12 +114,12 @@ class UserAdd(Resource):
 
 @user_ns.route("/<string:user_id>/view")
 class UserView(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.marshal_with(user_response)
     @user_ns.response(404, "User not found")
     @user_ns.response(500, "Internal Server Error")
     def get(self, user_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Запрос на просмотр пользователя user_id={user_id}",
             extra={"login": current_user.get("login")},
@@ -163,12 +163,12 @@ class UserView(Resource):
 
 @user_ns.route("/<string:user_id>/delete/soft")
 class UserDeleteSoft(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.marshal_with(user_msg_model)
     @user_ns.response(404, "User not found")
     @user_ns.response(500, "Internal Server Error")
     def patch(self, user_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user["role"] != "admin":
             logger.warning(
                 f"Несанкционированный запрос на мягкое удаление пользователя user_id={
@@ -224,12 +224,12 @@ class UserDeleteSoft(Resource):
 
 @user_ns.route("/<string:user_id>/restore")
 class UserRestore(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.marshal_with(user_msg_model)
     @user_ns.response(404, "User not found")
     @user_ns.response(500, "Internal Server Error")
     def patch(self, user_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user["role"] != "admin":
             logger.warning(
                 f"Несанкционированный запрос на восстановление пользователя user_id={
@@ -285,12 +285,12 @@ class UserRestore(Resource):
 
 @user_ns.route("/<string:user_id>/delete/hard")
 class UserDeleteHard(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.marshal_with(user_msg_model)
     @user_ns.response(404, "User not found")
     @user_ns.response(500, "Internal Server Error")
     def delete(self, user_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user["role"] != "admin":
             logger.warning(
                 f"Несанкционированный запрос на окончательное (hard) удаление пользователя user_id={
@@ -355,14 +355,14 @@ class UserDeleteHard(Resource):
 
 @user_ns.route("/<string:user_id>/edit")
 class UserEdit(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.expect(user_create_model)
     @user_ns.marshal_with(user_msg_model)
     @user_ns.response(400, "Bad request, invalid data.")
     @user_ns.response(404, "User not found")
     @user_ns.response(500, "Internal Server Error")
     def patch(self, user_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user["role"] != "admin":
             logger.warning(
                 f"Несанкционированный запрос на редактирование пользователя user_id={
@@ -464,12 +464,12 @@ class UserEdit(Resource):
 
 @user_ns.route("/all")
 class UserAll(Resource):
-    @jwt_required()
+    @auth_required
     @user_ns.expect(user_filter_parser)
     @user_ns.marshal_with(user_all_response)
     @user_ns.response(500, "Internal Server Error")
     def get(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Запрос на получение списка пользователей.",
             extra={"login": current_user.get("login")},
@@ -1,13 +1,11 @@
-import json
 import logging
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import admin_required, auth_required, current_identity
 from app.routes.models.work_category_models import (
     work_category_all_response,
     work_category_create_model,
@@ -21,6 +19,7 @@ from app.schemas.work_category_schemas import (
     WorkCategoryEditSchema,
     WorkCategoryFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -37,12 +36,12 @@ work_category_ns.models[work_category_model.name] = work_category_model
 
 @work_category_ns.route("/add")
 class WorkCategoryAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_category_ns.expect(work_category_create_model)
     @work_category_ns.marshal_with(work_category_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new work category.", extra={"login": current_user})
         schema = WorkCategoryCreateSchema()
         try:
@@ -90,10 +89,10 @@ class WorkCategoryAdd(Resource):
 
 @work_category_ns.route("/<string:work_category_id>/view")
 class WorkCategoryView(Resource):
-    @jwt_required()
+    @auth_required
     @work_category_ns.marshal_with(work_category_response)
     def get(self, work_category_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to view work category: {work_category_id}",
             extra={"login": current_user},
@@ -124,11 +123,11 @@ class WorkCategoryView(Resource):
 
 @work_category_ns.route("/<string:work_category_id>/delete/soft")
 class WorkCategoryDeleteSoft(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_category_ns.marshal_with(work_category_msg_model)
     def patch(self, work_category_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete work category: {work_category_id}",
             extra={"login": current_user},
@@ -160,11 +159,11 @@ class WorkCategoryDeleteSoft(Resource):
 
 @work_category_ns.route("/<string:work_category_id>/delete/hard")
 class WorkCategoryDeleteHard(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_category_ns.marshal_with(work_category_msg_model)
     def delete(self, work_category_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete work category: {work_category_id}",
             extra={"login": current_user},
@@ -205,12 +204,12 @@ class WorkCategoryDeleteHard(Resource):
 
 @work_category_ns.route("/<string:work_category_id>/edit")
 class WorkCategoryEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_category_ns.expect(work_category_create_model)
     @work_category_ns.marshal_with(work_category_msg_model)
     def patch(self, work_category_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit work category: {work_category_id}",
             extra={"login": current_user},
@@ -259,11 +258,11 @@ class WorkCategoryEdit(Resource):
 
 @work_category_ns.route("/all")
 class WorkCategoryAll(Resource):
-    @jwt_required()
+    @auth_required
     @work_category_ns.expect(work_category_filter_parser)
     @work_category_ns.marshal_with(work_category_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch all work categories.", extra={"login": current_user}
         )
@@ -1,14 +1,17 @@
-import json
 import logging
 from uuid import UUID
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    etag_conditional,
+)
 from app.routes.models.work_material_relation_models import (
     work_material_relation_all_response,
     work_material_relation_create_model,
@@ -22,6 +25,7 @@ from app.schemas.work_material_relation_schemas import (
     WorkMaterialRelationEditSchema,
     WorkMaterialRelationFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -49,12 +53,12 @@ work_material_relation_ns.models[work_material_relation_model.name] = (
 
 @work_material_relation_ns.route("/add")
 class WorkMaterialRelationAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_material_relation_ns.expect(work_material_relation_create_model)
     @work_material_relation_ns.marshal_with(work_material_relation_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             "Request to add new work material relation",
             extra={"login": current_user},
@@ -96,10 +100,10 @@ class WorkMaterialRelationAdd(Resource):
 
 @work_material_relation_ns.route("/<string:relation_id>/view")
 class WorkMaterialRelationView(Resource):
-    @jwt_required()
+    @auth_required
     @work_material_relation_ns.marshal_with(work_material_relation_response)
     def get(self, relation_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view work material relation: {relation_id}",
             extra={"login": current_user},
@@ -136,11 +140,11 @@ class WorkMaterialRelationView(Resource):
 
 @work_material_relation_ns.route("/<string:relation_id>/delete/hard")
 class WorkMaterialRelationHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_material_relation_ns.marshal_with(work_material_relation_msg_model)
     def delete(self, relation_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete work material relation: {relation_id}",
             extra={"login": current_user},
@@ -191,12 +195,12 @@ class WorkMaterialRelationHardDelete(Resource):
 
 @work_material_relation_ns.route("/<string:relation_id>/edit")
 class WorkMaterialRelationEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_material_relation_ns.expect(work_material_relation_create_model)
     @work_material_relation_ns.marshal_with(work_material_relation_msg_model)
     def patch(self, relation_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit work material relation: {relation_id}",
             extra={"login": current_user},
@@ -245,11 +249,12 @@ class WorkMaterialRelationEdit(Resource):
 
 @work_material_relation_ns.route("/all")
 class WorkMaterialRelationAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("work_material_relations")
     @work_material_relation_ns.expect(work_material_relation_filter_parser)
     @work_material_relation_ns.marshal_with(work_material_relation_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             "Request to fetch all work material relations",
             extra={"login": current_user},
@@ -1,23 +1,36 @@
-import json
 import logging
 from uuid import UUID
+from zipfile import BadZipFile
 
 from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    etag_conditional,
+)
 from app.routes.models.work_models import (
     work_all_response,
     work_create_model,
     work_filter_parser,
+    work_import_counts_model,
+    work_import_parser,
+    work_import_response,
     work_model,
     work_msg_model,
     work_response,
 )
-from app.schemas.work_schemas import WorkCreateSchema, WorkEditSchema, WorkFilterSchema
+from app.schemas.work_schemas import (
+    WorkCreateSchema,
+    WorkEditSchema,
+    WorkFilterSchema,
+    WorkImportSchema,
+)
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -29,16 +42,18 @@ work_ns.models[work_msg_model.name] = work_msg_model
 work_ns.models[work_response.name] = work_response
 work_ns.models[work_all_response.name] = work_all_response
 work_ns.models[work_model.name] = work_model
+work_ns.models[work_import_counts_model.name] = work_import_counts_model
+work_ns.models[work_import_response.name] = work_import_response
 
 
 @work_ns.route("/add")
 class WorkAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_ns.expect(work_create_model)
     @work_ns.marshal_with(work_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info("Request to add new work", extra={"login": current_user})
         if current_user["role"] != "admin":
             logger.warning(
@@ -77,10 +92,10 @@ class WorkAdd(Resource):
 
 @work_ns.route("/<string:work_id>/view")
 class WorkView(Resource):
-    @jwt_required()
+    @auth_required
     @work_ns.marshal_with(work_response)
     def get(self, work_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(f"Request to view work: {work_id}", extra={"login": current_user})
         try:
             try:
@@ -106,11 +121,11 @@ class WorkView(Resource):
 
 @work_ns.route("/<string:work_id>/delete/soft")
 class WorkSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_ns.marshal_with(work_msg_model)
     def patch(self, work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete work: {work_id}", extra={"login": current_user}
         )
@@ -144,11 +159,11 @@ class WorkSoftDelete(Resource):
 
 @work_ns.route("/<string:work_id>/delete/hard")
 class WorkHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_ns.marshal_with(work_msg_model)
     def delete(self, work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete work: {work_id}", extra={"login": current_user}
         )
@@ -188,12 +203,12 @@ class WorkHardDelete(Resource):
 
 @work_ns.route("/<string:work_id>/edit")
 class WorkEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_ns.expect(work_create_model)
     @work_ns.marshal_with(work_msg_model)
     def patch(self, work_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(f"Request to edit work: {work_id}", extra={"login": current_user})
 
         schema = WorkEditSchema()
@@ -230,11 +245,12 @@ class WorkEdit(Resource):
 
 @work_ns.route("/all")
 class WorkAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("works")
     @work_ns.expect(work_filter_parser)
     @work_ns.marshal_with(work_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info("Request to fetch all works", extra={"login": current_user})
 
         # Валидация query-параметров через Marshmallow
@@ -284,3 +300,48 @@ class WorkAll(Resource):
         except Exception as e:
             logger.error(f"Error fetching works: {e}", extra={"login": current_user})
             return {"msg": f"Error fetching works: {e}"}, 500
+
+
+@work_ns.route("/import")
+class WorkImport(Resource):
+    @auth_required
+    @admin_required
+    @work_ns.expect(work_import_parser)
+    @work_ns.marshal_with(work_import_response)
+    def post(self):
+        current_user = current_identity()
+        logger.info("Request to import price list", extra={"login": current_user})
+
+        try:
+            args = WorkImportSchema().load(request.args)
+        except ValidationError as err:
+            logger.error(
+                f"Validation error while importing price list: {err.messages}",
+                extra={"login": current_user},
+            )
+            return {"msg": "Validation error", "detail": err.messages}, 400
+        upload = request.files.get("file")
+        if upload is None:
+            return {"msg": "Price list file is required"}, 400
+
+        try:
+            from app.utils.db_works import import_price_list
+
+            summary = import_price_list(
+                upload.stream,
+                current_user["user_id"],
+                sheet_name=args.get("sheet"),  # type: ignore
+                dry_run=args["dry_run"],  # type: ignore
+            )
+        except (ValueError, KeyError, BadZipFile) as e:
+            logger.warning(f"Invalid price list: {e}", extra={"login": current_user})
+            return {"msg": f"Invalid price list: {e}"}, 400
+        except Exception as e:
+            logger.error(
+                f"Error importing price list: {e}", extra={"login": current_user}
+            )
+            return {"msg": f"Error importing price list: {e}"}, 500
+
+        logger.info(f"Price list imported: {summary}", extra={"login": current_user})
+        msg = "Price list checked" if summary["dry_run"] else "Price list imported"
+        return {"msg": f"{msg} successfully", **summary}, 200
@@ -1,27 +1,36 @@
-import json
 import logging
 from uuid import UUID
 
-from flask import abort, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask_restx import Namespace, Resource
+from flask import abort, current_app, request
+from flask_restx import Resource
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.decorators import admin_required
+from app.decorators import (
+    admin_required,
+    auth_required,
+    current_identity,
+    etag_conditional,
+)
 from app.routes.models.work_price_models import (
     work_price_all_response,
+    work_price_bulk_model,
+    work_price_bulk_response,
+    work_price_change_model,
     work_price_create_model,
     work_price_filter_parser,
+    work_price_matrix_row_model,
     work_price_model,
     work_price_msg_model,
     work_price_response,
 )
 from app.schemas.work_price_schemas import (
+    WorkPriceBulkSchema,
     WorkPriceCreateSchema,
     WorkPriceEditSchema,
     WorkPriceFilterSchema,
 )
+from app.utils.marshalling import Namespace
 
 logger = logging.getLogger("ok_service")
 
@@ -35,16 +44,20 @@ work_price_ns.models[work_price_msg_model.name] = work_price_msg_model
 work_price_ns.models[work_price_response.name] = work_price_response
 work_price_ns.models[work_price_all_response.name] = work_price_all_response
 work_price_ns.models[work_price_model.name] = work_price_model
+work_price_ns.models[work_price_matrix_row_model.name] = work_price_matrix_row_model
+work_price_ns.models[work_price_bulk_model.name] = work_price_bulk_model
+work_price_ns.models[work_price_change_model.name] = work_price_change_model
+work_price_ns.models[work_price_bulk_response.name] = work_price_bulk_response
 
 
 @work_price_ns.route("/add")
 class WorkPriceAdd(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_price_ns.expect(work_price_create_model)
     @work_price_ns.marshal_with(work_price_msg_model)
     def post(self):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         if current_user["role"] != "admin":
             logger.warning(
                 "Несанкционированный запрос на добавление нового объекта.",
@@ -85,10 +98,10 @@ class WorkPriceAdd(Resource):
 
 @work_price_ns.route("/<string:work_price_id>/view")
 class WorkPriceView(Resource):
-    @jwt_required()
+    @auth_required
     @work_price_ns.marshal_with(work_price_response)
     def get(self, work_price_id):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info(
             f"Request to view work price: {work_price_id}",
             extra={"login": current_user},
@@ -123,11 +136,11 @@ class WorkPriceView(Resource):
 
 @work_price_ns.route("/<string:work_price_id>/delete/soft")
 class WorkPriceSoftDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_price_ns.marshal_with(work_price_msg_model)
     def patch(self, work_price_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to soft delete work price: {work_price_id}",
             extra={"login": current_user},
@@ -162,11 +175,11 @@ class WorkPriceSoftDelete(Resource):
 
 @work_price_ns.route("/<string:work_price_id>/delete/hard")
 class WorkPriceHardDelete(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_price_ns.marshal_with(work_price_msg_model)
     def delete(self, work_price_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to hard delete work price: {work_price_id}",
             extra={"login": current_user},
@@ -207,12 +220,12 @@ class WorkPriceHardDelete(Resource):
 
 @work_price_ns.route("/<string:work_price_id>/edit")
 class WorkPriceEdit(Resource):
-    @jwt_required()
+    @auth_required
     @admin_required
     @work_price_ns.expect(work_price_create_model)
     @work_price_ns.marshal_with(work_price_msg_model)
     def patch(self, work_price_id):
-        current_user = json.loads(get_jwt_identity())
+        current_user = current_identity()
         logger.info(
             f"Request to edit work price: {work_price_id}",
             extra={"login": current_user},
@@ -258,11 +271,12 @@ class WorkPriceEdit(Resource):
 
 @work_price_ns.route("/all")
 class WorkPriceAll(Resource):
-    @jwt_required()
+    @auth_required
+    @etag_conditional("work_prices")
     @work_price_ns.expect(work_price_filter_parser)
     @work_price_ns.marshal_with(work_price_all_response)
     def get(self):
-        current_user = get_jwt_identity()
+        current_user = current_identity()
         logger.info("Request to fetch all work prices", extra={"login": current_user})
 
         # Валидация query-параметров через Marshmallow
@@ -320,3 +334,51 @@ class WorkPriceAll(Resource):
                 f"Error fetching work prices: {e}", extra={"login": current_user}
             )
             return {"msg": f"Error fetching work prices: {e}"}, 500
+
+
+@work_price_ns.route("/bulk")
+class WorkPriceBulk(Resource):
+    @auth_required
+    @admin_required
+    @work_price_ns.expect(work_price_bulk_model)
+    @work_price_ns.marshal_with(work_price_bulk_response)
+    def post(self):
+        current_user = current_identity()
+        logger.info("Request to bulk update work prices", extra={"login": current_user})
+
+        schema = WorkPriceBulkSchema()
+        try:
+            data = schema.load(request.json)  # type: ignore
+        except ValidationError as err:
+            logger.error(
+                f"Validation error while bulk updating work prices: {err.messages}",
+                extra={"login": current_user},
+            )
+            return {"msg": "Validation error", "error": err.messages}, 400
+        try:
+            from app.database.managers.works_managers import WorkPricesManager
+
+            db = WorkPricesManager()
+            summary = db.apply_matrix(
+                data["prices"],  # type: ignore
+                current_user["user_id"],
+                reprice=data["reprice"],  # type: ignore
+                reprice_backend=current_app.config.get(
+                    "REPRICE_JOBS_BACKEND", "inline"
+                ),
+            )
+        except ValueError as e:
+            logger.warning(f"Invalid price matrix: {e}", extra={"login": current_user})
+            return {"msg": str(e)}, 400
+        except Exception as e:
+            logger.error(
+                f"Error bulk updating work prices: {e}", extra={"login": current_user}
+            )
+            return {"msg": f"Error bulk updating work prices: {e}"}, 500
+
+        logger.info(
+            f"Work prices bulk updated: created {summary['created']}, "
+            f"updated {summary['updated']}",
+            extra={"login": current_user},
+        )
+        return {"msg": "Work prices updated successfully", **summary}, 200
@@ -0,0 +1,63 @@
+from marshmallow import (
+    Schema,
+    ValidationError,
+    fields,
+    pre_load,
+    validate,
+    validates_schema,
+)
+
+PAYROLL_GROUP_BY_CHOICES = ["project", "work", "night_shift", "extreme_conditions"]
+
+
+class PayrollFilterSchema(Schema):
+    class Meta:
+        unknown = "exclude"  # Исключать лишние поля
+
+    date_from = fields.Int(required=False)
+    date_to = fields.Int(required=False)
+    user = fields.List(fields.UUID(), required=False)
+    project = fields.List(fields.UUID(), required=False)
+    group_by = fields.List(
+        fields.String(
+            validate=validate.OneOf(
+                PAYROLL_GROUP_BY_CHOICES,
+                error="Group by must be one of: project, work, night_shift, "
+                "extreme_conditions.",
+            )
+        ),
+        required=False,
+    )
+
+    @pre_load
+    def split_list_filters(self, data, **kwargs):
+        """Normalize list-like filters (user, project, group_by)."""
+        data = dict(data)
+        for field_name in ["user", "project", "group_by"]:
+            raw_value = data.get(field_name)
+            if raw_value is None:
+                continue
+
+            values: list[str] = []
+            if isinstance(raw_value, str):
+                values = raw_value.split(",")
+            elif isinstance(raw_value, list):
+                for item in raw_value:
+                    if isinstance(item, str) and "," in item:
+                        values.extend(item.split(","))
+                    else:
+                        values.append(item)
+            else:
+                continue
+
+            data[field_name] = [str(val).strip() for val in values if str(val).strip()]
+        return data
+
+    @validates_schema
+    def validate_period(self, data, **kwargs):
+        date_from = data.get("date_from")
+        date_to = data.get("date_to")
+        if date_from is not None and date_to is not None and date_from > date_to:
+            raise ValidationError(
+                "'date_from' must be less than or equal to 'date_to'", "date_from"
+            )
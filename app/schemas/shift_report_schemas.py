@@ -220,3 +220,62 @@ class ShiftReportFilterSchema(Schema):
 
             data[field_name] = [str(val).strip() for val in values if str(val).strip()]
         return data
+
+
+class ShiftReportExportSchema(ShiftReportFilterSchema):
+    format = fields.String(
+        required=False,
+        missing="xlsx",
+        validate=validate.OneOf(
+            ["xlsx", "csv"], error="Format must be 'xlsx' or 'csv'."
+        ),
+    )
+
+
+class ShiftReportGeofenceSchema(ShiftReportFilterSchema):
+    radius = fields.Float(
+        required=False,
+        validate=validate.Range(min=0, error="Radius must be non-negative."),
+    )
+    tolerance = fields.Float(
+        required=False,
+        validate=validate.Range(min=0, error="Tolerance must be non-negative."),
+    )
+    only_violations = fields.Boolean(required=False, missing=True)
+
+
+class ShiftReportFillDistancesSchema(ShiftReportFilterSchema):
+    overwrite = fields.Boolean(required=False, missing=False)
+
+
+# Ограничение периода календаря, чтобы heatmap не превращался в выгрузку
+CALENDAR_MAX_DAYS = 366
+
+
+class ShiftReportCalendarSchema(ShiftReportFilterSchema):
+    day_from = fields.Date(required=True)
+    day_to = fields.Date(required=True)
+    group_by = fields.String(
+        required=False,
+        missing="user",
+        validate=validate.OneOf(
+            ["user", "project"], error="Group by must be 'user' or 'project'."
+        ),
+    )
+
+    @validates_schema
+    def validate_day_range(self, data, **kwargs):
+        day_from = data.get("day_from")
+        day_to = data.get("day_to")
+        if day_from is None or day_to is None:
+            return
+        if day_to < day_from:
+            raise ValidationError(
+                "Field 'day_to' must be greater than or equal to 'day_from'.",
+                "day_to",
+            )
+        if (day_to - day_from).days >= CALENDAR_MAX_DAYS:
+            raise ValidationError(
+                f"Calendar period must not exceed {CALENDAR_MAX_DAYS} days.",
+                "day_to",
+            )
@@ -0,0 +1,11 @@
+from marshmallow import Schema, fields, validate
+
+
+class SyncQuerySchema(Schema):
+    class Meta:
+        unknown = "exclude"  # Исключать лишние поля
+
+    since = fields.Int(
+        required=False,
+        validate=validate.Range(min=0, error="Sync token must be non-negative."),
+    )
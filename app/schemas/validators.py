@@ -57,11 +57,9 @@ def validate_work_exists(work_id_str):
     except ValueError as exc:
         raise ValidationError("Invalid UUID format") from exc
 
-    from app.database.managers.works_managers import WorksManager
+    from app.database.reference_cache import reference_cache
 
-    db = WorksManager()
-    work = db.get_record_by_id(work_id)
-    if not work:
+    if not reference_cache.work(work_id):
         raise ValidationError(f"Work with id={work_id} does not exist")
 
     return work_id_str
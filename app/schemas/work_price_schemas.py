@@ -41,3 +41,26 @@ class WorkPriceFilterSchema(Schema):
     sort_by = fields.String(required=False)
     sort_order = fields.String(required=False, validate=validate.OneOf(
         ["asc", "desc"], error="Sort order must be 'asc' or 'desc'."))
+
+
+class WorkPriceMatrixRowSchema(Schema):
+    class Meta:
+        unknown = "exclude"  # Исключать лишние поля
+
+    work = fields.UUID(required=True, error_messages={
+                       "required": "Field 'work' is required."})
+    prices = fields.Dict(
+        keys=fields.Int(validate=validate.OneOf([0, 1, 2, 3, 4])),
+        values=fields.Float(required=True, validate=validate.Range(
+            min=0, error="Price must be non-negative.")),
+        required=True, error_messages={"required": "Field 'prices' is required."})
+
+
+class WorkPriceBulkSchema(Schema):
+    class Meta:
+        unknown = "exclude"  # Исключать лишние поля
+
+    prices = fields.List(
+        fields.Nested(WorkPriceMatrixRowSchema), required=True,
+        validate=validate.Length(min=1, error="Price matrix must not be empty."))
+    reprice = fields.Boolean(required=False, missing=False)
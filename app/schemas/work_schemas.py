@@ -39,3 +39,11 @@ class WorkFilterSchema(Schema):
     sort_by = fields.String(required=False)
     sort_order = fields.String(required=False, validate=validate.OneOf(
         ["asc", "desc"], error="Sort order must be 'asc' or 'desc'."))
+
+
+class WorkImportSchema(Schema):
+    class Meta:
+        unknown = "exclude"  # Исключать лишние поля
+
+    sheet = fields.String(required=False, validate=validate.Length(min=1))
+    dry_run = fields.Boolean(required=False, missing=False)
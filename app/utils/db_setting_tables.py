@@ -19,26 +19,64 @@ def set_admin():
         return admin["user_id"]  # type: ignore
 
 
-def set_roles():
-    from app.database.managers.roles_managers import RolesManager
+ROLES = [
+    ("user", "Пользователь"),
+    ("admin", "Администратор"),
+    ("manager", "Менеджер"),
+    ("project-leader", "Прораб"),
+]
 
-    db = RolesManager()
+OBJECT_STATUSES = [
+    ("waiting", "В Ожидании"),
+    ("active", "Действующий"),
+    ("completed", "Завершенный"),
+]
 
-    ids = ["user", "admin", "manager", "project-leader"]
-    names = ["Пользователь", "Администратор", "Менеджер", "Прораб"]
 
-    for i in range(0, 4):
-        if not db.exists(role_id=ids[i]):
-            db.add(role_id=ids[i], name=names[i])
+SEED_REFERENCE_DATA = """
+WITH seeded_roles AS (
+    INSERT INTO roles (role_id, name)
+    SELECT * FROM unnest(CAST(:role_ids AS text[]), CAST(:role_names AS text[]))
+    ON CONFLICT (role_id) DO NOTHING
+    RETURNING 'roles'::text AS table_name
+), seeded_statuses AS (
+    INSERT INTO object_statuses (object_status_id, name)
+    SELECT * FROM unnest(CAST(:status_ids AS text[]), CAST(:status_names AS text[]))
+    ON CONFLICT (object_status_id) DO NOTHING
+    RETURNING 'object_statuses'::text AS table_name
+), bumped AS (
+    INSERT INTO table_versions (table_name, version)
+    SELECT table_name, 1
+    FROM (SELECT table_name FROM seeded_roles
+          UNION SELECT table_name FROM seeded_statuses) AS seeded
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1
+    RETURNING table_name
+)
+SELECT pg_notify(:channel, table_name) FROM bumped
+"""
 
 
-def set_object_status():
-    from app.database.managers.objects_managers import ObjectStatusesManager
+def seed_reference_data():
+    """Заполняет роли и статусы объектов одним запросом.
 
-    db = ObjectStatusesManager()
-    ids = ["waiting", "active", "completed"]
-    names = ["В Ожидании", "Действующий", "Завершенный"]
-    db.delete(record_id="in_progress")
-    for i in range(0, 3):
-        if not db.exists(object_status_id=ids[i]):
-            db.add(object_status_id=ids[i], name=names[i])
+    INSERT ... ON CONFLICT DO NOTHING для обеих таблиц в одном выражении
+    (вставки — в CTE): при каждом старте это один круглый путь до БД, а не
+    проверка и вставка каждой строки в отдельной сессии. Если строки
+    добавлены, версия таблицы увеличивается, как при записи через менеджер,
+    иначе клиенты с закэшированным списком получали бы 304."""
+    from sqlalchemy import text
+
+    from app.database.db_globals import engine
+    from app.database.reference_cache import NOTIFY_CHANNEL
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(SEED_REFERENCE_DATA),
+            {
+                "role_ids": [id_ for id_, _ in ROLES],
+                "role_names": [name for _, name in ROLES],
+                "status_ids": [id_ for id_, _ in OBJECT_STATUSES],
+                "status_names": [name for _, name in OBJECT_STATUSES],
+                "channel": NOTIFY_CHANNEL,
+            },
+        )
@@ -1,75 +1,87 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger("ok_service")
 
-def put_to_db(data, admin_id):
-    from app.database.managers.works_managers import (
-        WorkCategoriesManager,
-        WorkPricesManager,
-        WorksManager,
+# Лист и заголовки прайс-листа «Расценки СМР монтаж»
+DEFAULT_SHEET = "Расценки СМР монтаж"
+SHEET_COLUMNS = {
+    "Наименование оборудования": "work_category",
+    "Unnamed: 1": "work",
+    "1 разряд": "price_1",
+    "2 разряд": "price_2",
+    "3 разряд": "price_3",
+    "4 разряд": "price_4",
+}
+# Столбцы расценок по разрядам в нормализованном прайс-листе
+PRICE_COLUMNS = [f"price_{category}" for category in range(1, 5)]
+
+
+def normalize_price_sheet(df):
+    """Приводит лист прайс-листа к столбцам work_category, work, price_1..4.
+
+    Названия очищаются от лишних пробелов, строки без категории или работы
+    отбрасываются, расценки разбираются как числа (допускаются пробелы
+    между разрядами и десятичная запятая), отрицательные и нечисловые
+    значения считаются пустыми. Повтор работы в категории перекрывает
+    предыдущую строку."""
+    df = df.rename(columns=lambda column: str(column).strip()).rename(
+        columns=SHEET_COLUMNS
     )
+    missing = [column for column in ("work_category", "work") if column not in df]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    df = df.reindex(columns=["work_category", "work", *PRICE_COLUMNS])
 
-    work_manager = WorksManager()
-    category_manager = WorkCategoriesManager()
-    price_manager = WorkPricesManager()
-    for work in data:
-        if not category_manager.exists(name=work["work_category"]):
-            category = category_manager.add(
-                name=work["work_category"], created_by=admin_id
-            )
-        else:
-            category = category_manager.filter_one_by_dict(name=work["work_category"])
-        work_added = work_manager.add(
-            name=work["work"],
-            created_by=admin_id,
-            category=category["work_category_id"],  # type: ignore
-            measurement_unit="шт.",
+    for column in ("work_category", "work"):
+        df[column] = (
+            df[column]
+            .astype("string")
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip()
+            .replace("", pd.NA)
         )
-        for i in range(1, 5):
-            price = work.get(f"price_{i}")  # Берем цену
+    df = df.dropna(subset=["work_category", "work"])
 
-            if price is not None:  # Добавляем только если цена есть
-                price_manager.add(
-                    work=work_added["work_id"],
-                    created_by=admin_id,
-                    category=i,
-                    price=price,
-                )
+    for column in PRICE_COLUMNS:
+        price = pd.to_numeric(
+            df[column]
+            .astype("string")
+            .str.replace(r"\s+", "", regex=True)
+            .str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
+        df[column] = price.where(price >= 0).round(2)
 
+    df = df.drop_duplicates(subset=["work_category", "work"], keep="last")
+    return df.astype({"work_category": object, "work": object}).reset_index(drop=True)
 
-def put_works_in_db(admin_id):
-    # 1. Загружаем Excel-файл
-    print(admin_id)
-    file_path = "works.xlsx"
-    xls = pd.ExcelFile(file_path)
-
-    # 2. Проверяем, какие листы есть в файле
-    print("Доступные листы:", xls.sheet_names)
-
-    # 3. Загружаем данные с нужного листа
-    df = pd.read_excel(xls, sheet_name="Расценки СМР монтаж")
-
-    # 4. Убираем лишние пробелы из названий колонок
-    df.columns = df.columns.str.strip()
-
-    # 5. Переименовываем столбцы для удобства
-    df = df.rename(
-        columns={
-            "Наименование оборудования": "work_category",
-            "Unnamed: 1": "work",
-            "1 разряд": "price_1",
-            "2 разряд": "price_2",
-            "3 разряд": "price_3",
-            "4 разряд": "price_4",
-        }
-    )
 
-    # 6. Удаляем строки, где нет названия работы
-    df = df.dropna(subset=["work_category"])
+def import_price_sheet(df, admin_id, dry_run=False):
+    """Нормализует лист и загружает его в справочник работ одной транзакцией.
 
-    # 7. Преобразуем в словарь перед вставкой в базу
-    work_prices_data = df.to_dict(orient="records")
+    Возвращает сводку WorksManager.import_catalogue и число пропущенных
+    строк листа."""
+    from app.database.managers.works_managers import WorksManager
 
-    # 8. Выводим первые 10 записей
-    print(work_prices_data[:10])  # Теперь правильно!
+    catalogue = normalize_price_sheet(df)
+    summary = WorksManager().import_catalogue(catalogue, admin_id, dry_run=dry_run)
+    summary["skipped"] = len(df) - len(catalogue)
+    return summary
 
-    put_to_db(work_prices_data, admin_id)
+
+def import_price_list(source, admin_id, sheet_name=None, dry_run=False):
+    """Загружает прайс-лист из Excel-файла (путь или файловый объект)."""
+    df = pd.read_excel(source, sheet_name=sheet_name or DEFAULT_SHEET)
+    return import_price_sheet(df, admin_id, dry_run=dry_run)
+
+
+def put_to_db(data, admin_id):
+    return import_price_sheet(pd.DataFrame(data), admin_id)
+
+
+def put_works_in_db(admin_id):
+    summary = import_price_list("works.xlsx", admin_id)
+    logger.info(f"Прайс-лист works.xlsx загружен: {summary}", extra={"login": admin_id})
+    return summary
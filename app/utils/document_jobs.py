@@ -0,0 +1,108 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+
+from app.utils.template_client import payload_key, template_client
+
+logger = logging.getLogger("ok_service")
+
+
+class DocumentJobRunner:
+    """Выполняет задания генерации документов в фоновых потоках воркера.
+
+    Число одновременных обращений к сервису шаблонов из процесса
+    ограничено TEMPLATE_JOB_CONCURRENCY; потоки запросов gunicorn заняты
+    только постановкой задания и опросом статуса.
+
+    При DOCUMENT_JOBS_BACKEND="queue" задания уходят в очередь Postgres
+    (app.database.managers.job_queue_manager) и выполняются отдельным
+    процессом worker.py, переживая перезапуск веб-воркеров."""
+
+    def __init__(self):
+        self.concurrency = 2
+        self.backend = "thread"
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.concurrency = app.config.get("TEMPLATE_JOB_CONCURRENCY", 2)
+        self.backend = app.config.get("DOCUMENT_JOBS_BACKEND", "thread")
+
+    @property
+    def executor(self):
+        # Пул потоков не переживает fork — создаём свой в каждом воркере
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.concurrency,
+                        thread_name_prefix="document-job",
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, payload, created_by):
+        """Создаёт задание генерации и запускает его; возвращает задание.
+
+        Если поток запустить не удалось, задание сразу помечается упавшим,
+        а не остаётся queued навсегда."""
+        from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+        db = DocumentJobsManager()
+        job = db.create_job(
+            payload=payload,
+            cache_key=payload_key(payload),
+            created_by=created_by,
+            enqueue=self.backend == "queue",
+        )
+        if self.backend != "queue":
+            try:
+                self.executor.submit(self.run, UUID(job["job_id"]))
+            except Exception as e:
+                db.mark_failed(job["job_id"], e)
+                raise
+        return job
+
+    def run(self, job_id):
+        """Выполнение в потоке процесса: ошибка сразу завершает задание."""
+        from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+        try:
+            self.generate(job_id)
+        except Exception as e:
+            logger.error(
+                f"Ошибка задания генерации {job_id}: {e}", extra={"login": "system"}
+            )
+            DocumentJobsManager().mark_failed(job_id, e)
+
+    def generate(self, job_id):
+        """Генерирует документ и сохраняет его в задании; ошибки
+        пробрасываются, чтобы очередь могла повторить задание.
+
+        Документ хранится в БД, а не в кэше шаблонов: кэш локален для узла,
+        а worker.py и веб-процессы могут работать на разных машинах."""
+        from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+        db = DocumentJobsManager()
+        payload = db.get_payload(job_id)
+        db.mark_running(job_id)
+        key = payload_key(payload)
+        document = None
+        path = template_client.cached_path(key)
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    document = f.read()
+            except FileNotFoundError:
+                pass  # файл вытеснен из кэша между проверкой и чтением
+        if document is None:
+            upstream = template_client.open_stream(payload)
+            document = b"".join(template_client.iter_document(upstream, key))
+        db.mark_done(job_id, document)
+        logger.info(f"Задание генерации {job_id} выполнено", extra={"login": "system"})
+
+
+document_job_runner = DocumentJobRunner()
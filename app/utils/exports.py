@@ -0,0 +1,48 @@
+import csv
+import io
+import tempfile
+from uuid import UUID
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIMETYPE = "text/csv; charset=utf-8"
+
+
+def _cell(value):
+    """Приводит значение из БД к типу, который понимают csv и openpyxl."""
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def iter_csv(rows, batch_size=500):
+    """Генератор CSV: отдаёт байты порциями, не накапливая файл в памяти."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM, чтобы Excel корректно открыл кириллицу
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([_cell(value) for value in row])
+        if index % batch_size == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_xlsx(rows, title):
+    """Пишет строки в XLSX в режиме write-only и возвращает временный файл.
+
+    Write-only книга сбрасывает строки на диск по мере добавления,
+    поэтому потребление памяти не зависит от числа строк."""
+    # openpyxl импортируется только при выгрузке: он заметно замедляет старт
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title)
+    for row in rows:
+        sheet.append([_cell(value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,27 @@
+import numpy as np
+
+# Средний радиус Земли в метрах
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def as_float_array(values):
+    """Переводит последовательность координат в массив float, None -> NaN."""
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Векторизованное расстояние по формуле гаверсинусов, в метрах.
+
+    Принимает массивы одинаковой длины (или скаляры). Если хотя бы одна
+    координата пары отсутствует (NaN), результат для этой пары — NaN."""
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(value, dtype=np.float64))
+        for value in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
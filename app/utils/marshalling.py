@@ -0,0 +1,256 @@
+from functools import wraps
+from http import HTTPStatus
+from itertools import count
+from uuid import UUID
+
+import flask_restx
+from flask import current_app, has_request_context, request
+from flask_restx import fields
+from flask_restx import marshal as restx_marshal
+from flask_restx.inputs import boolean
+from flask_restx.utils import unpack
+
+# Поля, форматирование которых встраивается в код: {v} — значение
+SCALAR_FORMATS = {
+    fields.Raw: "{v}",
+    fields.String: "str({v})",
+    fields.Integer: "int({v})",
+    fields.Float: "float({v})",
+    fields.Boolean: "({v} if {v}.__class__ is bool else _boolean({v}))",
+}
+# UUID в String-поле остаётся объектом: orjson пишет его той же строкой
+NATIVE_FORMATS = {
+    **SCALAR_FORMATS,
+    fields.String: "({v} if {v}.__class__ is _UUID else str({v}))",
+}
+
+# Для отсутствующего ключа restx берёт getattr(dict, key) — у методов dict
+# результат другой, такие поля идут через field.output
+DICT_ATTRIBUTES = frozenset(dir(dict))
+
+_compiled = {}
+_building = set()
+
+
+def _make(field):
+    return field() if isinstance(field, type) else field
+
+
+def _none_value(field):
+    """Что Raw.output отдаёт для None: format(default), если default задан."""
+    return field.format(field.default) if field.default else field.default
+
+
+class _ModelCompiler:
+    """Генерирует исходный код функции marshal для модели flask-restx.
+
+    Для словарей, которые возвращают менеджеры, результат совпадает с
+    flask_restx.marshal: значения берутся через dict.get, форматирование
+    String/Integer/Float/Boolean/Raw встроено в код, Nested и List
+    вызывают скомпилированные функции вложенных моделей. Остальное
+    (ORM-объекты вместо dict, ошибки форматирования, Wildcard, маски,
+    нестандартные поля и атрибуты) уходит в обычный marshal или
+    field.output — для всего объекта или одного поля."""
+
+    def __init__(self, model, native):
+        self.model = model
+        self.native = native
+        self.formats = NATIVE_FORMATS if native else SCALAR_FORMATS
+        self.scope = {
+            "_UUID": UUID,
+            "_boolean": boolean,
+            "_restx_marshal": restx_marshal,
+        }
+        self.names = count()
+
+    def constant(self, value):
+        name = f"_c{next(self.names)}"
+        self.scope[name] = value
+        return name
+
+    def build(self):
+        model = self.model
+        items = [
+            (name, _make(field))
+            for name, field in getattr(model, "resolved", model).items()
+        ]
+        if getattr(model, "__mask__", None) or any(
+            isinstance(field, fields.Wildcard) for _, field in items
+        ):
+            return lambda obj: restx_marshal(obj, model)
+
+        model_ref = self.constant(model)
+        lines = [
+            "def marshal_model(obj):",
+            "    cls = obj.__class__",
+            "    if cls is list or cls is tuple:",
+            "        return [marshal_model(item) for item in obj]",
+            "    if cls is not dict:",
+            f"        return _restx_marshal(obj, {model_ref})",
+            "    get = obj.get",
+            "    try:",
+            "        return {",
+        ]
+        for index, (name, field) in enumerate(items):
+            lines.append(
+                f"            {name!r}: {self.field(name, field, f'v{index}')},"
+            )
+        lines += [
+            "        }",
+            "    except (ValueError, TypeError):",
+            # restx повторит разбор и поднимет MarshallingError
+            f"        return _restx_marshal(obj, {model_ref})",
+        ]
+        filename = f"<marshal {getattr(model, 'name', 'fields')}>"
+        # В код попадают только repr имён полей и ссылки на константы
+        exec(compile("\n".join(lines), filename, "exec"), self.scope)  # noqa: S102
+        return self.scope["marshal_model"]
+
+    def field(self, name, field, var):
+        """Выражение со значением поля `name` объекта `obj`."""
+        if isinstance(field, dict):
+            return f"{self.constant(compile_model(field, self.native))}(obj)"
+        attribute = name if field.attribute is None else field.attribute
+        if (
+            not isinstance(attribute, str)
+            or "." in attribute
+            or attribute in DICT_ATTRIBUTES
+            or getattr(field, "mask", None)
+            or callable(field.default)
+        ):
+            return self.generic(name, field)
+        getter = f"({var} := get({attribute!r}))"
+        kind = type(field)
+        if kind in self.formats:
+            none_value = self.constant(_none_value(field))
+            value = self.formats[kind].format(v=var)
+            return f"{none_value} if {getter} is None else {value}"
+        if kind is fields.Nested and not field.skip_none:
+            convert = self.constant(nested_converter(field, self.native))
+            return f"{convert}({getter})"
+        if kind is fields.List:
+            item = self.list_item(field.container)
+            if item is None:
+                return self.generic(name, field)
+            default = self.constant(field.default)
+            return (
+                f"[{item} for item in {var}] "
+                f"if {getter}.__class__ is list or {var}.__class__ is tuple "
+                f"else {default} if {var} is None "
+                f"else {self.generic(name, field)}"
+            )
+        return self.generic(name, field)
+
+    def list_item(self, container):
+        """Выражение для элемента `item` списка или None, если не поддержан."""
+        kind = type(container)
+        if kind is fields.Nested and not container.skip_none:
+            return f"{self.constant(nested_converter(container, self.native))}(item)"
+        if (
+            kind in self.formats
+            and not getattr(container, "mask", None)
+            and not callable(container.default)
+        ):
+            none_value = self.constant(_none_value(container))
+            value = self.formats[kind].format(v="item")
+            return f"{none_value} if item is None else {value}"
+        return None
+
+    def generic(self, name, field):
+        return f"{self.constant(field)}.output({name!r}, obj)"
+
+
+def nested_converter(field, native):
+    """Значение поля Nested, как Nested.output для уже извлечённого value."""
+    marshal_nested = compile_model(field.nested, native)
+    allow_null = field.allow_null
+    default = field.default
+
+    def convert(value):
+        if value is None:
+            if allow_null:
+                return None
+            if default is not None:
+                return default
+        return marshal_nested(value)
+
+    return convert
+
+
+def compile_model(model, native=False):
+    """Скомпилированная функция marshal для модели (кэшируется).
+
+    native=True — для ответов, которые сериализует orjson: UUID в
+    String-полях не превращаются в str, JSON получается тот же."""
+    key = (id(model), native)
+    if key in _compiled:
+        return _compiled[key][1]
+    if key in _building:
+        # Рекурсивная модель: внутренний уровень — обычный marshal
+        return lambda obj: restx_marshal(obj, model)
+    _building.add(key)
+    try:
+        fn = _ModelCompiler(model, native).build()
+    finally:
+        _building.discard(key)
+    # Модель держим в кэше, чтобы её id не достался другому объекту
+    _compiled[key] = (model, fn)
+    return fn
+
+
+def marshal(data, model, native=False):
+    """flask_restx.marshal без envelope/mask через скомпилированную модель."""
+    return compile_model(model, native)(data)
+
+
+class compiled_marshal_with:
+    """marshal_with на скомпилированной модели.
+
+    Модель компилируется при первом вызове. Запросы с заголовком маски
+    (RESTX_MASK_HEADER) маршалятся обычным flask_restx.marshal."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            resp = func(*args, **kwargs)
+            if not has_request_context():
+                marshal_model = compile_model(self.model)
+            elif request.headers.get(current_app.config["RESTX_MASK_HEADER"]):
+                marshal_model = self.masked
+            else:
+                native = current_app.config.get("API_JSON_RENDERER") == "orjson"
+                marshal_model = compile_model(self.model, native)
+            if isinstance(resp, tuple):
+                data, code, headers = unpack(resp)
+                return marshal_model(data), code, headers
+            return marshal_model(resp)
+
+        return wrapper
+
+    def masked(self, data):
+        mask = request.headers.get(current_app.config["RESTX_MASK_HEADER"])
+        return restx_marshal(data, self.model, mask=mask)
+
+
+class Namespace(flask_restx.Namespace):
+    """Namespace, в котором marshal_with использует скомпилированные модели.
+
+    Документация Swagger формируется родительским marshal_with, поэтому
+    не меняется; envelope, skip_none, mask и ordered обрабатывает restx."""
+
+    def marshal_with(
+        self, fields, as_list=False, code=HTTPStatus.OK, description=None, **kwargs
+    ):
+        document = super().marshal_with(fields, as_list, code, description, **kwargs)
+        if kwargs or self.ordered:
+            return document
+
+        def wrapper(func):
+            # Родительский декоратор записывает __apidoc__ в func
+            document(func)
+            return compiled_marshal_with(fields)(func)
+
+        return wrapper
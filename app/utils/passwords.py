@@ -0,0 +1,45 @@
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Параметры werkzeug по умолчанию
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasher:
+    """Хеширование паролей с настраиваемой стоимостью.
+
+    Метод задаётся строкой werkzeug (`scrypt:N:r:p`, `pbkdf2:sha256:итерации`)
+    и хранится в префиксе хеша, поэтому после смены параметров старые
+    хеши распознаются и перехешируются при следующем входе."""
+
+    def __init__(self, method=DEFAULT_HASH_METHOD):
+        self.method = method
+
+    @property
+    def method(self):
+        return self._method
+
+    @method.setter
+    def method(self, method):
+        self._method = method
+        # werkzeug раскрывает в хеше параметры по умолчанию (`scrypt` ->
+        # `scrypt:32768:8:1`), поэтому сравниваем с префиксом хеша-образца
+        self._prefix = generate_password_hash("", method=method).split("$", 1)[0]
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD)
+
+    def hash(self, password):
+        return generate_password_hash(str(password), method=self.method)
+
+    @staticmethod
+    def verify(password_hash, password):
+        if not password_hash:
+            return False
+        return check_password_hash(password_hash, str(password))
+
+    def needs_rehash(self, password_hash):
+        """Хеш построен не текущим методом/стоимостью."""
+        return password_hash.split("$", 1)[0] != self._prefix
+
+
+password_hasher = PasswordHasher()
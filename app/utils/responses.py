@@ -0,0 +1,119 @@
+import gzip
+from decimal import Decimal
+
+import brotli
+import orjson
+from flask import make_response, request
+from flask_restx.representations import output_json as restx_output_json
+
+# Типы ответа, которые имеет смысл сжимать (xlsx и картинки уже сжаты)
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def _default(value):
+    # orjson сам пишет UUID, datetime и dataclass; Decimal из Numeric-колонок —
+    # числом, как fields.Float в моделях Swagger
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data):
+    """JSON в байтах через orjson (UUID и Decimal без конвертации по полям)."""
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def output_json(data, code, headers=None):
+    """Представление application/json для flask-restx Api.
+
+    Заменяет стандартное (json.dumps с отступами в DEBUG): результат
+    marshal_with сериализуется в orjson за один проход."""
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    response.mimetype = "application/json"
+    return response
+
+
+JSON_RENDERERS = {
+    "orjson": output_json,
+    # Стандартный json flask-restx (RESTX_JSON, отступы в DEBUG)
+    "restx": restx_output_json,
+}
+
+
+def register_json_representation(api, renderer="orjson"):
+    if renderer not in JSON_RENDERERS:
+        raise ValueError(f"Неизвестный JSON_RENDERER: {renderer}")
+    api.representations["application/json"] = JSON_RENDERERS[renderer]
+
+
+class ResponseCompression:
+    """Сжатие ответов gzip/brotli по Accept-Encoding.
+
+    Сжимаются только текстовые ответы больше COMPRESS_MIN_SIZE байт;
+    потоковые ответы (CSV-выгрузки) и файлы идут как есть. Brotli
+    выбирается, если клиент принимает его не хуже gzip. У сжатого ответа
+    ETag становится слабым — If-None-Match по-прежнему даёт 304."""
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESS_ENABLED", True)
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        self.gzip_level = app.config.get("COMPRESS_GZIP_LEVEL", 6)
+        self.brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", 4)
+
+    @staticmethod
+    def compressible(mimetype):
+        return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+    @staticmethod
+    def negotiate(accept_encodings):
+        """Кодировка ("br" или "gzip") по разобранному Accept-Encoding."""
+        br = accept_encodings.quality("br")
+        gzip_quality = accept_encodings.quality("gzip")
+        if br > 0 and br >= gzip_quality:
+            return "br"
+        if gzip_quality > 0:
+            return "gzip"
+        return None
+
+    def compress(self, data, encoding):
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_response(self, response):
+        if (
+            not self.enabled
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or not self.compressible(response.mimetype or "")
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate(request.accept_encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < self.min_size:
+            return response
+        response.set_data(self.compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+response_compression = ResponseCompression()
@@ -0,0 +1,39 @@
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("ok_service")
+
+
+class StartupProfile:
+    """Замеры этапов create_app; отчёт пишется в лог и доступен в
+    app.extensions["startup_profile"] (см. benchmarks/startup_profile.py)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "phases_ms": {name: round(d * 1000, 1) for name, d in self.phases},
+        }
+
+    def log(self):
+        phases = ", ".join(f"{name} {d * 1000:.0f}" for name, d in self.phases)
+        logger.info(
+            f"Приложение создано за {self.total * 1000:.0f} мс ({phases})",
+            extra={"login": "init"},
+        )
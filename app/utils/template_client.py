@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("ok_service")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class TemplateServiceError(Exception):
+    """Сервис шаблонов недоступен или вернул ошибку."""
+
+    def __init__(self, msg, status=502):
+        super().__init__(msg)
+        self.status = status
+
+
+def payload_key(payload):
+    """Ключ кэша: sha256 от канонического JSON проверенных данных."""
+    canonical = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TemplateClient:
+    """Клиент сервиса шаблонов: пул соединений, таймауты, потоковая
+    передача и кэш готовых документов на диске по хешу запроса."""
+
+    def __init__(self):
+        self.url = None
+        self.timeout = (3.0, 120.0)
+        self.pool_size = 8
+        self.cache_dir = None
+        self.cache_ttl = 24 * 3600
+        self.cache_max_files = 500
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.url = app.config.get("TEMPLATE_SERVICE_URL")
+        self.timeout = (
+            app.config.get("TEMPLATE_SERVICE_CONNECT_TIMEOUT", 3.0),
+            app.config.get("TEMPLATE_SERVICE_READ_TIMEOUT", 120.0),
+        )
+        self.pool_size = app.config.get("TEMPLATE_SERVICE_POOL_SIZE", 8)
+        self.cache_dir = app.config.get("TEMPLATE_CACHE_DIR")
+        self.cache_ttl = app.config.get("TEMPLATE_CACHE_TTL", 24 * 3600)
+        self.cache_max_files = app.config.get("TEMPLATE_CACHE_MAX_FILES", 500)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def session(self):
+        """Сессия с пулом соединений; пересоздаётся в каждом воркере после fork."""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.pool_size
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def cached_path(self, key):
+        """Путь к готовому документу, если он есть в кэше и не устарел."""
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, key)
+        try:
+            if time.time() - os.path.getmtime(path) < self.cache_ttl:
+                return path
+        except OSError:
+            pass
+        return None
+
+    def open_stream(self, payload):
+        """Запрос к сервису без буферизации тела.
+
+        Возвращает ответ requests; тело читается через `iter_document`."""
+        if not self.url:
+            raise TemplateServiceError("TEMPLATE_SERVICE_URL is not configured", 500)
+        try:
+            response = self.session.post(
+                self.url, json=payload, timeout=self.timeout, stream=True
+            )
+        except requests.Timeout as e:
+            raise TemplateServiceError(f"Template service timeout: {e}", 504) from e
+        except requests.RequestException as e:
+            raise TemplateServiceError(f"Template service unavailable: {e}") from e
+        if not response.ok:
+            body = response.text[:1000]
+            response.close()
+            raise TemplateServiceError(
+                f"Template service error: {response.status_code} - {body}", 500
+            )
+        return response
+
+    def iter_document(self, response, key):
+        """Отдаёт тело ответа порциями и параллельно пишет его в кэш.
+
+        Файл кэша появляется атомарно и только при полностью прочитанном
+        ответе; оборванная передача в кэш не попадает. Временный файл
+        создаётся только после начала чтения: генератор, закрытый до
+        первой порции, не выполняет finally."""
+        tmp = None
+        completed = False
+        try:
+            if self.cache_dir:
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+                tmp = os.fdopen(fd, "wb")
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if tmp is not None:
+                    tmp.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            response.close()
+            if tmp is not None:
+                tmp.close()
+                if completed:
+                    os.replace(tmp_path, os.path.join(self.cache_dir, key))
+                    self._prune_cache()
+                else:
+                    os.unlink(tmp_path)
+
+    def _prune_cache(self):
+        """Удаляет устаревшие и самые старые файлы сверх лимита."""
+        try:
+            entries = []
+            now = time.time()
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".part") or not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if now - mtime >= self.cache_ttl:
+                        os.unlink(entry.path)
+                    else:
+                        entries.append((mtime, entry.path))
+            entries.sort()
+            for _, path in entries[: max(0, len(entries) - self.cache_max_files)]:
+                os.unlink(path)
+        except OSError as e:
+            logger.warning(
+                f"Не удалось очистить кэш шаблонов: {e}", extra={"login": "system"}
+            )
+
+
+template_client = TemplateClient()
@@ -0,0 +1,32 @@
+import logging
+
+logger = logging.getLogger("ok_service")
+
+
+def setup_tracing(app):
+    """Подключает трассировку Flask в Jaeger.
+
+    OpenTelemetry и экспортёр импортируются только здесь: без
+    TRACING_ENABLED они не загружаются вовсе. Экспортёр отправляет спаны
+    по UDP из фонового потока и не ждёт агента при старте."""
+    if not app.config.get("TRACING_ENABLED", True):
+        return
+    from opentelemetry import trace
+    from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    trace.set_tracer_provider(
+        TracerProvider(resource=Resource.create({"service.name": "ok_service"}))
+    )
+    jaeger_exporter = JaegerExporter(
+        agent_host_name=app.config.get("JAEGER_AGENT_HOST", "jaeger"),
+        agent_port=app.config.get("JAEGER_AGENT_PORT", 6831),
+    )
+    trace.get_tracer_provider().add_span_processor(  # type: ignore
+        BatchSpanProcessor(jaeger_exporter)
+    )
+    FlaskInstrumentor().instrument_app(app)
+    logger.info("Трассировка Jaeger подключена.", extra={"login": "init"})
@@ -0,0 +1,41 @@
+from base64 import urlsafe_b64encode
+from functools import lru_cache
+
+from config import Config
+
+config = Config()
+
+
+@lru_cache(maxsize=1)
+def vapid_private_key():
+    """Приватный VAPID-ключ в base64url для pywebpush.
+
+    Файл читается при первой отправке уведомления, а не при импорте
+    модулей, поэтому запуск приложения не зависит от наличия ключей."""
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    with open(config.VAPID_PRIVATE_KEY_PATH, "rb") as f:
+        private_key = load_pem_private_key(f.read(), password=None)
+    return urlsafe_b64encode(
+        private_key.private_numbers().private_value.to_bytes(  # type: ignore
+            length=(private_key.key_size + 7) // 8,  # type: ignore
+            byteorder="big",
+        )
+    ).decode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def vapid_public_key():
+    """Публичный VAPID-ключ (несжатая точка X9.62) в base64url."""
+    from cryptography.hazmat.primitives.serialization import (
+        Encoding,
+        PublicFormat,
+        load_pem_public_key,
+    )
+
+    with open(config.VAPID_PUBLIC_KEY_PATH, "rb") as f:
+        public_key = load_pem_public_key(f.read())
+    raw_public_key = public_key.public_bytes(
+        encoding=Encoding.X962, format=PublicFormat.UncompressedPoint
+    )
+    return urlsafe_b64encode(raw_public_key).decode("utf-8")
@@ -0,0 +1,13 @@
+import os
+
+from dotenv import load_dotenv
+
+from app.asgi import create_asgi_app
+
+load_dotenv()
+
+# Асинхронный режим для нагруженных списков (только чтение):
+#   uvicorn asgi:app --host 0.0.0.0 --port 8001
+# Работает рядом с gunicorn (run.py); прокси направляет сюда GET /*/all
+config_name = os.getenv("CONFIG_NAME", "development")
+app = create_asgi_app(config_name)
@@ -0,0 +1,115 @@
+"""Стоимость сериализации и сжатия большого списка.
+
+Запрашивает /shift_report_details/all?limit=5000 через тестовый клиент
+Flask (без сети) при двух API_JSON_RENDERER (restx — стандартный json,
+orjson) и трёх Accept-Encoding, печатает время запроса и размер тела;
+отдельно — время одной сериализации уже размеченного ответа:
+
+    DATABASE_URL=postgresql://postgres@localhost/ok_load \\
+        python benchmarks/json_render.py --rows 5000 --runs 20
+
+Нужна БД с данными (seed_data.py) и учётная запись администратора.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="JSON rendering benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--login", default="lt_admin")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--config", default="local_development")
+    return parser.parse_args()
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return result, times
+
+
+def measure_requests(renderer, args):
+    from app import create_app
+    from config import DevelopmentConfig, TestingConfig
+
+    for config in (DevelopmentConfig, TestingConfig):
+        config.API_JSON_RENDERER = renderer
+    app = create_app(args.config)
+    client = app.test_client()
+    response = client.post(
+        "/auth/login", json={"login": args.login, "password": args.password}
+    )
+    token = response.json["access_token"]
+    path = f"/shift_report_details/all?limit={args.rows}"
+
+    rows = []
+    for encoding in ENCODINGS:
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": encoding}
+        response, times = timed(lambda: client.get(path, headers=headers), args.runs)
+        rows.append((renderer, encoding, statistics.median(times), len(response.data)))
+    return rows
+
+
+def measure_serialization(args):
+    from flask_restx.representations import output_json as restx_output_json
+
+    from app import create_app
+    from app.utils.responses import output_json
+
+    app = create_app(args.config)
+    client = app.test_client()
+    response = client.post(
+        "/auth/login", json={"login": args.login, "password": args.password}
+    )
+    headers = {"Authorization": f"Bearer {response.json['access_token']}"}
+    data = client.get(
+        f"/shift_report_details/all?limit={args.rows}", headers=headers
+    ).json
+    count = len(data["shift_report_details"])
+
+    rows = []
+    with app.test_request_context():
+        for name, fn in (
+            ("json.dumps", lambda: json.dumps(data).encode()),
+            ("restx output_json", lambda: restx_output_json(data, 200).get_data()),
+            ("orjson output_json", lambda: output_json(data, 200).get_data()),
+        ):
+            body, times = timed(fn, args.runs)
+            rows.append((name, statistics.median(times), len(body)))
+    return count, rows
+
+
+def main():
+    args = parse_args()
+    results = []
+    for renderer in ("restx", "orjson"):
+        results += measure_requests(renderer, args)
+    count, serialization = measure_serialization(args)
+
+    print(f"GET /shift_report_details/all: {count} rows, median of {args.runs}")
+    print(f"{'renderer':<10}{'encoding':<10}{'ms':>10}{'bytes':>12}")
+    for renderer, encoding, ms, size in results:
+        print(f"{renderer:<10}{encoding:<10}{ms:>10.1f}{size:>12}")
+    print()
+    print(f"{'serialization':<22}{'ms':>10}{'bytes':>12}")
+    for name, ms, size in serialization:
+        print(f"{name:<22}{ms:>10.1f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
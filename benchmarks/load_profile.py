@@ -0,0 +1,286 @@
+"""Сценарий смешанной нагрузки поверх данных seed_data.py.
+
+Виртуальные пользователи (--concurrency) в течение --duration секунд
+выполняют действия с весами из PROFILE: вход, создание отчёта с деталями,
+страницы списков, статистику проекта и выгрузки. По каждому действию —
+число запросов, ошибки, пропускная способность и p50/p95/p99:
+
+    python benchmarks/load_profile.py --url http://localhost:8000 \\
+        --scale 1 --concurrency 50 --duration 120 --output before.json
+    python benchmarks/load_profile.py ... --baseline before.json
+
+С --baseline рядом с каждой метрикой печатается изменение относительно
+сохранённого прогона. --scale должен совпадать с тем, что был у
+seed_data.py: по нему вычисляются id проектов, работ и логины.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from seed_data import BASE_DATE, DEFAULT_PASSWORD, Volumes, seed_id
+
+# Действие -> вес в смеси
+PROFILE = {
+    "login": 5,
+    "create_report": 15,
+    "list_reports": 30,
+    "list_reports_filtered": 10,
+    "list_projects": 10,
+    "list_works": 10,
+    "project_stats": 10,
+    "export_csv": 8,
+    "export_xlsx": 2,
+}
+
+# Новые отчёты ставятся после всех сгенерированных и после отпусков
+FUTURE_DATE = BASE_DATE + 400 * 86400
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mixed load profile")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="сохранить результат в JSON")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    return parser.parse_args()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+class LoadProfile:
+    def __init__(self, client, volumes, password, rng):
+        self.client = client
+        self.volumes = volumes
+        self.password = password
+        self.rng = rng
+        self.tokens = {}
+        self.user = None
+
+    def random_user(self, role):
+        volumes = self.volumes
+        if role == "admin":
+            return 1
+        if role == "project-leader":
+            return self.rng.randint(2, volumes.leaders + 1)
+        return self.rng.randint(volumes.leaders + 2, volumes.users)
+
+    def random_project(self):
+        # Каждый 50-й проект сгенерирован удалённым
+        project = self.rng.randint(1, self.volumes.projects)
+        return project - 1 if project % 50 == 0 else project
+
+    async def login(self, user):
+        response = await self.client.post(
+            "/auth/login",
+            json={"login": self.volumes.login(user), "password": self.password},
+        )
+        return response
+
+    async def prepare(self):
+        """Вход под случайным пользователем каждой роли (вне замера)."""
+        for role in ("admin", "project-leader", "user"):
+            user = self.random_user(role)
+            response = await self.login(user)
+            response.raise_for_status()
+            self.tokens[role] = {
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            }
+            if role == "user":
+                self.user = user
+
+    async def get(self, role, path, **params):
+        return await self.client.get(path, params=params, headers=self.tokens[role])
+
+    async def act(self, action):
+        rng = self.rng
+        if action == "login":
+            return await self.login(self.random_user("user"))
+        if action == "create_report":
+            project = self.random_project()
+            slots = rng.sample(range(1, self.volumes.project_works + 1), 3)
+            date = FUTURE_DATE + rng.randint(0, 3650) * 86400
+            details = [
+                {
+                    "work": seed_id("work", self.volumes.project_work_work(project, s)),
+                    "project_work": self.volumes.project_work(project, s),
+                    "quantity": 2,
+                    "summ": 300,
+                }
+                for s in slots
+            ]
+            return await self.client.post(
+                "/shift_reports/add",
+                json={
+                    "user": seed_id("user", self.user),
+                    "date": date,
+                    "date_start": date + 6 * 3600,
+                    "date_end": date + 15 * 3600,
+                    "project": seed_id("project", project),
+                    "details": details,
+                },
+                headers=self.tokens["user"],
+            )
+        if action == "list_reports":
+            role = rng.choice(["admin", "project-leader", "user"])
+            return await self.get(
+                role,
+                "/shift_reports/all",
+                limit=50,
+                offset=50 * rng.randint(0, 20),
+            )
+        if action == "list_reports_filtered":
+            date_to = BASE_DATE - rng.randint(0, 300) * 86400
+            return await self.get(
+                "admin",
+                "/shift_reports/all",
+                limit=50,
+                project=seed_id("project", self.random_project()),
+                date_from=date_to - 60 * 86400,
+                date_to=date_to,
+                sort_by="date",
+                sort_order="desc",
+            )
+        if action == "list_projects":
+            return await self.get(
+                "admin", "/projects/all", limit=50, offset=50 * rng.randint(0, 20)
+            )
+        if action == "list_works":
+            return await self.get("user", "/works/all")
+        if action == "project_stats":
+            project = seed_id("project", self.random_project())
+            return await self.get("admin", f"/projects/{project}/get-stat")
+        if action == "export_csv":
+            return await self.get(
+                "admin",
+                "/shift_reports/export/shift_reports",
+                format="csv",
+                project=seed_id("project", self.random_project()),
+            )
+        if action == "export_xlsx":
+            return await self.get(
+                "admin",
+                "/shift_reports/export/details",
+                format="xlsx",
+                project=seed_id("project", self.random_project()),
+            )
+        raise ValueError(f"Неизвестное действие: {action}")
+
+
+async def run(args):
+    volumes = Volumes.scaled(args.scale)
+    actions, weights = zip(*PROFILE.items())
+    latencies = defaultdict(list)
+    errors = defaultdict(lambda: defaultdict(int))
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        profiles = [
+            LoadProfile(
+                client, volumes, args.password, random.Random(args.seed * 100_003 + n)
+            )
+            for n in range(args.concurrency)
+        ]
+        await asyncio.gather(*(profile.prepare() for profile in profiles))
+        deadline = time.perf_counter() + args.duration
+
+        async def virtual_user(profile):
+            while time.perf_counter() < deadline:
+                action = profile.rng.choices(actions, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await profile.act(action)
+                    await response.aread()
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[action].append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    errors[action][str(status)] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(profile) for profile in profiles))
+        elapsed = time.perf_counter() - started
+
+    results = {}
+    for action in actions:
+        values = latencies[action]
+        if not values:
+            continue
+        results[action] = {
+            "requests": len(values),
+            "errors": dict(errors[action]),
+            "rps": round(len(values) / elapsed, 2),
+            "p50": round(percentile(values, 0.5), 1),
+            "p95": round(percentile(values, 0.95), 1),
+            "p99": round(percentile(values, 0.99), 1),
+        }
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "elapsed": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "actions": results,
+    }
+
+
+def delta(value, base):
+    if not base:
+        return ""
+    return f" ({(value - base) / base * 100:+.0f}%)"
+
+
+def report(result, baseline=None):
+    baseline = (baseline or {}).get("actions", {})
+    print(
+        f"{result['requests']} requests in {result['elapsed']} s, "
+        f"{result['rps']} req/s (concurrency {result['concurrency']})"
+    )
+    header = f"{'action':<22}{'count':>7}{'err':>6}  {'rps':<16}"
+    print(header + "".join(f"{name:<18}" for name in ("p50 ms", "p95 ms", "p99 ms")))
+    for action, stats in result["actions"].items():
+        base = baseline.get(action, {})
+        line = f"{action:<22}{stats['requests']:>7}{sum(stats['errors'].values()):>6}  "
+        line += f"{stats['rps']}{delta(stats['rps'], base.get('rps'))}".ljust(16)
+        for key in ("p50", "p95", "p99"):
+            line += f"{stats[key]}{delta(stats[key], base.get(key))}".ljust(18)
+        print(line)
+        if stats["errors"]:
+            print(f"{'':<22}statuses: {stats['errors']}")
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(result, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Нагрузочный замер /auth/login.
+
+Имитирует утренний пик: много одновременных входов под существующими
+учётными записями. Запуск против работающего сервиса:
+
+    python benchmarks/login_benchmark.py --url http://localhost:8000 \
+        --login worker --password secret --concurrency 50 --requests 1000
+
+Несколько учётных записей передаются через --credentials (файл со
+строками `login:password`).
+"""
+
+import argparse
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+
+import requests
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--login")
+    parser.add_argument("--password")
+    parser.add_argument("--credentials", help="файл со строками login:password")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    return parser.parse_args()
+
+
+def load_credentials(args):
+    if args.credentials:
+        with open(args.credentials, encoding="utf-8") as f:
+            pairs = [line.strip().split(":", 1) for line in f if ":" in line]
+        return [(login, password) for login, password in pairs]
+    if not (args.login and args.password):
+        raise SystemExit("Нужны --login/--password или --credentials")
+    return [(args.login, args.password)]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    args = parse_args()
+    credentials = cycle(load_credentials(args))
+    jobs = [next(credentials) for _ in range(args.requests)]
+    url = f"{args.url.rstrip('/')}/auth/login"
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def login(credential):
+        started = time.perf_counter()
+        try:
+            response = session.post(
+                url,
+                json={"login": credential[0], "password": credential[1]},
+                timeout=args.timeout,
+            )
+            status = response.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        return status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(login, jobs))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for _, latency in results]
+    statuses = Counter(status for status, _ in results)
+    print(f"requests:    {len(results)} (concurrency {args.concurrency})")
+    print(f"elapsed:     {elapsed:.2f} s")
+    print(f"throughput:  {len(results) / elapsed:.1f} logins/s")
+    print(
+        f"latency ms:  mean {statistics.mean(latencies):.1f}  "
+        f"p50 {percentile(latencies, 0.5):.1f}  "
+        f"p95 {percentile(latencies, 0.95):.1f}  "
+        f"p99 {percentile(latencies, 0.99):.1f}  "
+        f"max {max(latencies):.1f}"
+    )
+    print(f"statuses:    {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    main()
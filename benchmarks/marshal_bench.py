@@ -0,0 +1,134 @@
+"""Маршалинг больших списков: flask_restx.marshal против скомпилированных
+моделей (app/utils/marshalling.py).
+
+Строки генерируются в памяти в том виде, в каком их отдают менеджеры
+(UUID, Decimal, вложенные словари), БД не нужна:
+
+    python benchmarks/marshal_bench.py --rows 10000 --runs 5
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Marshalling benchmark")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    return parser.parse_args()
+
+
+def shift_report_details(rows):
+    return {
+        "msg": "Shift report details found successfully",
+        "shift_report_details": [
+            {
+                "shift_report_detail_id": uuid.uuid4(),
+                "shift_report": {
+                    "id": uuid.uuid4(),
+                    "user_id": uuid.uuid4(),
+                    "date": 1767225600 - i,
+                },
+                "project_work": {
+                    "project_work_id": uuid.uuid4(),
+                    "name": f"Работа проекта {i % 10}",
+                },
+                "work": uuid.uuid4(),
+                "quantity": Decimal("2.50"),
+                "created_at": 1767225600 + i,
+                "created_by": uuid.uuid4(),
+                "summ": Decimal("375.00"),
+            }
+            for i in range(rows)
+        ],
+        "total": rows,
+    }
+
+
+def shift_reports(rows):
+    return {
+        "msg": "Shift reports found successfully",
+        "shift_reports": [
+            {
+                "shift_report_id": uuid.uuid4(),
+                "user": uuid.uuid4(),
+                "date": 1767225600 - i,
+                "project": uuid.uuid4(),
+                "signed": i % 3 == 0,
+                "number": i,
+                "night_shift": False,
+                "extreme_conditions": False,
+                "deleted": False,
+                "created_at": 1767225600,
+                "created_by": uuid.uuid4(),
+                "shift_report_details_sum": Decimal("1234.50"),
+                "lng_start": 37.6,
+                "ltd_start": 55.7,
+                "comment": None,
+            }
+            for i in range(rows)
+        ],
+        "total": rows,
+    }
+
+
+def timed(fn, runs, *args):
+    times = []
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn(*args)
+        times.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    args = parse_args()
+    from flask_restx import marshal as restx_marshal
+
+    from app.routes.models.shift_report_detail_models import (
+        shift_report_details_all_response,
+    )
+    from app.routes.models.shift_report_models import shift_report_all_response
+    from app.utils.marshalling import compile_model, marshal
+    from app.utils.responses import dumps
+
+    cases = [
+        (
+            "shift_report_details",
+            shift_report_details_all_response,
+            shift_report_details,
+        ),
+        ("shift_reports", shift_report_all_response, shift_reports),
+    ]
+    print(f"{args.rows} rows, median of {args.runs}")
+    print(
+        f"{'model':<22}{'restx ms':>10}{'compiled ms':>13}{'speedup':>9}"
+        f"{'native ms':>11}{'speedup':>9}"
+    )
+    for name, model, generate in cases:
+        data = generate(args.rows)
+        compile_model(model)
+        expected, restx_ms = timed(restx_marshal, args.runs, data, model)
+        actual, compiled_ms = timed(marshal, args.runs, data, model)
+        assert actual == expected, f"{name}: результаты различаются"
+        native, native_ms = timed(marshal, args.runs, data, model, True)
+        assert dumps(native) == dumps(expected), f"{name}: JSON различается"
+        print(
+            f"{name:<22}{restx_ms:>10.1f}{compiled_ms:>13.1f}"
+            f"{restx_ms / compiled_ms:>8.1f}x{native_ms:>11.1f}"
+            f"{restx_ms / native_ms:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
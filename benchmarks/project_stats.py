@@ -0,0 +1,188 @@
+"""Статистика проекта (ProjectsManager.get_project_stats*) на большом проекте.
+
+Поверх данных seed_data.py (с тем же --scale) создаёт отдельный проект
+с --reports сменными отчётами (две трети подписаны), по шесть деталей и
+материалов на отчёт, и замеряет три метода статистики: медиану времени
+и число SQL-запросов за вызов. Повторный запуск переиспользует проект:
+
+    DATABASE_URL=postgresql://postgres@localhost/ok_load \\
+        python benchmarks/project_stats.py --scale 1 --reports 10000
+
+Контрольные суммы в выводе позволяют сравнить результаты до и после
+изменения реализации.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from seed_data import BASE_DATE, Volumes, _id, seed_id
+from sqlalchemy import create_engine, event, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PROJECT_WORKS = 20
+
+SETUP = [
+    f"""
+    INSERT INTO projects (project_id, name, object, project_leader,
+                          night_shift_available, extreme_conditions_available,
+                          created_by, deleted)
+    SELECT {_id("big-project", ":reports")}, 'Большой проект ' || :reports,
+           {_id("object", "1")}, {_id("user", "2")}, true, true,
+           {_id("user", "1")}, false
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO project_works (project_work_id, project_work_name, work,
+                               project, quantity, summ, signed, created_by)
+    SELECT {_id("big-pw", ":reports || ':' || k")}, 'Работа проекта ' || k,
+           {_id("work", "1 + (k * 17) % :works")},
+           {_id("big-project", ":reports")}, 100000, 0, true, {_id("user", "1")}
+    FROM generate_series(1, :project_works) k
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO project_materials (project_material_id, project, material,
+                                   quantity, created_by)
+    SELECT {_id("big-pm", ":reports || ':' || k")},
+           {_id("big-project", ":reports")},
+           {_id("material", "1 + (k * 5) % :materials")}, 50000, {_id("user", "1")}
+    FROM generate_series(1, 10) k
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO shift_reports (shift_report_id, "user", date, date_start, date_end,
+                               project, signed, created_by, night_shift,
+                               extreme_conditions, deleted)
+    SELECT {_id("big-report", ":reports || ':' || r")},
+           {_id("user", "1 + (r * 104729) % :users")},
+           :base_date - (r % 365) * 86400, :base_date - (r % 365) * 86400,
+           :base_date - (r % 365) * 86400 + 9 * 3600,
+           {_id("big-project", ":reports")}, r % 3 <> 0, {_id("user", "1")},
+           r % 10 = 0, r % 25 = 0, false
+    FROM generate_series(1, :reports) r
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO shift_report_details (shift_report_detail_id, shift_report,
+                                      project_work, work, quantity, summ,
+                                      created_by)
+    SELECT {_id("big-detail", ":reports || ':' || r || ':' || k")},
+           {_id("big-report", ":reports || ':' || r")},
+           {_id("big-pw", ":reports || ':' || s")},
+           {_id("work", "1 + (s * 17) % :works")}, 1 + (r + k) % 10, 0,
+           {_id("user", "1")}
+    FROM generate_series(1, :reports) r, generate_series(1, 6) k,
+         LATERAL (SELECT 1 + (r + k) % :project_works AS s) d
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO shift_report_materials (shift_report_material_id, shift_report,
+                                        material, quantity, created_by)
+    SELECT {_id("big-srm", ":reports || ':' || r || ':' || k")},
+           {_id("big-report", ":reports || ':' || r")},
+           {_id("material", "1 + ((r + k) % 12) * 5 % :materials")}, 1 + k % 3,
+           {_id("user", "1")}
+    FROM generate_series(1, :reports) r, generate_series(1, 6) k
+    ON CONFLICT DO NOTHING
+    """,
+]
+
+METHODS = [
+    "get_project_stats",
+    "get_project_stats_by_project_work",
+    "get_project_stats_by_project_materials",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Project stats benchmark")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--config", default="local_development")
+    return parser.parse_args()
+
+
+def prepare(database_url, volumes, reports):
+    params = {
+        "reports": reports,
+        "project_works": PROJECT_WORKS,
+        "users": volumes.users,
+        "works": volumes.works,
+        "materials": volumes.materials,
+        "base_date": BASE_DATE,
+    }
+    engine = create_engine(database_url)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for sql in SETUP:
+            conn.execute(text(sql), params)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in (
+            "shift_reports",
+            "shift_report_details",
+            "shift_report_materials",
+        ):
+            conn.execute(text(f"ANALYZE {table}"))
+    engine.dispose()
+    return time.perf_counter() - started
+
+
+def checksum(stats):
+    """Число ключей и сумма всех количеств — для сравнения реализаций."""
+    total = sum(
+        value
+        for item in stats.values()
+        for value in item.values()
+        if isinstance(value, (int, float))
+    )
+    return len(stats), round(total, 2)
+
+
+def main():
+    args = parse_args()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("Нужен DATABASE_URL")
+    volumes = Volumes.scaled(args.scale)
+    elapsed = prepare(database_url, volumes, args.reports)
+    project_id = seed_id("big-project", args.reports)
+    print(f"Проект {project_id}: {args.reports} отчётов, подготовка {elapsed:.1f} s")
+
+    from app import create_app
+    from app.database import db_globals
+
+    app = create_app(args.config)
+    queries = [0]
+
+    @event.listens_for(db_globals.engine, "before_cursor_execute")
+    def count_query(*_):
+        queries[0] += 1
+
+    with app.app_context():
+        from app.database.managers.projects_managers import ProjectsManager
+
+        manager = ProjectsManager()
+        print(f"{'method':<40}{'ms':>10}{'queries':>9}{'keys':>6}{'checksum':>14}")
+        for name in METHODS:
+            method = getattr(manager, name)
+            times = []
+            for _ in range(args.runs):
+                queries[0] = 0
+                started = time.perf_counter()
+                stats = method(project_id)
+                times.append((time.perf_counter() - started) * 1000)
+            keys, total = checksum(stats)
+            print(
+                f"{name:<40}{statistics.median(times):>10.1f}{queries[0]:>9}"
+                f"{keys:>6}{total:>14}"
+            )
+
+
+if __name__ == "__main__":
+    main()
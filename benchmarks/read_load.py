@@ -0,0 +1,99 @@
+"""Нагрузочное сравнение списков: gunicorn (Flask) против uvicorn (asgi.py).
+
+Держит --concurrency одновременных соединений и гоняет по кругу GET
+нагруженных списков. Несколько --url сравниваются по очереди на одной
+и той же нагрузке:
+
+    python benchmarks/read_load.py --token "$JWT" --concurrency 500 \
+        --requests 5000 --url http://localhost:8000 --url http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from itertools import cycle
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/shift_reports/all?limit=50",
+    "/projects/all?limit=50",
+    "/works/all",
+    "/materials/all",
+    "/work_prices/all",
+    "/cities/all",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Read endpoints load test")
+    parser.add_argument("--url", action="append", help="можно указать несколько")
+    parser.add_argument("--token", required=True, help="JWT access-токен")
+    parser.add_argument("--path", action="append", help="по умолчанию — все списки")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    return parser.parse_args()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+async def run(url, args):
+    paths = cycle(args.path or DEFAULT_PATHS)
+    jobs = asyncio.Queue()
+    for _ in range(args.requests):
+        jobs.put_nowait(next(paths))
+    results = []
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    async with httpx.AsyncClient(
+        base_url=url, headers=headers, limits=limits, timeout=args.timeout
+    ) as client:
+
+        async def worker():
+            while not jobs.empty():
+                path = jobs.get_nowait()
+                started = time.perf_counter()
+                try:
+                    status = (await client.get(path)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                results.append((status, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for _, latency in results]
+    statuses = Counter(status for status, _ in results)
+    print(f"{url}")
+    print(f"  requests:    {len(results)} (concurrency {args.concurrency})")
+    print(f"  elapsed:     {elapsed:.2f} s")
+    print(f"  throughput:  {len(results) / elapsed:.1f} req/s")
+    print(
+        f"  latency ms:  mean {statistics.mean(latencies):.1f}  "
+        f"p50 {percentile(latencies, 0.5):.1f}  "
+        f"p95 {percentile(latencies, 0.95):.1f}  "
+        f"p99 {percentile(latencies, 0.99):.1f}  "
+        f"max {max(latencies):.1f}"
+    )
+    print(f"  statuses:    {dict(statuses)}")
+
+
+def main():
+    args = parse_args()
+    for url in args.url or ["http://localhost:8000", "http://localhost:8001"]:
+        asyncio.run(run(url, args))
+
+
+if __name__ == "__main__":
+    main()
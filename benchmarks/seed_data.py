@@ -0,0 +1,401 @@
+"""Синтетические данные объёма продакшена для нагрузочных замеров.
+
+Заполняет локальную БД (после `alembic upgrade head`) пользователями,
+объектами, проектами, справочниками, сменными отчётами с деталями и
+материалами, отпусками и ценами:
+
+    DATABASE_URL=postgresql://postgres@localhost/ok_load \\
+        python benchmarks/seed_data.py --scale 1
+
+При --scale 1 это 2k пользователей, 5k проектов, 500k отчётов и по 3M
+деталей и материалов отчётов. Все строки генерирует сам Postgres
+(generate_series), идентификаторы детерминированы — md5 от вида и номера
+(`seed_id`), поэтому повторный запуск дозаполняет недостающее, а
+нагрузочный сценарий (load_profile.py) вычисляет id без запросов.
+У всех пользователей один пароль (--password); логины: lt_admin,
+lt_leader_<n>, lt_user_<n>.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_PASSWORD = "loadtest"
+# День, от которого назад раскладываются отчёты и отпуска (полночь UTC)
+BASE_DATE = 1767225600  # 2026-01-01
+
+
+def seed_id(kind, *parts):
+    """Тот же UUID, что `md5('lt:<kind>:<parts>')::uuid` в SQL генератора."""
+    key = ":".join(["lt", kind, *map(str, parts)])
+    return str(uuid.UUID(hashlib.md5(key.encode()).hexdigest()))
+
+
+@dataclass
+class Volumes:
+    users: int = 2000
+    cities: int = 50
+    projects: int = 5000
+    works: int = 1000
+    work_categories: int = 20
+    materials: int = 500
+    project_works: int = 10  # на проект
+    shift_reports: int = 500_000
+    details: int = 6  # на отчёт
+    report_materials: int = 6  # на отчёт
+    leaves: int = 3  # на пользователя
+    price_categories: int = 4
+
+    @classmethod
+    def scaled(cls, scale):
+        volumes = cls()
+        for name in ("users", "projects", "works", "materials", "shift_reports"):
+            setattr(volumes, name, max(10, int(getattr(volumes, name) * scale)))
+        return volumes
+
+    @property
+    def leaders(self):
+        return max(1, self.users // 20)
+
+    @property
+    def objects(self):
+        return max(1, self.projects // 5)
+
+    # Индексы связей — те же выражения, что в SQL ниже
+    def role(self, user):
+        if user == 1:
+            return "admin"
+        return "project-leader" if user <= self.leaders + 1 else "user"
+
+    def login(self, user):
+        return {"admin": "lt_admin", "project-leader": f"lt_leader_{user}"}.get(
+            self.role(user), f"lt_user_{user}"
+        )
+
+    def project_leader(self, project):
+        return 2 + project % self.leaders
+
+    def project_work(self, project, slot):
+        return seed_id("pw", project, slot)
+
+    def project_work_work(self, project, slot):
+        return 1 + (project * 31 + slot * 17) % self.works
+
+
+def _id(kind, expr):
+    return f"md5('lt:{kind}:' || ({expr}))::uuid"
+
+
+STEPS = [
+    (
+        "roles",
+        """
+        INSERT INTO roles (role_id, name) VALUES
+            ('user', 'Пользователь'), ('admin', 'Администратор'),
+            ('manager', 'Менеджер'), ('project-leader', 'Прораб')
+        ON CONFLICT DO NOTHING;
+        INSERT INTO object_statuses (object_status_id, name) VALUES
+            ('waiting', 'В Ожидании'), ('active', 'Действующий'),
+            ('completed', 'Завершенный')
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+    (
+        "cities",
+        f"""
+        INSERT INTO cities (city_id, name, deleted)
+        SELECT {_id("city", "g")}, 'Город ' || g, false
+        FROM generate_series(1, :cities) g
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+    (
+        "users",
+        f"""
+        INSERT INTO users (user_id, login, password_hash, name, role, category,
+                           city_id, created_by, deleted)
+        SELECT {_id("user", "g")},
+               CASE WHEN g = 1 THEN 'lt_admin'
+                    WHEN g <= :leaders + 1 THEN 'lt_leader_' || g
+                    ELSE 'lt_user_' || g END,
+               :password_hash,
+               'Сотрудник ' || g,
+               CASE WHEN g = 1 THEN 'admin'
+                    WHEN g <= :leaders + 1 THEN 'project-leader'
+                    ELSE 'user' END,
+               1 + g % :price_categories,
+               {_id("city", "1 + g % :cities")},
+               {_id("user", "1")},
+               false
+        FROM generate_series(1, :users) g
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+    (
+        "reference",
+        f"""
+        INSERT INTO work_categories (work_category_id, name, created_by, deleted)
+        SELECT {_id("work_category", "g")}, 'Категория ' || g,
+               {_id("user", "1")}, false
+        FROM generate_series(1, :work_categories) g
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO works (work_id, name, category, measurement_unit,
+                           created_by, deleted)
+        SELECT {_id("work", "g")}, 'Работа ' || g,
+               {_id("work_category", "1 + g % :work_categories")},
+               (ARRAY['м', 'м2', 'м3', 'шт'])[1 + g % 4],
+               {_id("user", "1")}, false
+        FROM generate_series(1, :works) g
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO work_prices (work_price_id, work, category, price,
+                                 created_by, deleted)
+        SELECT {_id("work_price", "w || ':' || c")}, {_id("work", "w")}, c,
+               100 + (w * 37) % 900 + c * 50, {_id("user", "1")}, false
+        FROM generate_series(1, :works) w,
+             generate_series(1, :price_categories) c
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO materials (material_id, name, measurement_unit,
+                               created_by, deleted)
+        SELECT {_id("material", "g")}, 'Материал ' || g,
+               (ARRAY['кг', 'шт', 'м', 'л'])[1 + g % 4],
+               {_id("user", "1")}, false
+        FROM generate_series(1, :materials) g
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO work_material_relations (work_material_relation_id, work,
+                                             material, quantity, created_by)
+        SELECT {_id("wmr", "w || ':' || k")}, {_id("work", "w")},
+               {_id("material", "1 + (w * 7 + k * 13) % :materials")},
+               1 + k, {_id("user", "1")}
+        FROM generate_series(1, :works) w, generate_series(1, 2) k
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+    (
+        "projects",
+        f"""
+        INSERT INTO objects (object_id, name, address, city_id, status, manager,
+                             lng, ltd, created_by, deleted)
+        SELECT {_id("object", "o")}, 'Объект ' || o, 'Адрес ' || o,
+               {_id("city", "1 + o % :cities")}, 'active',
+               {_id("user", "2 + o % :leaders")},
+               37.3 + (o % 100) * 0.006, 55.5 + (o / 100 % 100) * 0.004,
+               {_id("user", "1")}, false
+        FROM generate_series(1, :objects) o
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO projects (project_id, name, object, project_leader,
+                              night_shift_available, extreme_conditions_available,
+                              created_by, deleted)
+        SELECT {_id("project", "p")}, 'Проект ' || p,
+               {_id("object", "1 + p % :objects")},
+               {_id("user", "2 + p % :leaders")},
+               p % 3 = 0, p % 7 = 0, {_id("user", "1")}, p % 50 = 0
+        FROM generate_series(1, :projects) p
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO project_works (project_work_id, project_work_name, work,
+                                   project, quantity, summ, signed, created_by)
+        SELECT {_id("pw", "p || ':' || k")}, 'Работа проекта ' || k,
+               {_id("work", "1 + (p * 31 + k * 17) % :works")},
+               {_id("project", "p")}, 1000, 150000, k % 2 = 0,
+               {_id("user", "1")}
+        FROM generate_series(1, :projects) p,
+             generate_series(1, :project_works) k
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO project_materials (project_material_id, project, material,
+                                       quantity, created_by)
+        SELECT {_id("pm", "p || ':' || k")}, {_id("project", "p")},
+               {_id("material", "1 + (p * 11 + k * 5) % :materials")},
+               500, {_id("user", "1")}
+        FROM generate_series(1, :projects) p, generate_series(1, 3) k
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO project_schedules (project_schedule_id, project, work,
+                                       quantity, date, created_by)
+        SELECT {_id("ps", "p || ':' || k")}, {_id("project", "p")},
+               {_id("work", "1 + (p * 31 + k * 17) % :works")},
+               250, :base_date + k * 7 * 86400, {_id("user", "1")}
+        FROM generate_series(1, :projects) p, generate_series(1, 4) k
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+    (
+        "leaves",
+        f"""
+        INSERT INTO leaves (leave_id, start_date, end_date, reason, user_id,
+                            responsible_id, created_by, deleted)
+        SELECT {_id("leave", "u || ':' || l")},
+               :base_date - (((u * 13 + l * 97) % 365) + 1) * 86400,
+               :base_date - (((u * 13 + l * 97) % 365) + 1 - l * 2) * 86400,
+               CAST((ARRAY['vacation', 'sick_leave', 'day_off'])[l]
+                    AS absence_reason_enum),
+               {_id("user", "u")}, {_id("user", "2 + u % :leaders")},
+               {_id("user", "1")}, false
+        FROM generate_series(:leaders + 2, :users) u,
+             generate_series(1, :leaves) l
+        ON CONFLICT DO NOTHING
+        """,
+    ),
+]
+
+# Отчёты, их детали и материалы — пачками по номерам отчётов [:first, :last]
+REPORT_STEPS = [
+    f"""
+    INSERT INTO shift_reports (shift_report_id, "user", date, date_start, date_end,
+                               project, lng_start, ltd_start, lng_end, ltd_end,
+                               distance_start, distance_end, signed, created_by,
+                               night_shift, extreme_conditions, deleted, comment)
+    SELECT {_id("report", "r")},
+           {_id("user", "1 + (r * 104729) % :users")},
+           :base_date - (r % 365) * 86400 + 6 * 3600,
+           :base_date - (r % 365) * 86400 + 6 * 3600,
+           :base_date - (r % 365) * 86400 + 15 * 3600,
+           {_id("project", "1 + (r * 7919) % :projects")},
+           37.3 + (r % 1000) * 0.0006, 55.5 + (r % 997) * 0.0004,
+           37.3 + (r % 1000) * 0.0006, 55.5 + (r % 997) * 0.0004,
+           (r % 800)::float, (r % 900)::float,
+           r % 3 = 0, {_id("user", "1 + (r * 104729) % :users")},
+           r % 10 = 0, r % 25 = 0, r % 100 = 0,
+           CASE WHEN r % 5 = 0 THEN 'Комментарий ' || r END
+    FROM generate_series(:first, :last) r
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO shift_report_details (shift_report_detail_id, shift_report,
+                                      project_work, work, quantity, summ,
+                                      created_by)
+    SELECT {_id("detail", "r || ':' || k")}, {_id("report", "r")},
+           {_id("pw", "p || ':' || s")},
+           {_id("work", "1 + (p * 31 + s * 17) % :works")},
+           q, q * 150, {_id("user", "1")}
+    FROM generate_series(:first, :last) r
+    CROSS JOIN LATERAL (SELECT 1 + (r * 7919) % :projects AS p) rp
+    CROSS JOIN LATERAL generate_series(1, :details) k
+    CROSS JOIN LATERAL (
+        SELECT 1 + (r + k) % :project_works AS s, 1 + (r + k) % 10 AS q
+    ) d
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    INSERT INTO shift_report_materials (shift_report_material_id, shift_report,
+                                        material, quantity, shift_report_detail,
+                                        created_by)
+    SELECT {_id("srm", "r || ':' || k")}, {_id("report", "r")},
+           {_id("material", "1 + (r * k) % :materials")}, 1 + (r + k) % 5,
+           CASE WHEN k <= :details THEN {_id("detail", "r || ':' || k")} END,
+           {_id("user", "1")}
+    FROM generate_series(:first, :last) r,
+         generate_series(1, :report_materials) k
+    ON CONFLICT DO NOTHING
+    """,
+]
+
+FINISH = """
+INSERT INTO table_versions (table_name, version)
+SELECT name, 1 FROM unnest(CAST(:tables AS text[])) AS name
+ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1
+"""
+
+SEEDED_TABLES = [
+    "roles",
+    "cities",
+    "users",
+    "work_categories",
+    "works",
+    "work_prices",
+    "materials",
+    "work_material_relations",
+    "objects",
+    "projects",
+    "project_works",
+    "project_materials",
+    "project_schedules",
+    "leaves",
+    "shift_reports",
+    "shift_report_details",
+    "shift_report_materials",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed production-scale data")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument(
+        "--batch", type=int, default=50_000, help="отчётов за транзакцию"
+    )
+    return parser.parse_args()
+
+
+def password_hash(password):
+    from werkzeug.security import generate_password_hash
+
+    from config import Config
+
+    return generate_password_hash(password, method=Config.PASSWORD_HASH_METHOD)
+
+
+def seed(engine, volumes, password, batch=50_000, log=print):
+    params = {
+        **{name: getattr(volumes, name) for name in volumes.__dataclass_fields__},
+        "leaders": volumes.leaders,
+        "objects": volumes.objects,
+        "base_date": BASE_DATE,
+        "password_hash": password_hash(password),
+    }
+    for name, sql in STEPS:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in sql.split(";\n"):
+                conn.execute(text(statement), params)
+        log(f"{name:<12} {time.perf_counter() - started:7.1f} s")
+
+    for first in range(1, volumes.shift_reports + 1, batch):
+        last = min(first + batch - 1, volumes.shift_reports)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for sql in REPORT_STEPS:
+                conn.execute(text(sql), {**params, "first": first, "last": last})
+        log(f"reports {first:>7}-{last:<7} {time.perf_counter() - started:5.1f} s")
+
+    with engine.begin() as conn:
+        conn.execute(text(FINISH), {"tables": SEEDED_TABLES})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in SEEDED_TABLES:
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        raise SystemExit("Нужен DATABASE_URL или --database-url")
+    volumes = Volumes.scaled(args.scale)
+    engine = create_engine(args.database_url)
+    print(f"База: {engine.url.render_as_string(hide_password=True)}")
+    print(f"Объёмы: {volumes}")
+    started = time.perf_counter()
+    seed(engine, volumes, args.password, batch=args.batch)
+    with engine.connect() as conn:
+        for table in ("users", "projects", "shift_reports", "shift_report_details"):
+            count = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+            print(f"{table:<22} {count:>10}")
+    print(f"Готово за {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Профиль холодного старта приложения.
+
+Показывает самые дорогие импорты (`python -X importtime`) и длительность
+этапов create_app в отдельном процессе, как при старте воркера:
+
+    CONFIG_NAME=local_development python benchmarks/startup_profile.py --top 25
+
+Нужны те же переменные окружения, что и для run.py (DATABASE_URL и т.д.).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CREATE_APP = """
+import json, os, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app(os.getenv("CONFIG_NAME", "local_development"))
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 1),
+    "create_app": app.extensions["startup_profile"],
+}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Startup profile")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    return parser.parse_args()
+
+
+def import_times(top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def create_app_times():
+    result = subprocess.run(
+        [sys.executable, "-c", CREATE_APP],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+
+    print(f"Самые дорогие импорты (cumulative, ms), top {args.top}:")
+    for cumulative, own, name in import_times(args.top):
+        print(f"  {cumulative / 1000:8.1f} {own / 1000:8.1f}  {name}")
+
+    runs = [create_app_times() for _ in range(args.runs)]
+    print(f"\nСтарт в отдельном процессе, запусков: {args.runs}")
+    print(f"  import app: {min(r['import_ms'] for r in runs):.1f} ms (min)")
+    print(
+        f"  create_app: {min(r['create_app']['total_ms'] for r in runs):.1f} ms (min)"
+    )
+    for phase in runs[0]["create_app"]["phases_ms"]:
+        best = min(r["create_app"]["phases_ms"][phase] for r in runs)
+        print(f"    {phase:<16} {best:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Загрузка прайс-листа работ (app/utils/db_works.py) на большом листе.
+
+Генерирует xlsx на --rows строк (категории по --per-category работ, четыре
+разряда) и замеряет четыре прохода: dry-run, первую загрузку, повторную
+загрузку без изменений и загрузку с изменённой каждой десятой расценкой.
+Работы создаются от имени администратора --login:
+
+    DATABASE_URL=postgresql://postgres@localhost/ok_load \\
+        python benchmarks/works_import.py --rows 5000
+
+Загруженные категории помечаются префиксом --prefix и остаются в БД.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Price list import benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--per-category", type=int, default=50)
+    parser.add_argument("--login", default="lt_admin")
+    parser.add_argument("--config", default="local_development")
+    parser.add_argument("--prefix", default=f"bench-{uuid.uuid4().hex[:6]}")
+    return parser.parse_args()
+
+
+def price_sheet(args, changed_every=None):
+    import pandas as pd
+
+    from app.utils.db_works import DEFAULT_SHEET
+
+    rows = []
+    for i in range(args.rows):
+        base = 100 + i % 900
+        if changed_every and i % changed_every == 0:
+            base += 7
+        rows.append(
+            [
+                f"{args.prefix} категория {i // args.per_category}",
+                f"Работа {i}",
+                *(base * grade for grade in range(1, 5)),
+            ]
+        )
+    buffer = io.BytesIO()
+    pd.DataFrame(
+        rows,
+        columns=[
+            "Наименование оборудования",
+            "Unnamed: 1",
+            "1 разряд",
+            "2 разряд",
+            "3 разряд",
+            "4 разряд",
+        ],
+    ).to_excel(buffer, sheet_name=DEFAULT_SHEET, index=False)
+    return buffer.getvalue()
+
+
+def main():
+    args = parse_args()
+    from app import create_app
+
+    app = create_app(args.config)
+    with app.app_context():
+        from app.database.managers.user_manager import UserManager
+        from app.utils.db_works import import_price_list
+
+        admin = UserManager().filter_one_by_dict(login=args.login)
+        if not admin:
+            sys.exit(f"User {args.login} not found")
+
+        sheets = {"initial": price_sheet(args), "changed": price_sheet(args, 10)}
+        passes = [
+            ("dry-run", "initial", True),
+            ("first import", "initial", False),
+            ("same sheet", "initial", False),
+            ("10% changed", "changed", False),
+        ]
+        print(f"{args.rows} rows, {len(sheets['initial']) // 1024} KiB xlsx")
+        print(f"{'pass':<14}{'seconds':>9}  changes")
+        for name, sheet, dry_run in passes:
+            started = time.perf_counter()
+            summary = import_price_list(
+                io.BytesIO(sheets[sheet]), admin["user_id"], dry_run=dry_run
+            )
+            elapsed = time.perf_counter() - started
+            changes = ", ".join(
+                f"{kind} +{summary[kind]['created']}/~{summary[kind]['updated']}"
+                for kind in ("categories", "works", "prices")
+            )
+            print(f"{name:<14}{elapsed:>9.2f}  {changes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 import os
+import tempfile
 from datetime import timedelta
+from multiprocessing import cpu_count
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def default_web_workers():
+    """Баланс между ядрами и воркерами gunicorn."""
+    return max(2, min(4, cpu_count() // 2))
+
+
 class Config:
     """Базовая конфигурация."""
 
@@ -14,13 +21,134 @@ class Config:
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     DATABASE_NAME = os.getenv("DATABASE_NAME")
+    # Процессы и потоки gunicorn (их же читает gunicorn.conf.py)
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(default_web_workers())))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "4"))
+    # Пул соединений на процесс: по одному на поток запросов, плюс фоновые
+    # потоки (генерация документов, обслуживание БД). Всего к Postgres
+    # WEB_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) соединений
+    DB_POOL_SIZE = int(
+        os.getenv(
+            "DB_POOL_SIZE",
+            str(WEB_THREADS + int(os.getenv("TEMPLATE_JOB_CONCURRENCY", "2")) + 1),
+        )
+    )
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", str(WEB_THREADS)))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Сколько соединений сервису можно занять на сервере БД
+    DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "90"))
+    # Пул asyncpg процесса uvicorn (asgi.py) для асинхронных списков
+    ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+    ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10"))
+    # Ожидание соединения не занимает поток, поэтому при пиковой нагрузке
+    # запросы ждут в очереди пула, как у gunicorn в очереди сокета
+    ASYNC_DB_POOL_TIMEOUT = int(os.getenv("ASYNC_DB_POOL_TIMEOUT", "120"))
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=365)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     API_KEY = os.getenv("API_KEY")
     ORIGIN = os.getenv("ORIGIN")
+    # Ключи WebPush читаются при первой отправке уведомления
+    VAPID_PRIVATE_KEY_PATH = os.getenv(
+        "VAPID_PRIVATE_KEY_PATH", "vapid_private_key.pem"
+    )
+    VAPID_PUBLIC_KEY_PATH = os.getenv("VAPID_PUBLIC_KEY_PATH", "vapid_public_key.pem")
+    # Трассировка в Jaeger (только конфигурация development)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true") == "true"
+    JAEGER_AGENT_HOST = os.getenv("JAEGER_AGENT_HOST", "jaeger")
+    JAEGER_AGENT_PORT = int(os.getenv("JAEGER_AGENT_PORT", "6831"))
     TEMPLATE_SERVICE_URL = os.getenv("TEMPLATE_SERVICE_URL")
+    # Таймауты (сек) и размер пула соединений к сервису шаблонов
+    TEMPLATE_SERVICE_CONNECT_TIMEOUT = float(
+        os.getenv("TEMPLATE_SERVICE_CONNECT_TIMEOUT", "3")
+    )
+    TEMPLATE_SERVICE_READ_TIMEOUT = float(
+        os.getenv("TEMPLATE_SERVICE_READ_TIMEOUT", "120")
+    )
+    TEMPLATE_SERVICE_POOL_SIZE = int(os.getenv("TEMPLATE_SERVICE_POOL_SIZE", "8"))
+    # Кэш сгенерированных документов по хешу данных (пусто — без кэша)
+    TEMPLATE_CACHE_DIR = os.getenv(
+        "TEMPLATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ok_templates")
+    )
+    # Срок жизни файла кэша; столько же хранится документ задания генерации
+    TEMPLATE_CACHE_TTL = int(os.getenv("TEMPLATE_CACHE_TTL", str(24 * 3600)))
+    TEMPLATE_CACHE_MAX_FILES = int(os.getenv("TEMPLATE_CACHE_MAX_FILES", "500"))
+    # Сколько заданий генерации документов воркер выполняет одновременно
+    TEMPLATE_JOB_CONCURRENCY = int(os.getenv("TEMPLATE_JOB_CONCURRENCY", "2"))
+    # Где выполнять задания генерации: "thread" — в потоках веб-воркера,
+    # "queue" — через очередь в Postgres и процесс worker.py
+    DOCUMENT_JOBS_BACKEND = os.getenv("DOCUMENT_JOBS_BACKEND", "thread")
+    # Пересчёт сумм после /work_prices/bulk с reprice: "inline" — в том же
+    # запросе после сохранения расценок, "queue" — заданием для worker.py
+    REPRICE_JOBS_BACKEND = os.getenv("REPRICE_JOBS_BACKEND", "inline")
+    # Очередь фоновых заданий (app/jobs, worker.py)
+    JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+    JOB_QUEUE_POLL_INTERVAL = float(os.getenv("JOB_QUEUE_POLL_INTERVAL", "1"))
+    # Через сколько секунд без продления задание считается потерянным
+    JOB_QUEUE_VISIBILITY_TIMEOUT = int(os.getenv("JOB_QUEUE_VISIBILITY_TIMEOUT", "300"))
+    # Задержка повтора: base * 2^(попытка-1), но не больше max (сек)
+    JOB_QUEUE_BACKOFF_BASE = int(os.getenv("JOB_QUEUE_BACKOFF_BASE", "10"))
+    JOB_QUEUE_BACKOFF_MAX = int(os.getenv("JOB_QUEUE_BACKOFF_MAX", "600"))
+    # Сколько дней хранить выполненные и окончательно упавшие задания
+    JOB_QUEUE_RETENTION_DAYS = int(os.getenv("JOB_QUEUE_RETENTION_DAYS", "7"))
+    # Радиус геозоны объекта в метрах для проверки координат смены
+    GEOFENCE_RADIUS = float(os.getenv("GEOFENCE_RADIUS", "500"))
+    # Сколько дней хранить надгробия удалённых записей для /sync
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(
+        os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90")
+    )
+    # Обслуживание БД (app/database/maintenance.py): раз в интервал лидер
+    # делает VACUUM/ANALYZE таблиц, где мёртвых или изменённых строк больше
+    # MIN_DEAD и DEAD_RATIO от живых, и REINDEX CONCURRENTLY индексов
+    # крупнее MIN_BYTES с оценкой раздутия не ниже BLOAT_PCT
+    MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "true") == "true"
+    MAINTENANCE_INTERVAL = int(os.getenv("MAINTENANCE_INTERVAL", "3600"))
+    MAINTENANCE_VACUUM_MIN_DEAD = int(os.getenv("MAINTENANCE_VACUUM_MIN_DEAD", "1000"))
+    MAINTENANCE_VACUUM_DEAD_RATIO = float(
+        os.getenv("MAINTENANCE_VACUUM_DEAD_RATIO", "0.1")
+    )
+    MAINTENANCE_REINDEX_BLOAT_PCT = float(
+        os.getenv("MAINTENANCE_REINDEX_BLOAT_PCT", "30")
+    )
+    MAINTENANCE_REINDEX_MIN_BYTES = int(
+        os.getenv("MAINTENANCE_REINDEX_MIN_BYTES", str(10 * 1024 * 1024))
+    )
+    # Кэш справочников в памяти воркера (см. app/database/reference_cache.py)
+    REFERENCE_CACHE_ENABLED = os.getenv("REFERENCE_CACHE_ENABLED", "true") == "true"
+    REFERENCE_CACHE_LISTEN = os.getenv("REFERENCE_CACHE_LISTEN", "true") == "true"
+    # Как часто (сек) сверять версии таблиц, даже если LISTEN работает
+    REFERENCE_CACHE_CHECK_INTERVAL = float(
+        os.getenv("REFERENCE_CACHE_CHECK_INTERVAL", "30")
+    )
+    # Сколько секунд держать в памяти список проектов прораба (0 — не кэшировать)
+    AUTH_SCOPE_CACHE_TTL = float(os.getenv("AUTH_SCOPE_CACHE_TTL", "30"))
+    # Метрики SQL по эндпоинтам (app/database/sql_metrics.py) и порог
+    # повторов одного запроса, после которого в лог пишется N+1
+    SQL_METRICS_ENABLED = os.getenv("SQL_METRICS_ENABLED", "true") == "true"
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+    # Журнал медленных запросов (app/database/slow_queries.py): запросы
+    # дольше порога (0 — выключено) попадают в кольцевой буфер на
+    # LOG_SIZE записей, для доли SAMPLE_RATE выполняется EXPLAIN ANALYZE
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(
+        os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1")
+    )
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(
+        os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000")
+    )
+    SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    # Сериализация ответов API: orjson или стандартный json flask-restx
+    API_JSON_RENDERER = os.getenv("API_JSON_RENDERER", "orjson")
+    # Сжатие ответов API (app/utils/responses.py): gzip или brotli по
+    # Accept-Encoding для тел больше COMPRESS_MIN_SIZE байт
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true") == "true"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+    # Метод и стоимость хеширования паролей в формате werkzeug; старые хеши
+    # перехешируются при входе
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
 
 
 class DevelopmentConfig(Config):
@@ -35,3 +163,9 @@ class TestingConfig(Config):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL")
+    # Фикстуры пишут в БД в обход менеджеров, поэтому кэш не используется
+    REFERENCE_CACHE_ENABLED = False
+    REFERENCE_CACHE_LISTEN = False
+    MAINTENANCE_ENABLED = False
+    # Дешёвый хеш, чтобы фикстуры с паролями не тормозили тесты
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
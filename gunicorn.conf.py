@@ -1,19 +1,18 @@
 import os
 from dotenv import load_dotenv
-from multiprocessing import cpu_count
+
+from config import Config
 
 load_dotenv()
 
 # Убедитесь, что порт задан с безопасным значением по умолчанию
 port = 8000
 
-# Количество CPU
-cpu_cores = cpu_count()
-
 bind = f"0.0.0.0:{port}"
-workers = max(2, min(4, cpu_cores // 2))  # Баланс между ядрами и воркерами
+# Баланс между ядрами и воркерами; от этих чисел считается пул соединений
+workers = Config.WEB_WORKERS
 timeout = 600  # Увеличенное время ожидания
-threads = 4  # Увеличьте до 4 потоков на воркер
+threads = Config.WEB_THREADS
 
 # Логи
 loglevel = "info"
@@ -23,3 +22,20 @@ capture_output = True  # Перехватывать вывод stdout/stderr и
 
 # Добавляем флаг для предзагрузки приложения
 preload_app = True
+
+
+def when_ready(server):
+    """Мастер загрузил приложение (seed, прогрев кэша) — закрываем его
+    соединения до запуска воркеров, чтобы им нечего было наследовать."""
+    from app.database.db_globals import engine
+
+    if engine is not None:
+        engine.dispose()
+
+
+def post_fork(server, worker):
+    """Каждый воркер начинает с пустого собственного пула."""
+    from app.database import dispose_engine_after_fork
+
+    dispose_engine_after_fork()
+    server.log.info(f"Worker {os.getpid()}: пул соединений инициализирован")
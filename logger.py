@@ -23,6 +23,9 @@ class LokiFormatter(logging.Formatter):
 
         # Пользовательская информация
         user_info = getattr(record, "login", {})
+        if hasattr(user_info, "to_dict"):
+            # Identity из app.decorators.auth
+            user_info = user_info.to_dict()
         if isinstance(user_info, dict):
             user_id = user_info.get("user_id", "unknown")
             login = user_info.get("login", "unknown")
@@ -45,6 +48,8 @@ class PrometheusHandler(logging.Handler):
             error_counter.inc()
 
             login_data = getattr(record, "login", {})
+            if hasattr(login_data, "to_dict"):
+                login_data = login_data.to_dict()
 
             try:
                 if isinstance(login_data, dict):
@@ -0,0 +1,118 @@
+# Tests for the async (ASGI) read endpoints: same responses as the Flask app
+import pytest
+from starlette.testclient import TestClient
+
+from app.asgi import create_asgi_app
+
+
+@pytest.fixture
+def asgi_client():
+    with TestClient(create_asgi_app("testing")) as client:
+        yield client
+
+
+def _both(client, asgi_client, path, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    flask_response = client.get(path, headers=headers)
+    asgi_response = asgi_client.get(path, headers=headers)
+    assert asgi_response.status_code == flask_response.status_code
+    return flask_response.json, asgi_response.json()
+
+
+def test_shift_reports_match_flask(
+    client, asgi_client, jwt_token, seed_shift_report, seed_shift_report_detail
+):
+    expected, actual = _both(client, asgi_client, "/shift_reports/all", jwt_token)
+    assert actual == expected
+    assert actual["total"] == 1
+    assert actual["shift_reports"][0]["shift_report_details_sum"] > 0
+
+
+def test_shift_reports_filters_and_validation(
+    client, asgi_client, jwt_token, seed_shift_report, seed_project
+):
+    path = f"/shift_reports/all?project={seed_project['project_id']}&limit=5"
+    expected, actual = _both(client, asgi_client, path, jwt_token)
+    assert actual == expected
+
+    expected, actual = _both(
+        client, asgi_client, "/shift_reports/all?limit=x", jwt_token
+    )
+    assert actual == expected
+
+
+def test_shift_reports_scoped_for_leader(
+    client, asgi_client, jwt_token_leader, seed_project_own, seed_project_other
+):
+    expected, actual = _both(
+        client, asgi_client, "/shift_reports/all", jwt_token_leader
+    )
+    assert actual == expected
+
+    path = f"/shift_reports/all?project={seed_project_other['project_id']}"
+    expected, actual = _both(client, asgi_client, path, jwt_token_leader)
+    assert actual == expected
+    assert actual["msg"] == "Forbidden"
+
+
+def test_projects_match_flask(client, asgi_client, jwt_token, seed_project):
+    expected, actual = _both(client, asgi_client, "/projects/all", jwt_token)
+    assert actual == expected
+    assert len(actual["projects"]) == 1
+
+
+@pytest.mark.parametrize("ns", ["works", "materials", "work_prices", "cities"])
+def test_reference_lists_match_flask(
+    client, asgi_client, jwt_token, seed_work_price, seed_material, seed_city, ns
+):
+    expected, actual = _both(client, asgi_client, f"/{ns}/all", jwt_token)
+    assert actual == expected
+    assert actual[ns]
+
+
+def test_reference_list_not_modified(client, asgi_client, jwt_token, seed_city):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etag = client.get("/cities/all", headers=headers).headers["ETag"]
+
+    response = asgi_client.get("/cities/all", headers=headers)
+    assert response.headers["ETag"] == etag
+
+    response = asgi_client.get(
+        "/cities/all", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_auth_errors(asgi_client, jwt_token):
+    response = asgi_client.get("/projects/all")
+    assert response.status_code == 401
+    assert response.json() == {"msg": "Missing Authorization Header"}
+
+    response = asgi_client.get("/projects/all", headers={"Authorization": jwt_token})
+    assert response.status_code == 422
+
+    response = asgi_client.get(
+        "/projects/all", headers={"Authorization": "Bearer not-a-token"}
+    )
+    assert response.status_code == 422
+
+
+def test_work_prices_etag_tracks_works(client, asgi_client, jwt_token, seed_work_price):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etag = client.get("/work_prices/all", headers=headers).headers["ETag"]
+    assert asgi_client.get("/work_prices/all", headers=headers).headers["ETag"] == etag
+
+    # Удаление работы меняет её расценки, не увеличивая версию work_prices
+    response = client.delete(
+        f"/works/{seed_work_price['work']}/delete/hard", headers=headers
+    )
+    assert response.status_code == 200
+
+    response = asgi_client.get(
+        "/work_prices/all", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    works = {price["work"] for price in response.json()["work_prices"]}
+    assert seed_work_price["work"] not in works
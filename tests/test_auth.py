@@ -0,0 +1,51 @@
+# Tests for the per-request auth context
+import flask_jwt_extended.view_decorators as view_decorators
+
+
+def test_missing_token(client):
+    response = client.get("/roles/all")
+    assert response.status_code == 401
+
+
+def test_invalid_token(client):
+    response = client.get("/roles/all", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 422
+
+
+def test_token_verified_once(client, jwt_token, monkeypatch):
+    calls = []
+    decode = view_decorators._decode_jwt_from_request
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(view_decorators, "_decode_jwt_from_request", counting_decode)
+
+    response = client.get(
+        "/roles/all", headers={"Authorization": f"Bearer {jwt_token}"}
+    )
+    assert response.status_code == 200
+    assert len(calls) == 1
+
+
+def test_role_decorators_use_identity(client, jwt_token_user):
+    headers = {"Authorization": f"Bearer {jwt_token_user}"}
+
+    response = client.post("/cities/add", json={"name": "Forbidden"}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_identity_on_g(test_app, jwt_token_leader, seed_leader):
+    from app.decorators import current_identity
+    from app.decorators.auth import authenticate_request
+
+    with test_app.test_request_context(
+        headers={"Authorization": f"Bearer {jwt_token_leader}"}
+    ):
+        authenticate_request()
+        identity = current_identity()
+
+        assert identity.user_id == seed_leader["user_id"]
+        assert identity["role"] == "project-leader"
+        assert identity.get("login") == seed_leader["login"]
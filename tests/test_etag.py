@@ -0,0 +1,83 @@
+# Tests for conditional GET on reference data
+from uuid import uuid4
+
+
+def test_roles_not_modified(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/roles/all", headers=headers)
+
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag
+
+    response = client.get("/roles/all", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_etag_depends_on_query(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etag = client.get("/cities/all", headers=headers).headers["ETag"]
+
+    response = client.get(
+        "/cities/all?limit=5", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_changes_after_write(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etag = client.get("/cities/all", headers=headers).headers["ETag"]
+
+    response = client.post(
+        "/cities/add", json={"name": f"City-{uuid4().hex[:6]}"}, headers=headers
+    )
+    assert response.status_code == 200
+
+    response = client.get("/cities/all", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json["cities"]) >= 1
+
+
+def test_works_etag_tracks_prices(client, jwt_token, seed_work, seed_user):
+    from app.database.managers.works_managers import WorkPricesManager
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etag = client.get("/works/all", headers=headers).headers["ETag"]
+
+    WorkPricesManager().add(
+        work=seed_work["work_id"],
+        category=1,
+        price=100,
+        created_by=seed_user["user_id"],
+    )
+
+    response = client.get("/works/all", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_child_lists_etag_tracks_parent_tables(
+    client, jwt_token, seed_material, seed_work_material_relation, seed_work_price
+):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    etags = {
+        url: client.get(url, headers=headers).headers["ETag"]
+        for url in ("/work_material_relations/all", "/work_prices/all")
+    }
+
+    # Удаление материала или работы (в т.ч. каскадное удаление связей и
+    # расценок в БД) меняет версию родительской таблицы
+    for url in (
+        f"/materials/{seed_material['material_id']}/delete/soft",
+        f"/works/{seed_work_price['work']}/delete/soft",
+    ):
+        assert client.patch(url, headers=headers).status_code == 200
+
+    for url, etag in etags.items():
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
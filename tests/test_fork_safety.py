@@ -0,0 +1,99 @@
+# Stress test: pooled connections are never shared across forked processes
+import multiprocessing
+import threading
+
+from sqlalchemy import text
+
+CHILDREN = 4
+THREADS = 4
+QUERIES = 50
+
+
+def _backend_pids(engine, threads=THREADS, queries=QUERIES):
+    """Гоняет запросы из нескольких потоков; возвращает pid бэкендов Postgres."""
+    pids, errors = set(), []
+    lock = threading.Lock()
+
+    def work():
+        try:
+            for _ in range(queries):
+                with engine.connect() as conn:
+                    pid = conn.execute(text("SELECT pg_backend_pid()")).scalar()
+                with lock:
+                    pids.add(pid)
+        except Exception as e:  # pragma: no cover - попадёт в assert
+            errors.append(repr(e))
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return pids, errors
+
+
+def _child(queue, use_post_fork_hook):
+    from app.database import dispose_engine_after_fork
+    from app.database.db_globals import engine
+
+    if use_post_fork_hook:
+        dispose_engine_after_fork()
+    queue.put(_backend_pids(engine))
+
+
+def _run_children(use_post_fork_hook):
+    from app.database.db_globals import engine
+
+    # Родитель держит открытые соединения в пуле к моменту fork
+    parent_pids, errors = _backend_pids(engine)
+    assert not errors
+    assert engine.pool.checkedin() > 0
+
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    children = [
+        ctx.Process(target=_child, args=(queue, use_post_fork_hook))
+        for _ in range(CHILDREN)
+    ]
+    for child in children:
+        child.start()
+    # Родитель продолжает работать параллельно с детьми
+    during_pids, errors = _backend_pids(engine)
+    assert not errors
+    results = [queue.get(timeout=60) for _ in children]
+    for child in children:
+        child.join(timeout=60)
+        assert child.exitcode == 0
+
+    seen = set(parent_pids | during_pids)
+    for pids, child_errors in results:
+        assert not child_errors
+        assert pids
+        # Ни один бэкенд (т.е. сокет) не использовался двумя процессами
+        assert not pids & seen
+        seen |= pids
+
+    # Соединения родителя не закрыты детьми
+    after_pids, errors = _backend_pids(engine, threads=1, queries=5)
+    assert not errors
+    assert after_pids <= parent_pids | during_pids
+
+
+def test_children_never_reuse_parent_connections(test_app):
+    _run_children(use_post_fork_hook=False)
+
+
+def test_post_fork_hook(test_app):
+    _run_children(use_post_fork_hook=True)
+
+
+def test_pool_budget():
+    from app.database import check_pool_budget
+
+    config = {
+        "WEB_WORKERS": 4,
+        "DB_POOL_SIZE": 7,
+        "DB_MAX_OVERFLOW": 4,
+        "DB_MAX_CONNECTIONS": 40,
+    }
+    assert check_pool_budget(config) == 44
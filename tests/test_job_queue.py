@@ -0,0 +1,256 @@
+# Tests for the Postgres-backed background job queue
+import time
+
+import pytest
+from sqlalchemy import text
+
+from tests.test_template import PAYLOAD, FakeResponse, FakeSession
+
+CONFIG = {
+    "JOB_QUEUE_VISIBILITY_TIMEOUT": 60,
+    "JOB_QUEUE_BACKOFF_BASE": 10,
+    "JOB_QUEUE_BACKOFF_MAX": 600,
+}
+
+
+@pytest.fixture
+def queue(test_app):
+    from app.database.managers.job_queue_manager import JobQueueManager
+
+    return JobQueueManager()
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """Регистрирует тестовые обработчики, не трогая боевой реестр."""
+    from app.jobs import registry
+
+    calls = []
+    failures = []
+
+    def echo(payload):
+        calls.append(payload)
+
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(
+        registry._TASKS, "tests.echo", registry.Task("tests.echo", echo)
+    )
+    monkeypatch.setitem(
+        registry._TASKS,
+        "tests.broken",
+        registry.Task(
+            "tests.broken", broken, on_failure=lambda p, e: failures.append(str(e))
+        ),
+    )
+    return calls, failures
+
+
+def _job(db_session, job_id):
+    from app.database.models import BackgroundJobs
+
+    db_session.expire_all()
+    return db_session.get(BackgroundJobs, job_id)
+
+
+def test_claim_respects_priority_and_run_at(queue):
+    low = queue.enqueue("tests.echo", {"n": 1}, priority=0)
+    high = queue.enqueue("tests.echo", {"n": 2}, priority=10)
+    queue.enqueue("tests.echo", {"n": 3}, priority=100, delay=3600)
+
+    assert queue.claim("w1", 60)["job_id"] == high
+    assert queue.claim("w1", 60)["job_id"] == low
+    # Отложенное задание ещё не готово
+    assert queue.claim("w1", 60) is None
+
+
+def test_claim_skips_locked_rows(queue, test_app):
+    from app.database.db_globals import engine
+
+    first = queue.enqueue("tests.echo", {}, priority=1)
+    second = queue.enqueue("tests.echo", {}, priority=0)
+
+    # Другой воркер держит блокировку первого задания в своей транзакции
+    with engine.connect() as conn, conn.begin():
+        conn.execute(
+            text("SELECT 1 FROM background_jobs WHERE job_id = :id FOR UPDATE"),
+            {"id": first},
+        )
+        claimed = queue.claim("w2", 60)
+        assert claimed["job_id"] == second
+
+    assert queue.claim("w2", 60)["job_id"] == first
+
+
+def test_failed_job_is_retried_with_backoff(queue, db_session):
+    from app.database.managers.job_queue_manager import _now
+
+    job_id = queue.enqueue("tests.broken", {}, max_attempts=2)
+    job = queue.claim("w1", 60)
+
+    before = _now()
+    assert queue.fail(job_id, "w1", "boom", job["attempts"], 2, 10, 600) is True
+    stored = _job(db_session, job_id)
+    assert stored.status == "queued"
+    assert stored.last_error == "boom"
+    assert stored.run_at >= before + 10
+    assert queue.claim("w1", 60) is None
+
+    db_session.execute(
+        text("UPDATE background_jobs SET run_at = 0 WHERE job_id = :id"),
+        {"id": job_id},
+    )
+    db_session.commit()
+    job = queue.claim("w1", 60)
+    assert job["attempts"] == 2
+    assert queue.fail(job_id, "w1", "boom", job["attempts"], 2, 10, 600) is False
+    assert _job(db_session, job_id).status == "failed"
+
+
+def test_expired_job_is_reclaimed(queue, db_session):
+    job_id = queue.enqueue("tests.echo", {}, max_attempts=2)
+    assert queue.claim("w1", 60)["job_id"] == job_id
+    assert queue.claim("w2", 60) is None
+
+    # Воркер w1 умер: окно видимости истекло
+    db_session.execute(
+        text("UPDATE background_jobs SET locked_until = 0 WHERE job_id = :id"),
+        {"id": job_id},
+    )
+    db_session.commit()
+    job = queue.claim("w2", 60)
+    assert job["job_id"] == job_id
+    assert job["attempts"] == 2
+
+    # Последняя попытка тоже потеряна — задание закрывается
+    db_session.execute(
+        text("UPDATE background_jobs SET locked_until = 0 WHERE job_id = :id"),
+        {"id": job_id},
+    )
+    db_session.commit()
+    assert queue.claim("w3", 60) is None
+    assert [j["job_id"] for j in queue.fail_expired()] == [job_id]
+    assert _job(db_session, job_id).status == "failed"
+
+
+def test_stale_worker_cannot_finish_reclaimed_job(queue, db_session):
+    job_id = queue.enqueue("tests.echo", {}, max_attempts=3)
+    queue.claim("w1", 60)
+    db_session.execute(
+        text("UPDATE background_jobs SET locked_until = 0 WHERE job_id = :id"),
+        {"id": job_id},
+    )
+    db_session.commit()
+    assert queue.claim("w2", 60)["job_id"] == job_id
+
+    # Поздние результаты w1 отбрасываются, задание остаётся за w2
+    assert queue.complete(job_id, "w1") is False
+    assert queue.fail(job_id, "w1", "boom", 1, 3, 10, 600) is None
+    assert queue.extend(job_id, "w1", 60) is False
+    stored = _job(db_session, job_id)
+    assert (stored.status, stored.locked_by) == ("running", "w2")
+
+    assert queue.complete(job_id, "w2") is True
+    assert _job(db_session, job_id).status == "done"
+
+
+def test_worker_abandons_job_after_losing_lease(queue, db_session, monkeypatch):
+    from app.jobs import registry
+    from app.jobs.worker import Worker
+
+    worker = Worker({**CONFIG, "JOB_QUEUE_VISIBILITY_TIMEOUT": 0.3}, worker_id="w1")
+    job_id = queue.enqueue("tests.slow", {})
+
+    def slow(payload):
+        # Пока задание выполняется, его забирает другой воркер
+        db_session.execute(
+            text(
+                "UPDATE background_jobs SET locked_by = 'w2', locked_until = 0 "
+                "WHERE job_id = :id"
+            ),
+            {"id": job_id},
+        )
+        db_session.commit()
+        time.sleep(0.3)
+
+    monkeypatch.setitem(
+        registry._TASKS, "tests.slow", registry.Task("tests.slow", slow)
+    )
+    finished = []
+    monkeypatch.setattr(
+        type(queue), "complete", lambda self, *args: finished.append(args)
+    )
+    assert worker.run_once()["job_id"] == job_id
+    # Воркер бросает задание, не пытаясь записать результат
+    assert finished == []
+    stored = _job(db_session, job_id)
+    assert (stored.status, stored.locked_by) == ("running", "w2")
+
+
+def test_worker_runs_and_retries_jobs(queue, tasks, db_session):
+    from app.jobs.worker import Worker
+
+    calls, failures = tasks
+    worker = Worker(CONFIG, worker_id="test")
+    ok = queue.enqueue("tests.echo", {"x": 1})
+    broken = queue.enqueue("tests.broken", {}, max_attempts=1)
+    unknown = queue.enqueue("tests.unknown", {})
+
+    while worker.run_once():
+        pass
+
+    assert calls == [{"x": 1}]
+    assert _job(db_session, ok).status == "done"
+    assert _job(db_session, broken).status == "failed"
+    assert failures == ["boom"]
+    assert _job(db_session, unknown).status == "failed"
+
+
+def test_document_job_through_queue(
+    client, jwt_token, tmp_path, monkeypatch, db_session
+):
+    import os
+
+    from app.jobs.worker import Worker
+    from app.utils.document_jobs import document_job_runner
+    from app.utils.template_client import template_client
+
+    monkeypatch.setattr(document_job_runner, "backend", "queue")
+    monkeypatch.setattr(template_client, "url", "http://templates.local/generate")
+    monkeypatch.setattr(template_client, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(
+        template_client, "_session", FakeSession(FakeResponse([b"PK", b"queued"]))
+    )
+    monkeypatch.setattr(template_client, "_session_pid", os.getpid())
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    job_id = client.post("/templates/jobs", json=PAYLOAD, headers=headers).json[
+        "job_id"
+    ]
+    # Без воркера задание ждёт в очереди
+    assert (
+        client.get(f"/templates/jobs/{job_id}", headers=headers).json["job"]["status"]
+        == "queued"
+    )
+
+    assert Worker(CONFIG, worker_id="test").run_once() is not None
+    job = client.get(f"/templates/jobs/{job_id}", headers=headers).json["job"]
+    assert job["status"] == "done"
+    response = client.get(f"/templates/jobs/{job_id}/download", headers=headers)
+    assert response.data == b"PKqueued"
+
+
+def test_purge_finished_jobs(queue, db_session):
+    from app.database.models import BackgroundJobs
+
+    done = queue.enqueue("tests.echo", {})
+    queue.claim("w1", 60)
+    queue.complete(done, "w1")
+    pending = queue.enqueue("tests.echo", {})
+
+    assert queue.purge_finished(int(time.time()) - 3600) == 0
+    assert queue.purge_finished(int(time.time()) + 60) == 1
+    db_session.expire_all()
+    remaining = [job_id for (job_id,) in db_session.query(BackgroundJobs.job_id)]
+    assert remaining == [pending]
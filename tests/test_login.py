@@ -0,0 +1,84 @@
+# Tests for login and password rehashing
+from sqlalchemy import event
+
+
+def _password_hash(db_session, user_id):
+    from app.database.models import Users
+
+    db_session.expire_all()
+    return db_session.query(Users.password_hash).filter_by(user_id=user_id).scalar()
+
+
+def test_login_single_query(client, test_app, seed_user):
+    from app.database.db_globals import engine
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.post(
+            "/auth/login", json={"login": "test_user", "password": "qweasdzcx"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.json["user_id"] == seed_user["user_id"]
+    assert len(statements) == 1
+
+
+def test_login_bad_password(client, seed_user):
+    response = client.post(
+        "/auth/login", json={"login": "test_user", "password": "wrong"}
+    )
+    assert response.status_code == 401
+
+    response = client.post("/auth/login", json={"login": "nobody", "password": "x"})
+    assert response.status_code == 401
+
+
+def test_login_rehashes_outdated_hash(client, db_session, seed_user):
+    from app.database.models import Users
+    from app.utils.passwords import password_hasher
+
+    user = db_session.query(Users).filter_by(login="test_user").one()
+    user_id = user.user_id
+    old_method = password_hasher.method
+    password_hasher.method = "pbkdf2:sha256:500"
+    try:
+        user.set_password("qweasdzcx")
+        db_session.commit()
+    finally:
+        password_hasher.method = old_method
+    old_hash = _password_hash(db_session, user_id)
+    assert password_hasher.needs_rehash(old_hash)
+
+    response = client.post(
+        "/auth/login", json={"login": "test_user", "password": "qweasdzcx"}
+    )
+    assert response.status_code == 200
+
+    new_hash = _password_hash(db_session, user_id)
+    assert new_hash.startswith(f"{password_hasher.method}$")
+    assert not password_hasher.needs_rehash(new_hash)
+
+    response = client.post(
+        "/auth/login", json={"login": "test_user", "password": "qweasdzcx"}
+    )
+    assert response.status_code == 200
+
+
+def test_needs_rehash_with_shorthand_method():
+    from app.utils.passwords import PasswordHasher
+
+    for method in ("scrypt", "pbkdf2", "pbkdf2:sha256"):
+        hasher = PasswordHasher(method)
+        # В хеше параметры раскрыты полностью, но метод тот же
+        assert not hasher.needs_rehash(hasher.hash("secret"))
+
+    assert PasswordHasher("pbkdf2:sha256:1000").needs_rehash(
+        PasswordHasher("pbkdf2").hash("secret")
+    )
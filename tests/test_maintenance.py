@@ -0,0 +1,152 @@
+# Tests for the database maintenance scheduler
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def scheduler(test_app):
+    from app.database.maintenance import MaintenanceScheduler
+
+    scheduler = MaintenanceScheduler()
+    scheduler.init_app(test_app)
+    scheduler.min_dead = 100
+    scheduler.reindex_min_bytes = 0
+    yield scheduler
+    scheduler.release_leadership()
+
+
+@pytest.fixture
+def scratch_table(test_app):
+    from app.database.db_globals import engine
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text("DROP TABLE IF EXISTS maintenance_scratch"))
+        conn.execute(text("CREATE TABLE maintenance_scratch (id int, code text)"))
+        conn.execute(
+            text(
+                "CREATE INDEX ix_maintenance_scratch_code ON maintenance_scratch (code)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO maintenance_scratch "
+                "SELECT g, md5(g::text) FROM generate_series(1, 20000) g"
+            )
+        )
+        conn.execute(text("DELETE FROM maintenance_scratch WHERE id % 10 <> 0"))
+        conn.execute(text("SELECT pg_stat_force_next_flush()"))
+    yield
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS maintenance_scratch"))
+        conn.commit()
+
+
+def test_single_leader(test_app):
+    from app.database.maintenance import MaintenanceScheduler
+
+    first, second = MaintenanceScheduler(), MaintenanceScheduler()
+    try:
+        assert first.acquire_leadership() is True
+        assert second.acquire_leadership() is False
+        # Лидер подтверждает блокировку повторно
+        assert first.acquire_leadership() is True
+
+        first.release_leadership()
+        assert second.acquire_leadership() is True
+    finally:
+        first.release_leadership()
+        second.release_leadership()
+
+
+def test_run_targets_dead_tuples_and_bloated_indexes(scheduler, scratch_table):
+    assert scheduler.acquire_leadership()
+    conn = scheduler._conn
+
+    candidates = {t["relname"] for t in scheduler.candidate_tables(conn)}
+    assert "maintenance_scratch" in candidates
+
+    summary = scheduler.run_once()
+    assert "public.maintenance_scratch" in summary["vacuum"]
+    # VACUUM обновил статистику: индекс на 90% пустой и перестраивается
+    assert "public.ix_maintenance_scratch_code" in summary["reindex"]
+
+    dead = conn.execute(
+        text(
+            "SELECT n_dead_tup FROM pg_stat_user_tables "
+            "WHERE relname = 'maintenance_scratch'"
+        )
+    ).scalar()
+    assert dead == 0
+    # Повторный проход ничего не трогает
+    assert "maintenance_scratch" not in {
+        t["relname"] for t in scheduler.candidate_tables(conn)
+    }
+    assert not any(
+        i["index_name"] == "ix_maintenance_scratch_code"
+        for i in scheduler.bloated_indexes(conn)
+    )
+
+
+def test_estimate_btree_bloat():
+    from app.database.maintenance import estimate_btree_bloat
+
+    # 10 000 ключей по 33 байта помещаются примерно в 60 страниц
+    assert estimate_btree_bloat(60, 10000, 33, 90, 8192) == 0.0
+    assert estimate_btree_bloat(600, 10000, 33, 90, 8192) > 80
+    # Индекс без статистики не считается раздутым
+    assert estimate_btree_bloat(600, -1, 33, 90, 8192) == 0.0
+
+
+def test_failed_reindex_drops_leftover_and_continues(scheduler, scratch_table):
+    from app.database.db_globals import engine
+
+    assert scheduler.acquire_leadership()
+    conn = scheduler._conn
+    try:
+        conn.execute(
+            text(
+                "CREATE FUNCTION maintenance_scratch_ok(int) RETURNS boolean "
+                "IMMUTABLE LANGUAGE plpgsql AS 'BEGIN RETURN true; END'"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX ix_maintenance_scratch_partial "
+                "ON maintenance_scratch (code) WHERE maintenance_scratch_ok(id)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO maintenance_scratch "
+                "SELECT g, md5(g::text) FROM generate_series(20001, 40000) g"
+            )
+        )
+        conn.execute(text("DELETE FROM maintenance_scratch WHERE id > 20000"))
+        conn.execute(text("VACUUM (ANALYZE) maintenance_scratch"))
+        # Построение новой копии индекса падает на предикате
+        conn.execute(
+            text(
+                "CREATE OR REPLACE FUNCTION maintenance_scratch_ok(int) "
+                "RETURNS boolean IMMUTABLE LANGUAGE plpgsql "
+                "AS 'BEGIN RAISE EXCEPTION ''broken''; END'"
+            )
+        )
+
+        summary = scheduler.run_once()
+        assert "public.ix_maintenance_scratch_partial" not in summary["reindex"]
+        # Следующий индекс перестраивается, несмотря на ошибку
+        assert "public.ix_maintenance_scratch_code" in summary["reindex"]
+        leftovers = conn.execute(
+            text(
+                "SELECT relname FROM pg_class "
+                "WHERE relname LIKE 'ix_maintenance_scratch_partial%'"
+            )
+        ).scalars()
+        assert leftovers.all() == ["ix_maintenance_scratch_partial"]
+    finally:
+        scheduler.release_leadership()
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS maintenance_scratch"))
+            conn.execute(text("DROP FUNCTION IF EXISTS maintenance_scratch_ok(int)"))
+            conn.commit()
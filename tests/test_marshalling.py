@@ -0,0 +1,149 @@
+# Tests for compiled marshalling: same output as flask_restx.marshal
+import importlib
+import pkgutil
+import random
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from flask_restx import Model, fields
+from flask_restx import marshal as restx_marshal
+from flask_restx.fields import MarshallingError
+
+import app.routes.models
+from app.utils.marshalling import compile_model, marshal
+from app.utils.responses import dumps
+
+
+def _all_models():
+    models = {}
+    for module_info in pkgutil.iter_modules(app.routes.models.__path__):
+        module = importlib.import_module(f"app.routes.models.{module_info.name}")
+        for value in vars(module).values():
+            if isinstance(value, Model):
+                models[value.name] = value
+    return sorted(models.items())
+
+
+def _sample_value(field, rng, depth):
+    if isinstance(field, type):
+        field = field()
+    if isinstance(field, dict):
+        return _sample(field, rng, depth + 1)
+    if rng.random() < 0.15:
+        return None
+    if isinstance(field, fields.Nested):
+        if depth > 3:
+            return None
+        return _sample(field.nested, rng, depth + 1)
+    if isinstance(field, fields.List):
+        return [_sample_value(field.container, rng, depth + 1) for _ in range(2)]
+    if isinstance(field, fields.Boolean):
+        return rng.choice([True, False, 0, 1, "true"])
+    if isinstance(field, fields.Integer):
+        return rng.choice([7, 1700000000, "42", 3.0])
+    if isinstance(field, fields.Float):
+        return rng.choice([1.5, Decimal("12.30"), 0, "2.5"])
+    if isinstance(field, fields.String):
+        return rng.choice(["text", uuid.uuid4(), 5, ""])
+    return rng.choice([{"a": 1}, [1, 2], "raw", 3])
+
+
+def _sample(model, rng, depth=0):
+    model = getattr(model, "resolved", model)
+    return {
+        name: _sample_value(field, rng, depth)
+        for name, field in model.items()
+        # Пропуск ключа вроде "keys" у restx даёт метод dict — не JSON
+        if rng.random() > 0.1 or hasattr(dict, name)
+    }
+
+
+@pytest.mark.parametrize("name,model", _all_models())
+def test_matches_restx_for_all_models(name, model):
+    rng = random.Random(name)
+    for _ in range(20):
+        data = _sample(model, rng)
+        expected = restx_marshal(data, model)
+        assert marshal(data, model) == expected
+        assert dumps(marshal(data, model, native=True)) == dumps(expected)
+    rows = [_sample(model, rng) for _ in range(5)]
+    assert marshal(rows, model) == restx_marshal(rows, model)
+
+
+def test_defaults_nested_and_attributes():
+    brief = Model("Brief", {"id": fields.String, "flag": fields.Boolean(default=False)})
+    model = Model(
+        "Sample",
+        {
+            "name": fields.String(default="unknown"),
+            "count": fields.Integer(default=0),
+            "renamed": fields.Float(attribute="source"),
+            "dotted": fields.String(attribute="inner.value"),
+            "keys": fields.String,
+            "null_brief": fields.Nested(brief, allow_null=True),
+            "empty_brief": fields.Nested(brief),
+            "default_brief": fields.Nested(brief, default={}),
+            "briefs": fields.List(fields.Nested(brief)),
+            "tags": fields.List(fields.String, default=[]),
+            "inline": {"source": fields.Float},
+        },
+    )
+    data = {
+        "source": Decimal("3.25"),
+        "inner": {"value": 5},
+        "briefs": [{"id": uuid.UUID(int=1)}, None],
+    }
+    assert marshal(data, model) == restx_marshal(data, model)
+    assert marshal(data, model)["keys"] == restx_marshal(data, model)["keys"]
+
+
+def test_inherited_model():
+    base = Model("Base", {"id": fields.String})
+    child = base.inherit("Child", {"total": fields.Integer})
+    data = {"id": 1, "total": "5"}
+    assert marshal(data, child) == {"id": "1", "total": 5}
+
+
+def test_objects_fall_back_to_restx():
+    model = Model("Obj", {"id": fields.String, "quantity": fields.Float})
+    obj = SimpleNamespace(id=uuid.UUID(int=3), quantity=Decimal("1.5"))
+    assert marshal(obj, model) == restx_marshal(obj, model)
+
+
+def test_invalid_value_raises_marshalling_error():
+    model = Model("Invalid", {"count": fields.Integer})
+    with pytest.raises(MarshallingError):
+        marshal({"count": "many"}, model)
+
+
+def test_model_compiled_once():
+    model = Model("Once", {"id": fields.String})
+    assert compile_model(model) is compile_model(model)
+    assert compile_model(model, native=True) is not compile_model(model)
+
+
+def test_native_keeps_uuid_objects():
+    model = Model("Native", {"id": fields.String, "name": fields.String})
+    value = uuid.uuid4()
+    assert marshal({"id": value, "name": 1}, model, native=True) == {
+        "id": value,
+        "name": "1",
+    }
+
+
+def test_mask_header_uses_restx(client, jwt_token, seed_shift_reports):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/all", headers={**headers, "X-Fields": "msg,total"}
+    )
+    assert response.status_code == 200
+    assert response.json == {"msg": "Shift reports found successfully", "total": 2}
+
+
+def test_swagger_documents_response_models(client):
+    spec = client.get("/swagger.json").json
+    response = spec["paths"]["/shift_report_details/all"]["get"]["responses"]["200"]
+    assert response["schema"] == {"$ref": "#/definitions/ShiftReportDetailsAllResponse"}
+    assert "ShiftReportDetails" in spec["definitions"]
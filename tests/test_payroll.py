@@ -0,0 +1,162 @@
+# Tests for payroll
+from uuid import UUID, uuid4
+
+import pytest
+
+
+@pytest.fixture
+def seed_payroll_reports(
+    db_session, seed_user, seed_project, seed_project_own, seed_work
+):
+    """Подписанные, неподписанные и удалённые отчеты с деталями."""
+    from app.database.models import ShiftReportDetails, ShiftReports
+
+    def add_report(project_id, summs, signed=True, deleted=False, night_shift=False):
+        report = ShiftReports(
+            shift_report_id=uuid4(),
+            user=UUID(seed_user["user_id"]),
+            date=20240110,
+            project=UUID(project_id),
+            created_by=UUID(seed_user["user_id"]),
+            signed=signed,
+            deleted=deleted,
+            night_shift=night_shift,
+        )
+        db_session.add(report)
+        db_session.flush()
+        for summ in summs:
+            db_session.add(
+                ShiftReportDetails(
+                    shift_report_detail_id=uuid4(),
+                    shift_report=report.shift_report_id,
+                    work=UUID(seed_work["work_id"]),
+                    quantity=1,
+                    summ=summ,
+                    created_by=UUID(seed_user["user_id"]),
+                )
+            )
+
+    add_report(seed_project["project_id"], [100, 50])
+    add_report(seed_project_own["project_id"], [30], night_shift=True)
+    add_report(seed_project["project_id"], [1000], signed=False)
+    add_report(seed_project["project_id"], [2000], deleted=True)
+    db_session.commit()
+
+
+def test_payroll_totals_with_breakdown(
+    client, jwt_token, seed_user, seed_project, seed_project_own, seed_payroll_reports
+):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/payroll?date_from=20240101&date_to=20240131&group_by=project",
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json["msg"] == "Payroll fetched successfully"
+    rows = response.json["payroll"]
+
+    total = [row for row in rows if row["level"] == "total"]
+    assert len(total) == 1
+    assert total[0]["summ"] == 180.0
+    assert total[0]["shift_reports_count"] == 2
+
+    user_rows = [row for row in rows if row["level"] == "user"]
+    assert len(user_rows) == 1
+    assert user_rows[0]["user"] == seed_user["user_id"]
+    assert user_rows[0]["summ"] == 180.0
+    assert user_rows[0]["details_count"] == 3
+
+    by_project = {row["project"]: row for row in rows if row["level"] == "project"}
+    assert by_project[seed_project["project_id"]]["summ"] == 150.0
+    assert by_project[seed_project["project_id"]]["project_name"] == "Test Project"
+    assert by_project[seed_project_own["project_id"]]["summ"] == 30.0
+
+
+def test_payroll_by_conditions(client, jwt_token, seed_payroll_reports):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/payroll?group_by=night_shift,extreme_conditions", headers=headers
+    )
+
+    assert response.status_code == 200
+    rows = response.json["payroll"]
+    night = [
+        row
+        for row in rows
+        if row["level"] == "extreme_conditions" and row["night_shift"] is True
+    ]
+    assert len(night) == 1
+    assert night[0]["summ"] == 30.0
+
+
+def test_payroll_leader_scope(
+    client, jwt_token_leader, seed_project_own, seed_payroll_reports
+):
+    headers = {"Authorization": f"Bearer {jwt_token_leader}"}
+    response = client.get("/payroll?group_by=project", headers=headers)
+
+    assert response.status_code == 200
+    rows = response.json["payroll"]
+    projects = {row["project"] for row in rows if row["level"] == "project"}
+    assert projects == {seed_project_own["project_id"]}
+    total = [row for row in rows if row["level"] == "total"][0]
+    assert total["summ"] == 30.0
+
+
+def test_payroll_user_sees_only_own(
+    client,
+    db_session,
+    jwt_token_user,
+    seed_user,
+    seed_leader,
+    seed_project,
+    seed_work,
+    seed_payroll_reports,
+):
+    from app.database.models import ShiftReportDetails, ShiftReports
+
+    # Выработка другого сотрудника за тот же период
+    report = ShiftReports(
+        shift_report_id=uuid4(),
+        user=UUID(seed_leader["user_id"]),
+        date=20240110,
+        project=UUID(seed_project["project_id"]),
+        created_by=UUID(seed_leader["user_id"]),
+        signed=True,
+    )
+    db_session.add(report)
+    db_session.flush()
+    db_session.add(
+        ShiftReportDetails(
+            shift_report_detail_id=uuid4(),
+            shift_report=report.shift_report_id,
+            work=UUID(seed_work["work_id"]),
+            quantity=1,
+            summ=500,
+            created_by=UUID(seed_leader["user_id"]),
+        )
+    )
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {jwt_token_user}"}
+    response = client.get(
+        "/payroll?date_from=20240101&date_to=20240131", headers=headers
+    )
+
+    assert response.status_code == 200
+    rows = response.json["payroll"]
+    user_rows = [row for row in rows if row["level"] == "user"]
+    assert len(user_rows) == 1
+    assert user_rows[0]["user"] == seed_user["user_id"]
+    assert user_rows[0]["summ"] == 180.0
+    total = [row for row in rows if row["level"] == "total"][0]
+    assert total["summ"] == 180.0
+
+
+def test_payroll_invalid_group_by(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/payroll?group_by=city", headers=headers)
+
+    assert response.status_code == 400
+    assert response.json["msg"] == "Validation error"
@@ -178,3 +178,88 @@ def test_get_all_projects(client, jwt_token, seed_project, seed_user, seed_objec
 
     # Проверяем вложенность project_leader
     assert project_data["project_leader"] == seed_user["user_id"]
+
+
+@pytest.fixture
+def seed_project_stats(db_session, seed_project_own, seed_project_work_own, seed_user):
+    """Две работы проекта с одной работой и отчеты: подписанный и нет."""
+    from uuid import UUID, uuid4
+
+    from app.database.models import ProjectWorks, ShiftReportDetails, ShiftReports
+
+    first = db_session.get(ProjectWorks, UUID(seed_project_work_own["project_work_id"]))
+    first.quantity = 10
+    second = ProjectWorks(
+        project_work_id=uuid4(),
+        project_work_name="Second project work",
+        work=first.work,
+        project=first.project,
+        quantity=5.5,
+        summ=0,
+        created_by=first.created_by,
+        signed=False,
+    )
+    db_session.add(second)
+    for signed, quantities in ((True, (2, 1.5)), (True, (3,)), (False, (100,))):
+        report = ShiftReports(
+            shift_report_id=uuid4(),
+            user=UUID(seed_user["user_id"]),
+            date=20240101,
+            project=first.project,
+            created_by=UUID(seed_user["user_id"]),
+            signed=signed,
+            deleted=False,
+        )
+        db_session.add(report)
+        for quantity in quantities:
+            db_session.add(
+                ShiftReportDetails(
+                    shift_report_detail_id=uuid4(),
+                    shift_report=report.shift_report_id,
+                    project_work=first.project_work_id,
+                    work=first.work,
+                    quantity=quantity,
+                    summ=0,
+                    created_by=UUID(seed_user["user_id"]),
+                )
+            )
+    db_session.commit()
+    return [
+        {
+            "project": str(work.project),
+            "project_work_id": str(work.project_work_id),
+            "project_work_name": work.project_work_name,
+            "work": str(work.work),
+        }
+        for work in (first, second)
+    ]
+
+
+def test_get_project_stats(client, jwt_token, seed_project_stats):
+    first, second = seed_project_stats
+    response = client.get(
+        f"/projects/{first['project']}/get-stat",
+        headers={"Authorization": f"Bearer {jwt_token}"},
+    )
+    assert response.status_code == 200
+    stats = response.json["stats"]
+    assert list(stats) == [first["work"]]
+    assert stats[first["work"]]["project_work_quantity"] == 15.5
+    assert stats[first["work"]]["shift_report_details_quantity"] == 6.5
+
+
+def test_get_project_stats_by_project_work(projects_manager, seed_project_stats):
+    first, second = seed_project_stats
+    stats = projects_manager.get_project_stats_by_project_work(first["project"])
+    assert stats == {
+        first["project_work_id"]: {
+            "project_work_quantity": 10.0,
+            "shift_report_details_quantity": 6.5,
+            "project_work_name": first["project_work_name"],
+        },
+        second["project_work_id"]: {
+            "project_work_quantity": 5.5,
+            "shift_report_details_quantity": 0.0,
+            "project_work_name": "Second project work",
+        },
+    }
@@ -0,0 +1,112 @@
+# Tests for the in-process reference data cache
+import time
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+
+@pytest.fixture
+def cache():
+    from app.database.reference_cache import ReferenceCache
+
+    cache = ReferenceCache()
+    cache.listen = False
+    cache.check_interval = 3600
+    yield cache
+    # Поток LISTEN и его соединение не должны переживать тест
+    cache.stop_listener()
+
+
+def test_work_price_hit_and_miss(cache, seed_work_price, seed_work):
+    before = cache.stats().get("work_prices", {"hit": 0, "miss": 0})
+
+    assert cache.work_price(seed_work["work_id"], 1) == Decimal("100.00")
+    assert cache.work_price(UUID(seed_work["work_id"]), 1) == Decimal("100.00")
+    assert cache.work_price(seed_work["work_id"], 4) is None
+
+    after = cache.stats()["work_prices"]
+    assert after["miss"] - before["miss"] == 1
+    assert after["hit"] - before["hit"] == 2
+    assert after["hit_rate"] is not None
+
+
+def test_reload_on_version_change(cache, seed_work_price, seed_work):
+    from app.database.managers.works_managers import WorkPricesManager
+
+    cache.check_interval = 0
+    assert cache.work_price(seed_work["work_id"], 1) == Decimal("100.00")
+
+    WorkPricesManager().update(
+        UUID(seed_work_price["work_price_id"]), price=Decimal("150.00")
+    )
+
+    assert cache.work_price(seed_work["work_id"], 1) == Decimal("150.00")
+
+
+def test_invalidate_table_drops_dependent_sections(
+    cache, seed_work, seed_work_material_relation
+):
+    assert cache.work_materials(seed_work["work_id"])
+    assert cache.work(seed_work["work_id"]).name == seed_work["name"]
+
+    cache.invalidate_table("materials")
+
+    assert "work_materials" not in cache._snapshots
+    assert "works" in cache._snapshots
+
+
+def test_notify_invalidates_cache(cache, seed_work_price, seed_work):
+    from app.database.managers.works_managers import WorkPricesManager
+
+    # Секция загружена до подписки, как при прогреве в мастере
+    assert cache.work_price(seed_work["work_id"], 1) == Decimal("100.00")
+    snapshot = cache._snapshots["work_prices"]
+
+    cache.listen = True
+    cache.work_price(seed_work["work_id"], 1)
+    deadline = time.monotonic() + 5
+    while not cache._listener_connected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert cache._listener_connected
+    # Подписка не сбрасывает загруженные секции, а сверяет их версии
+    cache.work_price(seed_work["work_id"], 1)
+    assert cache._snapshots["work_prices"] is snapshot
+
+    WorkPricesManager().update(
+        UUID(seed_work_price["work_price_id"]), price=Decimal("175.00")
+    )
+
+    deadline = time.monotonic() + 5
+    while "work_prices" in cache._snapshots and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert "work_prices" not in cache._snapshots
+    assert cache.work_price(seed_work["work_id"], 1) == Decimal("175.00")
+
+    thread = cache._listener_thread
+    cache.stop_listener()
+    assert not thread.is_alive()
+
+
+def test_write_invalidates_local_cache_on_commit(
+    monkeypatch, seed_work_price, seed_work
+):
+    from app.database.managers.works_managers import WorkPricesManager
+    from app.database.reference_cache import reference_cache
+
+    monkeypatch.setattr(reference_cache, "enabled", True)
+    monkeypatch.setattr(reference_cache, "listen", False)
+    monkeypatch.setattr(reference_cache, "check_interval", 3600)
+    reference_cache.clear()
+    try:
+        assert reference_cache.work_price(seed_work["work_id"], 1) == Decimal("100.00")
+
+        WorkPricesManager().update(
+            UUID(seed_work_price["work_price_id"]), price=Decimal("125.00")
+        )
+
+        # Сброс сразу после коммита, не дожидаясь своего же NOTIFY
+        assert "work_prices" not in reference_cache._snapshots
+        assert reference_cache.work_price(seed_work["work_id"], 1) == Decimal("125.00")
+    finally:
+        reference_cache.clear()
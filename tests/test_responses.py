@@ -0,0 +1,100 @@
+# Tests for the orjson representation and gzip/brotli response compression
+import gzip
+import json
+import uuid
+from decimal import Decimal
+
+import brotli
+import pytest
+
+from app.utils.responses import dumps, response_compression
+
+
+@pytest.fixture
+def compress_all(monkeypatch):
+    monkeypatch.setattr(response_compression, "min_size", 0)
+
+
+def _get(client, path, token, **headers):
+    return client.get(path, headers={"Authorization": f"Bearer {token}", **headers})
+
+
+def test_dumps_uuid_and_decimal():
+    value = uuid.uuid4()
+    assert json.loads(dumps({"id": value, "summ": Decimal("12.50"), 1: None})) == {
+        "id": str(value),
+        "summ": 12.5,
+        "1": None,
+    }
+
+
+def test_json_representation(client, jwt_token, seed_shift_reports):
+    response = _get(client, "/shift_reports/all", jwt_token)
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.json["total"] == 2
+    assert "Content-Encoding" not in response.headers
+
+
+def test_gzip_compression(client, jwt_token, seed_shift_reports, compress_all):
+    plain = _get(client, "/shift_reports/all", jwt_token)
+    response = _get(
+        client, "/shift_reports/all", jwt_token, **{"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_brotli_preferred(client, jwt_token, seed_shift_reports, compress_all):
+    plain = _get(client, "/shift_reports/all", jwt_token)
+    response = _get(
+        client,
+        "/shift_reports/all",
+        jwt_token,
+        **{"Accept-Encoding": "gzip, deflate, br"},
+    )
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == plain.data
+
+    response = _get(
+        client, "/shift_reports/all", jwt_token, **{"Accept-Encoding": "br;q=0"}
+    )
+    assert "Content-Encoding" not in response.headers
+
+
+def test_small_response_not_compressed(client, jwt_token, seed_shift_reports):
+    response = _get(
+        client, "/shift_reports/all?limit=1", jwt_token, **{"Accept-Encoding": "gzip"}
+    )
+    assert len(response.data) < response_compression.min_size
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_compressed_etag_is_weak(client, jwt_token, compress_all):
+    headers = {"Accept-Encoding": "gzip"}
+    response = _get(client, "/cities/all", jwt_token, **headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    response = _get(
+        client, "/cities/all", jwt_token, **headers, **{"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_asgi_compression(jwt_token, seed_shift_reports, compress_all):
+    from starlette.testclient import TestClient
+
+    from app.asgi import create_asgi_app
+
+    with TestClient(create_asgi_app("testing")) as asgi_client:
+        response_compression.min_size = 0
+        response = asgi_client.get(
+            "/shift_reports/all",
+            headers={"Authorization": f"Bearer {jwt_token}", "Accept-Encoding": "br"},
+        )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.json()["total"] == 2
@@ -0,0 +1,104 @@
+# Tests for project-leader scope checks
+from uuid import uuid4
+
+import pytest
+
+
+@pytest.fixture
+def scope():
+    from app.database.managers.scope_manager import ScopeManager
+    from app.database.scope_cache import scope_cache
+
+    scope_cache.clear()
+    yield ScopeManager()
+    scope_cache.clear()
+
+
+def test_leads_project_work_and_schedule(
+    scope,
+    seed_leader,
+    seed_project_work_own,
+    seed_project_work_other,
+    seed_project_schedule_own,
+    seed_project_schedule_other,
+):
+    leader_id = seed_leader["user_id"]
+
+    assert scope.leads_project_work(leader_id, seed_project_work_own["project_work_id"])
+    assert not scope.leads_project_work(
+        leader_id, seed_project_work_other["project_work_id"]
+    )
+    assert scope.leads_project_schedule(
+        leader_id, seed_project_schedule_own["project_schedule_id"]
+    )
+    assert not scope.leads_project_schedule(
+        leader_id, seed_project_schedule_other["project_schedule_id"]
+    )
+
+
+def test_leads_projects_bulk(scope, seed_leader, seed_project_own, seed_project_other):
+    leader_id = seed_leader["user_id"]
+
+    assert scope.leads_projects(leader_id, [seed_project_own["project_id"]] * 2)
+    assert not scope.leads_projects(
+        leader_id, [seed_project_own["project_id"], seed_project_other["project_id"]]
+    )
+    assert not scope.leads_project(leader_id, uuid4())
+
+
+def test_led_project_ids_cached(scope, seed_leader, seed_project_own):
+    from app.database.scope_cache import scope_cache
+
+    leader_id = seed_leader["user_id"]
+    project_ids = scope.get_led_project_ids(leader_id)
+
+    assert project_ids == {seed_project_own["project_id"]}
+    assert scope_cache.get(leader_id) == project_ids
+
+
+def test_bulk_add_rejects_foreign_project(
+    client, jwt_token_leader, seed_project_own, seed_project_other, seed_work
+):
+    headers = {"Authorization": f"Bearer {jwt_token_leader}"}
+    items = [
+        {
+            "project": project["project_id"],
+            "project_work_name": "Scoped work",
+            "work": seed_work["work_id"],
+            "quantity": 1.0,
+        }
+        for project in (seed_project_own, seed_project_other)
+    ]
+
+    response = client.post("/project_works/add/many", json=items, headers=headers)
+    assert response.status_code == 403
+
+    response = client.post("/project_works/add/many", json=items[:1], headers=headers)
+    assert response.status_code == 200
+
+
+def test_leader_shift_report_scope_is_subquery(seed_leader):
+    from sqlalchemy import Select
+
+    from app.routes.namespaces.shift_report_ns import apply_role_scope
+
+    filters = {"project": None}
+    assert apply_role_scope({"role": "project-leader", **seed_leader}, filters)
+    # Проекты прораба не выгружаются, а подставляются в запрос подзапросом
+    assert isinstance(filters["project"], Select)
+
+
+def test_leader_without_projects_sees_no_shift_reports(
+    client, jwt_token_leader, seed_shift_report
+):
+    headers = {"Authorization": f"Bearer {jwt_token_leader}"}
+    response = client.get("/shift_reports/all", headers=headers)
+    assert response.status_code == 200
+    assert response.json["shift_reports"] == []
+    assert response.json["total"] == 0
+
+    response = client.get(
+        "/shift_reports/calendar?day_from=2024-01-01&day_to=2024-01-31", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json["calendar"] == []
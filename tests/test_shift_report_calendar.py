@@ -0,0 +1,96 @@
+# Tests for shift reports calendar
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+MSK = timezone(timedelta(hours=3))
+
+
+def _epoch(year, month, day, hour=0):
+    return int(datetime(year, month, day, hour, tzinfo=MSK).timestamp())
+
+
+@pytest.fixture
+def seed_calendar_reports(db_session, seed_user, seed_project, seed_work):
+    """Отчеты за несколько дней января 2024 с деталями."""
+    from app.database.models import ShiftReportDetails, ShiftReports
+
+    for date, summ, signed, deleted in (
+        (_epoch(2024, 1, 10, 12), 100, True, False),
+        # Полночь по Москве — это ещё 9 января по UTC
+        (_epoch(2024, 1, 10, 0), 50, False, False),
+        (_epoch(2024, 1, 11, 23), 30, True, False),
+        (_epoch(2024, 1, 11, 12), 999, True, True),
+        (_epoch(2024, 2, 1), 70, True, False),
+    ):
+        report = ShiftReports(
+            shift_report_id=uuid4(),
+            user=UUID(seed_user["user_id"]),
+            date=date,
+            project=UUID(seed_project["project_id"]),
+            created_by=UUID(seed_user["user_id"]),
+            signed=signed,
+            deleted=deleted,
+        )
+        db_session.add(report)
+        db_session.flush()
+        db_session.add(
+            ShiftReportDetails(
+                shift_report_detail_id=uuid4(),
+                shift_report=report.shift_report_id,
+                work=UUID(seed_work["work_id"]),
+                quantity=1,
+                summ=summ,
+                created_by=UUID(seed_user["user_id"]),
+            )
+        )
+    db_session.commit()
+
+
+def test_calendar_by_user(client, jwt_token, seed_user, seed_calendar_reports):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/calendar?day_from=2024-01-01&day_to=2024-01-31",
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    cells = {cell["day"]: cell for cell in response.json["calendar"]}
+    assert set(cells) == {"2024-01-10", "2024-01-11"}
+    assert cells["2024-01-10"]["user"] == seed_user["user_id"]
+    assert cells["2024-01-10"]["shift_reports_count"] == 2
+    assert cells["2024-01-10"]["signed_count"] == 1
+    assert cells["2024-01-10"]["summ"] == 150.0
+    assert cells["2024-01-11"]["summ"] == 30.0
+
+
+def test_calendar_by_project(client, jwt_token, seed_project, seed_calendar_reports):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/calendar?day_from=2024-01-01&day_to=2024-02-29"
+        "&group_by=project&signed=true",
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    cells = response.json["calendar"]
+    assert [cell["day"] for cell in cells] == ["2024-01-10", "2024-01-11", "2024-02-01"]
+    assert all(cell["project"] == seed_project["project_id"] for cell in cells)
+    assert cells[0]["project_name"] == "Test Project"
+    assert cells[0]["summ"] == 100.0
+
+
+def test_calendar_invalid_range(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/calendar?day_from=2024-02-01&day_to=2024-01-01",
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/shift_reports/calendar?day_from=2023-01-01&day_to=2024-12-31",
+        headers=headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,87 @@
+# Tests for shift report exports
+import csv
+import io
+
+from openpyxl import load_workbook
+
+
+def test_export_shift_reports_csv(client, jwt_token, seed_shift_report):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/export/shift_reports?format=csv", headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert "shift_reports.csv" in response.headers["Content-Disposition"]
+
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert rows[0][0] == "shift_report_id"
+    assert "shift_report_details_sum" in rows[0]
+    assert len(rows) == 2
+    record = dict(zip(rows[0], rows[1]))
+    assert record["shift_report_id"] == seed_shift_report["shift_report_id"]
+    assert record["project_name"] == "Test Project"
+    assert record["object_name"] == "Test Object"
+    assert record["comment"] == "Seed shift report comment"
+
+
+def test_export_details_xlsx(client, jwt_token, seed_shift_report_detail):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/shift_reports/export/details", headers=headers)
+
+    assert response.status_code == 200
+    assert response.mimetype.endswith("spreadsheetml.sheet")
+
+    workbook = load_workbook(io.BytesIO(response.data), read_only=True)
+    rows = list(workbook["details"].iter_rows(values_only=True))
+    assert rows[0][0] == "shift_report_detail_id"
+    assert len(rows) == 2
+    record = dict(zip(rows[0], rows[1]))
+    assert (
+        record["shift_report_detail_id"]
+        == seed_shift_report_detail["shift_report_detail_id"]
+    )
+    assert record["work_name"] == "Test Work"
+    assert float(record["summ"]) == 105.0
+
+
+def test_export_materials_csv(client, jwt_token, seed_shift_report_material):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/shift_reports/export/materials?format=csv", headers=headers)
+
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert len(rows) == 2
+    record = dict(zip(rows[0], rows[1]))
+    assert record["material_name"] == "Test Material"
+    assert float(record["quantity"]) == 1.5
+
+
+def test_export_respects_filters_and_roles(
+    client, jwt_token, jwt_token_leader, seed_shift_report
+):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/export/shift_reports?format=csv&date_from=20250101",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert len(rows) == 1
+
+    # Отчет относится к проекту другого прораба
+    headers = {"Authorization": f"Bearer {jwt_token_leader}"}
+    response = client.get(
+        "/shift_reports/export/shift_reports?format=csv", headers=headers
+    )
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+    assert len(rows) == 1
+
+
+def test_export_unknown_entity(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/shift_reports/export/users", headers=headers)
+
+    assert response.status_code == 404
@@ -0,0 +1,98 @@
+# Tests for shift report geofence verification
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+
+def test_haversine_vectorized():
+    from app.utils.geo import as_float_array, haversine_m
+
+    # Москва -> Санкт-Петербург, около 634 км
+    distances = haversine_m(
+        as_float_array([55.7558, 55.7558, None]),
+        as_float_array([37.6173, 37.6173, 37.6173]),
+        as_float_array([59.9386, 55.7558, 55.7558]),
+        as_float_array([30.3141, 37.6173, 37.6173]),
+    )
+    assert distances[0] == pytest.approx(634_000, rel=0.01)
+    assert distances[1] == 0
+    assert np.isnan(distances[2])
+
+
+def test_geofence_report(client, jwt_token, seed_shift_reports):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/shift_reports/geofence?radius=100", headers=headers)
+
+    assert response.status_code == 200
+    summary = response.json["summary"]
+    assert summary["checked"] == 2
+    assert summary["violations"] == 1
+    assert summary["radius"] == 100
+
+    rows = response.json["shift_reports"]
+    assert len(rows) == 1
+    assert rows[0]["shift_report_id"] == seed_shift_reports[1]["shift_report_id"]
+    assert rows[0]["start_outside"] is True
+    assert rows[0]["computed_distance_start"] > 100_000
+
+
+def test_geofence_distance_mismatch(client, jwt_token, seed_shift_report):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get(
+        "/shift_reports/geofence?radius=100&tolerance=0.5", headers=headers
+    )
+
+    assert response.status_code == 200
+    rows = response.json["shift_reports"]
+    assert len(rows) == 1
+    # Клиент передал 10.5 м, фактически точка совпадает с объектом
+    assert rows[0]["computed_distance_start"] == 0
+    assert rows[0]["distance_mismatch"] is True
+    assert rows[0]["start_outside"] is False
+
+
+def test_geofence_forbidden_for_user(client, jwt_token_user, seed_shift_report):
+    headers = {"Authorization": f"Bearer {jwt_token_user}"}
+    response = client.get("/shift_reports/geofence", headers=headers)
+
+    assert response.status_code == 403
+
+
+def test_fill_distances(client, jwt_token, db_session, seed_user, seed_project):
+    from app.database.models import ShiftReports
+
+    report = ShiftReports(
+        shift_report_id=uuid4(),
+        user=UUID(seed_user["user_id"]),
+        date=20240102,
+        project=UUID(seed_project["project_id"]),
+        created_by=UUID(seed_user["user_id"]),
+        lng_start=37.6173,
+        ltd_start=55.7558,
+        lng_end=37.6273,
+        ltd_end=55.7558,
+        distance_end=1.0,
+    )
+    db_session.add(report)
+    db_session.commit()
+    report_id = report.shift_report_id
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.post("/shift_reports/geofence/fill", headers=headers)
+    assert response.status_code == 200
+    assert response.json["updated"] == 1
+
+    db_session.expire_all()
+    report = db_session.query(ShiftReports).filter_by(shift_report_id=report_id).one()
+    assert report.distance_start == 0
+    assert report.distance_end == 1.0
+
+    response = client.post(
+        "/shift_reports/geofence/fill?overwrite=true", headers=headers
+    )
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    report = db_session.query(ShiftReports).filter_by(shift_report_id=report_id).one()
+    assert report.distance_end == pytest.approx(626, rel=0.01)
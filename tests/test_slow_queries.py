@@ -0,0 +1,99 @@
+# Tests for slow query capture and the diagnostics endpoint
+import time
+
+import pytest
+
+from app.database.slow_queries import explainable, parameters_shape, slow_query_log
+
+
+@pytest.fixture
+def capture_all(monkeypatch):
+    monkeypatch.setattr(slow_query_log, "threshold", 1e-9)
+    monkeypatch.setattr(slow_query_log, "sample_rate", 1.0)
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+def _wait_for_plan(client, headers, endpoint):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        entries = client.get(
+            f"/diagnostics/slow_queries?endpoint={endpoint}", headers=headers
+        ).json["slow_queries"]
+        if any(entry["explain"] == "done" for entry in entries):
+            return entries
+        time.sleep(0.05)
+    raise AssertionError("EXPLAIN did not finish")
+
+
+def test_parameters_shape():
+    assert parameters_shape({"id_1": "x", "ids": [1, 2], "n": 5}) == {
+        "id_1": "str",
+        "ids": "list[2]",
+        "n": "int",
+    }
+    assert parameters_shape(("a", None)) == {"0": "str", "1": "NoneType"}
+    shape = parameters_shape({f"p{i}": i for i in range(60)})
+    assert len(shape) == 51
+    assert shape["..."] == "+10"
+
+
+def test_only_selects_are_explained():
+    assert explainable("  SELECT 1")
+    assert not explainable("SELECT * FROM t FOR UPDATE SKIP LOCKED")
+    assert not explainable("SELECT * FROM t\nFOR UPDATE")
+    assert not explainable("SELECT * FROM t FOR NO KEY UPDATE")
+    assert not explainable("select * from t for share nowait")
+    assert not explainable("SELECT * FROM t FOR KEY SHARE")
+    assert not explainable("UPDATE t SET a = 1")
+    assert not explainable("WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x")
+
+
+def test_slow_query_captured_with_plan(
+    client, jwt_token, seed_shift_reports, capture_all
+):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    assert client.get("/shift_reports/all", headers=headers).status_code == 200
+
+    entries = _wait_for_plan(client, headers, "/shift_reports/all")
+    entry = next(entry for entry in entries if entry["explain"] == "done")
+    assert entry["role"] == "admin"
+    assert entry["statement"].lstrip().startswith("SELECT")
+    assert all("%" not in value for value in entry["parameters"].values())
+    plan = entry["plan"][0]
+    assert "Plan" in plan
+    assert "Execution Time" in plan
+    assert "Shared Hit Blocks" in plan["Plan"]
+
+
+def test_writes_are_not_explained(client, jwt_token, capture_all):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.post("/cities/add", json={"name": "Slow city"}, headers=headers)
+    assert response.status_code == 200
+
+    entries = client.get(
+        "/diagnostics/slow_queries?endpoint=/cities/add", headers=headers
+    ).json["slow_queries"]
+    inserts = [e for e in entries if e["statement"].startswith("INSERT")]
+    assert inserts
+    assert all(entry["explain"] == "skipped" for entry in inserts)
+
+
+def test_diagnostics_admin_only(client, jwt_token, jwt_token_user, capture_all):
+    response = client.get(
+        "/diagnostics/slow_queries",
+        headers={"Authorization": f"Bearer {jwt_token_user}"},
+    )
+    assert response.status_code == 403
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    client.get("/cities/all", headers=headers)
+    assert client.get("/diagnostics/slow_queries", headers=headers).json["slow_queries"]
+
+    response = client.delete("/diagnostics/slow_queries", headers=headers)
+    assert response.status_code == 200
+    entries = client.get("/diagnostics/slow_queries?limit=1", headers=headers).json[
+        "slow_queries"
+    ]
+    assert len(entries) <= 1
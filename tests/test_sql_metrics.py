@@ -0,0 +1,92 @@
+# Tests for per-endpoint SQL metrics and the N+1 detector
+import logging
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.database.sql_metrics import normalize_statement, sql_instrumentation
+
+ENDPOINT = "/shift_reports/all"
+
+
+def _sample(name, endpoint=ENDPOINT):
+    return REGISTRY.get_sample_value(name, {"endpoint": endpoint}) or 0
+
+
+@pytest.fixture
+def low_threshold(monkeypatch):
+    monkeypatch.setattr(sql_instrumentation, "n_plus_one_threshold", 1)
+
+
+def test_normalize_statement():
+    first = normalize_statement(
+        "SELECT * FROM works\n WHERE work_id = %(work_id_1)s AND price > 10 "
+        "AND name = 'a''b' AND category IN (%(c_1_1)s, %(c_1_2)s) LIMIT %(p)s"
+    )
+    second = normalize_statement(
+        "SELECT * FROM works WHERE work_id = %(work_id_1)s AND price > 20 "
+        "AND name = 'x' AND category IN (%(c_1_1)s) LIMIT %(p)s"
+    )
+    assert first == second
+    assert first == (
+        "SELECT * FROM works WHERE work_id = ? AND price > ? AND name = ? "
+        "AND category IN (?) LIMIT ?"
+    )
+
+
+def test_request_metrics(client, jwt_token, seed_shift_reports):
+    queries = _sample("db_request_queries_count")
+    rows = _sample("db_request_rows_sum")
+
+    response = client.get(ENDPOINT, headers={"Authorization": f"Bearer {jwt_token}"})
+    assert response.status_code == 200
+
+    assert _sample("db_request_queries_count") == queries + 1
+    assert _sample("db_request_rows_sum") > rows
+    assert _sample("db_request_duration_seconds_sum") > 0
+
+
+def test_n_plus_one_detected(
+    client, jwt_token, seed_shift_reports, low_threshold, caplog
+):
+    detected = _sample("db_n_plus_one_total")
+
+    with caplog.at_level(logging.WARNING, logger="ok_service"):
+        response = client.get(
+            ENDPOINT, headers={"Authorization": f"Bearer {jwt_token}"}
+        )
+    assert response.status_code == 200
+
+    assert _sample("db_n_plus_one_total") == detected + 1
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "get_total_sum_by_shift_report" in warnings[0]
+    assert "shift_reports_managers.py" in warnings[0]
+
+
+def test_no_n_plus_one_below_threshold(client, jwt_token, seed_shift_reports):
+    detected = _sample("db_n_plus_one_total")
+
+    client.get(ENDPOINT, headers={"Authorization": f"Bearer {jwt_token}"})
+
+    assert _sample("db_n_plus_one_total") == detected
+
+
+def test_asgi_n_plus_one_detected(jwt_token, seed_shift_reports, low_threshold):
+    from starlette.testclient import TestClient
+
+    from app.asgi import create_asgi_app
+
+    app = create_asgi_app("testing")
+    sql_instrumentation.n_plus_one_threshold = 1
+    detected = _sample("db_n_plus_one_total")
+    queries = _sample("db_request_queries_sum")
+
+    with TestClient(app) as asgi_client:
+        response = asgi_client.get(
+            ENDPOINT, headers={"Authorization": f"Bearer {jwt_token}"}
+        )
+    assert response.status_code == 200
+
+    assert _sample("db_request_queries_sum") >= queries + 3
+    assert _sample("db_n_plus_one_total") == detected + 1
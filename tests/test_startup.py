@@ -0,0 +1,69 @@
+# Tests for application startup
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+
+def test_seed_reference_data_is_idempotent(db_session):
+    from app.utils.db_setting_tables import (
+        OBJECT_STATUSES,
+        ROLES,
+        seed_reference_data,
+    )
+
+    def snapshot():
+        roles = db_session.execute(text("SELECT role_id FROM roles")).scalars()
+        statuses = db_session.execute(
+            text("SELECT object_status_id FROM object_statuses")
+        ).scalars()
+        return sorted(roles), sorted(statuses)
+
+    seed_reference_data()
+    roles, statuses = snapshot()
+    seed_reference_data()
+
+    assert snapshot() == (roles, statuses)
+    assert {id_ for id_, _ in ROLES} <= set(roles)
+    assert {id_ for id_, _ in OBJECT_STATUSES} <= set(statuses)
+
+
+def test_seed_reference_data_bumps_versions(db_session):
+    from app.database.managers.table_versions_manager import TableVersionsManager
+    from app.utils.db_setting_tables import seed_reference_data
+
+    tables = ("roles", "object_statuses")
+    seed_reference_data()
+    before = TableVersionsManager().get_versions(tables)
+
+    # Без вставок версии не меняются
+    seed_reference_data()
+    assert TableVersionsManager().get_versions(tables) == before
+
+    db_session.execute(
+        text("DELETE FROM object_statuses WHERE object_status_id = 'waiting'")
+    )
+    db_session.commit()
+    seed_reference_data()
+    after = TableVersionsManager().get_versions(tables)
+    assert after["roles"] == before["roles"]
+    assert after["object_statuses"] > before["object_statuses"]
+
+
+def test_startup_profile_is_recorded(test_app):
+    report = test_app.extensions["startup_profile"]
+    assert report["total_ms"] > 0
+    assert {"database", "seed", "namespaces"} <= set(report["phases_ms"])
+
+
+def test_optional_integrations_are_not_imported():
+    # Отдельный процесс: в текущем модули могли загрузить другие тесты
+    code = (
+        "import sys, app; "
+        "print(','.join(m for m in ('openpyxl', 'pywebpush', "
+        "'opentelemetry.exporter.jaeger.thrift') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,195 @@
+# Tests for delta sync
+from uuid import UUID
+
+
+def test_sync_full_snapshot(client, jwt_token, seed_shift_report_detail):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/sync", headers=headers)
+
+    assert response.status_code == 200
+    assert isinstance(response.json["token"], int)
+    assert len(response.json["shift_reports"]) == 1
+    assert len(response.json["shift_report_details"]) == 1
+    assert len(response.json["project_works"]) == 1
+    assert response.json["deleted"]["shift_reports"] == []
+
+
+def test_sync_returns_only_changes(
+    client, jwt_token, db_session, seed_shift_reports, seed_shift_report_detail
+):
+    from app.database.models import ShiftReports
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    token = client.get("/sync", headers=headers).json["token"]
+
+    changed_id = seed_shift_reports[0]["shift_report_id"]
+    db_session.query(ShiftReports).filter(
+        ShiftReports.shift_report_id == UUID(changed_id)
+    ).update({"comment": "changed"}, synchronize_session=False)
+    db_session.commit()
+
+    response = client.get(f"/sync?since={token}", headers=headers)
+    assert response.status_code == 200
+    assert [report["shift_report_id"] for report in response.json["shift_reports"]] == [
+        changed_id
+    ]
+    assert response.json["shift_reports"][0]["comment"] == "changed"
+    assert response.json["shift_report_details"] == []
+    assert response.json["project_works"] == []
+    assert response.json["token"] > token
+
+
+def test_sync_tombstones_for_hard_delete(
+    client, jwt_token, seed_shift_report, seed_shift_report_detail
+):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    token = client.get("/sync", headers=headers).json["token"]
+
+    response = client.delete(
+        f"/shift_reports/{seed_shift_report['shift_report_id']}/delete/hard",
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = client.get(f"/sync?since={token}", headers=headers)
+    assert response.status_code == 200
+    deleted = response.json["deleted"]
+    assert deleted["shift_reports"] == [seed_shift_report["shift_report_id"]]
+    # Детали удалены каскадом, но тоже попадают в надгробия
+    assert deleted["shift_report_details"] == [
+        seed_shift_report_detail["shift_report_detail_id"]
+    ]
+    assert response.json["shift_reports"] == []
+
+
+def test_sync_user_scope(client, jwt_token_user, seed_shift_report, seed_admin):
+    headers = {"Authorization": f"Bearer {jwt_token_user}"}
+    response = client.get("/sync", headers=headers)
+
+    assert response.status_code == 200
+    reports = response.json["shift_reports"]
+    assert [report["shift_report_id"] for report in reports] == [
+        seed_shift_report["shift_report_id"]
+    ]
+
+
+def test_sync_invalid_token(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.get("/sync?since=abc", headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_sync_tombstones_follow_scope(
+    client,
+    jwt_token,
+    jwt_token_user,
+    jwt_token_leader,
+    seed_shift_report,
+    seed_shift_report_detail,
+    seed_admin,
+    db_session,
+):
+    from app.database.models import ShiftReports
+
+    report_id = seed_shift_report["shift_report_id"]
+    detail_id = seed_shift_report_detail["shift_report_detail_id"]
+    tokens = {
+        token: client.get("/sync", headers={"Authorization": f"Bearer {token}"}).json[
+            "token"
+        ]
+        for token in (jwt_token, jwt_token_user, jwt_token_leader)
+    }
+
+    # Отчет переназначен другому пользователю — у автора он должен исчезнуть
+    db_session.query(ShiftReports).filter(
+        ShiftReports.shift_report_id == UUID(report_id)
+    ).update({"user": UUID(seed_admin["user_id"])}, synchronize_session=False)
+    db_session.commit()
+
+    def sync(token):
+        headers = {"Authorization": f"Bearer {token}"}
+        response = client.get(f"/sync?since={tokens[token]}", headers=headers)
+        assert response.status_code == 200
+        return response.json
+
+    delta = sync(jwt_token_user)
+    assert delta["shift_reports"] == []
+    assert delta["deleted"]["shift_reports"] == [report_id]
+    assert delta["deleted"]["shift_report_details"] == [detail_id]
+
+    # Администратор видит обе области: строки приходят изменениями
+    delta = sync(jwt_token)
+    assert [row["shift_report_id"] for row in delta["shift_reports"]] == [report_id]
+    assert [row["shift_report_detail_id"] for row in delta["shift_report_details"]] == [
+        detail_id
+    ]
+    assert delta["deleted"]["shift_reports"] == []
+    assert delta["deleted"]["shift_report_details"] == []
+
+    # Прораб чужого проекта не получает ни изменений, ни удалений
+    delta = sync(jwt_token_leader)
+    assert delta["shift_reports"] == []
+    assert delta["deleted"] == {
+        "shift_reports": [],
+        "shift_report_details": [],
+        "project_works": [],
+    }
+
+
+def test_sync_project_leader_change(
+    client,
+    jwt_token_leader,
+    jwt_token_other_leader,
+    seed_project_work_own,
+    seed_other_leader,
+    db_session,
+):
+    from app.database.models import Projects
+
+    headers = {"Authorization": f"Bearer {jwt_token_leader}"}
+    other_headers = {"Authorization": f"Bearer {jwt_token_other_leader}"}
+    token = client.get("/sync", headers=headers).json["token"]
+    other_token = client.get("/sync", headers=other_headers).json["token"]
+
+    db_session.query(Projects).filter(
+        Projects.project_id == UUID(seed_project_work_own["project"])
+    ).update(
+        {"project_leader": UUID(seed_other_leader["user_id"])},
+        synchronize_session=False,
+    )
+    db_session.commit()
+
+    project_work_id = seed_project_work_own["project_work_id"]
+    delta = client.get(f"/sync?since={token}", headers=headers).json
+    assert delta["deleted"]["project_works"] == [project_work_id]
+
+    delta = client.get(f"/sync?since={other_token}", headers=other_headers).json
+    assert [row["project_work_id"] for row in delta["project_works"]] == [
+        project_work_id
+    ]
+    assert delta["deleted"]["project_works"] == []
+
+
+def test_sync_full_resync_after_purge(client, jwt_token, seed_shift_report):
+    import time
+
+    from app.database.managers.sync_manager import SyncManager
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    token = client.get("/sync", headers=headers).json["token"]
+    client.delete(
+        f"/shift_reports/{seed_shift_report['shift_report_id']}/delete/hard",
+        headers=headers,
+    )
+    assert SyncManager().purge_tombstones(int(time.time()) + 60) >= 1
+
+    # Удаление уже не восстановить из надгробий — только полный снимок
+    response = client.get(f"/sync?since={token}", headers=headers)
+    assert response.status_code == 200
+    assert response.json["full_resync"] is True
+    assert response.json["shift_reports"] == []
+
+    token = response.json["token"]
+    response = client.get(f"/sync?since={token}", headers=headers)
+    assert response.json["full_resync"] is False
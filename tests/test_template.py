@@ -0,0 +1,154 @@
+# Tests for the template service proxy
+import os
+
+import pytest
+import requests
+
+PAYLOAD = {
+    "name": "Act",
+    "file_name": "act.docx",
+    "document_data": {"number": 1, "items": ["a", "b"]},
+}
+
+
+class FakeResponse:
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {}
+        self.text = "error" if not self.ok else ""
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append(kwargs)
+        if self.error:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture
+def template_client(tmp_path, monkeypatch):
+    from app.utils.template_client import template_client
+
+    monkeypatch.setattr(template_client, "url", "http://templates.local/generate")
+    monkeypatch.setattr(template_client, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(template_client, "_session_pid", None)
+    return template_client
+
+
+def _use_session(monkeypatch, client, session):
+    monkeypatch.setattr(client, "_session", session)
+    monkeypatch.setattr(client, "_session_pid", os.getpid())
+
+
+def test_generate_streams_and_caches(client, jwt_token, template_client, monkeypatch):
+    session = FakeSession(FakeResponse([b"PK\x03\x04", b"docx-body"]))
+    _use_session(monkeypatch, template_client, session)
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    response = client.post("/templates/generate", json=PAYLOAD, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-Template-Cache"] == "miss"
+    assert response.data == b"PK\x03\x04docx-body"
+    assert session.calls[0]["stream"] is True
+    assert session.calls[0]["timeout"] == template_client.timeout
+
+    # Порядок ключей не влияет на ключ кэша
+    reordered = dict(reversed(list(PAYLOAD.items())))
+    response = client.post("/templates/generate", json=reordered, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-Template-Cache"] == "hit"
+    assert response.data == b"PK\x03\x04docx-body"
+    assert len(session.calls) == 1
+
+
+def test_generate_content_length(client, jwt_token, template_client, monkeypatch):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    plain = FakeResponse([b"PK", b"plain"])
+    plain.headers = {"Content-Length": "7"}
+    _use_session(monkeypatch, template_client, FakeSession(plain))
+    response = client.post("/templates/generate", json=PAYLOAD, headers=headers)
+    assert response.headers["Content-Length"] == "7"
+    assert response.data == b"PKplain"
+
+    # Тело распаковывается при чтении — длина сжатого ответа не подходит
+    monkeypatch.setattr(template_client, "cache_dir", None)
+    gzipped = FakeResponse([b"PK", b"unpacked-body"])
+    gzipped.headers = {"Content-Length": "9", "Content-Encoding": "gzip"}
+    _use_session(monkeypatch, template_client, FakeSession(gzipped))
+    response = client.post("/templates/generate", json=PAYLOAD, headers=headers)
+    assert response.headers.get("Content-Length") != "9"
+    assert response.data == b"PKunpacked-body"
+
+
+def test_generate_closed_before_first_chunk(
+    test_app, jwt_token, template_client, monkeypatch, tmp_path
+):
+    from werkzeug.test import EnvironBuilder
+
+    upstream = FakeResponse([b"PK", b"never-read"])
+    _use_session(monkeypatch, template_client, FakeSession(upstream))
+    environ = EnvironBuilder(
+        path="/templates/generate",
+        method="POST",
+        json=PAYLOAD,
+        headers={"Authorization": f"Bearer {jwt_token}"},
+    ).get_environ()
+    statuses = []
+
+    # WSGI-сервер закрывает ответ, не прочитав ни одной порции
+    app_iter = test_app(environ, lambda status, headers: statuses.append(status))
+    app_iter.close()
+
+    assert statuses == ["200 OK"]
+    assert upstream.closed
+    assert os.listdir(tmp_path) == []
+
+
+def test_generate_upstream_timeout(client, jwt_token, template_client, monkeypatch):
+    session = FakeSession(error=requests.ReadTimeout("slow"))
+    _use_session(monkeypatch, template_client, session)
+
+    response = client.post(
+        "/templates/generate",
+        json=PAYLOAD,
+        headers={"Authorization": f"Bearer {jwt_token}"},
+    )
+    assert response.status_code == 504
+
+
+def test_generate_upstream_error_not_cached(
+    client, jwt_token, template_client, monkeypatch, tmp_path
+):
+    session = FakeSession(FakeResponse([], status_code=500))
+    _use_session(monkeypatch, template_client, session)
+
+    response = client.post(
+        "/templates/generate",
+        json=PAYLOAD,
+        headers={"Authorization": f"Bearer {jwt_token}"},
+    )
+    assert response.status_code == 500
+    assert session.response.closed
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_payload_key_is_canonical():
+    from app.utils.template_client import payload_key
+
+    assert payload_key({"a": 1, "b": [1, 2]}) == payload_key({"b": [1, 2], "a": 1})
+    assert payload_key({"a": 1}) != payload_key({"a": 2})
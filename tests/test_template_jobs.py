@@ -0,0 +1,141 @@
+# Tests for background document generation jobs
+import os
+import time
+
+import pytest
+
+from tests.test_template import PAYLOAD, FakeResponse, FakeSession
+
+
+@pytest.fixture
+def template_client(tmp_path, monkeypatch):
+    from app.utils.template_client import template_client
+
+    monkeypatch.setattr(template_client, "url", "http://templates.local/generate")
+    monkeypatch.setattr(template_client, "cache_dir", str(tmp_path))
+    return template_client
+
+
+def _use_session(monkeypatch, client, session):
+    monkeypatch.setattr(client, "_session", session)
+    monkeypatch.setattr(client, "_session_pid", os.getpid())
+
+
+def _wait_for_job(client, job_id, headers):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = client.get(f"/templates/jobs/{job_id}", headers=headers).json["job"]
+        if job["status"] in {"done", "failed"}:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_lifecycle(client, jwt_token, template_client, monkeypatch):
+    session = FakeSession(FakeResponse([b"PK", b"job-doc"]))
+    _use_session(monkeypatch, template_client, session)
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    response = client.post("/templates/jobs", json=PAYLOAD, headers=headers)
+    assert response.status_code == 202
+    job_id = response.json["job_id"]
+
+    job = _wait_for_job(client, job_id, headers)
+    assert job["status"] == "done"
+    assert job["finished_at"] is not None
+
+    response = client.get(f"/templates/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 200
+    assert response.data == b"PKjob-doc"
+    assert len(session.calls) == 1
+
+
+def test_job_document_does_not_depend_on_local_cache(
+    client, jwt_token, template_client, monkeypatch, tmp_path
+):
+    from app.database.managers.document_jobs_manager import DocumentJobsManager
+
+    _use_session(monkeypatch, template_client, FakeSession(FakeResponse([b"PKdoc"])))
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    job_id = client.post("/templates/jobs", json=PAYLOAD, headers=headers).json[
+        "job_id"
+    ]
+    assert _wait_for_job(client, job_id, headers)["status"] == "done"
+
+    # Документ отдаёт и узел, в чьём кэше файла нет (воркер на другой машине)
+    for path in tmp_path.iterdir():
+        path.unlink()
+    response = client.get(f"/templates/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 200
+    assert response.data == b"PKdoc"
+
+    # По истечении срока хранения документ удаляется
+    assert DocumentJobsManager().purge_documents(time.time() + 1) == 1
+    response = client.get(f"/templates/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 410
+
+
+def test_job_failure(client, jwt_token, template_client, monkeypatch):
+    session = FakeSession(FakeResponse([], status_code=500))
+    _use_session(monkeypatch, template_client, session)
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    job_id = client.post("/templates/jobs", json=PAYLOAD, headers=headers).json[
+        "job_id"
+    ]
+
+    job = _wait_for_job(client, job_id, headers)
+    assert job["status"] == "failed"
+    assert job["error"]
+
+    response = client.get(f"/templates/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 409
+
+
+def test_job_visible_only_to_owner(
+    client, jwt_token, jwt_token_user, template_client, monkeypatch
+):
+    session = FakeSession(FakeResponse([b"doc"]))
+    _use_session(monkeypatch, template_client, session)
+    admin_headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    job_id = client.post("/templates/jobs", json=PAYLOAD, headers=admin_headers).json[
+        "job_id"
+    ]
+    _wait_for_job(client, job_id, admin_headers)
+
+    response = client.get(
+        f"/templates/jobs/{job_id}",
+        headers={"Authorization": f"Bearer {jwt_token_user}"},
+    )
+    assert response.status_code == 403
+
+
+def test_job_not_left_queued_when_submit_fails(
+    client, jwt_token, template_client, monkeypatch, db_session
+):
+    from app.database.managers.job_queue_manager import JobQueueManager
+    from app.database.models import DocumentJobs
+    from app.utils.document_jobs import document_job_runner
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("queue is down")
+
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    # Очередь: задание и запись очереди создаются одной транзакцией
+    monkeypatch.setattr(document_job_runner, "backend", "queue")
+    monkeypatch.setattr(JobQueueManager, "enqueue", broken)
+    response = client.post("/templates/jobs", json=PAYLOAD, headers=headers)
+    assert response.status_code == 500
+    assert db_session.query(DocumentJobs).count() == 0
+
+    # Потоки: незапущенное задание сразу помечается упавшим
+    monkeypatch.setattr(document_job_runner, "backend", "thread")
+    monkeypatch.setattr(document_job_runner.executor, "submit", broken)
+    response = client.post("/templates/jobs", json=PAYLOAD, headers=headers)
+    assert response.status_code == 500
+    db_session.expire_all()
+    job = db_session.query(DocumentJobs).one()
+    assert (job.status, job.error) == ("failed", "queue is down")
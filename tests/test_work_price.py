@@ -1,3 +1,5 @@
+from uuid import uuid4
+
 import pytest
 
 
@@ -154,3 +156,122 @@ def test_get_all_work_prices(client, jwt_token, seed_work_price):
         wp["work_price_id"] == str(seed_work_price["work_price_id"])
         for wp in work_prices
     )
+
+
+def _bulk(client, token, payload):
+    return client.post(
+        "/work_prices/bulk",
+        json=payload,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+def test_bulk_work_prices(client, jwt_token, seed_work_price, db_session):
+    from app.database.models import TableVersions, WorkPrices
+
+    work_id = seed_work_price["work"]
+    version = db_session.get(TableVersions, "work_prices")
+    before = version.version if version else 0
+
+    payload = {"prices": [{"work": work_id, "prices": {"1": 100, "2": 200.5}}]}
+    response = _bulk(client, jwt_token, payload)
+    assert response.status_code == 200, response.json
+    assert response.json["created"] == 1
+    assert response.json["updated"] == 0
+    assert response.json["unchanged"] == 1
+    assert response.json["reprice_job_id"] is None
+    [change] = response.json["changes"]
+    assert change["work"] == work_id
+    assert change["category"] == 2
+    assert change["old_price"] is None
+    assert change["price"] == 200.5
+    assert change["change"] == "created"
+
+    payload = {"prices": [{"work": work_id, "prices": {"1": 150, "2": 200.5}}]}
+    response = _bulk(client, jwt_token, payload)
+    assert response.json["updated"] == 1
+    assert response.json["changes"][0]["old_price"] == 100
+    assert (
+        response.json["changes"][0]["work_price_id"]
+        == (seed_work_price["work_price_id"])
+    )
+
+    # Повтор той же матрицы ничего не пишет и не сбрасывает кэши
+    response = _bulk(client, jwt_token, payload)
+    assert response.json["changes"] == []
+
+    db_session.expire_all()
+    prices = db_session.query(WorkPrices.category, WorkPrices.price).filter(
+        WorkPrices.work == work_id
+    )
+    assert sorted(prices) == [(1, 150), (2, 200.5)]
+    assert db_session.get(TableVersions, "work_prices").version == before + 2
+
+
+def test_bulk_work_prices_reprice_inline(
+    client, jwt_token, seed_work, seed_shift_report_detail, db_session
+):
+    from app.database.models import ShiftReportDetails
+
+    payload = {
+        "prices": [{"work": seed_work["work_id"], "prices": {"0": 120}}],
+        "reprice": True,
+    }
+    response = _bulk(client, jwt_token, payload)
+    assert response.status_code == 200, response.json
+    assert response.json["reprice_job_id"] is None
+    assert response.json["repriced"] == 1
+    db_session.expire_all()
+    detail = db_session.get(
+        ShiftReportDetails, seed_shift_report_detail["shift_report_detail_id"]
+    )
+    assert detail.summ == 1260  # 120 * 10.5
+
+
+def test_bulk_work_prices_reprice_queue(
+    client, jwt_token, seed_work, seed_shift_report_detail, db_session, monkeypatch
+):
+    from app.database.models import BackgroundJobs, ShiftReportDetails
+    from app.jobs import get_task
+
+    monkeypatch.setitem(client.application.config, "REPRICE_JOBS_BACKEND", "queue")
+    payload = {
+        "prices": [{"work": seed_work["work_id"], "prices": {"0": 120}}],
+        "reprice": True,
+    }
+    response = _bulk(client, jwt_token, payload)
+    assert response.status_code == 200, response.json
+    assert response.json["repriced"] is None
+    job = db_session.get(BackgroundJobs, response.json["reprice_job_id"])
+    assert job.payload == {"works": [seed_work["work_id"]]}
+
+    get_task(job.kind).func(job.payload)
+    db_session.expire_all()
+    detail = db_session.get(
+        ShiftReportDetails, seed_shift_report_detail["shift_report_detail_id"]
+    )
+    assert detail.summ == 1260  # 120 * 10.5
+
+
+def test_bulk_work_prices_invalid(client, jwt_token, jwt_token_user, seed_work):
+    response = _bulk(
+        client,
+        jwt_token,
+        {"prices": [{"work": seed_work["work_id"], "prices": {"7": 100}}]},
+    )
+    assert response.status_code == 400
+
+    response = _bulk(
+        client,
+        jwt_token,
+        {"prices": [{"work": str(uuid4()), "prices": {"1": 100}}]},
+    )
+    assert response.status_code == 400
+    assert response.json["msg"].startswith("Works not found")
+
+    response = _bulk(
+        client,
+        jwt_token_user,
+        {"prices": [{"work": seed_work["work_id"], "prices": {"1": 100}}]},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,172 @@
+# Tests for the price list import: normalization, diff and bulk upsert
+import io
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from app.utils.db_works import DEFAULT_SHEET, normalize_price_sheet
+
+HEADERS = [" Наименование оборудования ", "Unnamed: 1", "1 разряд", "2 разряд"]
+
+
+def _xlsx(rows, sheet_name=DEFAULT_SHEET):
+    buffer = io.BytesIO()
+    pd.DataFrame(rows, columns=HEADERS).to_excel(
+        buffer, sheet_name=sheet_name, index=False
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def _import(client, token, rows, query=""):
+    return client.post(
+        f"/works/import{query}",
+        data={"file": (_xlsx(rows), "prices.xlsx")},
+        headers={"Authorization": f"Bearer {token}"},
+        content_type="multipart/form-data",
+    )
+
+
+def _prices(db_session, work_name):
+    from app.database.models import WorkPrices, Works
+
+    db_session.expire_all()
+    rows = (
+        db_session.query(WorkPrices.category, WorkPrices.price)
+        .join(Works, Works.work_id == WorkPrices.work)
+        .filter(Works.name == work_name)
+    )
+    return dict(rows.all())
+
+
+def test_normalize_price_sheet():
+    df = pd.DataFrame(
+        [
+            ["  Кабель ", "Прокладка   кабеля", "1 200,50", -5],
+            ["Кабель", None, 100, 200],
+            [None, "Без категории", 100, 200],
+            ["Кабель", "Прокладка кабеля", "1 300", "нет"],
+            ["Щиты", 42, 10.555, None],
+        ],
+        columns=HEADERS,
+    )
+    result = normalize_price_sheet(df)
+    assert result.columns.tolist() == [
+        "work_category",
+        "work",
+        "price_1",
+        "price_2",
+        "price_3",
+        "price_4",
+    ]
+    records = result.where(result.notna(), None).to_dict("records")
+    assert records == [
+        {
+            "work_category": "Кабель",
+            "work": "Прокладка кабеля",
+            "price_1": 1300.0,
+            "price_2": None,
+            "price_3": None,
+            "price_4": None,
+        },
+        {
+            "work_category": "Щиты",
+            "work": "42",
+            "price_1": 10.56,
+            "price_2": None,
+            "price_3": None,
+            "price_4": None,
+        },
+    ]
+
+
+def test_normalize_requires_columns():
+    with pytest.raises(ValueError, match="work_category"):
+        normalize_price_sheet(pd.DataFrame({"Unnamed: 1": ["Работа"]}))
+
+
+def test_import_dry_run_and_apply(client, jwt_token, db_session, seed_work_price):
+    from app.database.models import WorkCategories, Works
+
+    rows = [
+        ["Test Category", "Test Work", 100, 250],
+        ["Test Category", "New Work", 300, None],
+        ["New Category", "Other Work", "1 000,5", 1200],
+        [None, "Skipped", 1, 2],
+    ]
+    response = _import(client, jwt_token, rows, "?dry_run=true")
+    assert response.status_code == 200, response.json
+    assert response.json == {
+        "msg": "Price list checked successfully",
+        "dry_run": True,
+        "rows": 3,
+        "skipped": 1,
+        "categories": {"created": 1, "updated": 0, "unchanged": 1},
+        "works": {"created": 2, "updated": 0, "unchanged": 1},
+        "prices": {"created": 4, "updated": 0, "unchanged": 1},
+    }
+    assert not db_session.query(Works).filter_by(name="New Work").count()
+
+    response = _import(client, jwt_token, rows)
+    assert response.status_code == 200, response.json
+    assert response.json["msg"] == "Price list imported successfully"
+    assert response.json["prices"] == {"created": 4, "updated": 0, "unchanged": 1}
+
+    db_session.expire_all()
+    category = db_session.query(WorkCategories).filter_by(name="New Category").one()
+    work = db_session.query(Works).filter_by(name="Other Work").one()
+    assert work.category == category.work_category_id
+    assert work.measurement_unit == "шт."
+    assert _prices(db_session, "Test Work") == {1: Decimal(100), 2: Decimal(250)}
+    assert _prices(db_session, "Other Work") == {
+        1: Decimal("1000.50"),
+        2: Decimal(1200),
+    }
+
+    # Повторная загрузка ничего не меняет
+    response = _import(client, jwt_token, rows)
+    assert response.json["works"] == {"created": 0, "updated": 0, "unchanged": 3}
+    assert response.json["prices"] == {"created": 0, "updated": 0, "unchanged": 5}
+
+
+def test_import_updates_prices_and_restores_deleted(
+    client, jwt_token, db_session, seed_work_price
+):
+    from app.database.models import Works
+
+    work = db_session.query(Works).filter_by(name="Test Work").one()
+    work.deleted = True
+    db_session.commit()
+
+    response = _import(client, jwt_token, [["Test Category", "Test Work", 150, None]])
+    assert response.status_code == 200, response.json
+    assert response.json["works"] == {"created": 0, "updated": 1, "unchanged": 0}
+    assert response.json["prices"] == {"created": 0, "updated": 1, "unchanged": 0}
+
+    db_session.expire_all()
+    assert db_session.query(Works).filter_by(name="Test Work").one().deleted is False
+    assert _prices(db_session, "Test Work") == {1: Decimal(150)}
+
+
+def test_import_invalid_file(client, jwt_token):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    response = client.post(
+        "/works/import",
+        data={"file": (io.BytesIO(b"not excel"), "prices.xlsx")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 400
+    assert response.json["msg"].startswith("Invalid price list")
+
+    response = _import(client, jwt_token, [], "?sheet=Missing")
+    assert response.status_code == 400
+
+    response = client.post("/works/import", headers=headers)
+    assert response.status_code == 400
+
+
+def test_import_forbidden_for_user(client, jwt_token_user):
+    response = _import(client, jwt_token_user, [["Category", "Work", 1, 2]])
+    assert response.status_code == 403
@@ -0,0 +1,21 @@
+import os
+
+from dotenv import load_dotenv
+
+from app import create_app
+from app.database.maintenance import maintenance_scheduler
+from app.jobs.worker import Worker
+
+load_dotenv()
+
+# Отдельный процесс для очереди фоновых заданий:
+#   python worker.py
+# Запускается рядом с gunicorn (run.py); число потоков — JOB_WORKER_CONCURRENCY
+config_name = os.getenv("CONFIG_NAME", "development")
+app = create_app(config_name)
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        maintenance_scheduler.ensure_started()
+        Worker(app.config).run()